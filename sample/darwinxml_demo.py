@@ -12,7 +12,10 @@ Shows how to:
 import asyncio
 from typing import List
 
-from mdrag.capabilities.ingestion.docling.chunker import DoclingChunks
+from mdrag.capabilities.ingestion.docling.chunker import (
+    ChunkDocumentContext,
+    DoclingChunks,
+)
 from mdrag.capabilities.ingestion.docling.darwinxml_models import (
     ValidationStatus,
 )
@@ -53,18 +56,22 @@ async def create_sample_chunk(
         metadata={"demo": True},
     )
 
-    return DoclingChunks(
+    document = ChunkDocumentContext(
+        title=title,
+        base_metadata={"chunk_method": "hierarchical"},
+        passport=passport,
         frontmatter=frontmatter,
+    )
+
+    return DoclingChunks(
+        document=document,
         content=content,
         index=index,
         start_char=0,
         end_char=len(content),
-        passport=passport,
         token_count=len(content.split()),
-        metadata={
-            "chunk_method": "hierarchical",
-            "is_table": False,
-        },
+        heading_path=heading_path or [],
+        page_number=1,
     )
 
 
@@ -1,11 +1,21 @@
-"""Initialize MongoDB search indexes for Docker deployment."""
+"""Initialize MongoDB indexes for Docker deployment.
 
+Usage:
+    uv run python server/maintenance/init_indexes.py [--dry-run] [--no-wait]
+
+Index specs (vector, text, and B-tree) are derived from settings and the
+search/purge filter fields by ``mdrag.integrations.mongodb.indexes``; this
+script diffs them against the live indexes, applies the changes, waits for
+search indexes to become queryable, and reports filters left unindexed.
+"""
+
+import argparse
 import asyncio
 import sys
 from pathlib import Path
 
 from pymongo import AsyncMongoClient
-from pymongo.errors import ConnectionFailure, OperationFailure
+from pymongo.errors import ConnectionFailure
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 
@@ -19,211 +29,30 @@ def _load_logging():
     return get_logger, setup_logging
 
 
-async def create_vector_search_index(
-    client: AsyncMongoClient,
-    database: str,
-    collection: str,
-    index_name: str,
-    logger,
-) -> bool:
-    """
-    Create vector search index on the chunks collection.
-
-    Args:
-        client: MongoDB client
-        database: Database name
-        collection: Collection name
-        index_name: Index name
-
-    Returns:
-        True if index was created or already exists, False otherwise
-    """
-    try:
-        db = client[database]
-        coll = db[collection]
-
-        # Check if index already exists
-        cursor = await coll.list_indexes()
-        existing_indexes = await cursor.to_list(length=None)
-        for idx in existing_indexes:
-            if idx.get("name") == index_name:
-                await logger.info(
-                    "vector_index_exists",
-                    action="vector_index_exists",
-                    index_name=index_name,
-                    database=database,
-                    collection=collection,
-                )
-                return True
-
-        # Create vector search index
-        # Note: This requires MongoDB Enterprise with vector search support
-        await db.command(
-            {
-                "createSearchIndexes": collection,
-                "indexes": [
-                    {
-                        "name": index_name,
-                        "type": "vectorSearch",
-                        "definition": {
-                            "fields": [
-                                {
-                                    "type": "vector",
-                                    "path": "embedding",
-                                    "numDimensions": 1536,
-                                    "similarity": "cosine",
-                                }
-                            ]
-                        },
-                    }
-                ],
-            }
-        )
-
-        await logger.info(
-            "vector_index_created",
-            action="vector_index_created",
-            index_name=index_name,
-            database=database,
-            collection=collection,
-        )
-        return True
-
-    except OperationFailure as e:
-        if "CommandNotFound" in str(e) or "not supported" in str(e).lower():
-            await logger.error(
-                "vector_index_not_supported",
-                action="vector_index_not_supported",
-                error=str(e),
-            )
-        else:
-            await logger.error(
-                "vector_index_create_failed",
-                action="vector_index_create_failed",
-                error=str(e),
-                database=database,
-                collection=collection,
-            )
-        return False
-    except Exception as e:
-        await logger.error(
-            "vector_index_create_unexpected_error",
-            action="vector_index_create_unexpected_error",
-            error=str(e),
-            error_type=type(e).__name__,
-            database=database,
-            collection=collection,
-        )
-        return False
-
-
-async def create_text_search_index(
-    client: AsyncMongoClient,
-    database: str,
-    collection: str,
-    index_name: str,
-    logger,
-) -> bool:
-    """
-    Create full-text search index on the chunks collection.
-
-    Args:
-        client: MongoDB client
-        database: Database name
-        collection: Collection name
-        index_name: Index name
-
-    Returns:
-        True if index was created or already exists, False otherwise
-    """
-    try:
-        db = client[database]
-        coll = db[collection]
-
-        # Check if index already exists
-        cursor = await coll.list_indexes()
-        existing_indexes = await cursor.to_list(length=None)
-        for idx in existing_indexes:
-            if idx.get("name") == index_name:
-                await logger.info(
-                    "text_index_exists",
-                    action="text_index_exists",
-                    index_name=index_name,
-                    database=database,
-                    collection=collection,
-                )
-                return True
-
-        # Create Atlas Search index
-        # Note: This requires MongoDB Enterprise with Atlas Search support
-        await db.command(
-            {
-                "createSearchIndexes": collection,
-                "indexes": [
-                    {
-                        "name": index_name,
-                        "type": "search",
-                        "definition": {
-                            "mappings": {
-                                "dynamic": False,
-                                "fields": {
-                                    "content": {
-                                        "type": "string",
-                                        "analyzer": "lucene.standard",
-                                    }
-                                },
-                            }
-                        },
-                    }
-                ],
-            }
-        )
-
-        await logger.info(
-            "text_index_created",
-            action="text_index_created",
-            index_name=index_name,
-            database=database,
-            collection=collection,
-        )
-        return True
-
-    except OperationFailure as e:
-        if "CommandNotFound" in str(e) or "not supported" in str(e).lower():
-            await logger.error(
-                "text_index_not_supported",
-                action="text_index_not_supported",
-                error=str(e),
-            )
-        else:
-            await logger.error(
-                "text_index_create_failed",
-                action="text_index_create_failed",
-                error=str(e),
-                database=database,
-                collection=collection,
-            )
-        return False
-    except Exception as e:
-        await logger.error(
-            "text_index_create_unexpected_error",
-            action="text_index_create_unexpected_error",
-            error=str(e),
-            error_type=type(e).__name__,
-            database=database,
-            collection=collection,
-        )
-        return False
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Report planned index changes and unindexed filters without applying",
+    )
+    parser.add_argument(
+        "--no-wait",
+        action="store_true",
+        help="Do not wait for search indexes to become queryable",
+    )
+    return parser.parse_args()
 
 
-async def initialize_indexes(logger) -> bool:
+async def initialize_indexes(logger, *, dry_run: bool = False, wait: bool = True) -> bool:
     """
     Initialize all required MongoDB indexes for the RAG system.
 
     Returns:
-        True if all indexes were created successfully, False otherwise
+        True if all indexes are in place and queryable, False otherwise
     """
     from mdrag.config.settings import Settings  # type: ignore[reportMissingImports]
+    from mdrag.integrations.mongodb.indexes import IndexManager  # type: ignore[reportMissingImports]
 
     settings = Settings()
     client = None
@@ -244,35 +73,22 @@ async def initialize_indexes(logger) -> bool:
         version = build_info.get("version", "unknown")
         await logger.info(f"MongoDB version: {version}")
 
-        # Create vector search index
-        vector_success = await create_vector_search_index(
-            client,
-            settings.mongodb_database,
-            settings.mongodb_collection_chunks,
-            settings.mongodb_vector_index,
-            logger,
+        manager = IndexManager.from_settings(client[settings.mongodb_database], settings)
+        report = await manager.sync(
+            dry_run=dry_run,
+            wait=wait,
+            timeout=settings.mongodb_index_ready_timeout,
         )
 
-        # Create text search index
-        text_success = await create_text_search_index(
-            client,
-            settings.mongodb_database,
-            settings.mongodb_collection_chunks,
-            settings.mongodb_text_index,
-            logger,
-        )
-
-        if vector_success and text_success:
+        if report.ok:
             await logger.info("All indexes initialized successfully")
             return True
-        else:
+        if report.plan.unsupported:
             await logger.warning(
-                "Some indexes failed to initialize. Check if you're using MongoDB Enterprise Edition."
+                "Search indexes are not supported by this server. "
+                "Use MongoDB Enterprise or Atlas (free tier includes these features)."
             )
-            await logger.warning(
-                "For development, you can use MongoDB Atlas which includes these features on the free tier."
-            )
-            return False
+        return False
 
     except ConnectionFailure as e:
         await logger.error(f"Failed to connect to MongoDB: {e}")
@@ -288,13 +104,14 @@ async def initialize_indexes(logger) -> bool:
 
 async def main():
     """Main entry point for index initialization."""
+    args = _parse_args()
     get_logger, setup_logging = _load_logging()
     await setup_logging()
     logger = get_logger(__name__)
 
     await logger.info("Starting MongoDB index initialization...")
 
-    success = await initialize_indexes(logger)
+    success = await initialize_indexes(logger, dry_run=args.dry_run, wait=not args.no_wait)
 
     if success:
         await logger.info("Index initialization completed successfully")
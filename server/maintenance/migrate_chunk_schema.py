@@ -0,0 +1,128 @@
+"""Rewrite stored chunks into the compact chunk schema (version 2).
+
+Usage:
+    uv run python server/maintenance/migrate_chunk_schema.py [--batch-size N] [--dry-run]
+
+The migration streams chunks that are not yet at the current schema version
+and rewrites them in unordered bulk writes, so it can be interrupted and run
+again at any time.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+
+from pymongo import AsyncMongoClient
+from pymongo.errors import ConnectionFailure
+
+ROOT_DIR = Path(__file__).resolve().parents[2]
+
+
+def _load_logging():
+    from mdrag.mdrag_logging.service_logging import (  # type: ignore[reportMissingImports]
+        get_logger,
+        setup_logging,
+    )
+
+    return get_logger, setup_logging
+
+
+def _parse_args() -> argparse.Namespace:
+    from mdrag.integrations.mongodb.adapters.chunk_schema import (  # type: ignore[reportMissingImports]
+        DEFAULT_MIGRATION_BATCH_SIZE,
+    )
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_MIGRATION_BATCH_SIZE,
+        help="Chunk updates per bulk write",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Count chunks that would be rewritten without writing",
+    )
+    return parser.parse_args()
+
+
+async def migrate_chunk_schema(logger, *, batch_size: int, dry_run: bool) -> bool:
+    """
+    Migrate the configured chunks collection to the current chunk schema.
+
+    Returns:
+        True if the migration completed, False otherwise
+    """
+    from mdrag.config.settings import Settings  # type: ignore[reportMissingImports]
+    from mdrag.integrations.mongodb.adapters.chunk_schema import (  # type: ignore[reportMissingImports]
+        CHUNK_SCHEMA_VERSION,
+        migrate_chunks,
+    )
+
+    settings = Settings()
+    client = None
+
+    try:
+        client = AsyncMongoClient(
+            settings.mongodb_connection_string, serverSelectionTimeoutMS=10000
+        )
+        await client.admin.command("ping")
+        db = client[settings.mongodb_database]
+
+        await logger.info(
+            "chunk_schema_migration_started",
+            action="chunk_schema_migration_started",
+            collection=settings.mongodb_collection_chunks,
+            schema_version=CHUNK_SCHEMA_VERSION,
+            batch_size=batch_size,
+            dry_run=dry_run,
+        )
+        counts = await migrate_chunks(
+            db[settings.mongodb_collection_chunks],
+            db[settings.mongodb_collection_documents],
+            batch_size=batch_size,
+            dry_run=dry_run,
+        )
+        await logger.info(
+            "chunk_schema_migration_completed",
+            action="chunk_schema_migration_completed",
+            dry_run=dry_run,
+            **counts,
+        )
+        return True
+
+    except ConnectionFailure as e:
+        await logger.error(f"Failed to connect to MongoDB: {e}")
+        return False
+    except Exception as e:
+        await logger.error(
+            "chunk_schema_migration_failed",
+            action="chunk_schema_migration_failed",
+            error=str(e),
+            error_type=type(e).__name__,
+        )
+        return False
+    finally:
+        if client:
+            await client.close()
+
+
+async def main():
+    """Main entry point for the chunk schema migration."""
+    args = _parse_args()
+    get_logger, setup_logging = _load_logging()
+    await setup_logging()
+    logger = get_logger(__name__)
+
+    success = await migrate_chunk_schema(
+        logger,
+        batch_size=args.batch_size,
+        dry_run=args.dry_run,
+    )
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
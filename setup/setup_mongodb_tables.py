@@ -28,6 +28,8 @@ from mdrag.config.settings import Settings
 _REQUIRED_COLLECTIONS = [
     "mongodb_collection_documents",
     "mongodb_collection_chunks",
+    "mongodb_collection_representations",
+    "mongodb_collection_chunk_fingerprints",
     "mongodb_collection_traces",
     "mongodb_collection_feedback",
 ]
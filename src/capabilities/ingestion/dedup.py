@@ -0,0 +1,185 @@
+"""Chunk fingerprinting for exact and near-duplicate suppression.
+
+Crawled sites repeat navigation, footers, and boilerplate sections across
+pages. Chunks are fingerprinted with their exact ``chunk_hash`` and a 64-bit
+SimHash over three-word shingles; SimHashes within a small Hamming distance
+are treated as near duplicates. Shingles keep word order in the fingerprint,
+so chunks that merely share a vocabulary (a reordered list, a different
+sentence about the same terms) are not matched. One edited word changes up
+to three shingles, so in very short chunks a small edit can move the
+fingerprint past the distance the band index finds; exact copies are still
+caught by ``chunk_hash``.
+
+The SimHash is split into bands so candidates can be found with an equality
+index lookup: two fingerprints within ``BAND_COUNT - 1`` bits of each other
+share at least one band.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from mdrag.capabilities.ingestion.docling.chunker import DoclingChunks
+
+SIMHASH_BITS = 64
+BAND_COUNT = 4
+BAND_BITS = SIMHASH_BITS // BAND_COUNT
+SHINGLE_SIZE = 3
+# Chunks shorter than this are too generic to fingerprint reliably.
+MIN_FINGERPRINT_WORDS = 8
+
+_TOKEN = re.compile(r"\w+")
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkFingerprint:
+    """Exact and near-duplicate fingerprints for one chunk."""
+
+    index: int
+    chunk_hash: str
+    simhash: int
+
+    @property
+    def bands(self) -> List[int]:
+        return simhash_bands(self.simhash)
+
+
+@dataclass(frozen=True, slots=True)
+class ChunkDuplicate:
+    """Link from a suppressed chunk to the chunk it duplicates."""
+
+    index: int
+    canonical_document_uid: str
+    canonical_chunk_hash: str
+    exact: bool
+
+
+def simhash(text: str) -> int:
+    """Compute a 64-bit SimHash over lower-cased word shingles.
+
+    Per-bit vote counts are kept as bit-sliced counters (one integer per
+    counter bit, one lane per SimHash bit), so adding a shingle costs a few
+    integer operations instead of one per bit.
+    """
+    tokens = _TOKEN.findall(text.lower())
+    if not tokens:
+        return 0
+    shingles = [
+        " ".join(tokens[i : i + SHINGLE_SIZE])
+        for i in range(max(len(tokens) - SHINGLE_SIZE + 1, 1))
+    ]
+
+    counters: List[int] = []
+    for shingle in shingles:
+        carry = int.from_bytes(
+            hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(),
+            "big",
+        )
+        for i, counter in enumerate(counters):
+            if not carry:
+                break
+            counters[i], carry = counter ^ carry, counter & carry
+        if carry:
+            counters.append(carry)
+
+    threshold = len(shingles) / 2
+    fingerprint = 0
+    for bit in range(SIMHASH_BITS):
+        votes = sum(((counter >> bit) & 1) << i for i, counter in enumerate(counters))
+        if votes > threshold:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(left: int, right: int) -> int:
+    """Number of differing bits between two fingerprints."""
+    return (left ^ right).bit_count()
+
+
+def simhash_bands(fingerprint: int) -> List[int]:
+    """Split a SimHash into bands tagged with their position."""
+    mask = (1 << BAND_BITS) - 1
+    return [
+        (band << BAND_BITS) | ((fingerprint >> (band * BAND_BITS)) & mask)
+        for band in range(BAND_COUNT)
+    ]
+
+
+def to_signed64(value: int) -> int:
+    """Map an unsigned 64-bit value into BSON's signed int64 range."""
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def from_signed64(value: int) -> int:
+    """Inverse of ``to_signed64``."""
+    return value + (1 << 64) if value < 0 else value
+
+
+def fingerprint_chunk(chunk: DoclingChunks) -> Optional[ChunkFingerprint]:
+    """Fingerprint a chunk, or return None if it is too short to compare."""
+    text = chunk.embedding_input
+    if len(_TOKEN.findall(text)) < MIN_FINGERPRINT_WORDS:
+        return None
+    return ChunkFingerprint(
+        index=chunk.index,
+        chunk_hash=chunk.chunk_hash,
+        simhash=simhash(text),
+    )
+
+
+def find_internal_duplicates(
+    fingerprints: Iterable[ChunkFingerprint],
+    document_uid: str,
+    max_distance: int,
+) -> dict[int, ChunkDuplicate]:
+    """Find chunks that duplicate an earlier chunk of the same document."""
+    duplicates: dict[int, ChunkDuplicate] = {}
+    seen_hashes: set[str] = set()
+    by_band: dict[int, List[ChunkFingerprint]] = {}
+    for fingerprint in fingerprints:
+        if fingerprint.chunk_hash in seen_hashes:
+            duplicates[fingerprint.index] = ChunkDuplicate(
+                index=fingerprint.index,
+                canonical_document_uid=document_uid,
+                canonical_chunk_hash=fingerprint.chunk_hash,
+                exact=True,
+            )
+            continue
+        match = None
+        for band in fingerprint.bands:
+            for candidate in by_band.get(band, []):
+                if hamming_distance(candidate.simhash, fingerprint.simhash) <= max_distance:
+                    match = candidate
+                    break
+            if match:
+                break
+        if match:
+            duplicates[fingerprint.index] = ChunkDuplicate(
+                index=fingerprint.index,
+                canonical_document_uid=document_uid,
+                canonical_chunk_hash=match.chunk_hash,
+                exact=False,
+            )
+            continue
+        seen_hashes.add(fingerprint.chunk_hash)
+        for band in fingerprint.bands:
+            by_band.setdefault(band, []).append(fingerprint)
+    return duplicates
+
+
+__all__ = [
+    "BAND_COUNT",
+    "ChunkDuplicate",
+    "ChunkFingerprint",
+    "MIN_FINGERPRINT_WORDS",
+    "fingerprint_chunk",
+    "find_internal_duplicates",
+    "from_signed64",
+    "hamming_distance",
+    "simhash",
+    "simhash_bands",
+    "to_signed64",
+]
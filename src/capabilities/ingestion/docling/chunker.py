@@ -8,16 +8,26 @@ This module uses Docling's HierarchicalChunker which:
 - Provides heading paths for citation context
 """
 
+import hashlib
+import threading
+from collections import ChainMap
+from collections.abc import MutableMapping
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Sequence
 
 from dotenv import load_dotenv
 from docling.chunking import HierarchicalChunker
 from transformers import AutoTokenizer
 
+from mdrag.capabilities.ingestion.docling.markdown_blocks import (
+    BLOCK_TABLE,
+    parse_markdown_blocks,
+)
 from mdrag.capabilities.ingestion.models import IngestionDocument, MetadataPassport
-from mdrag.integrations.models import Source, SourceFrontmatter
+from mdrag.integrations.models import SourceFrontmatter
+from pydantic import BaseModel, Field, InstanceOf
 from mdrag.mdrag_logging.service_logging import get_logger, log_async
 
 # Load environment variables
@@ -25,6 +35,57 @@ load_dotenv()
 
 logger = get_logger(__name__)
 
+TOKENIZER_MODEL_ID = "sentence-transformers/all-MiniLM-L6-v2"
+
+_tokenizers: Dict[str, Any] = {}
+_tokenizer_lock = threading.Lock()
+
+
+def get_tokenizer(model_id: str = TOKENIZER_MODEL_ID) -> Any:
+    """Return the process-wide tokenizer for ``model_id``, loading it on first use.
+
+    The local Hugging Face cache is tried first so loading works offline and
+    does not contact the hub; the hub is only used if the model is not cached.
+    """
+    tokenizer = _tokenizers.get(model_id)
+    if tokenizer is not None:
+        return tokenizer
+    with _tokenizer_lock:
+        tokenizer = _tokenizers.get(model_id)
+        if tokenizer is None:
+            log_async(
+                logger,
+                "info",
+                "docling_tokenizer_init",
+                action="docling_tokenizer_init",
+                model_id=model_id,
+            )
+            try:
+                tokenizer = AutoTokenizer.from_pretrained(model_id, local_files_only=True)
+            except OSError:
+                tokenizer = AutoTokenizer.from_pretrained(model_id)
+            _tokenizers[model_id] = tokenizer
+    return tokenizer
+
+
+def count_tokens(
+    tokenizer: Any,
+    texts: Sequence[str],
+    *,
+    add_special_tokens: bool = True,
+) -> List[int]:
+    """Count tokens for many texts with a single batched tokenizer call."""
+    if not texts:
+        return []
+    encoded = tokenizer(
+        list(texts),
+        add_special_tokens=add_special_tokens,
+        return_attention_mask=False,
+        return_token_type_ids=False,
+        verbose=False,
+    )
+    return [len(ids) for ids in encoded["input_ids"]]
+
 
 @dataclass
 class ChunkingConfig:
@@ -44,15 +105,38 @@ class ChunkingConfig:
             raise ValueError("Minimum chunk size must be positive")
 
 
-class DoclingChunks(Source):
-    """Represents a document chunk with full metadata + optional embedding."""
+@dataclass(frozen=True, slots=True)
+class ChunkDocumentContext:
+    """Document-level chunk fields, built once and shared by every chunk."""
+
+    title: str
+    base_metadata: Dict[str, Any]
+    passport: MetadataPassport
+    frontmatter: SourceFrontmatter
+
+
+class DoclingChunks(BaseModel):
+    """A document chunk: its own fields plus a reference to the shared document.
+
+    Only per-chunk values (text, index, offsets, heading path, page, token
+    count, embedding) are stored on the chunk. ``passport``, ``frontmatter``,
+    and ``metadata`` are views over the shared ``document`` context, so all
+    chunks of a document hold a single copy of its document-level metadata.
+    """
 
+    document: InstanceOf[ChunkDocumentContext]
+    content: str
     index: int
     start_char: int
     end_char: int
     token_count: Optional[int] = None
     embedding: Optional[List[float]] = None  # For embedder compatibility
-    passport: MetadataPassport
+    heading_path: List[str] = Field(default_factory=list)
+    page_number: Optional[int] = None
+    is_table: bool = False
+    embedding_text: Optional[str] = None
+    # Per-chunk metadata added after chunking (embedding model, ...)
+    extra_metadata: Dict[str, Any] = Field(default_factory=dict)
 
     def model_post_init(self, __context: Any) -> None:
         """Calculate token count if not provided."""
@@ -60,6 +144,66 @@ class DoclingChunks(Source):
             # Rough estimation: ~4 characters per token
             self.token_count = len(self.content) // 4
 
+    # Chunks are not mutated after chunking, so the per-chunk views of the
+    # shared passport and frontmatter are built once on first access.
+    @cached_property
+    def passport(self) -> MetadataPassport:
+        """The document passport with this chunk's page and heading path."""
+        base = self.document.passport
+        return base.model_copy(
+            update={
+                "page_number": self.page_number or base.page_number,
+                "heading_path": self.heading_path or base.heading_path,
+            }
+        )
+
+    @cached_property
+    def frontmatter(self) -> SourceFrontmatter:
+        """The document frontmatter with this chunk's page and heading path."""
+        base = self.document.frontmatter
+        return base.model_copy(
+            update={
+                "metadata": {
+                    **base.metadata,
+                    "heading_path": self.heading_path,
+                    "page_number": self.page_number,
+                }
+            }
+        )
+
+    @property
+    def metadata(self) -> MutableMapping[str, Any]:
+        """Chunk metadata layered over the document's; writes stay on this chunk."""
+        heading_hierarchy = " > ".join(self.heading_path) if self.heading_path else None
+        derived = {
+            "token_count": self.token_count,
+            "heading_path": self.heading_path,
+            "heading_hierarchy": heading_hierarchy,
+            "page_number": self.page_number,
+            "summary_context": summary_context(self.document.title, self.heading_path),
+            "is_table": self.is_table,
+            "raw_text": self.content,
+            "embedding_text": self.embedding_text,
+        }
+        return ChainMap(self.extra_metadata, derived, self.document.base_metadata)
+
+    @property
+    def embedding_input(self) -> str:
+        """Text sent to the embedding model for this chunk."""
+        return self.embedding_text or self.content
+
+    @property
+    def chunk_hash(self) -> str:
+        """SHA-256 of the embedding input, used to match chunks across versions."""
+        return hashlib.sha256(self.embedding_input.encode("utf-8")).hexdigest()
+
+
+def summary_context(title: str, heading_path: List[str]) -> str:
+    """Title and heading path of a chunk, as shown in search results."""
+    if heading_path:
+        return f"{title} | {' > '.join(heading_path)}"
+    return title
+
 
 class DoclingHierarchicalChunker:
     """
@@ -80,24 +224,8 @@ class DoclingHierarchicalChunker:
             config: Chunking configuration
         """
         self.config = config
-
-        # Initialize tokenizer for token-aware chunking
-        model_id = "sentence-transformers/all-MiniLM-L6-v2"
-        log_async(
-            logger,
-            "info",
-            "docling_tokenizer_init",
-            action="docling_tokenizer_init",
-            model_id=model_id,
-        )
-        self.tokenizer = AutoTokenizer.from_pretrained(model_id)
-
-        # Create HierarchicalChunker
-        self.chunker = HierarchicalChunker(
-            tokenizer=self.tokenizer,
-            max_tokens=config.max_tokens,
-            merge_peers=True,
-        )
+        # Tokenizer and HierarchicalChunker are created on first use
+        self._chunker: Optional[HierarchicalChunker] = None
 
         log_async(
             logger,
@@ -107,11 +235,49 @@ class DoclingHierarchicalChunker:
             max_tokens=config.max_tokens,
         )
 
-    async def chunk_document(self, document: IngestionDocument) -> List[DoclingChunks]:
+    @property
+    def tokenizer(self) -> Any:
+        """Shared tokenizer for token-aware chunking."""
+        return get_tokenizer()
+
+    @property
+    def chunker(self) -> HierarchicalChunker:
+        """Docling HierarchicalChunker, created on first use."""
+        if self._chunker is None:
+            self._chunker = HierarchicalChunker(
+                tokenizer=self.tokenizer,
+                max_tokens=self.config.max_tokens,
+                merge_peers=True,
+            )
+        return self._chunker
+
+    def _count_tokens(
+        self,
+        texts: Sequence[str],
+        *,
+        add_special_tokens: bool = True,
+    ) -> List[int]:
+        return count_tokens(
+            self.tokenizer,
+            texts,
+            add_special_tokens=add_special_tokens,
+        )
+
+    async def chunk_document(
+        self,
+        document: IngestionDocument,
+        *,
+        heading_context: Optional[List[str]] = None,
+        index_offset: int = 0,
+    ) -> List[DoclingChunks]:
         """Chunk a processed document using Docling's HierarchicalChunker.
 
         Args:
             document: Docling-processed ingestion document.
+            heading_context: Heading path in effect where this document starts.
+                Used for page windows so chunks before the window's first
+                heading keep the section they belong to.
+            index_offset: Index assigned to the first chunk.
 
         Returns:
             List of document chunks with contextualized content.
@@ -137,91 +303,78 @@ class DoclingHierarchicalChunker:
 
         docling_doc = document.docling_document
         if docling_doc is None:
-            await logger.warning(
-                "docling_chunker_fallback",
-                action="docling_chunker_fallback",
-                reason="no_docling_document",
-            )
-            return self._simple_fallback_chunk(document.content, base_metadata)
+            try:
+                return await self._chunk_markdown(
+                    document,
+                    base_metadata,
+                    heading_context=heading_context,
+                    index_offset=index_offset,
+                )
+            except Exception as exc:
+                await logger.error(
+                    "markdown_chunker_failed",
+                    action="markdown_chunker_failed",
+                    error=str(exc),
+                    error_type=type(exc).__name__,
+                )
+                return self._simple_fallback_chunk(
+                    document.content,
+                    base_metadata,
+                    index_offset=index_offset,
+                )
 
         try:
             # Use HierarchicalChunker to chunk the DoclingDocument
             chunk_iter = self.chunker.chunk(dl_doc=docling_doc)
             chunks = list(chunk_iter)
 
-            # Convert Docling chunks to DoclingChunks objects
-            document_chunks = []
-            current_pos = 0
-
-            for i, chunk in enumerate(chunks):
+            contextualized: List[tuple[str, List[str]]] = []
+            for chunk in chunks:
                 # Get contextualized text (includes heading hierarchy)
                 contextualized_text = self._contextualize(chunk)
 
                 heading_path = self._extract_heading_path(chunk)
+                if not heading_path and heading_context:
+                    heading_path = list(heading_context)
+                    contextualized_text = (
+                        "\n".join(heading_context) + "\n" + contextualized_text
+                    )
+                contextualized.append((contextualized_text, heading_path))
+
+            context = self._document_context(
+                base_metadata,
+                title=document.title,
+                frontmatter=document.metadata.frontmatter.model_copy(deep=True),
+                total_chunks=len(chunks),
+            )
+
+            # Count actual tokens in one batch
+            token_counts = self._count_tokens([text for text, _ in contextualized])
+
+            # Convert Docling chunks to DoclingChunks objects
+            document_chunks = []
+            current_pos = 0
+
+            for i, (chunk, (contextualized_text, heading_path), token_count) in enumerate(
+                zip(chunks, contextualized, token_counts)
+            ):
                 page_number = self._extract_page_number(chunk)
                 is_table = self._extract_is_table(chunk, contextualized_text)
-                summary_context = self._build_summary_context(
-                    title=document.title,
-                    heading_path=heading_path,
-                )
-                embedding_text = None
-                if is_table:
-                    embedding_text = self._flatten_markdown_table(contextualized_text)
-
-                # Count actual tokens
-                token_count = len(self.tokenizer.encode(contextualized_text))
-
-                passport = MetadataPassport(
-                    document_uid=base_metadata.get("document_uid", ""),
-                    source_type=base_metadata.get("source_type", "upload"),
-                    source_url=base_metadata.get("source_url", ""),
-                    source_id=base_metadata.get("source_id"),
-                    source_group=base_metadata.get("source_group"),
-                    user_id=base_metadata.get("user_id"),
-                    org_id=base_metadata.get("org_id"),
-                    document_title=base_metadata.get("document_title", document.title),
-                    page_number=page_number or base_metadata.get("page_number"),
-                    heading_path=heading_path or base_metadata.get("heading_path", []),
-                    ingestion_timestamp=base_metadata.get(
-                        "ingestion_timestamp", datetime.now().isoformat()
-                    ),
-                    content_hash=base_metadata.get("content_hash", ""),
-                )
-                frontmatter = metadata.frontmatter.model_copy(deep=True)
-                frontmatter.metadata = {
-                    **frontmatter.metadata,
-                    "heading_path": heading_path,
-                    "page_number": page_number,
-                }
-
-                # Create chunk metadata
-                chunk_metadata = {
-                    **base_metadata,
-                    "total_chunks": len(chunks),
-                    "token_count": token_count,
-                    "has_context": True,
-                    "heading_path": heading_path,
-                    "heading_hierarchy": " > ".join(heading_path) if heading_path else None,
-                    "page_number": page_number,
-                    "summary_context": summary_context,
-                    "is_table": is_table,
-                    "raw_text": contextualized_text.strip(),
-                    "embedding_text": embedding_text,
-                }
 
                 # Estimate character positions
                 start_char = current_pos
                 end_char = start_char + len(contextualized_text)
 
                 document_chunks.append(
-                    DoclingChunks(
-                        frontmatter=frontmatter,
-                        content=contextualized_text.strip(),
-                        index=i,
+                    self._build_chunk(
+                        context,
+                        text=contextualized_text,
+                        index=index_offset + i,
                         start_char=start_char,
                         end_char=end_char,
-                        metadata=chunk_metadata,
-                        passport=passport,
+                        heading_path=heading_path,
+                        page_number=page_number,
+                        is_table=is_table,
                         token_count=token_count,
                     )
                 )
@@ -242,13 +395,212 @@ class DoclingHierarchicalChunker:
                 error=str(exc),
                 error_type=type(exc).__name__,
             )
-            return self._simple_fallback_chunk(document.content, base_metadata)
+            return self._simple_fallback_chunk(
+                document.content,
+                base_metadata,
+                index_offset=index_offset,
+            )
+
+    async def _chunk_markdown(
+        self,
+        document: IngestionDocument,
+        base_metadata: Dict[str, Any],
+        *,
+        heading_context: Optional[List[str]] = None,
+        index_offset: int = 0,
+    ) -> List[DoclingChunks]:
+        """Chunk text-native markdown by its own heading and block structure.
+
+        Consecutive blocks under the same heading path are merged up to
+        ``max_tokens``; tables always form their own chunk and oversized
+        blocks are split on line and word boundaries. Chunk text is prefixed
+        with the heading path the same way Docling contextualizes chunks.
+        """
+        blocks = parse_markdown_blocks(document.content)
+        block_paths = [block.heading_path or list(heading_context or []) for block in blocks]
+        heading_texts = list(dict.fromkeys("\n".join(path) for path in block_paths))
+        heading_tokens = dict(
+            zip(
+                heading_texts,
+                self._count_tokens(heading_texts, add_special_tokens=False),
+            )
+        )
+        block_tokens_list = self._count_tokens(
+            [block.text for block in blocks],
+            add_special_tokens=False,
+        )
+        # Leave room for the special tokens added when the chunk is embedded
+        max_content_tokens = self.config.max_tokens - 2
+
+        groups: List[tuple[List[str], List[str], int, bool]] = []
+        current_path: Optional[List[str]] = None
+        current_texts: List[str] = []
+        current_tokens = 0
+        current_start = 0
+        current_table = False
+
+        def flush() -> None:
+            nonlocal current_texts, current_tokens
+            if current_texts:
+                groups.append(
+                    (current_path or [], current_texts, current_start, current_table)
+                )
+            current_texts = []
+            current_tokens = 0
+
+        for block, heading_path, block_tokens in zip(blocks, block_paths, block_tokens_list):
+            budget = max(
+                max_content_tokens - heading_tokens["\n".join(heading_path)],
+                self.config.max_tokens // 2,
+            )
+            is_table = block.kind == BLOCK_TABLE
+            if (
+                heading_path != current_path
+                or is_table
+                or current_table
+                or current_tokens + block_tokens > budget
+            ):
+                flush()
+            current_path = heading_path
+            current_table = is_table
+
+            if block_tokens > budget and not is_table:
+                for piece in self._split_oversized(block.text, budget):
+                    groups.append((heading_path, [piece], block.start_char, False))
+                continue
+            if not current_texts:
+                current_start = block.start_char
+            current_texts.append(block.text)
+            current_tokens += block_tokens
+        flush()
+
+        texts = ["\n".join([*path, "\n\n".join(parts)]) for path, parts, _, _ in groups]
+        context = self._document_context(
+            {**base_metadata, "chunk_method": "markdown"},
+            title=document.title,
+            frontmatter=document.metadata.frontmatter.model_copy(deep=True),
+            total_chunks=len(groups),
+        )
+        chunks: List[DoclingChunks] = []
+        for i, ((heading_path, _, start_char, is_table), text, token_count) in enumerate(
+            zip(groups, texts, self._count_tokens(texts))
+        ):
+            chunks.append(
+                self._build_chunk(
+                    context,
+                    text=text,
+                    index=index_offset + i,
+                    start_char=start_char,
+                    end_char=start_char + len(text),
+                    heading_path=heading_path,
+                    page_number=None,
+                    is_table=is_table,
+                    token_count=token_count,
+                )
+            )
+
+        await logger.info(
+            "markdown_chunker_complete",
+            action="markdown_chunker_complete",
+            chunk_count=len(chunks),
+        )
+        return chunks
+
+    def _split_oversized(self, text: str, budget: int) -> List[str]:
+        """Split a block that exceeds the token budget on line/word boundaries."""
+        lines = text.split("\n")
+        units: List[tuple[str, str]] = []
+        for line, line_tokens in zip(
+            lines, self._count_tokens(lines, add_special_tokens=False)
+        ):
+            if line_tokens <= budget:
+                units.append((line, "\n"))
+            else:
+                units.extend((word, " ") for word in line.split(" "))
+        unit_tokens_list = self._count_tokens(
+            [unit for unit, _ in units],
+            add_special_tokens=False,
+        )
+
+        pieces: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+        for (unit, separator), unit_tokens in zip(units, unit_tokens_list):
+            if current and current_tokens + unit_tokens > budget:
+                pieces.append("".join(current).strip())
+                current = []
+                current_tokens = 0
+            current.append(unit + separator)
+            current_tokens += unit_tokens
+        if current:
+            pieces.append("".join(current).strip())
+        return [piece for piece in pieces if piece]
 
     @staticmethod
-    def _build_summary_context(title: str, heading_path: list[str]) -> str:
-        if heading_path:
-            return f"{title} | {' > '.join(heading_path)}"
-        return title
+    def _document_context(
+        base_metadata: Dict[str, Any],
+        *,
+        title: str,
+        frontmatter: SourceFrontmatter,
+        total_chunks: int,
+    ) -> ChunkDocumentContext:
+        """Build the document-level fields shared by every chunk."""
+        passport = MetadataPassport(
+            document_uid=base_metadata.get("document_uid", ""),
+            source_type=base_metadata.get("source_type", "upload"),
+            source_url=base_metadata.get("source_url", ""),
+            source_id=base_metadata.get("source_id"),
+            source_group=base_metadata.get("source_group"),
+            user_id=base_metadata.get("user_id"),
+            org_id=base_metadata.get("org_id"),
+            document_title=base_metadata.get("document_title", title),
+            page_number=base_metadata.get("page_number"),
+            heading_path=base_metadata.get("heading_path", []),
+            ingestion_timestamp=base_metadata.get(
+                "ingestion_timestamp", datetime.now().isoformat()
+            ),
+            content_hash=base_metadata.get("content_hash", ""),
+        )
+        return ChunkDocumentContext(
+            title=title,
+            base_metadata={
+                **base_metadata,
+                "total_chunks": total_chunks,
+                "has_context": True,
+            },
+            passport=passport,
+            frontmatter=frontmatter,
+        )
+
+    def _build_chunk(
+        self,
+        context: ChunkDocumentContext,
+        *,
+        text: str,
+        index: int,
+        start_char: int,
+        end_char: int,
+        heading_path: List[str],
+        page_number: Optional[int],
+        is_table: bool,
+        token_count: int,
+    ) -> DoclingChunks:
+        """Build a chunk holding only its own fields and a reference to ``context``."""
+        content = text.strip()
+        # Inputs are already validated; skip re-validation per chunk
+        return DoclingChunks.model_construct(
+            document=context,
+            content=content,
+            index=index,
+            start_char=start_char,
+            end_char=end_char,
+            heading_path=heading_path,
+            page_number=page_number,
+            is_table=is_table,
+            embedding_text=self._flatten_markdown_table(text) if is_table else None,
+            token_count=token_count,
+            extra_metadata={},
+        )
 
     def _contextualize(self, chunk: Any) -> str:
         """Get contextualized text from a Docling chunk."""
@@ -397,6 +749,7 @@ class DoclingHierarchicalChunker:
         self,
         content: str,
         base_metadata: Dict[str, Any],
+        index_offset: int = 0,
     ) -> List[DoclingChunks]:
         """
         Simple fallback chunking when HierarchicalChunker can't be used.
@@ -408,17 +761,17 @@ class DoclingHierarchicalChunker:
         Args:
             content: Content to chunk
             base_metadata: Base metadata for chunks
+            index_offset: Index assigned to the first chunk
 
         Returns:
             List of document chunks
         """
-        chunks = []
+        windows: List[tuple[str, int, int]] = []
         chunk_size = self.config.chunk_size
         overlap = self.config.chunk_overlap
 
         # Simple sliding window approach
         start = 0
-        chunk_index = 0
 
         while start < len(content):
             end = start + chunk_size
@@ -441,71 +794,40 @@ class DoclingHierarchicalChunker:
                 end = chunk_end
 
             if chunk_text.strip():
-                token_count = len(self.tokenizer.encode(chunk_text))
-                summary_context = self._build_summary_context(
-                    title=base_metadata.get("document_title", ""),
-                    heading_path=[],
-                )
-                is_table = self._extract_is_table({}, chunk_text)
-                embedding_text = (
-                    self._flatten_markdown_table(chunk_text) if is_table else None
-                )
-
-                passport = MetadataPassport(
-                    document_uid=base_metadata.get("document_uid", ""),
-                    source_type=base_metadata.get("source_type", "upload"),
-                    source_url=base_metadata.get("source_url", ""),
-                    source_id=base_metadata.get("source_id"),
-                    source_group=base_metadata.get("source_group"),
-                    user_id=base_metadata.get("user_id"),
-                    org_id=base_metadata.get("org_id"),
-                    document_title=base_metadata.get("document_title", ""),
-                    page_number=base_metadata.get("page_number"),
-                    heading_path=base_metadata.get("heading_path", []),
-                    ingestion_timestamp=base_metadata.get(
-                        "ingestion_timestamp", datetime.now().isoformat()
-                    ),
-                    content_hash=base_metadata.get("content_hash", ""),
-                )
-                frontmatter = SourceFrontmatter(
-                    source_type=passport.source_type,
-                    source_url=passport.source_url,
-                    source_title=passport.document_title,
-                    metadata={
-                        "heading_path": passport.heading_path,
-                        "page_number": passport.page_number,
-                    },
-                )
-
-                chunks.append(
-                    DoclingChunks(
-                        frontmatter=frontmatter,
-                        content=chunk_text.strip(),
-                        index=chunk_index,
-                        start_char=start,
-                        end_char=end,
-                        metadata={
-                            **base_metadata,
-                            "chunk_method": "simple_fallback",
-                            "total_chunks": -1,  # Will update after
-                            "summary_context": summary_context,
-                            "is_table": is_table,
-                            "raw_text": chunk_text.strip(),
-                            "embedding_text": embedding_text,
-                        },
-                        passport=passport,
-                        token_count=token_count,
-                    )
-                )
-
-                chunk_index += 1
+                windows.append((chunk_text, start, end))
 
             # Move forward with overlap
             start = end - overlap
 
-        # Update total chunks
-        for chunk in chunks:
-            chunk.metadata["total_chunks"] = len(chunks)
+        title = base_metadata.get("document_title", "")
+        context = self._document_context(
+            {**base_metadata, "chunk_method": "simple_fallback"},
+            title=title,
+            frontmatter=SourceFrontmatter(
+                source_type=base_metadata.get("source_type", "upload"),
+                source_url=base_metadata.get("source_url", ""),
+                source_title=title,
+            ),
+            total_chunks=len(windows),
+        )
+        # Token counts for all windows in one batch
+        token_counts = self._count_tokens([text.strip() for text, _, _ in windows])
+        chunks = [
+            self._build_chunk(
+                context,
+                text=chunk_text,
+                index=index_offset + i,
+                start_char=start_char,
+                end_char=end_char,
+                heading_path=[],
+                page_number=None,
+                is_table=self._extract_is_table({}, chunk_text),
+                token_count=token_count,
+            )
+            for i, ((chunk_text, start_char, end_char), token_count) in enumerate(
+                zip(windows, token_counts)
+            )
+        ]
 
         log_async(
             logger,
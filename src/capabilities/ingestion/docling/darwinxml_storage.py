@@ -14,6 +14,8 @@ from datetime import datetime
 from typing import Any, Dict, List, Optional
 
 from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
 
 from mdrag.capabilities.ingestion.docling.darwinxml_models import DarwinXMLDocument
 from mdrag.capabilities.ingestion.models import GraphTriple
@@ -21,6 +23,9 @@ from mdrag.mdrag_logging.service_logging import get_logger
 
 logger = get_logger(__name__)
 
+# Operations sent per bulk_write call.
+DEFAULT_BULK_BATCH_SIZE = 500
+
 
 class DarwinXMLStorage:
     """
@@ -28,7 +33,7 @@ class DarwinXMLStorage:
 
     This class handles:
     - Storing DarwinXML metadata with chunks
-    - Upserting based on content_hash
+    - Upserting per chunk (document content_hash and chunk index)
     - Extracting graph data for Neo4j
     - Querying by tags, categories, and relationships
     """
@@ -61,7 +66,8 @@ class DarwinXMLStorage:
         Args:
             darwin_doc: DarwinXML document to store
             embedding: Optional embedding vector
-            upsert: If True, update existing document with same content_hash
+            upsert: If True, update the stored chunk with the same document
+                content_hash and chunk index
             document_id: Optional Mongo document ObjectId for lookup joins
 
         Returns:
@@ -74,13 +80,9 @@ class DarwinXMLStorage:
             document_id,
         )
 
-        # Upsert based on content_hash
         if upsert:
-            content_hash = darwin_doc.provenance.content_hash
-            filter_query = {"darwin_metadata.provenance.content_hash": content_hash}
-
             result = await self.chunks_collection.update_one(
-                filter_query,
+                self._upsert_filter(darwin_doc),
                 {"$set": chunk_doc},
                 upsert=True,
             )
@@ -116,41 +118,39 @@ class DarwinXMLStorage:
         embeddings: Optional[List[List[float]]] = None,
         upsert: bool = True,
         document_id: Optional[Any] = None,
+        batch_size: int = DEFAULT_BULK_BATCH_SIZE,
+        session: Optional[Any] = None,
     ) -> List[str]:
         """
         Store a batch of DarwinXML documents.
 
+        Documents are written with unordered ``bulk_write`` calls of at most
+        ``batch_size`` operations. A failed write does not stop the rest of
+        its batch; its position in the returned list is an empty string.
+
         Args:
             darwin_docs: List of DarwinXML documents
             embeddings: Optional list of embedding vectors (same order as documents)
             upsert: If True, update existing documents
             document_id: Optional Mongo document ObjectId for lookup joins
+            batch_size: Maximum operations per bulk write
+            session: Optional client session, to write inside a transaction
 
         Returns:
             List of inserted/updated document IDs
         """
-        doc_ids = []
-
-        for i, darwin_doc in enumerate(darwin_docs):
-            embedding = embeddings[i] if embeddings and i < len(embeddings) else None
-
-            try:
-                doc_id = await self.store_darwin_document(
-                    darwin_doc=darwin_doc,
-                    embedding=embedding,
-                    upsert=upsert,
-                    document_id=document_id,
-                )
-                doc_ids.append(doc_id)
-            except Exception as e:
-                await logger.error(
-                    "darwin_storage_failed",
-                    action="darwin_storage_failed",
-                    chunk_uuid=darwin_doc.chunk_uuid,
-                    error=str(e),
+        doc_ids: List[str] = []
+        for start in range(0, len(darwin_docs), batch_size):
+            batch = darwin_docs[start : start + batch_size]
+            batch_embeddings = [
+                embeddings[i] if embeddings and i < len(embeddings) else None
+                for i in range(start, start + len(batch))
+            ]
+            doc_ids.extend(
+                await self._write_batch(
+                    batch, batch_embeddings, upsert, document_id, session=session
                 )
-                # Continue with other documents
-                doc_ids.append("")
+            )
 
         await logger.info(
             "darwin_batch_stored",
@@ -161,6 +161,62 @@ class DarwinXMLStorage:
 
         return doc_ids
 
+    async def _write_batch(
+        self,
+        darwin_docs: List[DarwinXMLDocument],
+        embeddings: List[Optional[List[float]]],
+        upsert: bool,
+        document_id: Optional[Any],
+        *,
+        session: Optional[Any] = None,
+    ) -> List[str]:
+        """Write one batch with a single unordered bulk_write, one operation per chunk."""
+        chunk_docs = [
+            self._darwin_to_chunk_document(darwin_doc, embedding, document_id)
+            for darwin_doc, embedding in zip(darwin_docs, embeddings)
+        ]
+        if upsert:
+            operations: List[Any] = [
+                UpdateOne(self._upsert_filter(darwin_doc), {"$set": chunk_doc}, upsert=True)
+                for darwin_doc, chunk_doc in zip(darwin_docs, chunk_docs)
+            ]
+            # Matched (updated) documents are identified by their chunk UUID.
+            doc_ids = [darwin_doc.chunk_uuid for darwin_doc in darwin_docs]
+        else:
+            operations = [InsertOne(chunk_doc) for chunk_doc in chunk_docs]
+            doc_ids = []
+
+        try:
+            result = await self.chunks_collection.bulk_write(
+                operations, ordered=False, session=session
+            )
+            details = {
+                "upserted": [
+                    {"index": index, "_id": upserted_id}
+                    for index, upserted_id in (result.upserted_ids or {}).items()
+                ],
+                "writeErrors": [],
+            }
+        except BulkWriteError as exc:
+            details = exc.details
+
+        if not upsert:
+            # InsertOne assigns ``_id`` on the client before sending.
+            doc_ids = [str(chunk_doc.get("_id", "")) for chunk_doc in chunk_docs]
+        for upserted in details.get("upserted", []):
+            doc_ids[upserted["index"]] = str(upserted["_id"])
+        for error in details.get("writeErrors", []):
+            index = error["index"]
+            doc_ids[index] = ""
+            await logger.error(
+                "darwin_storage_failed",
+                action="darwin_storage_failed",
+                chunk_uuid=darwin_docs[index].chunk_uuid,
+                error=error.get("errmsg", ""),
+                error_code=error.get("code"),
+            )
+        return doc_ids
+
     async def get_graph_triples(
         self, darwin_doc: DarwinXMLDocument
     ) -> List[GraphTriple]:
@@ -419,6 +475,18 @@ class DarwinXMLStorage:
 
         return chunk_doc
 
+    @staticmethod
+    def _upsert_filter(darwin_doc: DarwinXMLDocument) -> Dict[str, Any]:
+        """Identify a stored chunk by its document's content hash and its index.
+
+        The provenance content hash is the source document's, shared by all of
+        its chunks, so the chunk index is needed to tell them apart.
+        """
+        return {
+            "darwin_metadata.provenance.content_hash": darwin_doc.provenance.content_hash,
+            "darwin_metadata.chunk_index": darwin_doc.chunk_index,
+        }
+
     @staticmethod
     def _source_type_to_mask(source_type: str) -> int:
         mapping = {"web": 1, "gdrive": 2, "upload": 4}
@@ -104,9 +104,10 @@ class DarwinXMLWrapper:
         )
 
         # Build DarwinXML document
+        passport = chunk.passport
         darwin_doc = DarwinXMLDocument(
             id=chunk_uuid,
-            document_title=chunk.passport.document_title,
+            document_title=passport.document_title,
             chunk_index=chunk.index,
             chunk_uuid=chunk_uuid,
             content=chunk.content,
@@ -118,8 +119,8 @@ class DarwinXMLWrapper:
                 "token_count": chunk.token_count,
                 "start_char": chunk.start_char,
                 "end_char": chunk.end_char,
-                "source_type": chunk.passport.source_type,
-                "page_number": chunk.passport.page_number,
+                "source_type": passport.source_type,
+                "page_number": passport.page_number,
                 **chunk.metadata,
             },
         )
@@ -214,20 +215,21 @@ class DarwinXMLWrapper:
         if chunk.metadata.get("is_table", False):
             tags.append("content:table")
 
+        passport = chunk.passport
         return ProvenanceMetadata(
-            ingestion_timestamp=chunk.passport.ingestion_timestamp,
-            document_uid=chunk.passport.document_uid,
-            source_url=chunk.passport.source_url,
-            source_type=chunk.passport.source_type,
-            source_id=chunk.passport.source_id,
-            source_group=chunk.passport.source_group,
-            user_id=chunk.passport.user_id,
-            org_id=chunk.passport.org_id,
+            ingestion_timestamp=passport.ingestion_timestamp,
+            document_uid=passport.document_uid,
+            source_url=passport.source_url,
+            source_type=passport.source_type,
+            source_id=passport.source_id,
+            source_group=passport.source_group,
+            user_id=passport.user_id,
+            org_id=passport.org_id,
             validation_status=validation_status,
             processor_version=self.processor_version,
             chunker_version="hierarchical-v1",
             embedding_model=self.embedding_model,
-            content_hash=chunk.passport.content_hash
+            content_hash=passport.content_hash
             or self._compute_content_hash(chunk.content),
             tags=tags,
         )
@@ -246,6 +248,7 @@ class DarwinXMLWrapper:
         attributes = self._extract_attributes(chunk)
         relationships = self._build_relationships(chunk, chunk_uuid, parent_chunk_id)
 
+        passport = chunk.passport
         main_annotation = DarwinAnnotation(
             type=content_type,
             content=chunk.content,
@@ -253,15 +256,15 @@ class DarwinXMLWrapper:
             relationships=relationships,
             parent_id=parent_chunk_id,
             metadata={
-                "heading_path": chunk.passport.heading_path,
-                "page_number": chunk.passport.page_number,
+                "heading_path": passport.heading_path,
+                "page_number": passport.page_number,
                 "token_count": chunk.token_count,
             },
         )
         annotations.append(main_annotation)
 
         # Add heading hierarchy annotations
-        for i, heading in enumerate(chunk.passport.heading_path):
+        for i, heading in enumerate(passport.heading_path):
             heading_ann = DarwinAnnotation(
                 type=AnnotationType.HEADING,
                 content=heading,
@@ -0,0 +1,153 @@
+"""Lightweight markdown structure parsing for text-native sources.
+
+Markdown and plain-text sources already carry their structure, so they are
+split into heading-scoped blocks here instead of going through Docling's
+conversion pipeline.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+_ATX_HEADING = re.compile(r"^ {0,3}(#{1,6})\s+(.*?)(?:\s+#+)?\s*$")
+_SETEXT_UNDERLINE = re.compile(r"^ {0,3}(=+|-+)\s*$")
+_FENCE = re.compile(r"^ {0,3}(```|~~~)")
+_LIST_ITEM = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+")
+
+BLOCK_PARAGRAPH = "paragraph"
+BLOCK_LIST = "list"
+BLOCK_TABLE = "table"
+BLOCK_CODE = "code"
+
+
+@dataclass
+class MarkdownBlock:
+    """A contiguous block of markdown under a heading path."""
+
+    kind: str
+    text: str
+    heading_path: List[str] = field(default_factory=list)
+    start_char: int = 0
+
+
+class _BlockBuilder:
+    """Accumulates lines for the block currently being parsed."""
+
+    def __init__(self) -> None:
+        self.blocks: List[MarkdownBlock] = []
+        self.kind: Optional[str] = None
+        self.lines: List[str] = []
+        self.start_char = 0
+
+    def add(self, kind: str, line: str, offset: int, heading_path: List[str]) -> None:
+        if self.kind is not None and self.kind != kind:
+            self.flush(heading_path)
+        if self.kind is None:
+            self.kind = kind
+            self.start_char = offset
+        self.lines.append(line)
+
+    def flush(self, heading_path: List[str]) -> None:
+        if self.kind is not None:
+            text = "\n".join(self.lines).strip("\n")
+            if text.strip():
+                self.blocks.append(
+                    MarkdownBlock(
+                        kind=self.kind,
+                        text=text,
+                        heading_path=list(heading_path),
+                        start_char=self.start_char,
+                    )
+                )
+        self.kind = None
+        self.lines = []
+
+
+def parse_markdown_blocks(text: str) -> List[MarkdownBlock]:
+    """Split markdown into paragraph, list, table, and code blocks.
+
+    Headings (ATX and setext) are not emitted as blocks; they update the
+    heading path attached to the blocks that follow them.
+
+    Args:
+        text: Markdown or plain-text content.
+
+    Returns:
+        Blocks in document order.
+    """
+    builder = _BlockBuilder()
+    headings: List[tuple[int, str]] = []
+    fence: Optional[str] = None
+    offset = 0
+
+    def heading_path() -> List[str]:
+        return [title for _, title in headings]
+
+    def push_heading(level: int, title: str) -> None:
+        while headings and headings[-1][0] >= level:
+            headings.pop()
+        headings.append((level, title))
+
+    for line in text.splitlines():
+        line_offset = offset
+        offset += len(line) + 1
+
+        if fence is not None:
+            builder.lines.append(line)
+            if line.strip().startswith(fence):
+                builder.flush(heading_path())
+                fence = None
+            continue
+
+        fence_match = _FENCE.match(line)
+        if fence_match:
+            builder.flush(heading_path())
+            fence = fence_match.group(1)
+            builder.add(BLOCK_CODE, line, line_offset, heading_path())
+            continue
+
+        heading_match = _ATX_HEADING.match(line)
+        if heading_match:
+            builder.flush(heading_path())
+            title = heading_match.group(2).strip()
+            if title:
+                push_heading(len(heading_match.group(1)), title)
+            continue
+
+        stripped = line.strip()
+        if not stripped:
+            builder.flush(heading_path())
+            continue
+
+        underline = _SETEXT_UNDERLINE.match(line)
+        if underline:
+            if builder.kind == BLOCK_PARAGRAPH and len(builder.lines) == 1:
+                title = builder.lines[0].strip()
+                builder.kind = None
+                builder.lines = []
+                push_heading(1 if underline.group(1).startswith("=") else 2, title)
+            else:
+                builder.flush(heading_path())
+            continue
+
+        if stripped.startswith("|"):
+            builder.add(BLOCK_TABLE, line, line_offset, heading_path())
+        elif _LIST_ITEM.match(line) or (builder.kind == BLOCK_LIST and line[:1].isspace()):
+            builder.add(BLOCK_LIST, line, line_offset, heading_path())
+        else:
+            builder.add(BLOCK_PARAGRAPH, line, line_offset, heading_path())
+
+    builder.flush(heading_path())
+    return builder.blocks
+
+
+__all__ = [
+    "BLOCK_CODE",
+    "BLOCK_LIST",
+    "BLOCK_PARAGRAPH",
+    "BLOCK_TABLE",
+    "MarkdownBlock",
+    "parse_markdown_blocks",
+]
@@ -0,0 +1,153 @@
+"""Per-document Docling pipeline selection for PDFs.
+
+OCR and table-structure models dominate Docling conversion time, but most
+PDFs are born-digital with a usable text layer. A cheap pypdfium2 probe over a
+sample of pages decides which models a document actually needs.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+# A page with fewer extractable characters than this has no usable text layer.
+MIN_TEXT_CHARS = 32
+# Vector path objects on a page above this suggest ruled tables.
+TABLE_PATH_OBJECTS = 12
+# Share of sampled pages needing OCR above which the whole document is OCR'd.
+FULL_OCR_RATIO = 0.8
+DEFAULT_SAMPLE_PAGES = 8
+
+_ALIGNED_COLUMNS = re.compile(r"\S(?:\t| {2,})\S.*\S(?:\t| {2,})\S")
+
+
+@dataclass(frozen=True)
+class PipelineProfile:
+    """Docling PDF pipeline options for a class of documents."""
+
+    name: str
+    do_ocr: bool
+    force_full_page_ocr: bool
+    do_table_structure: bool
+
+
+PROFILE_TEXT = PipelineProfile("text", False, False, False)
+PROFILE_TEXT_TABLES = PipelineProfile("text_tables", False, False, True)
+PROFILE_OCR_PARTIAL = PipelineProfile("ocr_partial", True, False, False)
+PROFILE_OCR_PARTIAL_TABLES = PipelineProfile("ocr_partial_tables", True, False, True)
+PROFILE_OCR_FULL = PipelineProfile("ocr_full", True, True, True)
+
+
+@dataclass
+class PdfProbe:
+    """Text-layer, image, and table signals from a sample of PDF pages."""
+
+    page_count: int
+    sampled_pages: int
+    text_pages: int
+    ocr_pages: int
+    image_pages: int
+    table_pages: int
+    avg_chars: float
+
+    def as_metadata(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def probe_pdf(
+    pdf_input: str | bytes,
+    sample_pages: int = DEFAULT_SAMPLE_PAGES,
+) -> Optional[PdfProbe]:
+    """Probe a PDF without converting it.
+
+    Pages are sampled evenly across the document. A page needs OCR when it
+    has images but no usable text layer; blank pages do not.
+
+    Returns:
+        Probe results, or None if pypdfium2 is unavailable or the file
+        cannot be opened.
+    """
+    try:
+        import pypdfium2
+        import pypdfium2.raw as pdfium_c
+    except ImportError:
+        return None
+    try:
+        pdf = pypdfium2.PdfDocument(pdf_input)
+    except Exception:
+        return None
+
+    try:
+        page_count = len(pdf)
+        if page_count == 0:
+            return None
+        step = max(page_count / max(sample_pages, 1), 1)
+        indices = sorted({min(int(i * step), page_count - 1) for i in range(sample_pages)})
+
+        text_pages = ocr_pages = image_pages = table_pages = 0
+        total_chars = 0
+        for index in indices:
+            page = pdf[index]
+            try:
+                textpage = page.get_textpage()
+                try:
+                    text = textpage.get_text_range()
+                finally:
+                    textpage.close()
+                images = paths = 0
+                for obj in page.get_objects(max_depth=1):
+                    if obj.type == pdfium_c.FPDF_PAGEOBJ_IMAGE:
+                        images += 1
+                    elif obj.type == pdfium_c.FPDF_PAGEOBJ_PATH:
+                        paths += 1
+            finally:
+                page.close()
+
+            chars = len(text.strip())
+            total_chars += chars
+            has_text = chars >= MIN_TEXT_CHARS
+            text_pages += has_text
+            image_pages += images > 0
+            ocr_pages += images > 0 and not has_text
+            aligned_lines = sum(
+                1 for line in text.splitlines() if _ALIGNED_COLUMNS.search(line)
+            )
+            table_pages += paths >= TABLE_PATH_OBJECTS or aligned_lines >= 3
+
+        return PdfProbe(
+            page_count=page_count,
+            sampled_pages=len(indices),
+            text_pages=text_pages,
+            ocr_pages=ocr_pages,
+            image_pages=image_pages,
+            table_pages=table_pages,
+            avg_chars=round(total_chars / len(indices), 1),
+        )
+    finally:
+        pdf.close()
+
+
+def select_profile(probe: PdfProbe) -> PipelineProfile:
+    """Pick the cheapest pipeline profile that handles the probed document."""
+    if probe.ocr_pages / probe.sampled_pages >= FULL_OCR_RATIO:
+        # Scanned documents: tables cannot be detected from a missing text
+        # layer, so keep table structure on.
+        return PROFILE_OCR_FULL
+    has_tables = probe.table_pages > 0
+    if probe.ocr_pages:
+        return PROFILE_OCR_PARTIAL_TABLES if has_tables else PROFILE_OCR_PARTIAL
+    return PROFILE_TEXT_TABLES if has_tables else PROFILE_TEXT
+
+
+__all__ = [
+    "PROFILE_OCR_FULL",
+    "PROFILE_OCR_PARTIAL",
+    "PROFILE_OCR_PARTIAL_TABLES",
+    "PROFILE_TEXT",
+    "PROFILE_TEXT_TABLES",
+    "PdfProbe",
+    "PipelineProfile",
+    "probe_pdf",
+    "select_profile",
+]
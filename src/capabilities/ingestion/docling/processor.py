@@ -6,22 +6,30 @@ import asyncio
 import hashlib
 import json
 import os
-import tempfile
+from io import BytesIO
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 from urllib.parse import urlparse
 
-from docling.document_converter import DocumentConverter
+from docling.datamodel.base_models import DocumentStream, InputFormat
+from docling.datamodel.pipeline_options import PdfPipelineOptions
+from docling.document_converter import DocumentConverter, PdfFormatOption
 from docling_core.types.doc.document import DoclingDocument
 
 from pydantic import BaseModel
 
+from mdrag.capabilities.ingestion.docling.pipeline_profiles import (
+    PipelineProfile,
+    probe_pdf,
+    select_profile,
+)
 from mdrag.capabilities.ingestion.models import (
     CollectedSource,
     DocumentIdentity,
     IngestionDocument,
     IngestionMetadata,
     Namespace,
+    PageWindow,
     SourceContent,
     SourceContentKind,
     ingestion_timestamp,
@@ -31,13 +39,32 @@ from mdrag.config.settings import Settings
 
 logger = get_logger(__name__)
 
+# Sources with these suffixes are parsed as markdown without Docling.
+TEXT_NATIVE_SUFFIXES = frozenset({".md", ".markdown", ".txt"})
+
 
 class _MaterializedContent(BaseModel):
-    """Internal helper for content materialization."""
+    """Source content in the form Docling reads it: a file path or in-memory bytes."""
 
-    path: str
+    name: str
     content_hash: str
-    cleanup: bool
+    path: Optional[str] = None
+    data: Optional[bytes] = None
+
+    @property
+    def suffix(self) -> str:
+        return Path(self.name).suffix.lower()
+
+    @property
+    def pdf_input(self) -> str | bytes:
+        """Input for pypdfium2, which opens paths and bytes alike."""
+        return self.path if self.path is not None else self.data
+
+    def docling_source(self) -> str | DocumentStream:
+        """Return a Docling input; streams are single-use, so each call makes a new one."""
+        if self.path is not None:
+            return self.path
+        return DocumentStream(name=self.name, stream=BytesIO(self.data))
 
 
 class DoclingProcessor:
@@ -50,6 +77,7 @@ class DoclingProcessor:
             settings: Application settings.
         """
         self.settings = settings
+        self._converters: Dict[str, DocumentConverter] = {}
 
     async def convert_source(self, source: CollectedSource) -> IngestionDocument:
         """Convert a collected source into an ingestion document.
@@ -69,21 +97,198 @@ class DoclingProcessor:
             source_type=source.frontmatter.source_type,
             source_url=source.frontmatter.source_url,
         )
+        if self.settings.ingestion_markdown_fast_path and self._is_text_native(
+            source.content
+        ):
+            return await self._convert_text_native(source)
+
         materialized = await self._materialize_content(source.content)
-        try:
-            docling_doc = await self._convert_docling(materialized.path)
-        finally:
-            if materialized.cleanup:
-                await self._cleanup_tempfile(materialized.path)
+        profile = await self._select_pipeline(materialized)
+        docling_doc = await self._convert_docling(materialized, profile=profile)
 
         markdown = self._export_to_markdown(docling_doc)
         title_hint = source.frontmatter.source_title or source.frontmatter.source_url or ""
         title = self._extract_title(markdown, title_hint)
+        metadata = self._build_metadata(
+            source,
+            materialized.content_hash,
+            title,
+            converter="docling",
+            pipeline_profile=profile.name if profile else "default",
+        )
+
+        ingestion_doc = IngestionDocument(
+            content=markdown,
+            docling_document=docling_doc,
+            docling_json=self._serialize_docling(docling_doc),
+            page_texts=self._extract_page_texts(docling_doc),
+            title=title,
+            metadata=metadata,
+        )
+
+        await logger.info(
+            "docling_convert_complete",
+            action="docling_convert_complete",
+            document_uid=metadata.identity.document_uid,
+            title=title,
+        )
+        return ingestion_doc
+
+    async def count_pages(self, source: CollectedSource) -> Optional[int]:
+        """Return the page count for paginated sources, or None if unknown.
+
+        Only PDFs are paginated; other formats are always converted in one shot.
+        """
+        if self._guess_suffix(source.content).lower() != ".pdf":
+            return None
+        data = source.content.data
+        if isinstance(data, str) and source.content.kind != SourceContentKind.FILE_PATH:
+            return None
+        return await asyncio.to_thread(self._count_pdf_pages, data)
+
+    async def convert_source_windows(
+        self,
+        source: CollectedSource,
+        window_size: int,
+    ) -> AsyncIterator[IngestionDocument]:
+        """Convert a paginated source in windows of ``window_size`` pages.
+
+        Each yielded document shares the identity and title of the whole source
+        but only holds the Docling output, markdown, and page texts for its own
+        window, so callers can chunk, embed, and store it before the next
+        window is converted.
+
+        Args:
+            source: Collected source payload.
+            window_size: Number of pages per window.
+
+        Yields:
+            IngestionDocument for each page window, in page order.
+        """
+        materialized = await self._materialize_content(source.content)
+        total_pages = await asyncio.to_thread(self._count_pdf_pages, materialized.pdf_input)
+        if not total_pages:
+            raise ValueError("Unable to determine page count for windowed conversion")
+        total_windows = (total_pages + window_size - 1) // window_size
+        profile = await self._select_pipeline(materialized)
+        title_hint = source.frontmatter.source_title or source.frontmatter.source_url or ""
+        title: Optional[str] = None
+        metadata: Optional[IngestionMetadata] = None
+
+        for index in range(total_windows):
+            start_page = index * window_size + 1
+            end_page = min(start_page + window_size - 1, total_pages)
+            docling_doc = await self._convert_docling(
+                materialized,
+                page_range=(start_page, end_page),
+                profile=profile,
+            )
+            markdown = self._export_to_markdown(docling_doc)
+            if metadata is None:
+                title = self._extract_title(markdown, title_hint)
+                metadata = self._build_metadata(
+                    source,
+                    materialized.content_hash,
+                    title,
+                    converter="docling",
+                    pipeline_profile=profile.name if profile else "default",
+                )
+            page_texts = {
+                str(start_page + int(page) - 1): text
+                for page, text in self._extract_page_texts(docling_doc).items()
+            }
+            await logger.info(
+                "docling_convert_window_complete",
+                action="docling_convert_window_complete",
+                document_uid=metadata.identity.document_uid,
+                window=index,
+                start_page=start_page,
+                end_page=end_page,
+                total_pages=total_pages,
+            )
+            yield IngestionDocument(
+                content=markdown,
+                docling_document=docling_doc,
+                docling_json=self._serialize_docling(docling_doc),
+                page_texts=page_texts,
+                title=title or title_hint,
+                metadata=metadata,
+                page_window=PageWindow(
+                    index=index,
+                    start_page=start_page,
+                    end_page=end_page,
+                    total_pages=total_pages,
+                    total_windows=total_windows,
+                ),
+            )
+
+    async def _convert_text_native(self, source: CollectedSource) -> IngestionDocument:
+        """Build an ingestion document from markdown/plain text without Docling.
+
+        The content hash is computed over the same bytes the Docling path would
+        hash, so document identity does not depend on which path was taken.
+        """
+        content = source.content
+        if content.kind == SourceContentKind.FILE_PATH:
+            file_path = str(content.data)
+            if not os.path.exists(file_path):
+                raise FileNotFoundError(f"Source file not found: {file_path}")
+            data_bytes = await asyncio.to_thread(Path(file_path).read_bytes)
+        elif isinstance(content.data, str):
+            data_bytes = content.data.encode("utf-8")
+        else:
+            data_bytes = content.data
+
+        markdown = data_bytes.decode("utf-8-sig", errors="replace")
+        title_hint = source.frontmatter.source_title or source.frontmatter.source_url or ""
+        title = self._extract_title(markdown, title_hint)
+        metadata = self._build_metadata(
+            source,
+            content.content_hash or self._hash_bytes(data_bytes),
+            title,
+            converter="markdown",
+        )
 
+        await logger.info(
+            "docling_convert_complete",
+            action="docling_convert_complete",
+            document_uid=metadata.identity.document_uid,
+            title=title,
+            converter="markdown",
+        )
+        return IngestionDocument(
+            content=markdown,
+            page_texts={},
+            title=title,
+            metadata=metadata,
+        )
+
+    @staticmethod
+    def _is_text_native(content: SourceContent) -> bool:
+        """Return True for markdown/plain-text content that needs no conversion."""
+        if content.kind == SourceContentKind.MARKDOWN:
+            return True
+        if content.kind not in (SourceContentKind.FILE_PATH, SourceContentKind.BYTES):
+            return False
+        name = content.filename
+        if not name and content.kind == SourceContentKind.FILE_PATH:
+            name = str(content.data)
+        return Path(name or "").suffix.lower() in TEXT_NATIVE_SUFFIXES
+
+    def _build_metadata(
+        self,
+        source: CollectedSource,
+        content_hash: str,
+        title: str,
+        *,
+        converter: str,
+        pipeline_profile: Optional[str] = None,
+    ) -> IngestionMetadata:
+        """Build identity, namespace, and frontmatter metadata for a source."""
         identity = DocumentIdentity.build(
             source_type=source.frontmatter.source_type,
             source_url=source.frontmatter.source_url,
-            content_hash=materialized.content_hash,
+            content_hash=content_hash,
             source_id=source.frontmatter.source_id,
             source_mime_type=source.frontmatter.source_mime_type,
         )
@@ -106,43 +311,40 @@ class DoclingProcessor:
             "document_title": title,
         }
 
-        metadata = IngestionMetadata(
+        return IngestionMetadata(
             identity=identity,
             namespace=Namespace(**namespace.model_dump()),
             frontmatter=frontmatter,
             collected_at=frontmatter.source_fetched_at or ingestion_timestamp(),
             ingested_at=ingestion_timestamp(),
-            source_metadata={**source.metadata, "source_mask": source_mask},
-        )
-
-        ingestion_doc = IngestionDocument(
-            content=markdown,
-            docling_document=docling_doc,
-            docling_json=self._serialize_docling(docling_doc),
-            page_texts=self._extract_page_texts(docling_doc),
-            title=title,
-            metadata=metadata,
-        )
-
-        await logger.info(
-            "docling_convert_complete",
-            action="docling_convert_complete",
-            document_uid=identity.document_uid,
-            title=title,
+            source_metadata={
+                **source.metadata,
+                "source_mask": source_mask,
+                "converter": converter,
+                "pipeline_profile": pipeline_profile,
+            },
         )
-        return ingestion_doc
 
     async def _materialize_content(self, content: SourceContent) -> _MaterializedContent:
-        """Materialize source content into a file for Docling conversion."""
+        """Prepare source content for Docling without copying it.
+
+        Files are converted in place and in-memory content is handed over as a
+        stream, so nothing is written to disk. A ``content_hash`` computed
+        upstream (while an upload was streamed to disk) is reused rather than
+        re-reading the file.
+        """
+        suffix = self._guess_suffix(content)
         if content.kind == SourceContentKind.FILE_PATH:
             file_path = str(content.data)
             if not os.path.exists(file_path):
                 raise FileNotFoundError(f"Source file not found: {file_path}")
-            content_hash = await asyncio.to_thread(self._hash_file, file_path)
+            content_hash = content.content_hash or await asyncio.to_thread(
+                self._hash_file, file_path
+            )
             return _MaterializedContent(
-                path=file_path,
+                name=file_path,
                 content_hash=content_hash,
-                cleanup=False,
+                path=file_path,
             )
 
         if isinstance(content.data, str):
@@ -150,13 +352,11 @@ class DoclingProcessor:
         else:
             data_bytes = content.data
 
-        content_hash = self._hash_bytes(data_bytes)
-        suffix = self._guess_suffix(content)
-        temp_path = await asyncio.to_thread(self._write_tempfile, data_bytes, suffix)
+        stem = Path(content.filename).stem if content.filename else ""
         return _MaterializedContent(
-            path=temp_path,
-            content_hash=content_hash,
-            cleanup=True,
+            name=f"{stem or 'source'}{suffix}",
+            content_hash=content.content_hash or self._hash_bytes(data_bytes),
+            data=data_bytes,
         )
 
     @staticmethod
@@ -176,27 +376,71 @@ class DoclingProcessor:
             return ".pdf"
         return ".bin"
 
+    async def _select_pipeline(
+        self,
+        materialized: _MaterializedContent,
+    ) -> Optional[PipelineProfile]:
+        """Probe a PDF and choose the cheapest Docling pipeline that fits it.
+
+        Returns None for non-PDFs, when selection is disabled, or when the
+        probe fails; those use Docling's default pipeline.
+        """
+        if not self.settings.ingestion_pdf_pipeline_selection:
+            return None
+        if materialized.suffix != ".pdf":
+            return None
+        probe = await asyncio.to_thread(probe_pdf, materialized.pdf_input)
+        if probe is None:
+            return None
+        profile = select_profile(probe)
+        await logger.info(
+            "docling_pipeline_selected",
+            action="docling_pipeline_selected",
+            profile=profile.name,
+            **probe.as_metadata(),
+        )
+        return profile
+
+    def _get_converter(self, profile: Optional[PipelineProfile] = None) -> DocumentConverter:
+        """Return the shared Docling converter for a profile, creating it on first use."""
+        key = profile.name if profile else "default"
+        converter = self._converters.get(key)
+        if converter is None:
+            converter = self._build_converter(profile)
+            self._converters[key] = converter
+        return converter
+
     @staticmethod
-    def _write_tempfile(data: bytes, suffix: str) -> str:
-        """Write data to a temporary file and return the file path."""
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as handle:
-            handle.write(data)
-            handle.flush()
-            return handle.name
-
-    async def _cleanup_tempfile(self, path: str) -> None:
-        """Remove temporary files created for Docling conversion."""
-        try:
-            await asyncio.to_thread(os.remove, path)
-        except FileNotFoundError:
-            return
+    def _build_converter(profile: Optional[PipelineProfile]) -> DocumentConverter:
+        """Create a Docling converter with PDF pipeline options for a profile."""
+        if profile is None:
+            return DocumentConverter()
+        pipeline_options = PdfPipelineOptions(
+            do_ocr=profile.do_ocr,
+            do_table_structure=profile.do_table_structure,
+        )
+        pipeline_options.ocr_options.force_full_page_ocr = profile.force_full_page_ocr
+        return DocumentConverter(
+            format_options={
+                InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
+            }
+        )
 
-    async def _convert_docling(self, file_path: str) -> DoclingDocument:
-        """Convert a file to a Docling document."""
+    async def _convert_docling(
+        self,
+        materialized: _MaterializedContent,
+        page_range: Optional[tuple[int, int]] = None,
+        profile: Optional[PipelineProfile] = None,
+    ) -> DoclingDocument:
+        """Convert a source (or a 1-based inclusive page range of it) to Docling."""
 
         def _convert() -> DoclingDocument:
-            converter = DocumentConverter()
-            result = converter.convert(file_path)
+            converter = self._get_converter(profile)
+            source = materialized.docling_source()
+            if page_range is not None:
+                result = converter.convert(source, page_range=page_range)
+            else:
+                result = converter.convert(source)
             return result.document
 
         try:
@@ -258,6 +502,22 @@ class DoclingProcessor:
                 hasher.update(chunk)
         return hasher.hexdigest()
 
+    @staticmethod
+    def _count_pdf_pages(pdf_input: str | bytes) -> Optional[int]:
+        """Count PDF pages (from a path or raw bytes) without converting."""
+        try:
+            import pypdfium2
+        except ImportError:
+            return None
+        try:
+            pdf = pypdfium2.PdfDocument(pdf_input)
+        except Exception:
+            return None
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
     @staticmethod
     def _source_mask(source_type: str) -> int:
         mapping = {"web": 1, "gdrive": 2, "upload": 4}
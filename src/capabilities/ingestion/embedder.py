@@ -74,54 +74,44 @@ class EmbeddingGenerator:
             chunks: List of document chunks
             progress_callback: Optional callback for progress updates
 
+        Chunks that already carry an embedding (for example vectors reused from
+        a previous version of the document) are passed through unchanged.
+        Embeddings are attached to the given chunk objects in place.
+
         Returns:
             Chunks with embeddings added
         """
         if not chunks:
             return chunks
 
+        pending = [chunk for chunk in chunks if chunk.embedding is None]
+        if not pending:
+            return chunks
+
         await logger.info(
             "embedding_generation_start",
             action="embedding_generation_start",
-            chunk_count=len(chunks),
+            chunk_count=len(pending),
             batch_size=self.batch_size,
             model=self.model,
         )
 
         # Process chunks in batches
-        embedded_chunks = []
-        total_batches = (len(chunks) + self.batch_size - 1) // self.batch_size
-
-        for i in range(0, len(chunks), self.batch_size):
-            batch_chunks = chunks[i:i + self.batch_size]
-            batch_texts = [
-                (chunk.metadata.get("embedding_text") or chunk.content)
-                if chunk.metadata
-                else chunk.content
-                for chunk in batch_chunks
-            ]
+        generated_at = datetime.now().isoformat()
+        total_batches = (len(pending) + self.batch_size - 1) // self.batch_size
+
+        for i in range(0, len(pending), self.batch_size):
+            batch_chunks = pending[i:i + self.batch_size]
+            batch_texts = [chunk.embedding_input for chunk in batch_chunks]
 
             # Generate embeddings for this batch
             embeddings = await self.generate_embeddings_batch(batch_texts)
 
             # Add embeddings to chunks
             for chunk, embedding in zip(batch_chunks, embeddings):
-                embedded_chunk = DoclingChunks(
-                    frontmatter=chunk.frontmatter,
-                    content=chunk.content,
-                    index=chunk.index,
-                    start_char=chunk.start_char,
-                    end_char=chunk.end_char,
-                    metadata={
-                        **chunk.metadata,
-                        "embedding_model": self.model,
-                        "embedding_generated_at": datetime.now().isoformat()
-                    },
-                    passport=chunk.passport,
-                    token_count=chunk.token_count
-                )
-                embedded_chunk.embedding = embedding
-                embedded_chunks.append(embedded_chunk)
+                chunk.embedding = embedding
+                chunk.metadata["embedding_model"] = self.model
+                chunk.metadata["embedding_generated_at"] = generated_at
 
             # Progress update
             current_batch = (i // self.batch_size) + 1
@@ -138,10 +128,10 @@ class EmbeddingGenerator:
         await logger.info(
             "embedding_generation_complete",
             action="embedding_generation_complete",
-            chunk_count=len(embedded_chunks),
+            chunk_count=len(pending),
             model=self.model,
         )
-        return embedded_chunks
+        return chunks
 
     async def embed_query(self, query: str) -> List[float]:
         """
@@ -10,12 +10,13 @@ from __future__ import annotations
 import argparse
 import asyncio
 import sys
-import glob
 import os
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Callable, Optional, TypeVar
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Optional, TypeVar
 
 from dotenv import load_dotenv
+from redis.exceptions import RedisError
 
 from mdrag.capabilities.ingestion.docling.chunker import (
     ChunkingConfig,
@@ -29,7 +30,14 @@ from mdrag.capabilities.ingestion.docling.darwinxml_validator import (
 )
 from mdrag.capabilities.ingestion.docling.darwinxml_wrapper import DarwinXMLWrapper
 from mdrag.capabilities.ingestion.docling.processor import DoclingProcessor
+from mdrag.capabilities.ingestion.dedup import (
+    ChunkDuplicate,
+    ChunkFingerprint,
+    find_internal_duplicates,
+    fingerprint_chunk,
+)
 from mdrag.capabilities.ingestion.embedder import EmbeddingGenerator, create_embedder
+from mdrag.capabilities.ingestion.locks import DocumentLocks
 from pydantic import BaseModel
 
 from mdrag.capabilities.ingestion.models import (
@@ -37,14 +45,26 @@ from mdrag.capabilities.ingestion.models import (
     GoogleDriveCollectionRequest,
     GraphTriple,
     IngestionConfig,
+    IngestionDocument,
     IngestionResult,
     Namespace,
     StorageRepresentations,
+    StorageResult,
     UploadCollectionRequest,
     WebCollectionRequest,
 )
-from mdrag.capabilities.ingestion.protocols import SourceCollector, StorageAdapter
+from mdrag.capabilities.ingestion.protocols import (
+    BufferedStorageAdapter,
+    ChunkFingerprintIndex,
+    ContentAliasIndex,
+    IncrementalStorageAdapter,
+    SourceCollector,
+    StorageAdapter,
+)
+from mdrag.capabilities.ingestion.scanner import FolderManifest, scan_document_files
 from mdrag.capabilities.ingestion.sources import Crawl4AICollector, GoogleDriveCollector, UploadCollector
+from mdrag.integrations.crawl4ai.cache import CrawlCache
+from mdrag.integrations.crawl4ai.pool import close_shared_browser_pool
 from mdrag.integrations.mongodb.adapters.storage import MongoStorageAdapter
 from mdrag.integrations.google_drive import parse_csv_values
 from mdrag.mdrag_logging.service_logging import get_logger, log_async, setup_logging
@@ -59,6 +79,12 @@ logger = get_logger(__name__)
 RequestT = TypeVar("RequestT", bound=BaseModel)
 
 
+async def _iterate(sources: list[CollectedSource]) -> AsyncIterator[CollectedSource]:
+    """Adapt a list of sources to the streaming ingestion loop."""
+    for source in sources:
+        yield source
+
+
 class IngestionWorkflow:
     """Coordinate collection, processing, and storage for ingestion."""
 
@@ -71,6 +97,7 @@ class IngestionWorkflow:
         chunker: Optional[DoclingHierarchicalChunker] = None,
         embedder: Optional[EmbeddingGenerator] = None,
         storage: Optional[StorageAdapter] = None,
+        document_locks: Optional[DocumentLocks] = None,
     ) -> None:
         """Initialize the ingestion workflow.
 
@@ -81,6 +108,7 @@ class IngestionWorkflow:
             chunker: Optional chunker override.
             embedder: Optional embedder override.
             storage: Optional storage adapter override.
+            document_locks: Per-document write locks for the default storage.
         """
         self.settings = settings or load_settings()
         self.config = config
@@ -97,6 +125,7 @@ class IngestionWorkflow:
         self.storage = storage or MongoStorageAdapter(
             settings=self.settings,
             config=config,
+            document_locks=document_locks,
         )
         self.darwin_wrapper = (
             DarwinXMLWrapper(
@@ -157,6 +186,10 @@ class IngestionWorkflow:
             action="ingestion_collect_start",
             collector=collector_name,
         )
+        collect_stream = getattr(collector, "collect_stream", None)
+        if collect_stream is not None:
+            # Streaming collectors are ingested page by page while collection runs.
+            return await self.ingest_sources(collect_stream(request))
         sources = await collector.collect(request)
         await logger.info(
             "ingestion_collect_complete",
@@ -168,21 +201,77 @@ class IngestionWorkflow:
 
     async def ingest_sources(
         self,
-        sources: list[CollectedSource],
-        progress_callback: Optional[Callable[[int, int], None]] = None,
+        sources: list[CollectedSource] | AsyncIterable[CollectedSource],
+        progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+        on_result: Optional[
+            Callable[[int, Optional[int], IngestionResult], Awaitable[None]]
+        ] = None,
+        on_ingested: Optional[
+            Callable[[CollectedSource, IngestionResult], Awaitable[None]]
+        ] = None,
     ) -> list[IngestionResult]:
-        """Ingest a list of collected sources."""
-        if not sources:
-            return []
+        """Ingest collected sources.
+
+        ``sources`` may be an async iterable, such as a streaming deep crawl;
+        each source is ingested as soon as it arrives and ``total`` is None.
+        ``on_result`` is awaited with ``(index, total, result)`` after each
+        source, for progress reporting that needs to do I/O. ``on_ingested``
+        is awaited with ``(source, result)`` for bookkeeping tied to the
+        source itself.
+
+        With a storage that buffers writes across documents, a source is
+        reported only once its writes are flushed; writes that fail in the
+        flush are added to its result's ``errors``. Each call buffers in its
+        own write scope, so concurrent calls never share buffered writes.
+        """
+        if isinstance(sources, list):
+            if not sources:
+                return []
+            total: Optional[int] = len(sources)
+            stream = _iterate(sources)
+        else:
+            total = None
+            stream = sources
         if not self._initialized:
             await self.initialize()
 
         results: list[IngestionResult] = []
-        for index, source in enumerate(sources, start=1):
-            result = await self._ingest_single_source(source)
-            results.append(result)
-            if progress_callback:
-                progress_callback(index, len(sources))
+        unreported: list[tuple[int, CollectedSource, IngestionResult]] = []
+
+        async def report(flushed: bool = False) -> None:
+            buffered: set[str] = set()
+            if isinstance(self.storage, BufferedStorageAdapter):
+                if flushed:
+                    await self.storage.flush()
+                for document_uid, errors in self.storage.pop_write_errors().items():
+                    for _, _, result in unreported:
+                        if result.document_uid == document_uid:
+                            result.errors.extend(errors)
+                buffered = self.storage.buffered_documents()
+            # Report in order, stopping at the first source still buffered.
+            while unreported and unreported[0][2].document_uid not in buffered:
+                index, source, result = unreported.pop(0)
+                if progress_callback:
+                    progress_callback(index, total)
+                if on_result:
+                    await on_result(index, total, result)
+                if on_ingested:
+                    await on_ingested(source, result)
+
+        scope = (
+            self.storage.write_scope()
+            if isinstance(self.storage, BufferedStorageAdapter)
+            else nullcontext()
+        )
+        async with scope:
+            index = 0
+            async for source in stream:
+                index += 1
+                result = await self._ingest_single_source(source)
+                results.append(result)
+                unreported.append((index, source, result))
+                await report()
+            await report(flushed=True)
         return results
 
     async def ingest_documents_folder(
@@ -191,10 +280,43 @@ class IngestionWorkflow:
         *,
         namespace: Optional[Namespace] = None,
         progress_callback: Optional[Callable[[int, int], None]] = None,
+        incremental: bool = False,
+        manifest_path: Optional[str] = None,
     ) -> list[IngestionResult]:
-        """Ingest documents from a local folder using the upload collector."""
-        files = self._find_document_files(documents_folder)
+        """Ingest documents from a local folder using the upload collector.
+
+        With ``incremental`` set, a manifest of file size, mtime, and hash is
+        kept for the folder. Only new or modified files are ingested, and
+        files removed since the last run are purged from storage.
+        """
+        if not os.path.isdir(documents_folder):
+            await logger.error(
+                "documents_folder_not_found",
+                action="documents_folder_not_found",
+                documents_folder=documents_folder,
+            )
+            return []
+        files = scan_document_files(documents_folder)
+
+        manifest: Optional[FolderManifest] = None
+        if incremental:
+            manifest = FolderManifest(documents_folder, manifest_path).load()
+            diff = manifest.diff(files)
+            await logger.info(
+                "ingestion_folder_diff",
+                action="ingestion_folder_diff",
+                documents_folder=documents_folder,
+                new_count=len(diff.new),
+                modified_count=len(diff.modified),
+                deleted_count=len(diff.deleted),
+                unchanged_count=len(diff.unchanged),
+            )
+            await self._purge_deleted_files(diff.deleted, manifest, namespace)
+            files = diff.changed
+
         if not files:
+            if manifest:
+                manifest.save()
             return []
         collector = UploadCollector()
         sources: list[CollectedSource] = []
@@ -202,15 +324,51 @@ class IngestionWorkflow:
             request = UploadCollectionRequest(
                 filename=os.path.basename(file_path),
                 file_path=file_path,
+                content_hash=manifest.content_hash(file_path) if manifest else None,
                 namespace=namespace or Namespace(),
             )
             sources.extend(await collector.collect(request))
-        return await self.ingest_sources(sources, progress_callback=progress_callback)
+        results = await self.ingest_sources(sources, progress_callback=progress_callback)
+
+        if manifest:
+            for file_path, result in zip(files, results):
+                if not result.errors:
+                    manifest.mark_ingested(file_path)
+            manifest.save()
+        return results
+
+    async def _purge_deleted_files(
+        self,
+        deleted_files: list[str],
+        manifest: FolderManifest,
+        namespace: Optional[Namespace],
+    ) -> None:
+        """Remove stored data for files that disappeared from the folder."""
+        if not deleted_files:
+            return
+        if not self._initialized:
+            await self.initialize()
+        if not isinstance(self.storage, IncrementalStorageAdapter):
+            await logger.warning(
+                "ingestion_purge_unsupported",
+                action="ingestion_purge_unsupported",
+                deleted_count=len(deleted_files),
+            )
+            return
+        for file_path in deleted_files:
+            await self.storage.delete_source(
+                f"file://{os.path.abspath(file_path)}",
+                namespace or Namespace(),
+            )
+            manifest.mark_deleted(file_path)
 
     async def _ingest_single_source(self, source: CollectedSource) -> IngestionResult:
         """Process, chunk, embed, and store a single source."""
         start_time = datetime.now()
         try:
+            if await self._should_stream_windows(source):
+                return await self._ingest_windowed_source(source, start_time)
+
             document = await self.processor.convert_source(source)
             await logger.info(
                 "ingestion_document_processed",
@@ -219,6 +377,17 @@ class IngestionWorkflow:
                 title=document.title,
             )
 
+            alias_result = await self._store_content_alias(document)
+            if alias_result is not None:
+                return IngestionResult(
+                    document_uid=document.metadata.identity.document_uid,
+                    title=document.title,
+                    chunks_created=0,
+                    processing_time_ms=self._elapsed_ms(start_time),
+                    storage_results=[alias_result],
+                    errors=[],
+                )
+
             chunks = await self.chunker.chunk_document(document)
             if not chunks:
                 await logger.warning(
@@ -235,12 +404,18 @@ class IngestionWorkflow:
                     errors=["No chunks created"],
                 )
 
+            chunks, fingerprints, duplicates = await self._suppress_duplicate_chunks(
+                document,
+                chunks,
+            )
+            reused_count = await self._reuse_stored_embeddings(document, chunks)
             embedded_chunks = await self.embedder.embed_chunks(chunks)
             await logger.info(
                 "ingestion_embeddings_complete",
                 action="ingestion_embeddings_complete",
                 document_uid=document.metadata.identity.document_uid,
                 chunk_count=len(embedded_chunks),
+                reused_count=reused_count,
             )
 
             darwin_documents, graph_triples = await self._build_darwin_bundle(
@@ -260,12 +435,17 @@ class IngestionWorkflow:
                 representations=representations,
                 darwin_documents=darwin_documents,
             )
+            await self._record_fingerprints(document, fingerprints, duplicates)
 
             return IngestionResult(
                 document_uid=document.metadata.identity.document_uid,
                 title=document.title,
                 chunks_created=len(embedded_chunks),
                 processing_time_ms=self._elapsed_ms(start_time),
+                duplicate_chunks_skipped=sum(d.exact for d in duplicates.values()),
+                near_duplicate_chunks_skipped=sum(
+                    not d.exact for d in duplicates.values()
+                ),
                 storage_results=[storage_result],
                 errors=[],
             )
@@ -284,6 +464,210 @@ class IngestionWorkflow:
                 errors=[str(exc)],
             )
 
+    async def _should_stream_windows(self, source: CollectedSource) -> bool:
+        """Return True when the source is large enough to convert in page windows."""
+        window_size = self.config.page_window_size
+        if not window_size:
+            return False
+        page_count = await self.processor.count_pages(source)
+        return bool(page_count and page_count > window_size)
+
+    async def _ingest_windowed_source(
+        self,
+        source: CollectedSource,
+        start_time: datetime,
+    ) -> IngestionResult:
+        """Convert, chunk, embed, and store a large source one page window at a time.
+
+        Only the current window's Docling document and chunks are held in memory.
+        The heading path of the last chunk in a window is carried into the next
+        so chunks that continue a section keep their heading context.
+        """
+        heading_context: list[str] = []
+        chunk_offset = 0
+        chunks_created = 0
+        duplicates: dict[int, ChunkDuplicate] = {}
+        storage_results: list[StorageResult] = []
+        document_uid = ""
+        title = source.frontmatter.source_title or source.frontmatter.source_url
+
+        async for document in self.processor.convert_source_windows(
+            source,
+            self.config.page_window_size,
+        ):
+            document_uid = document.metadata.identity.document_uid
+            title = document.title
+            chunks = await self.chunker.chunk_document(
+                document,
+                heading_context=heading_context,
+                index_offset=chunk_offset,
+            )
+            fingerprints: list[ChunkFingerprint] = []
+            window_duplicates: dict[int, ChunkDuplicate] = {}
+            if chunks:
+                heading_context = chunks[-1].heading_path or heading_context
+                chunk_offset += len(chunks)
+                chunks, fingerprints, window_duplicates = (
+                    await self._suppress_duplicate_chunks(document, chunks)
+                )
+                duplicates.update(window_duplicates)
+                chunks_created += len(chunks)
+                await self._reuse_stored_embeddings(document, chunks)
+                chunks = await self.embedder.embed_chunks(chunks)
+
+            darwin_documents, graph_triples = await self._build_darwin_bundle(
+                chunks,
+                document_uid,
+            )
+            storage_results.append(
+                await self.storage.store(
+                    document=document,
+                    chunks=chunks,
+                    representations=StorageRepresentations(
+                        markdown=document.content,
+                        docling_json=document.docling_json,
+                        graph_triples=graph_triples,
+                    ),
+                    darwin_documents=darwin_documents,
+                )
+            )
+            await self._record_fingerprints(document, fingerprints, window_duplicates)
+            await logger.info(
+                "ingestion_window_stored",
+                action="ingestion_window_stored",
+                document_uid=document_uid,
+                window=document.page_window.index if document.page_window else 0,
+                chunk_count=len(chunks),
+            )
+
+        return IngestionResult(
+            document_uid=document_uid,
+            title=title,
+            chunks_created=chunks_created,
+            processing_time_ms=self._elapsed_ms(start_time),
+            duplicate_chunks_skipped=sum(d.exact for d in duplicates.values()),
+            near_duplicate_chunks_skipped=sum(not d.exact for d in duplicates.values()),
+            storage_results=storage_results,
+            errors=[] if chunk_offset else ["No chunks created"],
+        )
+
+    async def _store_content_alias(
+        self,
+        document: IngestionDocument,
+    ) -> Optional[StorageResult]:
+        """Store the document as an alias if its content is already stored.
+
+        Aliased documents share the canonical document's chunks, so they are
+        neither chunked nor embedded.
+        """
+        if not self.config.dedup_documents or not isinstance(
+            self.storage, ContentAliasIndex
+        ):
+            return None
+        result = await self.storage.store_content_alias(document)
+        if result is not None:
+            await logger.info(
+                "ingestion_document_aliased",
+                action="ingestion_document_aliased",
+                document_uid=document.metadata.identity.document_uid,
+                canonical_document_id=result.metadata.get("canonical_document_id"),
+            )
+        return result
+
+    async def _suppress_duplicate_chunks(
+        self,
+        document: IngestionDocument,
+        chunks: list[DoclingChunks],
+    ) -> tuple[list[DoclingChunks], list[ChunkFingerprint], dict[int, ChunkDuplicate]]:
+        """Drop chunks that duplicate chunks already stored in the namespace.
+
+        Chunks are matched exactly by chunk hash and approximately by SimHash,
+        both within the document and against other sources in the same
+        namespace. Skipped chunks are not embedded or stored; the storage
+        links the document's source to the chunks they duplicate.
+
+        Returns:
+            Kept chunks, fingerprints of the kept chunks, and the suppressed
+            chunks keyed by chunk index with a link to their canonical chunk.
+        """
+        if not self.config.dedup_chunks or not isinstance(
+            self.storage, ChunkFingerprintIndex
+        ):
+            return chunks, [], {}
+
+        fingerprints = [
+            fingerprint
+            for fingerprint in (fingerprint_chunk(chunk) for chunk in chunks)
+            if fingerprint is not None
+        ]
+        document_uid = document.metadata.identity.document_uid
+        duplicates = find_internal_duplicates(
+            fingerprints,
+            document_uid,
+            self.config.near_duplicate_distance,
+        )
+        remaining = [f for f in fingerprints if f.index not in duplicates]
+        duplicates.update(
+            await self.storage.find_duplicate_chunks(
+                document,
+                remaining,
+                self.config.near_duplicate_distance,
+            )
+        )
+        if not duplicates:
+            return chunks, fingerprints, duplicates
+
+        kept = [chunk for chunk in chunks if chunk.index not in duplicates]
+        await logger.info(
+            "ingestion_duplicate_chunks_skipped",
+            action="ingestion_duplicate_chunks_skipped",
+            document_uid=document_uid,
+            exact_count=sum(d.exact for d in duplicates.values()),
+            near_count=sum(not d.exact for d in duplicates.values()),
+            kept_count=len(kept),
+        )
+        return (
+            kept,
+            [f for f in fingerprints if f.index not in duplicates],
+            duplicates,
+        )
+
+    async def _record_fingerprints(
+        self,
+        document: IngestionDocument,
+        fingerprints: list[ChunkFingerprint],
+        duplicates: dict[int, ChunkDuplicate],
+    ) -> None:
+        """Record fingerprints of stored chunks and links of suppressed ones."""
+        if not self.config.dedup_chunks or not isinstance(
+            self.storage, ChunkFingerprintIndex
+        ):
+            return
+        await self.storage.record_chunk_fingerprints(document, fingerprints, duplicates)
+
+    async def _reuse_stored_embeddings(
+        self,
+        document: IngestionDocument,
+        chunks: list[DoclingChunks],
+    ) -> int:
+        """Attach embeddings from the stored document version to unchanged chunks."""
+        if not self.config.diff_chunk_writes or not isinstance(
+            self.storage, IncrementalStorageAdapter
+        ):
+            return 0
+        stored = await self.storage.load_chunk_embeddings(
+            document,
+            embedding_model=self.embedder.model,
+        )
+        reused = 0
+        for chunk in chunks:
+            embedding = stored.get(chunk.chunk_hash)
+            if embedding is not None and chunk.embedding is None:
+                chunk.embedding = embedding
+                chunk.metadata["embedding_model"] = self.embedder.model
+                reused += 1
+        return reused
+
     async def _build_darwin_bundle(
         self,
         chunks: list[DoclingChunks],
@@ -339,43 +723,32 @@ class IngestionWorkflow:
     def _elapsed_ms(start_time: datetime) -> float:
         return (datetime.now() - start_time).total_seconds() * 1000
 
-    @staticmethod
-    def _find_document_files(documents_folder: str) -> list[str]:
-        """Find all supported document files in the documents folder."""
-        if not os.path.exists(documents_folder):
-            log_async(
-                logger,
-                "error",
-                "documents_folder_not_found",
-                action="documents_folder_not_found",
-                documents_folder=documents_folder,
-            )
-            return []
 
-        patterns = [
-            "*.md",
-            "*.markdown",
-            "*.txt",
-            "*.pdf",
-            "*.docx",
-            "*.doc",
-            "*.pptx",
-            "*.ppt",
-            "*.xlsx",
-            "*.xls",
-            "*.html",
-            "*.htm",
-            "*.mp3",
-            "*.wav",
-            "*.m4a",
-            "*.flac",
-        ]
-        files: list[str] = []
-        for pattern in patterns:
-            files.extend(
-                glob.glob(os.path.join(documents_folder, "**", pattern), recursive=True)
-            )
-        return sorted(files)
+async def _clear_crawl_cache(settings: Settings) -> None:
+    """Clear the crawl cache along with the store it describes.
+
+    Otherwise conditional recrawls would skip pages the cache still marks as
+    unchanged although their documents were just deleted.
+    """
+    if not settings.crawl4ai_conditional_requests:
+        return
+    cache = CrawlCache(settings.redis_url, ttl=settings.crawl4ai_cache_ttl)
+    try:
+        deleted = await cache.clear()
+    except RedisError as exc:
+        await logger.warning(
+            "crawl_cache_clear_failed",
+            action="crawl_cache_clear_failed",
+            error=str(exc),
+        )
+        return
+    finally:
+        await cache.close()
+    await logger.info(
+        "crawl_cache_cleared",
+        action="crawl_cache_cleared",
+        deleted_count=deleted,
+    )
 
 
 async def main() -> None:
@@ -394,6 +767,16 @@ async def main() -> None:
         action="store_true",
         help="Skip cleaning existing data before ingestion",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only ingest new or changed files and purge deleted ones (implies --no-clean)",
+    )
+    parser.add_argument(
+        "--manifest",
+        default=None,
+        help="Manifest path for incremental folder ingestion (default: <documents>/.mdrag_manifest.json)",
+    )
     parser.add_argument(
         "--chunk-size",
         type=int,
@@ -453,6 +836,29 @@ async def main() -> None:
         default=None,
         help="Comma-separated Google Docs IDs",
     )
+    parser.add_argument(
+        "--page-window-size",
+        type=int,
+        default=None,
+        help="Convert PDFs with more pages than this in windows of this many pages",
+    )
+    parser.add_argument(
+        "--write-batch-size",
+        type=int,
+        default=0,
+        help="Buffer chunk writes across documents into bulk writes of this many operations",
+    )
+    parser.add_argument(
+        "--transactional-writes",
+        action="store_true",
+        help="Replace each document and its chunks in a transaction (requires a replica set)",
+    )
+    parser.add_argument(
+        "--no-dedup-chunks",
+        action="store_false",
+        dest="dedup_chunks",
+        help="Store chunks that duplicate chunks already stored in the namespace",
+    )
     parser.add_argument(
         "--enable-darwinxml",
         action="store_true",
@@ -482,6 +888,10 @@ async def main() -> None:
         enable_darwinxml=args.enable_darwinxml,
         darwinxml_validate=args.darwinxml_validate,
         darwinxml_strict=args.darwinxml_strict,
+        page_window_size=args.page_window_size,
+        write_batch_size=args.write_batch_size,
+        transactional_writes=args.transactional_writes,
+        dedup_chunks=args.dedup_chunks,
     )
 
     workflow = IngestionWorkflow(config=config)
@@ -511,7 +921,7 @@ async def main() -> None:
         print(str(e), file=sys.stderr)
         sys.exit(1)
 
-    def progress_callback(current: int, total: int) -> None:
+    def progress_callback(current: int, total: Optional[int]) -> None:
         log_async(
             logger,
             "info",
@@ -522,8 +932,9 @@ async def main() -> None:
         )
 
     try:
-        if not args.no_clean:
+        if not args.no_clean and not args.incremental:
             await workflow.storage.clean()
+            await _clear_crawl_cache(workflow.settings)
 
         results: list[IngestionResult] = []
         if crawl_urls:
@@ -557,6 +968,8 @@ async def main() -> None:
             await workflow.ingest_documents_folder(
                 args.documents,
                 progress_callback=progress_callback,
+                incremental=args.incremental,
+                manifest_path=args.manifest,
             )
         )
 
@@ -576,6 +989,7 @@ async def main() -> None:
         )
     finally:
         await workflow.close()
+        await close_shared_browser_pool()
 
 
 if __name__ == "__main__":
@@ -1,13 +1,18 @@
 """Ingestion job processing and worker helpers."""
 
+from mdrag.capabilities.ingestion.jobs.scheduler import FairShareScheduler, PriorityClass
 from mdrag.capabilities.ingestion.jobs.store import JobState, JobStatus, JobStore
 from mdrag.capabilities.ingestion.jobs.service import IngestionService
 from mdrag.capabilities.ingestion.jobs.worker import process_ingestion_job
+from mdrag.capabilities.ingestion.jobs.warm_worker import WarmIngestionWorker
 
 __all__ = [
+    "FairShareScheduler",
+    "PriorityClass",
     "JobState",
     "JobStatus",
     "JobStore",
     "IngestionService",
+    "WarmIngestionWorker",
     "process_ingestion_job",
 ]
\ No newline at end of file
@@ -0,0 +1,50 @@
+"""Idempotency keys for ingestion jobs.
+
+Jobs queued for the same source identity share a key, so a retried request
+or a reading saved twice is answered with the job already in flight instead of
+a second job racing the first on the same documents.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from typing import Any, Dict, Optional
+
+from mdrag.integrations.crawl4ai.frontier import normalize_url
+
+_NAMESPACE_FIELDS = ("user_id", "org_id", "source_group")
+
+
+def idempotency_key(payload: Dict[str, Any]) -> Optional[str]:
+    """Derive a job's idempotency key from its source identity.
+
+    Returns:
+        A stable key, or None if the payload has no identity to deduplicate on
+        (an upload without a ``content_hash``).
+    """
+    source_type = payload.get("source_type")
+    if source_type == "web":
+        identity: Dict[str, Any] = {
+            "url": normalize_url(payload["url"]) or payload["url"].strip(),
+            "deep": bool(payload.get("deep")),
+            "max_depth": payload.get("max_depth"),
+        }
+    elif source_type == "gdrive":
+        identity = {
+            field: sorted(set(payload.get(field) or []))
+            for field in ("file_ids", "folder_ids", "doc_ids")
+        }
+    elif source_type == "upload" and payload.get("content_hash"):
+        identity = {"content_hash": payload["content_hash"]}
+    else:
+        return None
+
+    namespace = payload.get("namespace") or {}
+    identity["source_type"] = source_type
+    identity["namespace"] = {field: namespace.get(field) for field in _NAMESPACE_FIELDS}
+    digest = hashlib.sha256(json.dumps(identity, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+__all__ = ["idempotency_key"]
@@ -0,0 +1,376 @@
+"""Fair-share scheduling of ingestion jobs across priority classes and tenants.
+
+RQ serves its queue in FIFO order, so one tenant's deep crawl can hold every
+worker while other tenants' single-file uploads wait behind it. Jobs are
+instead submitted to per-class, per-tenant pending lists in Redis, and a
+dispatcher moves them into the RQ queue only while the queue holds fewer than
+``ingestion_scheduler_window`` jobs, so the order workers see is decided here:
+
+- Priority classes are served strictly in order: interactive uploads, then
+  readings, then bulk crawls.
+- Within a class, tenants (``org_id``, else ``user_id``) take turns by
+  deficit round robin, weighted by ``ingestion_tenant_weights``.
+- A tenant with ``ingestion_tenant_max_running`` jobs dispatched and not yet
+  finished is skipped until one finishes.
+
+One dispatcher runs at a time (a Redis leader lock), so several API replicas
+or standalone schedulers can run side by side.
+
+Usage:
+    uv run python -m mdrag.capabilities.ingestion.jobs.scheduler
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import signal
+import statistics
+import time
+from collections import defaultdict, deque
+from enum import Enum
+from typing import Any, Dict, Optional
+
+import redis
+from redis import asyncio as aioredis
+from redis.exceptions import LockError
+from rq import Queue
+
+from mdrag.config.settings import Settings, load_settings
+from mdrag.mdrag_logging.service_logging import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+# Dotted path RQ workers resolve to run an ingestion job.
+INGESTION_JOB_HANDLER = "mdrag.capabilities.ingestion.jobs.worker.process_ingestion_job"
+
+_PREFIX = "ingestion:sched"
+_WAKEUP_KEY = f"{_PREFIX}:wakeup"
+_LEADER_KEY = f"{_PREFIX}:leader"
+# Seconds the leader lock lives without being renewed.
+_LEADER_TTL = 30
+# Recent wait times kept per class for percentiles.
+_WAIT_SAMPLES = 1000
+DEFAULT_TENANT = "default"
+
+
+class PriorityClass(str, Enum):
+    """Scheduling classes, served in declaration order."""
+
+    INTERACTIVE = "interactive"
+    READINGS = "readings"
+    BULK = "bulk"
+
+
+PRIORITY_ORDER = tuple(PriorityClass)
+
+
+def classify_job(payload: Dict[str, Any]) -> PriorityClass:
+    """Pick a job's priority class.
+
+    An explicit ``priority`` in the payload wins. Otherwise deep crawls, Drive
+    folders, and fanned-out collected sources are bulk; everything else is
+    interactive.
+    """
+    if payload.get("priority"):
+        return PriorityClass(payload["priority"])
+    source_type = payload.get("source_type")
+    if source_type == "web" and payload.get("deep"):
+        return PriorityClass.BULK
+    if source_type == "gdrive" and payload.get("folder_ids"):
+        return PriorityClass.BULK
+    if source_type == "collected":
+        return PriorityClass.BULK
+    return PriorityClass.INTERACTIVE
+
+
+def tenant_key(payload: Dict[str, Any]) -> str:
+    """Tenant a job is fair-shared under: its org, else its user."""
+    namespace = payload.get("namespace") or {}
+    return namespace.get("org_id") or namespace.get("user_id") or DEFAULT_TENANT
+
+
+class FairShareScheduler:
+    """Submit ingestion jobs and dispatch them to RQ in fair-share order."""
+
+    def __init__(
+        self,
+        settings: Settings,
+        *,
+        queue_name: str = "default",
+        client: Optional[aioredis.Redis] = None,
+        queue: Optional[Queue] = None,
+    ) -> None:
+        """Initialize the scheduler.
+
+        Args:
+            settings: Application settings.
+            queue_name: RQ queue jobs are dispatched to.
+            client: Async Redis client override (decoding responses).
+            queue: RQ queue override.
+        """
+        self.settings = settings
+        self.redis = client or aioredis.Redis.from_url(
+            settings.redis_url, decode_responses=True
+        )
+        self._queue = queue
+        self._queue_name = queue_name
+        self.window = settings.ingestion_scheduler_window
+        self.max_running = settings.ingestion_tenant_max_running
+        self.weights = settings.ingestion_tenant_weights
+        self._rings: Dict[PriorityClass, deque[str]] = defaultdict(deque)
+        self._deficits: Dict[PriorityClass, Dict[str, float]] = defaultdict(dict)
+        self._stopping = False
+
+    @property
+    def queue(self) -> Queue:
+        if self._queue is None:
+            # RQ needs a synchronous connection that does not decode responses.
+            self._queue = Queue(
+                self._queue_name,
+                connection=redis.Redis.from_url(self.settings.redis_url),
+            )
+        return self._queue
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self.redis.aclose()
+
+    async def submit(self, job_id: str, payload: Dict[str, Any]) -> PriorityClass:
+        """Add a job to its class and tenant's pending list."""
+        priority = classify_job(payload)
+        tenant = tenant_key(payload)
+        entry = {"job_id": job_id, "payload": payload, "submitted_at": time.time()}
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.rpush(self._pending_key(priority, tenant), json.dumps(entry))
+        pipe.sadd(self._tenants_key(priority), tenant)
+        pipe.rpush(_WAKEUP_KEY, 1)
+        await pipe.execute()
+        await logger.info(
+            "ingestion_job_scheduled",
+            action="ingestion_job_scheduled",
+            job_id=job_id,
+            priority=priority.value,
+            tenant=tenant,
+        )
+        return priority
+
+    async def release(self, job_id: str, payload: Dict[str, Any]) -> None:
+        """Free the tenant slot held by a finished job."""
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.zrem(self._running_key(tenant_key(payload)), job_id)
+        pipe.rpush(_WAKEUP_KEY, 1)
+        await pipe.execute()
+
+    async def next_job(self) -> Optional[Dict[str, Any]]:
+        """Take the next job to dispatch, or None if nothing is eligible.
+
+        The job is counted against its tenant's running cap until ``release``.
+        """
+        for priority in PRIORITY_ORDER:
+            entry = await self._next_in_class(priority)
+            if entry is not None:
+                entry["priority"] = priority.value
+                return entry
+        return None
+
+    async def dispatch_once(self) -> bool:
+        """Move one job into the RQ queue if the queue has room.
+
+        Returns:
+            True if a job was dispatched.
+        """
+        backlog = await asyncio.to_thread(lambda: self.queue.count)
+        if backlog >= self.window:
+            return False
+        entry = await self.next_job()
+        if entry is None:
+            return False
+        job_id, payload = entry["job_id"], entry["payload"]
+        try:
+            await asyncio.to_thread(self.queue.enqueue, INGESTION_JOB_HANDLER, job_id, payload)
+        except Exception:
+            priority = PriorityClass(entry["priority"])
+            await self.redis.lpush(
+                self._pending_key(priority, tenant_key(payload)),
+                json.dumps({key: entry[key] for key in ("job_id", "payload", "submitted_at")}),
+            )
+            await self.redis.sadd(self._tenants_key(priority), tenant_key(payload))
+            await self.release(job_id, payload)
+            raise
+        await self._record_wait(entry)
+        return True
+
+    async def run(self, *, poll_interval: float = 1.0) -> None:
+        """Dispatch jobs until ``stop`` is called, while holding leadership."""
+        lock = self.redis.lock(_LEADER_KEY, timeout=_LEADER_TTL)
+        while not self._stopping:
+            if not await lock.acquire(blocking=True, blocking_timeout=poll_interval):
+                continue
+            await logger.info("ingestion_scheduler_leader", action="ingestion_scheduler_leader")
+            try:
+                while not self._stopping:
+                    await lock.reacquire()
+                    try:
+                        dispatched = await self.dispatch_once()
+                    except Exception as exc:
+                        await logger.error(
+                            "ingestion_scheduler_dispatch_failed",
+                            action="ingestion_scheduler_dispatch_failed",
+                            error=str(exc),
+                            error_type=type(exc).__name__,
+                        )
+                        await asyncio.sleep(poll_interval)
+                        continue
+                    if not dispatched:
+                        # Woken early by submissions and releases.
+                        await self.redis.blpop([_WAKEUP_KEY], timeout=poll_interval)
+                        await self.redis.delete(_WAKEUP_KEY)
+            except LockError:
+                await logger.warning(
+                    "ingestion_scheduler_leadership_lost",
+                    action="ingestion_scheduler_leadership_lost",
+                )
+            else:
+                await lock.release()
+
+    def stop(self) -> None:
+        """Stop dispatching after the current job."""
+        self._stopping = True
+
+    async def metrics(self) -> Dict[str, Any]:
+        """Pending depth, dispatch counts, and queue wait times per class."""
+        classes: Dict[str, Any] = {}
+        for priority in PRIORITY_ORDER:
+            tenants = await self.redis.smembers(self._tenants_key(priority))
+            pending = {
+                tenant: await self.redis.llen(self._pending_key(priority, tenant))
+                for tenant in sorted(tenants)
+            }
+            stats = await self.redis.hgetall(self._stats_key(priority))
+            waits = sorted(
+                float(value)
+                for value in await self.redis.lrange(self._waits_key(priority), 0, -1)
+            )
+            dispatched = int(stats.get("dispatched", 0))
+            classes[priority.value] = {
+                "pending": sum(pending.values()),
+                "pending_by_tenant": pending,
+                "dispatched": dispatched,
+                "wait_seconds": {
+                    "mean": float(stats.get("wait_seconds_total", 0)) / dispatched
+                    if dispatched
+                    else 0.0,
+                    "p50": statistics.median(waits) if waits else 0.0,
+                    "p95": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                },
+            }
+        return {"classes": classes}
+
+    async def _next_in_class(self, priority: PriorityClass) -> Optional[Dict[str, Any]]:
+        """Deficit round robin over the class's tenants with pending jobs."""
+        tenants = set(await self.redis.smembers(self._tenants_key(priority)))
+        ring = self._rings[priority]
+        deficits = self._deficits[priority]
+        for tenant in list(ring):
+            if tenant not in tenants:
+                ring.remove(tenant)
+                deficits.pop(tenant, None)
+        ring.extend(sorted(tenants - set(ring)))
+
+        for _ in range(len(ring)):
+            tenant = ring[0]
+            if await self._running(tenant) >= self.max_running:
+                ring.rotate(-1)
+                continue
+            # A tenant earns its quantum at the start of each turn.
+            if deficits.get(tenant, 0.0) < 1:
+                deficits[tenant] = deficits.get(tenant, 0.0) + self.weights.get(tenant, 1.0)
+            if deficits[tenant] < 1:
+                ring.rotate(-1)
+                continue
+            raw = await self.redis.lpop(self._pending_key(priority, tenant))
+            if raw is None:
+                await self._retire(priority, tenant)
+                ring.popleft()
+                deficits.pop(tenant, None)
+                continue
+            deficits[tenant] -= 1
+            if deficits[tenant] < 1:
+                ring.rotate(-1)
+            entry = json.loads(raw)
+            await self.redis.zadd(self._running_key(tenant), {entry["job_id"]: time.time()})
+            return entry
+        return None
+
+    async def _running(self, tenant: str) -> int:
+        """Jobs the tenant has dispatched and not released.
+
+        Slots older than the lease are dropped, so a worker that died without
+        releasing cannot cap a tenant forever.
+        """
+        key = self._running_key(tenant)
+        expired = time.time() - self.settings.ingestion_scheduler_lease_seconds
+        await self.redis.zremrangebyscore(key, "-inf", expired)
+        return await self.redis.zcard(key)
+
+    async def _retire(self, priority: PriorityClass, tenant: str) -> None:
+        """Drop a tenant with no pending jobs, unless one arrived meanwhile."""
+        await self.redis.srem(self._tenants_key(priority), tenant)
+        if await self.redis.llen(self._pending_key(priority, tenant)):
+            await self.redis.sadd(self._tenants_key(priority), tenant)
+
+    async def _record_wait(self, entry: Dict[str, Any]) -> None:
+        wait = max(0.0, time.time() - entry["submitted_at"])
+        priority = PriorityClass(entry["priority"])
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hincrby(self._stats_key(priority), "dispatched", 1)
+        pipe.hincrbyfloat(self._stats_key(priority), "wait_seconds_total", wait)
+        pipe.lpush(self._waits_key(priority), wait)
+        pipe.ltrim(self._waits_key(priority), 0, _WAIT_SAMPLES - 1)
+        await pipe.execute()
+        await logger.info(
+            "ingestion_job_dispatched",
+            action="ingestion_job_dispatched",
+            job_id=entry["job_id"],
+            priority=priority.value,
+            tenant=tenant_key(entry["payload"]),
+            wait_ms=int(wait * 1000),
+        )
+
+    @staticmethod
+    def _tenants_key(priority: PriorityClass) -> str:
+        return f"{_PREFIX}:{priority.value}:tenants"
+
+    @staticmethod
+    def _pending_key(priority: PriorityClass, tenant: str) -> str:
+        return f"{_PREFIX}:{priority.value}:pending:{tenant}"
+
+    @staticmethod
+    def _running_key(tenant: str) -> str:
+        return f"{_PREFIX}:running:{tenant}"
+
+    @staticmethod
+    def _stats_key(priority: PriorityClass) -> str:
+        return f"{_PREFIX}:{priority.value}:stats"
+
+    @staticmethod
+    def _waits_key(priority: PriorityClass) -> str:
+        return f"{_PREFIX}:{priority.value}:waits"
+
+
+async def main() -> None:
+    """Run a standalone scheduler dispatcher."""
+    await setup_logging()
+    scheduler = FairShareScheduler(load_settings())
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, scheduler.stop)
+    try:
+        await scheduler.run()
+    finally:
+        await scheduler.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
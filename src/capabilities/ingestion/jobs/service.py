@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 from time import perf_counter
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence
 
 from mdrag.capabilities.ingestion.ingest import IngestionWorkflow
+from mdrag.capabilities.ingestion.jobs.scheduler import (
+    INGESTION_JOB_HANDLER,
+    FairShareScheduler,
+    classify_job,
+)
 from mdrag.capabilities.ingestion.jobs.store import JobStatus, JobStore
+from mdrag.capabilities.ingestion.locks import DocumentLocks
 from mdrag.capabilities.ingestion.models import (
+    CollectedSource,
     GoogleDriveCollectionRequest,
     IngestionConfig,
     IngestionResult,
@@ -18,6 +26,8 @@ from mdrag.capabilities.ingestion.models import (
 )
 from mdrag.capabilities.ingestion.sources import Crawl4AICollector, GoogleDriveCollector, UploadCollector
 from mdrag.capabilities.ingestion.validation import validate_ingestion
+from mdrag.integrations.crawl4ai.cache import CrawlCache, content_hash
+from mdrag.integrations.crawl4ai.pool import close_shared_browser_pool
 from mdrag.mdrag_logging.service_logging import get_logger, log_async
 from mdrag.config.settings import Settings
 
@@ -29,20 +39,57 @@ _SOURCE_TYPE_TO_COLLECTOR: dict[str, str] = {
     "upload": "upload",
 }
 
+# Child jobs carrying already-collected sources use this source type.
+COLLECTED_SOURCE_TYPE = "collected"
+
+ChildEnqueuer = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
 
 class IngestionService:
     """Coordinate ingestion workflow operations for job workers."""
 
-    def __init__(self, settings: Settings) -> None:
+    def __init__(
+        self,
+        settings: Settings,
+        *,
+        persistent: bool = False,
+        enqueue: Optional[ChildEnqueuer] = None,
+    ) -> None:
         """Initialize the ingestion service.
 
         Args:
             settings: Application settings.
+            persistent: Keep the workflow and its clients open between jobs
+                and validate each collector only once. The owner must call
+                ``close`` when done.
+            enqueue: Coroutine function queueing a child job as
+                ``(job_id, payload)`` (default: the fair-share scheduler, or
+                the RQ ``default`` queue when scheduling is disabled).
         """
         self.settings = settings
+        self.persistent = persistent
+        self.scheduler = FairShareScheduler(settings)
+        self._enqueue = enqueue or self._submit_child
+        self._queue = None
+        self._validated_collectors: set[str] = set()
+        self.document_locks = DocumentLocks(
+            settings.redis_url,
+            timeout=settings.ingestion_document_lock_timeout,
+        )
+        self.crawl_cache = (
+            CrawlCache(settings.redis_url, ttl=settings.crawl4ai_cache_ttl)
+            if settings.crawl4ai_conditional_requests
+            else None
+        )
         self.workflow = IngestionWorkflow(
-            config=IngestionConfig(),
+            config=IngestionConfig(
+                page_window_size=settings.ingestion_page_window_size,
+                write_batch_size=settings.ingestion_write_batch_size,
+                transactional_writes=settings.ingestion_transactional_writes,
+                dedup_chunks=settings.ingestion_dedup_chunks,
+            ),
             settings=settings,
+            document_locks=self.document_locks,
         )
 
     async def run_job(
@@ -61,24 +108,29 @@ class IngestionService:
             source_type=source_type,
         )
 
+        parent_id = payload.get("parent_id")
+
+        async def progress(index: int, total: Optional[int], result: IngestionResult) -> None:
+            await job_store.report_progress(
+                job_id,
+                sources_done=index,
+                sources_total=total,
+                chunks_embedded=result.chunks_created,
+            )
+
         try:
             await self.workflow.initialize()
-            collector_name = _SOURCE_TYPE_TO_COLLECTOR.get(
+            collector_name = payload.get("collector") or _SOURCE_TYPE_TO_COLLECTOR.get(
                 source_type, source_type or "upload"
             )
-            await validate_ingestion(
-                self.settings,
-                collectors=[collector_name],
-                strict_mongodb=False,
-                require_redis=True,
-            )
+            await self._validate(collector_name)
             results: list[IngestionResult] = []
             namespace = Namespace(**(payload.get("namespace") or {}))
 
             if source_type == "web":
-                collector = Crawl4AICollector(settings=self.settings)
-                job_store.update_status(job_id, JobStatus.FETCHING_SOURCE)
-                sources = await collector.collect(
+                collector = Crawl4AICollector(settings=self.settings, cache=self.crawl_cache)
+                await job_store.update_status(job_id, JobStatus.FETCHING_SOURCE)
+                sources = collector.collect_stream(
                     WebCollectionRequest(
                         url=payload["url"],
                         deep=bool(payload.get("deep")),
@@ -86,49 +138,107 @@ class IngestionService:
                         namespace=namespace,
                     )
                 )
-                job_store.update_status(job_id, JobStatus.DOCLING_PARSING)
-                results = await self.workflow.ingest_sources(sources)
-                job_store.update_status(job_id, JobStatus.INDEXING)
+                if self.settings.ingestion_fanout_batch_size:
+                    sources = await self._fan_out_stream(
+                        job_id,
+                        job_store,
+                        sources,
+                        lambda batch: {
+                            "source_type": COLLECTED_SOURCE_TYPE,
+                            "collector": collector_name,
+                            "sources": [source.model_dump(mode="json") for source in batch],
+                            "namespace": payload.get("namespace") or {},
+                        },
+                        classify_job(payload).value,
+                    )
+                    if sources is None:
+                        return
+                await job_store.update_status(job_id, JobStatus.DOCLING_PARSING)
+                results = await self.workflow.ingest_sources(
+                    sources, on_result=progress, on_ingested=self._record_crawl
+                )
+                await job_store.update_status(job_id, JobStatus.INDEXING)
             elif source_type == "gdrive":
                 collector = GoogleDriveCollector(settings=self.settings)
-                job_store.update_status(job_id, JobStatus.FETCHING_SOURCE)
-                sources = await collector.collect(
-                    GoogleDriveCollectionRequest(
-                        file_ids=payload.get("file_ids", []),
-                        folder_ids=payload.get("folder_ids", []),
-                        doc_ids=payload.get("doc_ids", []),
-                        namespace=namespace,
-                    )
+                await job_store.update_status(job_id, JobStatus.FETCHING_SOURCE)
+                request = GoogleDriveCollectionRequest(
+                    file_ids=payload.get("file_ids", []),
+                    folder_ids=payload.get("folder_ids", []),
+                    doc_ids=payload.get("doc_ids", []),
+                    namespace=namespace,
                 )
-                job_store.update_status(job_id, JobStatus.DOCLING_PARSING)
-                results = await self.workflow.ingest_sources(sources)
-                job_store.update_status(job_id, JobStatus.INDEXING)
+                if (
+                    parent_id is None
+                    and self.settings.google_service_account_file
+                    and self.settings.ingestion_fanout_batch_size
+                ):
+                    file_ids = await collector.resolve_file_ids(request)
+                    request = GoogleDriveCollectionRequest(file_ids=file_ids, namespace=namespace)
+                    batches = self._fanout_batches(file_ids)
+                    if batches:
+                        await self._fan_out(
+                            job_id,
+                            job_store,
+                            [
+                                {
+                                    "source_type": "gdrive",
+                                    "file_ids": batch,
+                                    "namespace": payload.get("namespace") or {},
+                                }
+                                for batch in batches
+                            ],
+                            classify_job(payload).value,
+                        )
+                        return
+                sources = await collector.collect(request)
+                await job_store.update_status(job_id, JobStatus.DOCLING_PARSING)
+                results = await self.workflow.ingest_sources(
+                    sources, on_result=progress
+                )
+                await job_store.update_status(job_id, JobStatus.INDEXING)
             elif source_type == "upload":
                 collector = UploadCollector()
-                job_store.update_status(job_id, JobStatus.DOCLING_PARSING)
+                await job_store.update_status(job_id, JobStatus.DOCLING_PARSING)
                 sources = await collector.collect(
                     UploadCollectionRequest(
                         filename=payload.get("filename") or os.path.basename(
                             payload["file_path"]
                         ),
                         file_path=payload["file_path"],
+                        content_hash=payload.get("content_hash"),
                         namespace=namespace,
                     )
                 )
-                results = await self.workflow.ingest_sources(sources)
-                job_store.update_status(job_id, JobStatus.INDEXING)
+                results = await self.workflow.ingest_sources(
+                    sources, on_result=progress
+                )
+                await job_store.update_status(job_id, JobStatus.INDEXING)
                 self._cleanup_upload(payload.get("file_path"), job_id)
+            elif source_type == COLLECTED_SOURCE_TYPE:
+                sources = [
+                    CollectedSource.model_validate(source)
+                    for source in payload.get("sources", [])
+                ]
+                await job_store.update_status(job_id, JobStatus.DOCLING_PARSING)
+                results = await self.workflow.ingest_sources(
+                    sources, on_result=progress, on_ingested=self._record_crawl
+                )
+                await job_store.update_status(job_id, JobStatus.INDEXING)
             else:
                 raise ValueError(f"Unsupported source type: {source_type}")
 
             result_payload = {
                 "documents": [self._result_to_dict(result) for result in results],
             }
-            job_store.update_status(
+            await job_store.update_status(
                 job_id,
                 JobStatus.COMPLETED,
                 result=result_payload,
             )
+            if parent_id:
+                await job_store.record_child_result(
+                    parent_id, job_id, failed=False, result=result_payload
+                )
             duration_ms = int((perf_counter() - start_time) * 1000)
             await logger.info(
                 "ingestion_job_complete",
@@ -139,7 +249,11 @@ class IngestionService:
                 duration_ms=duration_ms,
             )
         except Exception as exc:
-            job_store.update_status(job_id, JobStatus.FAILED, error=str(exc))
+            await job_store.update_status(job_id, JobStatus.FAILED, error=str(exc))
+            if parent_id:
+                await job_store.record_child_result(
+                    parent_id, job_id, failed=True, error=str(exc)
+                )
             await logger.error(
                 "ingestion_job_failed",
                 action="ingestion_job_failed",
@@ -150,7 +264,209 @@ class IngestionService:
             )
             raise
         finally:
-            await self.workflow.close()
+            if self.settings.ingestion_scheduler_enabled:
+                await self.scheduler.release(job_id, payload)
+            if not self.persistent:
+                await self.close()
+
+    async def close(self) -> None:
+        """Close the workflow, its clients, and this loop's browser pool."""
+        await self.workflow.close()
+        await self.document_locks.close()
+        await self.scheduler.close()
+        if self.crawl_cache is not None:
+            await self.crawl_cache.close()
+        await close_shared_browser_pool()
+
+    def _fanout_batches(self, items: Sequence[Any]) -> Optional[List[List[Any]]]:
+        """Split ``items`` into child-job batches, or None if the job stays whole."""
+        size = self.settings.ingestion_fanout_batch_size
+        if not size or len(items) <= size:
+            return None
+        return [list(items[start : start + size]) for start in range(0, len(items), size)]
+
+    async def _fan_out(
+        self,
+        job_id: str,
+        job_store: JobStore,
+        child_payloads: List[Dict[str, Any]],
+        priority: str,
+    ) -> None:
+        """Enqueue one child job per payload and leave the parent waiting.
+
+        The parent's child count is recorded before anything is enqueued; the
+        last child to finish completes the parent. A child that cannot be
+        enqueued is recorded as failed so the parent still completes. Children
+        are scheduled in the parent's ``priority`` class.
+        """
+        await job_store.start_children(job_id, len(child_payloads))
+        for index, child_payload in enumerate(child_payloads):
+            await self._enqueue_child(job_id, job_store, index, child_payload, priority)
+        await logger.info(
+            "ingestion_job_fanned_out",
+            action="ingestion_job_fanned_out",
+            job_id=job_id,
+            child_count=len(child_payloads),
+        )
+
+    async def _fan_out_stream(
+        self,
+        job_id: str,
+        job_store: JobStore,
+        sources: AsyncIterator[CollectedSource],
+        child_payload: Callable[[List[CollectedSource]], Dict[str, Any]],
+        priority: str,
+    ) -> Optional[List[CollectedSource]]:
+        """Fan streamed sources out into child jobs as each batch fills.
+
+        The first batch is held back: if the stream ends within it, the job
+        stays whole and the held sources are returned for in-process
+        ingestion. Otherwise the parent's fan-out is opened, every full batch
+        is enqueued as soon as it fills, and the child count is sealed when the
+        stream ends.
+
+        If the stream fails after the fan-out was opened, the sources already
+        collected are still enqueued and the fan-out is sealed with the stream
+        error, which the parent reports once its children finish. A stream
+        that fails before any child was enqueued fails the job as usual.
+
+        Returns:
+            The held sources if the job stays whole, else None.
+        """
+        size = self.settings.ingestion_fanout_batch_size
+        batch: List[CollectedSource] = []
+        child_count = 0
+        stream_error: Optional[str] = None
+        iterator = sources.__aiter__()
+        while True:
+            try:
+                source = await iterator.__anext__()
+            except StopAsyncIteration:
+                break
+            except Exception as exc:
+                if not child_count:
+                    raise
+                stream_error = str(exc) or type(exc).__name__
+                await logger.error(
+                    "ingestion_fanout_stream_failed",
+                    action="ingestion_fanout_stream_failed",
+                    job_id=job_id,
+                    child_count=child_count,
+                    error=stream_error,
+                    error_type=type(exc).__name__,
+                )
+                break
+            batch.append(source)
+            if len(batch) <= size:
+                continue
+            if not child_count:
+                await job_store.start_children(job_id)
+            await self._enqueue_child(
+                job_id, job_store, child_count, child_payload(batch[:size]), priority
+            )
+            child_count += 1
+            batch = batch[size:]
+
+        if not child_count:
+            return batch
+        if batch:
+            await self._enqueue_child(
+                job_id, job_store, child_count, child_payload(batch), priority
+            )
+            child_count += 1
+        await job_store.seal_children(job_id, child_count, error=stream_error)
+        await logger.info(
+            "ingestion_job_fanned_out",
+            action="ingestion_job_fanned_out",
+            job_id=job_id,
+            child_count=child_count,
+            streamed=True,
+        )
+        return None
+
+    async def _enqueue_child(
+        self,
+        job_id: str,
+        job_store: JobStore,
+        index: int,
+        child_payload: Dict[str, Any],
+        priority: str,
+    ) -> None:
+        """Create and enqueue one child job, recording it as failed if that fails."""
+        child_id = f"{job_id}-{index}"
+        child_payload = {**child_payload, "parent_id": job_id, "priority": priority}
+        await job_store.create_job(child_id, self._stored_payload(child_payload), parent_id=job_id)
+        try:
+            await self._enqueue(child_id, child_payload)
+        except Exception as exc:
+            await job_store.update_status(child_id, JobStatus.FAILED, error=str(exc))
+            await job_store.record_child_result(job_id, child_id, failed=True, error=str(exc))
+
+    async def _record_crawl(self, source: CollectedSource, result: IngestionResult) -> None:
+        """Record an ingested web page in the crawl cache.
+
+        Only pages ingested without errors are recorded, so a page that failed
+        is fetched and ingested again on the next crawl even if unchanged.
+        ``ingest_sources`` calls this only once the page's buffered writes are
+        flushed, with any flush failure already in ``result.errors``. Entries
+        are scoped to the source's namespace.
+        """
+        frontmatter = source.frontmatter
+        if (
+            self.crawl_cache is None
+            or result.errors
+            or frontmatter.source_type != "web"
+            or not frontmatter.source_url
+            or not isinstance(source.content.data, str)
+        ):
+            return
+        await self.crawl_cache.scoped(source.namespace).put(
+            frontmatter.source_url,
+            etag=frontmatter.source_etag,
+            last_modified=frontmatter.source_modified_at,
+            content_hash=content_hash(source.content.data),
+            links=source.links,
+        )
+
+    async def _submit_child(self, job_id: str, payload: Dict[str, Any]) -> None:
+        """Submit a child job to the scheduler, or straight to RQ."""
+        if self.settings.ingestion_scheduler_enabled:
+            await self.scheduler.submit(job_id, payload)
+        else:
+            await asyncio.to_thread(self._enqueue_rq, job_id, payload)
+
+    def _enqueue_rq(self, job_id: str, payload: Dict[str, Any]) -> None:
+        """Queue a child job on the RQ ``default`` queue."""
+        if self._queue is None:
+            import redis
+            from rq import Queue
+
+            self._queue = Queue(connection=redis.Redis.from_url(self.settings.redis_url))
+        self._queue.enqueue(INGESTION_JOB_HANDLER, job_id, payload)
+
+    @staticmethod
+    def _stored_payload(payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Job-record copy of a child payload, without collected content."""
+        if "sources" not in payload:
+            return payload
+        stored = {key: value for key, value in payload.items() if key != "sources"}
+        stored["source_urls"] = [
+            source["frontmatter"].get("source_url") for source in payload["sources"]
+        ]
+        return stored
+
+    async def _validate(self, collector_name: str) -> None:
+        """Validate the pipeline for a collector, once per persistent service."""
+        if collector_name in self._validated_collectors:
+            return
+        await validate_ingestion(
+            self.settings,
+            collectors=[collector_name],
+            strict_mongodb=False,
+            require_redis=True,
+        )
+        if self.persistent:
+            self._validated_collectors.add(collector_name)
 
     @staticmethod
     def _cleanup_upload(file_path: str | None, job_id: str) -> None:
@@ -1,4 +1,4 @@
-"""Ingestion job tracking and status persistence."""
+"""Ingestion job tracking, status persistence, and progress events."""
 
 from __future__ import annotations
 
@@ -6,11 +6,11 @@ import json
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, AsyncIterator, Dict, Optional
 
-import redis
+import redis.asyncio as redis
 
-from mdrag.mdrag_logging.service_logging import get_logger, log_async
+from mdrag.mdrag_logging.service_logging import get_logger
 
 logger = get_logger(__name__)
 
@@ -22,10 +22,40 @@ class JobStatus(str, Enum):
     FETCHING_SOURCE = "FETCHING_SOURCE"
     DOCLING_PARSING = "DOCLING_PARSING"
     INDEXING = "INDEXING"
+    WAITING_FOR_CHILDREN = "WAITING_FOR_CHILDREN"
     COMPLETED = "COMPLETED"
     FAILED = "FAILED"
 
 
+TERMINAL_STATUSES = frozenset({JobStatus.COMPLETED, JobStatus.FAILED})
+
+_PROGRESS_FIELDS = ("sources_done", "sources_total", "chunks_embedded")
+
+_JOB_KEY_PREFIX = "ingestion:job:"
+
+# Claim an idempotency key unless it points at a job that is still in flight.
+# Returns the job ID that owns the key afterwards.
+_CLAIM_SCRIPT = """
+local existing = redis.call('GET', KEYS[1])
+if existing then
+  local status = redis.call('HGET', ARGV[3] .. existing, 'status')
+  if status and status ~= 'COMPLETED' and status ~= 'FAILED' then
+    return existing
+  end
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return ARGV[1]
+"""
+
+# Delete an idempotency key only if ``ARGV[1]`` still owns it.
+_RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
 @dataclass
 class JobState:
     job_id: str
@@ -35,15 +65,32 @@ class JobState:
     error: Optional[str] = None
     result: Optional[Dict[str, Any]] = None
     payload: Optional[Dict[str, Any]] = None
+    parent_id: Optional[str] = None
+    children: Optional[Dict[str, Optional[int]]] = None
+    progress: Optional[Dict[str, int]] = None
 
 
 class JobStore:
-    """Persist job state in Redis."""
+    """Persist job state in Redis and publish progress events.
+
+    Each job is a Redis hash; updates write only the fields that changed and
+    publish an event on the job's channel in the same pipeline, so watchers
+    see every transition without polling.
+    """
 
-    def __init__(self, redis_url: str) -> None:
-        self.redis = redis.Redis.from_url(redis_url, decode_responses=True)
+    def __init__(self, redis_url: str, client: Optional[redis.Redis] = None) -> None:
+        self.redis = client or redis.Redis.from_url(redis_url, decode_responses=True)
 
-    def create_job(self, job_id: str, payload: Dict[str, Any]) -> JobState:
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self.redis.aclose()
+
+    async def create_job(
+        self,
+        job_id: str,
+        payload: Dict[str, Any],
+        parent_id: Optional[str] = None,
+    ) -> JobState:
         now = datetime.now().isoformat()
         state = JobState(
             job_id=job_id,
@@ -51,55 +98,284 @@ class JobStore:
             created_at=now,
             updated_at=now,
             payload=payload,
+            parent_id=parent_id,
+        )
+        await self.redis.hset(
+            self._key(job_id),
+            mapping={
+                "status": state.status.value,
+                "created_at": now,
+                "updated_at": now,
+                "error": "",
+                "payload": json.dumps(payload or {}),
+                "result": json.dumps({}),
+                "parent_id": parent_id or "",
+            },
         )
-        self._save_state(state)
-        log_async(
-            logger,
-            "info",
+        await logger.info(
             "ingestion_job_created",
             action="ingestion_job_created",
             job_id=job_id,
             status=state.status.value,
+            parent_id=parent_id,
         )
         return state
 
-    def update_status(
+    async def claim_idempotency_key(self, key: str, job_id: str, ttl: int) -> str:
+        """Make ``job_id`` the owner of ``key`` unless an owner is in flight.
+
+        The check and the claim run atomically in Redis, so concurrent
+        identical requests cannot both claim the key. The key expires after
+        ``ttl`` seconds as a backstop for jobs that never finish.
+
+        Returns:
+            ``job_id`` if claimed, else the in-flight job's ID.
+        """
+        owner = await self.redis.eval(
+            _CLAIM_SCRIPT,
+            1,
+            self._idempotency_key(key),
+            job_id,
+            ttl,
+            _JOB_KEY_PREFIX,
+        )
+        return owner
+
+    async def release_idempotency_key(self, key: str, job_id: str) -> bool:
+        """Drop ``key`` if ``job_id`` still owns it, so the next request can claim it.
+
+        Returns:
+            True if the key was released.
+        """
+        released = await self.redis.eval(_RELEASE_SCRIPT, 1, self._idempotency_key(key), job_id)
+        return bool(released)
+
+    async def delete_job(self, job_id: str) -> None:
+        """Remove a job record that was never queued."""
+        await self.redis.delete(self._key(job_id))
+
+    async def update_status(
         self,
         job_id: str,
         status: JobStatus,
         error: Optional[str] = None,
         result: Optional[Dict[str, Any]] = None,
-    ) -> JobState:
-        state = self.get_job(job_id) or JobState(
-            job_id=job_id,
-            status=status,
-            created_at=datetime.now().isoformat(),
-            updated_at=datetime.now().isoformat(),
-        )
-        state.status = status
-        state.updated_at = datetime.now().isoformat()
+    ) -> None:
+        """Set a job's status, writing only the changed fields."""
+        now = datetime.now().isoformat()
+        fields: Dict[str, str] = {"status": status.value, "updated_at": now}
         if error is not None:
-            state.error = error
+            fields["error"] = error
         if result is not None:
-            state.result = result
-        self._save_state(state)
-        log_async(
-            logger,
-            "info",
+            fields["result"] = json.dumps(result)
+        event: Dict[str, Any] = {
+            "job_id": job_id,
+            "event": "status",
+            "status": status.value,
+            "updated_at": now,
+        }
+        if error is not None:
+            event["error"] = error
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hsetnx(self._key(job_id), "created_at", now)
+        pipe.hset(self._key(job_id), mapping=fields)
+        pipe.publish(self._channel(job_id), json.dumps(event))
+        await pipe.execute()
+        await logger.info(
             "ingestion_job_status_updated",
             action="ingestion_job_status_updated",
             job_id=job_id,
             status=status.value,
             has_error=bool(error),
         )
-        return state
 
-    def get_job(self, job_id: str) -> Optional[JobState]:
-        raw = self.redis.hgetall(self._key(job_id))
+    async def report_progress(
+        self,
+        job_id: str,
+        *,
+        sources_done: Optional[int] = None,
+        sources_total: Optional[int] = None,
+        chunks_embedded: int = 0,
+    ) -> None:
+        """Record progress within the current stage and publish it.
+
+        ``chunks_embedded`` is added to the job's running total.
+        """
+        key = self._key(job_id)
+        now = datetime.now().isoformat()
+        fields: Dict[str, Any] = {"updated_at": now}
+        if sources_done is not None:
+            fields["sources_done"] = sources_done
+        if sources_total is not None:
+            fields["sources_total"] = sources_total
+
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hset(key, mapping=fields)
+        pipe.hincrby(key, "chunks_embedded", chunks_embedded)
+        pipe.hmget(key, "status", *_PROGRESS_FIELDS)
+        _, _, (status, *progress) = await pipe.execute()
+        event = {
+            "job_id": job_id,
+            "event": "progress",
+            "status": status,
+            "updated_at": now,
+            **{name: int(value or 0) for name, value in zip(_PROGRESS_FIELDS, progress)},
+        }
+        await self.redis.publish(self._channel(job_id), json.dumps(event))
+
+    async def start_children(self, parent_id: str, child_count: Optional[int] = None) -> None:
+        """Record that a job fanned out into ``child_count`` child jobs.
+
+        Must be called before the children are enqueued, so the last child to
+        finish can tell that it is the last one. With ``child_count`` None the
+        fan-out is open: children are enqueued as they are produced and
+        ``seal_children`` records the final count.
+        """
+        fields: Dict[str, int] = {"children_done": 0, "children_failed": 0}
+        if child_count is not None:
+            fields["children_total"] = child_count
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.delete(self._results_key(parent_id))
+        pipe.hdel(self._key(parent_id), "fanout_error")
+        pipe.hset(self._key(parent_id), mapping=fields)
+        await pipe.execute()
+        await self.update_status(parent_id, JobStatus.WAITING_FOR_CHILDREN)
+
+    async def seal_children(
+        self,
+        parent_id: str,
+        child_count: int,
+        *,
+        error: Optional[str] = None,
+    ) -> Optional[JobState]:
+        """Record the final child count of an open fan-out.
+
+        Runs atomically against ``record_child_result``, so exactly one of them
+        sees the last child finish: this call if every child already has.
+        ``error`` records why the fan-out ended early; it is reported in the
+        parent's result once the children that were enqueued finish.
+
+        Returns:
+            The parent's final state if all children had finished, else None.
+        """
+        key = self._key(parent_id)
+        fields: Dict[str, Any] = {"children_total": child_count}
+        if error:
+            fields["fanout_error"] = error
+        pipe = self.redis.pipeline()
+        pipe.hset(key, mapping=fields)
+        pipe.hget(key, "children_done")
+        pipe.hget(key, "children_failed")
+        _, done, failed_count = await pipe.execute()
+        if int(done or 0) < child_count:
+            return None
+        return await self._complete_parent(parent_id, child_count, int(failed_count or 0))
+
+    async def record_child_result(
+        self,
+        parent_id: str,
+        child_id: str,
+        *,
+        failed: bool,
+        result: Optional[Dict[str, Any]] = None,
+        error: Optional[str] = None,
+    ) -> Optional[JobState]:
+        """Fold a finished child job into its parent.
+
+        Counters are updated atomically, so children finishing on different
+        workers never lose an update. The child that finishes last completes
+        the parent with the aggregated results.
+
+        Returns:
+            The parent's final state if this was the last child, else None.
+        """
+        key = self._key(parent_id)
+        entry = {"job_id": child_id, "failed": failed, "error": error, "result": result or {}}
+        pipe = self.redis.pipeline()
+        pipe.rpush(self._results_key(parent_id), json.dumps(entry))
+        pipe.hincrby(key, "children_failed", int(failed))
+        pipe.hincrby(key, "children_done", 1)
+        pipe.hget(key, "children_total")
+        _, failed_count, done, total = await pipe.execute()
+        await self.redis.publish(
+            self._channel(parent_id),
+            json.dumps(
+                {
+                    "job_id": parent_id,
+                    "event": "progress",
+                    "status": JobStatus.WAITING_FOR_CHILDREN.value,
+                    "children_done": done,
+                    "children_failed": failed_count,
+                }
+            ),
+        )
+        if total is None or done < int(total):
+            return None
+        return await self._complete_parent(parent_id, int(total), failed_count)
+
+    async def _complete_parent(
+        self,
+        parent_id: str,
+        total: int,
+        failed_count: int,
+    ) -> Optional[JobState]:
+        """Aggregate child results into the parent and finish it."""
+        entries = [
+            json.loads(raw)
+            for raw in await self.redis.lrange(self._results_key(parent_id), 0, -1)
+        ]
+        fanout_error = await self.redis.hget(self._key(parent_id), "fanout_error")
+        aggregated = {
+            "documents": [
+                document
+                for entry in entries
+                for document in (entry.get("result") or {}).get("documents", [])
+            ],
+            "children": {
+                "total": total,
+                "completed": total - failed_count,
+                "failed": failed_count,
+            },
+            "failed_children": [
+                {"job_id": entry["job_id"], "error": entry.get("error")}
+                for entry in entries
+                if entry.get("failed")
+            ],
+        }
+        errors = []
+        if failed_count == total:
+            errors.append("All child jobs failed")
+        elif failed_count:
+            errors.append(f"{failed_count} of {total} child jobs failed")
+        if fanout_error:
+            aggregated["fanout_error"] = fanout_error
+            errors.append(f"Source stream failed after {total} child jobs: {fanout_error}")
+        await self.redis.delete(self._results_key(parent_id))
+        await self.update_status(
+            parent_id,
+            JobStatus.FAILED if failed_count == total else JobStatus.COMPLETED,
+            error="; ".join(errors) or None,
+            result=aggregated,
+        )
+        return await self.get_job(parent_id)
+
+    async def get_job(self, job_id: str) -> Optional[JobState]:
+        raw = await self.redis.hgetall(self._key(job_id))
         if not raw:
             return None
         payload = json.loads(raw.get("payload", "null"))
         result = json.loads(raw.get("result", "null"))
+        children = None
+        if "children_done" in raw:
+            children = {
+                "total": int(raw["children_total"]) if "children_total" in raw else None,
+                "done": int(raw.get("children_done", 0)),
+                "failed": int(raw.get("children_failed", 0)),
+            }
+        progress = None
+        if any(name in raw for name in _PROGRESS_FIELDS):
+            progress = {name: int(raw.get(name, 0)) for name in _PROGRESS_FIELDS}
         return JobState(
             job_id=job_id,
             status=JobStatus(raw.get("status", JobStatus.PENDING.value)),
@@ -108,21 +384,68 @@ class JobStore:
             error=raw.get("error") or None,
             payload=payload,
             result=result,
+            parent_id=raw.get("parent_id") or None,
+            children=children,
+            progress=progress,
         )
 
-    def _save_state(self, state: JobState) -> None:
-        self.redis.hset(
-            self._key(state.job_id),
-            mapping={
+    async def watch(
+        self,
+        job_id: str,
+        *,
+        keepalive: float = 15.0,
+    ) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Stream a job's events until it reaches a terminal status.
+
+        The current state is yielded first as a ``snapshot`` event. ``None``
+        is yielded after ``keepalive`` idle seconds so callers can send a
+        heartbeat. Nothing is yielded for an unknown job.
+        """
+        pubsub = self.redis.pubsub()
+        # Subscribe before reading the snapshot so no transition is missed.
+        await pubsub.subscribe(self._channel(job_id))
+        try:
+            state = await self.get_job(job_id)
+            if state is None:
+                return
+            yield {
+                "job_id": job_id,
+                "event": "snapshot",
                 "status": state.status.value,
-                "created_at": state.created_at,
                 "updated_at": state.updated_at,
-                "error": state.error or "",
-                "payload": json.dumps(state.payload or {}),
-                "result": json.dumps(state.result or {}),
-            },
-        )
+                "error": state.error,
+                "progress": state.progress,
+                "children": state.children,
+            }
+            if state.status in TERMINAL_STATUSES:
+                return
+            while True:
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=keepalive
+                )
+                if message is None:
+                    yield None
+                    continue
+                event = json.loads(message["data"])
+                yield event
+                if event.get("status") in {status.value for status in TERMINAL_STATUSES}:
+                    return
+        finally:
+            await pubsub.unsubscribe(self._channel(job_id))
+            await pubsub.aclose()
+
+    @staticmethod
+    def _idempotency_key(key: str) -> str:
+        return f"ingestion:idempotency:{key}"
 
     @staticmethod
     def _key(job_id: str) -> str:
-        return f"ingestion:job:{job_id}"
\ No newline at end of file
+        return f"{_JOB_KEY_PREFIX}{job_id}"
+
+    @staticmethod
+    def _results_key(job_id: str) -> str:
+        return f"ingestion:job:{job_id}:child_results"
+
+    @staticmethod
+    def _channel(job_id: str) -> str:
+        return f"ingestion:job:{job_id}:events"
@@ -0,0 +1,220 @@
+"""Long-lived ingestion worker that keeps its resources warm between jobs.
+
+``process_ingestion_job`` runs each RQ job in a fresh event loop with a new
+``IngestionService``, and the default RQ worker forks a new process per job,
+so the tokenizer, Docling converters, and MongoDB/embedding clients are
+rebuilt every time. This worker keeps one event loop and one persistent
+``IngestionService`` for its lifetime and runs up to
+``ingestion_worker_concurrency`` jobs at once. The jobs share the storage
+adapter, but each buffers its chunk writes in its own write scope, so one
+job never flushes, reports, or releases the locks of another job's writes.
+
+It consumes the same RQ queue and registers itself as an RQ worker, so
+enqueueing and worker validation are unchanged. Job progress is tracked in
+the ``JobStore``; RQ's started/finished registries are not maintained.
+
+Usage:
+    uv run python -m mdrag.capabilities.ingestion.jobs.warm_worker [--queue default]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import signal
+import uuid
+from contextlib import suppress
+from typing import Any, Optional
+
+import redis
+from rq import Queue, Worker
+from rq.exceptions import DequeueTimeout
+from rq.job import Job
+from rq.job import JobStatus as RQJobStatus
+
+from mdrag.capabilities.ingestion.jobs.scheduler import INGESTION_JOB_HANDLER
+from mdrag.capabilities.ingestion.jobs.service import IngestionService
+from mdrag.capabilities.ingestion.jobs.store import JobStore
+from mdrag.config.settings import Settings, load_settings
+from mdrag.mdrag_logging.service_logging import get_logger, setup_logging
+
+logger = get_logger(__name__)
+
+# Seconds each blocking dequeue waits, bounding how long a stop request waits.
+DEQUEUE_TIMEOUT = 5
+# Seconds between RQ heartbeats, well within RQ's default worker TTL.
+HEARTBEAT_INTERVAL = 60
+
+_INGESTION_HANDLER = INGESTION_JOB_HANDLER
+
+
+class WarmIngestionWorker:
+    """Run queued ingestion jobs concurrently on one event loop."""
+
+    def __init__(
+        self,
+        settings: Settings,
+        *,
+        queue_name: str = "default",
+        concurrency: Optional[int] = None,
+        service: Optional[IngestionService] = None,
+        job_store: Optional[JobStore] = None,
+        connection: Optional[redis.Redis] = None,
+    ) -> None:
+        """Initialize the worker.
+
+        Args:
+            settings: Application settings.
+            queue_name: RQ queue to consume.
+            concurrency: Jobs run at once (default: ``ingestion_worker_concurrency``).
+            service: Persistent ingestion service override.
+            job_store: Job store override.
+            connection: Redis connection for RQ (not decoding responses).
+        """
+        self.settings = settings
+        self.concurrency = concurrency or settings.ingestion_worker_concurrency
+        self.connection = connection or redis.Redis.from_url(settings.redis_url)
+        self.queue = Queue(queue_name, connection=self.connection)
+        self.job_store = job_store or JobStore(settings.redis_url)
+        self.service = service or IngestionService(settings, persistent=True)
+        self._stopping = False
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def stop(self) -> None:
+        """Stop taking new jobs; running jobs are finished first."""
+        self._stopping = True
+
+    async def run(self) -> None:
+        """Consume the queue until ``stop`` is called."""
+        rq_worker = Worker(
+            [self.queue],
+            connection=self.connection,
+            name=f"warm-ingestion-{uuid.uuid4().hex[:8]}",
+        )
+        rq_worker.register_birth()
+        slots = asyncio.Semaphore(self.concurrency)
+        await self.service.workflow.initialize()
+        await logger.info(
+            "warm_worker_started",
+            action="warm_worker_started",
+            worker=rq_worker.name,
+            queue=self.queue.name,
+            concurrency=self.concurrency,
+        )
+        # Heartbeats run apart from the dequeue loop, which waits for a free
+        # slot while ``concurrency`` long jobs run.
+        heartbeat = asyncio.create_task(self._heartbeat(rq_worker))
+        try:
+            while not self._stopping:
+                await slots.acquire()
+                job = await asyncio.to_thread(self._dequeue)
+                if job is None:
+                    slots.release()
+                    continue
+                task = asyncio.create_task(self._run(job))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+                task.add_done_callback(lambda _: slots.release())
+        finally:
+            if self._tasks:
+                await asyncio.gather(*self._tasks, return_exceptions=True)
+            heartbeat.cancel()
+            with suppress(asyncio.CancelledError):
+                await heartbeat
+            await self.service.close()
+            await self.job_store.close()
+            rq_worker.register_death()
+            await logger.info(
+                "warm_worker_stopped",
+                action="warm_worker_stopped",
+                worker=rq_worker.name,
+            )
+
+    async def _heartbeat(self, rq_worker: Worker) -> None:
+        """Keep the RQ worker registration alive until cancelled."""
+        while True:
+            try:
+                await asyncio.to_thread(rq_worker.heartbeat)
+            except redis.RedisError as exc:
+                await logger.warning(
+                    "warm_worker_heartbeat_failed",
+                    action="warm_worker_heartbeat_failed",
+                    worker=rq_worker.name,
+                    error=str(exc),
+                )
+            await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+    def _dequeue(self) -> Optional[Job]:
+        try:
+            result = Queue.dequeue_any(
+                [self.queue],
+                timeout=DEQUEUE_TIMEOUT,
+                connection=self.connection,
+            )
+        except DequeueTimeout:
+            return None
+        return result[0] if result else None
+
+    async def _run(self, job: Job) -> None:
+        """Run one job, in the event loop if it is an ingestion job."""
+        job.set_status(RQJobStatus.STARTED)
+        try:
+            if job.func_name == _INGESTION_HANDLER:
+                job_id, payload = job.args
+                await self._run_ingestion(job_id, payload)
+            else:
+                await asyncio.to_thread(job.perform)
+        except Exception as exc:
+            job.set_status(RQJobStatus.FAILED)
+            await logger.error(
+                "warm_worker_job_failed",
+                action="warm_worker_job_failed",
+                rq_job_id=job.id,
+                func_name=job.func_name,
+                error=str(exc),
+                error_type=type(exc).__name__,
+            )
+            return
+        job.set_status(RQJobStatus.FINISHED)
+
+    async def _run_ingestion(self, job_id: str, payload: dict[str, Any]) -> None:
+        await logger.info(
+            "ingestion_worker_start",
+            action="ingestion_worker_start",
+            job_id=job_id,
+            source_type=payload.get("source_type"),
+        )
+        await self.service.run_job(job_id, payload, self.job_store)
+        await logger.info(
+            "ingestion_worker_complete",
+            action="ingestion_worker_complete",
+            job_id=job_id,
+        )
+
+
+async def main() -> None:
+    """Main entrypoint for the warm ingestion worker."""
+    parser = argparse.ArgumentParser(description="Run a warm async ingestion worker")
+    parser.add_argument("--queue", default="default", help="RQ queue to consume")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=None,
+        help="Jobs run at once (default: INGESTION_WORKER_CONCURRENCY)",
+    )
+    args = parser.parse_args()
+
+    await setup_logging()
+    worker = WarmIngestionWorker(
+        load_settings(),
+        queue_name=args.queue,
+        concurrency=args.concurrency,
+    )
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
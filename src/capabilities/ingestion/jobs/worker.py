@@ -27,8 +27,14 @@ def process_ingestion_job(job_id: str, payload: Dict[str, Any]) -> None:
     job_store = JobStore(settings.redis_url)
     service = IngestionService(settings)
 
+    async def run() -> None:
+        try:
+            await service.run_job(job_id, payload, job_store)
+        finally:
+            await job_store.close()
+
     try:
-        asyncio.run(service.run_job(job_id, payload, job_store))
+        asyncio.run(run())
         log_async(
             logger,
             "info",
@@ -0,0 +1,108 @@
+"""Distributed per-document write locks.
+
+Two jobs ingesting the same source (a retried request, a reading saved twice)
+resolve to the same ``document_uid`` and would both replace its document and
+chunks. Storage takes a Redis lock per ``document_uid`` around those writes so
+concurrent writers on any worker are serialized. Locks expire after
+``timeout`` seconds, so a crashed worker cannot block a document forever;
+holders that keep a lock longer extend it before it expires.
+"""
+
+from __future__ import annotations
+
+from typing import Optional
+
+import redis.asyncio as redis
+from redis.asyncio.lock import Lock
+from redis.exceptions import LockError, RedisError
+
+from mdrag.capabilities.ingestion.exceptions import IngestionError
+from mdrag.mdrag_logging.service_logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class DocumentLocks:
+    """Acquire and release Redis locks keyed by ``document_uid``."""
+
+    def __init__(
+        self,
+        redis_url: str,
+        *,
+        timeout: float = 300.0,
+        blocking_timeout: float = 600.0,
+        client: Optional[redis.Redis] = None,
+    ) -> None:
+        """Initialize the lock manager.
+
+        Args:
+            redis_url: Redis connection URL.
+            timeout: Seconds a held lock lives before it expires.
+            blocking_timeout: Seconds to wait for a lock held elsewhere.
+            client: Redis client override.
+        """
+        self.redis = client or redis.Redis.from_url(redis_url)
+        self.timeout = timeout
+        self.blocking_timeout = blocking_timeout
+
+    async def acquire(self, document_uid: str, *, blocking: bool = True) -> Optional[Lock]:
+        """Acquire the lock for a document.
+
+        Returns:
+            The held lock, or None if ``blocking`` is False and another writer
+            holds it.
+
+        Raises:
+            IngestionError: If the lock is not acquired within ``blocking_timeout``.
+        """
+        lock = self.redis.lock(
+            f"ingestion:lock:document:{document_uid}",
+            timeout=self.timeout,
+            blocking_timeout=self.blocking_timeout,
+        )
+        if await lock.acquire(blocking=blocking):
+            return lock
+        if not blocking:
+            return None
+        raise IngestionError(
+            f"Timed out after {self.blocking_timeout}s waiting for document lock "
+            f"{document_uid}"
+        )
+
+    async def extend(self, document_uid: str, lock: Lock) -> bool:
+        """Reset a held lock's expiry to ``timeout`` seconds from now.
+
+        Returns:
+            False if the lock already expired, was taken over, or Redis could
+            not be reached; this is logged, not raised.
+        """
+        try:
+            await lock.reacquire()
+        except RedisError as exc:
+            await logger.warning(
+                "document_lock_extend_failed",
+                action="document_lock_extend_failed",
+                document_uid=document_uid,
+                error=str(exc),
+            )
+            return False
+        return True
+
+    async def release(self, document_uid: str, lock: Lock) -> None:
+        """Release a held lock; an expired lock is logged, not raised."""
+        try:
+            await lock.release()
+        except LockError as exc:
+            await logger.warning(
+                "document_lock_release_failed",
+                action="document_lock_release_failed",
+                document_uid=document_uid,
+                error=str(exc),
+            )
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self.redis.aclose()
+
+
+__all__ = ["DocumentLocks"]
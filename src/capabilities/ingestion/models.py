@@ -98,6 +98,8 @@ class SourceContent(BaseModel):
     data: str | bytes
     filename: Optional[str] = None
     mime_type: Optional[str] = None
+    # SHA-256 of the raw payload when already known, so it is not recomputed.
+    content_hash: Optional[str] = None
 
 
 class CollectedSource(BaseModel):
@@ -121,17 +123,39 @@ class IngestionMetadata(BaseModel):
     source_metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
+class PageWindow(BaseModel):
+    """Page range covered by a windowed slice of a large document."""
+
+    index: int
+    start_page: int
+    end_page: int
+    total_pages: int
+    total_windows: int
+
+    @property
+    def is_first(self) -> bool:
+        return self.index == 0
+
+    @property
+    def is_last(self) -> bool:
+        return self.index == self.total_windows - 1
+
+
 class IngestionDocument(BaseModel):
-    """Docling-processed document ready for chunking."""
+    """Processed document ready for chunking.
+
+    Text-native sources skip Docling conversion and carry no Docling document.
+    """
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
     content: str
-    docling_document: DoclingDocument
-    docling_json: Dict[str, Any]
+    docling_document: Optional[DoclingDocument] = None
+    docling_json: Optional[Dict[str, Any]] = None
     page_texts: Dict[str, str]
     title: str
     metadata: IngestionMetadata
+    page_window: Optional[PageWindow] = None
 
 
 class GraphTriple(BaseModel):
@@ -147,7 +171,7 @@ class StorageRepresentations(BaseModel):
     """Canonical representations for storage adapters."""
 
     markdown: str
-    docling_json: Dict[str, Any]
+    docling_json: Optional[Dict[str, Any]] = None
     graph_triples: List[GraphTriple] = Field(default_factory=list)
     cypher_statements: List[str] = Field(default_factory=list)
 
@@ -172,6 +196,13 @@ class IngestionConfig(BaseModel):
     enable_darwinxml: bool = False
     darwinxml_validate: bool = True
     darwinxml_strict: bool = False
+    diff_chunk_writes: bool = True
+    write_batch_size: int = Field(default=0, ge=0)
+    transactional_writes: bool = False
+    page_window_size: Optional[int] = None
+    dedup_documents: bool = True
+    dedup_chunks: bool = True
+    near_duplicate_distance: int = Field(default=3, ge=0, le=3)
 
 
 class IngestionResult(BaseModel):
@@ -181,6 +212,8 @@ class IngestionResult(BaseModel):
     title: str
     chunks_created: int
     processing_time_ms: float
+    duplicate_chunks_skipped: int = 0
+    near_duplicate_chunks_skipped: int = 0
     storage_results: List[StorageResult] = Field(default_factory=list)
     errors: List[str] = Field(default_factory=list)
 
@@ -214,6 +247,7 @@ class UploadCollectionRequest(CollectionRequest):
     content: Optional[str | bytes] = None
     file_path: Optional[str] = None
     mime_type: Optional[str] = None
+    content_hash: Optional[str] = None
 
 
 def ingestion_timestamp() -> str:
@@ -233,6 +267,7 @@ __all__ = [
     "IngestionResult",
     "MetadataPassport",
     "Namespace",
+    "PageWindow",
     "SourceContent",
     "SourceContentKind",
     "StorageRepresentations",
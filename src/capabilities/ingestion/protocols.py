@@ -2,15 +2,17 @@
 
 from __future__ import annotations
 
-from typing import Generic, Protocol, TypeVar, runtime_checkable
+from typing import AsyncContextManager, Generic, Optional, Protocol, TypeVar, runtime_checkable
 
 from pydantic import BaseModel
 
 from mdrag.capabilities.ingestion.docling.chunker import DoclingChunks
 from mdrag.capabilities.ingestion.docling.darwinxml_models import DarwinXMLDocument
+from mdrag.capabilities.ingestion.dedup import ChunkDuplicate, ChunkFingerprint
 from mdrag.capabilities.ingestion.models import (
     CollectedSource,
     IngestionDocument,
+    Namespace,
     StorageRepresentations,
     StorageResult,
 )
@@ -59,4 +61,96 @@ class StorageAdapter(Protocol):
         ...
 
 
-__all__ = ["IngestionProcessor", "SourceCollector", "StorageAdapter"]
+@runtime_checkable
+class IncrementalStorageAdapter(StorageAdapter, Protocol):
+    """Storage adapter that can reuse chunks from a previous document version."""
+
+    async def load_chunk_embeddings(
+        self,
+        document: IngestionDocument,
+        embedding_model: str,
+    ) -> dict[str, list[float]]:
+        """Return stored embeddings keyed by chunk hash for the prior version."""
+        ...
+
+    async def delete_source(
+        self,
+        source_url: str,
+        namespace: Optional[Namespace] = None,
+    ) -> dict[str, int]:
+        """Delete everything stored for a source that no longer exists."""
+        ...
+
+
+@runtime_checkable
+class BufferedStorageAdapter(StorageAdapter, Protocol):
+    """Storage adapter that may buffer writes across documents."""
+
+    def write_scope(self) -> AsyncContextManager[None]:
+        """Keep writes made inside the scope in their own buffer."""
+        ...
+
+    async def flush(self) -> None:
+        """Send buffered writes."""
+        ...
+
+    def buffered_documents(self) -> set[str]:
+        """document_uids with writes still waiting for a flush."""
+        ...
+
+    def pop_write_errors(self) -> dict[str, list[str]]:
+        """Return and clear errors of flushed writes, keyed by document_uid."""
+        ...
+
+
+@runtime_checkable
+class ChunkFingerprintIndex(Protocol):
+    """Per-namespace index of chunk fingerprints for duplicate suppression."""
+
+    async def find_duplicate_chunks(
+        self,
+        document: IngestionDocument,
+        fingerprints: list[ChunkFingerprint],
+        max_distance: int,
+    ) -> dict[int, ChunkDuplicate]:
+        """Return chunks already stored for other sources in the namespace."""
+        ...
+
+    async def record_chunk_fingerprints(
+        self,
+        document: IngestionDocument,
+        fingerprints: list[ChunkFingerprint],
+        duplicates: Optional[dict[int, ChunkDuplicate]] = None,
+    ) -> None:
+        """Record fingerprints of the chunks stored for a document.
+
+        ``duplicates`` are the document's suppressed chunks; the storage links
+        the document's source to the chunks they duplicate.
+        """
+        ...
+
+
+@runtime_checkable
+class ContentAliasIndex(Protocol):
+    """Storage that shares one chunk set between sources with identical content."""
+
+    async def store_content_alias(
+        self,
+        document: IngestionDocument,
+    ) -> Optional[StorageResult]:
+        """Store a document as an alias of a stored copy with the same content.
+
+        Returns None when no such copy exists in the document's namespace.
+        """
+        ...
+
+
+__all__ = [
+    "BufferedStorageAdapter",
+    "ChunkFingerprintIndex",
+    "ContentAliasIndex",
+    "IncrementalStorageAdapter",
+    "IngestionProcessor",
+    "SourceCollector",
+    "StorageAdapter",
+]
@@ -0,0 +1,205 @@
+"""Folder scanning and manifest-based change detection for local ingestion."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+SUPPORTED_SUFFIXES = frozenset(
+    {
+        ".md",
+        ".markdown",
+        ".txt",
+        ".pdf",
+        ".docx",
+        ".doc",
+        ".pptx",
+        ".ppt",
+        ".xlsx",
+        ".xls",
+        ".html",
+        ".htm",
+        ".mp3",
+        ".wav",
+        ".m4a",
+        ".flac",
+    }
+)
+
+MANIFEST_FILENAME = ".mdrag_manifest.json"
+
+
+def scan_document_files(root: str) -> List[str]:
+    """Walk ``root`` once and return supported files, sorted.
+
+    Uses ``os.scandir`` so file type and name checks come from the directory
+    entry without extra ``stat`` calls. Hidden directories are skipped.
+    """
+    files: List[str] = []
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if not entry.name.startswith("."):
+                            stack.append(entry.path)
+                    elif entry.is_file() and (
+                        os.path.splitext(entry.name)[1].lower() in SUPPORTED_SUFFIXES
+                    ):
+                        files.append(entry.path)
+        except (PermissionError, FileNotFoundError):
+            continue
+    return sorted(files)
+
+
+@dataclass
+class ManifestEntry:
+    """Recorded state of a file at its last successful ingestion."""
+
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+@dataclass
+class ManifestDiff:
+    """Files grouped by change since the last recorded manifest."""
+
+    new: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    deleted: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+
+    @property
+    def changed(self) -> List[str]:
+        return self.new + self.modified
+
+
+class FolderManifest:
+    """Persisted ``(path, size, mtime, hash)`` records for a documents folder.
+
+    Paths are stored relative to the folder root so the manifest survives the
+    folder being mounted at a different location.
+    """
+
+    def __init__(self, root: str, path: Optional[str] = None) -> None:
+        """Initialize the manifest.
+
+        Args:
+            root: Documents folder the manifest describes.
+            path: Manifest file path. Defaults to a hidden file in ``root``.
+        """
+        self.root = root
+        self.path = path or os.path.join(root, MANIFEST_FILENAME)
+        self.entries: Dict[str, ManifestEntry] = {}
+        self._pending: Dict[str, ManifestEntry] = {}
+
+    def load(self) -> "FolderManifest":
+        """Load entries from disk; a missing or unreadable file means empty."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as handle:
+                raw = json.load(handle)
+        except (FileNotFoundError, json.JSONDecodeError):
+            raw = {}
+        self.entries = {
+            rel_path: ManifestEntry(**entry)
+            for rel_path, entry in (raw.get("files") or {}).items()
+        }
+        return self
+
+    def save(self) -> None:
+        """Atomically write entries to disk."""
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as handle:
+            json.dump(
+                {
+                    "version": 1,
+                    "files": {
+                        rel_path: asdict(entry)
+                        for rel_path, entry in sorted(self.entries.items())
+                    },
+                },
+                handle,
+            )
+        os.replace(temp_path, self.path)
+
+    def diff(self, files: List[str]) -> ManifestDiff:
+        """Compare scanned files with recorded entries.
+
+        Files whose size and mtime match are unchanged without being read.
+        Otherwise the file is hashed; a matching hash (e.g. a touched file)
+        is treated as unchanged and its entry refreshed.
+        """
+        result = ManifestDiff()
+        seen = set()
+        for file_path in files:
+            rel_path = self._relative(file_path)
+            seen.add(rel_path)
+            stat = os.stat(file_path)
+            recorded = self.entries.get(rel_path)
+            if recorded and recorded.size == stat.st_size and recorded.mtime_ns == stat.st_mtime_ns:
+                result.unchanged.append(file_path)
+                continue
+            entry = ManifestEntry(
+                size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                sha256=hash_file(file_path),
+            )
+            if recorded and recorded.sha256 == entry.sha256:
+                self.entries[rel_path] = entry
+                result.unchanged.append(file_path)
+                continue
+            self._pending[rel_path] = entry
+            if recorded:
+                result.modified.append(file_path)
+            else:
+                result.new.append(file_path)
+
+        for rel_path in self.entries:
+            if rel_path not in seen:
+                result.deleted.append(os.path.join(self.root, rel_path))
+        return result
+
+    def content_hash(self, file_path: str) -> Optional[str]:
+        """Return the hash computed during ``diff`` for a changed file."""
+        entry = self._pending.get(self._relative(file_path))
+        return entry.sha256 if entry else None
+
+    def mark_ingested(self, file_path: str) -> None:
+        """Record a changed file as successfully ingested."""
+        rel_path = self._relative(file_path)
+        entry = self._pending.pop(rel_path, None)
+        if entry:
+            self.entries[rel_path] = entry
+
+    def mark_deleted(self, file_path: str) -> None:
+        """Forget a file that has been purged."""
+        self.entries.pop(self._relative(file_path), None)
+
+    def _relative(self, file_path: str) -> str:
+        return os.path.relpath(file_path, self.root)
+
+
+def hash_file(file_path: str) -> str:
+    """Compute the SHA-256 of a file."""
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+__all__ = [
+    "FolderManifest",
+    "MANIFEST_FILENAME",
+    "ManifestDiff",
+    "ManifestEntry",
+    "SUPPORTED_SUFFIXES",
+    "hash_file",
+    "scan_document_files",
+]
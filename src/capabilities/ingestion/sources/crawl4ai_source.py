@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import AsyncIterator, List
 
 from mdrag.capabilities.ingestion.models import (
     CollectedSource,
@@ -11,7 +11,8 @@ from mdrag.capabilities.ingestion.models import (
     WebCollectionRequest,
 )
 from mdrag.capabilities.ingestion.protocols import SourceCollector
-from mdrag.integrations.crawl4ai import Crawl4AIClient
+from mdrag.integrations.crawl4ai import Crawl4AIClient, CrawlCache
+from mdrag.integrations.models import Source
 from mdrag.mdrag_logging.service_logging import get_logger
 from mdrag.config.settings import Settings, load_settings
 
@@ -27,12 +28,29 @@ class Crawl4AICollector(SourceCollector[WebCollectionRequest]):
         self,
         client: Crawl4AIClient | None = None,
         settings: Settings | None = None,
+        cache: CrawlCache | None = None,
     ) -> None:
+        """Initialize the collector.
+
+        Args:
+            client: Crawl4AI client override.
+            settings: Application settings.
+            cache: Crawl cache; pages it shows are unchanged are skipped.
+        """
         self.settings = settings or load_settings()
         self.client = client or Crawl4AIClient()
+        self.cache = cache
 
     async def collect(self, request: WebCollectionRequest) -> List[CollectedSource]:
         """Collect web sources and normalize for ingestion."""
+        return [source async for source in self.collect_stream(request)]
+
+    async def collect_stream(self, request: WebCollectionRequest) -> AsyncIterator[CollectedSource]:
+        """Yield web sources as they are crawled, normalized for ingestion.
+
+        Deep crawls stream each page as soon as it is fetched, so callers can
+        ingest early pages while the crawl is still running.
+        """
         await logger.info(
             "collector_crawl4ai_start",
             action="collector_crawl4ai_start",
@@ -41,10 +59,16 @@ class Crawl4AICollector(SourceCollector[WebCollectionRequest]):
             max_depth=request.max_depth,
         )
 
+        cache = self.cache.scoped(request.namespace) if self.cache is not None else None
         if request.deep:
-            sources = await self.client.crawl_deep(
+            sources = self.client.crawl_deep_stream(
                 start_url=request.url,
                 max_depth=request.max_depth or self.settings.crawl4ai_max_depth,
+                max_concurrent=self.settings.crawl4ai_max_concurrent,
+                max_per_host=self.settings.crawl4ai_max_per_host,
+                host_delay=self.settings.crawl4ai_host_delay,
+                max_pages=self.settings.crawl4ai_max_pages,
+                max_bytes=self.settings.crawl4ai_max_bytes,
                 word_count_threshold=self.settings.crawl4ai_word_count_threshold,
                 remove_overlay_elements=self.settings.crawl4ai_remove_overlay_elements,
                 remove_base64_images=self.settings.crawl4ai_remove_base64_images,
@@ -53,6 +77,9 @@ class Crawl4AICollector(SourceCollector[WebCollectionRequest]):
                 timeout=self.settings.crawl4ai_timeout,
                 cookies=self.settings.crawl4ai_cookies,
                 user_agent=self.settings.crawl4ai_user_agent,
+                cache=cache,
+                fetch_mode=self.settings.crawl4ai_fetch_mode,
+                min_text_chars=self.settings.crawl4ai_static_min_text_chars,
             )
         else:
             source = await self.client.crawl_single_page(
@@ -65,12 +92,20 @@ class Crawl4AICollector(SourceCollector[WebCollectionRequest]):
                 timeout=self.settings.crawl4ai_timeout,
                 cookies=self.settings.crawl4ai_cookies,
                 user_agent=self.settings.crawl4ai_user_agent,
+                cache=cache,
+                fetch_mode=self.settings.crawl4ai_fetch_mode,
+                min_text_chars=self.settings.crawl4ai_static_min_text_chars,
             )
-            sources = [source] if source else []
+            sources = _single(source)
 
-        collected: List[CollectedSource] = []
-        for source in sources:
-            if not source:
+        collected_count = 0
+        async for source in sources:
+            if source.metadata.get("crawl_unchanged"):
+                await logger.info(
+                    "collector_crawl4ai_unchanged",
+                    action="collector_crawl4ai_unchanged",
+                    url=source.frontmatter.source_url or request.url,
+                )
                 continue
             payload = source.html or source.content or ""
             if not payload.strip():
@@ -85,23 +120,27 @@ class Crawl4AICollector(SourceCollector[WebCollectionRequest]):
                 if source.html and source.html.strip()
                 else SourceContentKind.MARKDOWN
             )
-            collected.append(
-                CollectedSource(
-                    frontmatter=source.frontmatter,
-                    content=SourceContent(kind=kind, data=payload),
-                    metadata=source.metadata,
-                    links=source.links,
-                    namespace=request.namespace,
-                )
+            collected_count += 1
+            yield CollectedSource(
+                frontmatter=source.frontmatter,
+                content=SourceContent(kind=kind, data=payload),
+                metadata=source.metadata,
+                links=source.links,
+                namespace=request.namespace,
             )
 
         await logger.info(
             "collector_crawl4ai_complete",
             action="collector_crawl4ai_complete",
             url=request.url,
-            collected_count=len(collected),
+            collected_count=collected_count,
         )
-        return collected
+
+
+async def _single(source: Source | None) -> AsyncIterator[Source]:
+    """Adapt a single-page crawl result to the streaming interface."""
+    if source:
+        yield source
 
 
 __all__ = ["Crawl4AICollector"]
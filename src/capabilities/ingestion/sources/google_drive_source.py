@@ -58,27 +58,10 @@ class GoogleDriveCollector(SourceCollector[GoogleDriveCollectionRequest]):
         )
 
         client = self._get_drive_client()
-        file_ids = list(request.file_ids) + list(request.doc_ids)
-
-        for folder_id in request.folder_ids:
-            try:
-                files = await client.list_files_in_folder(folder_id)
-                file_ids.extend([file.get("id") for file in files if file.get("id")])
-            except Exception as exc:
-                await logger.error(
-                    "collector_gdrive_folder_failed",
-                    action="collector_gdrive_folder_failed",
-                    folder_id=folder_id,
-                    error=str(exc),
-                    error_type=type(exc).__name__,
-                )
+        file_ids = await self.resolve_file_ids(request)
 
         collected: List[CollectedSource] = []
-        seen: set[str] = set()
         for file_id in file_ids:
-            if not file_id or file_id in seen:
-                continue
-            seen.add(file_id)
             try:
                 metadata = await client.get_file(file_id)
                 name = metadata.get("name", file_id)
@@ -145,6 +128,30 @@ class GoogleDriveCollector(SourceCollector[GoogleDriveCollectionRequest]):
         )
         return collected
 
+    async def resolve_file_ids(self, request: GoogleDriveCollectionRequest) -> List[str]:
+        """Expand folders into file IDs without downloading anything.
+
+        Returns:
+            Unique file IDs in request order (files, docs, then folder contents).
+        """
+        client = self._get_drive_client()
+        file_ids = list(request.file_ids) + list(request.doc_ids)
+
+        for folder_id in request.folder_ids:
+            try:
+                files = await client.list_files_in_folder(folder_id)
+                file_ids.extend([file.get("id") for file in files if file.get("id")])
+            except Exception as exc:
+                await logger.error(
+                    "collector_gdrive_folder_failed",
+                    action="collector_gdrive_folder_failed",
+                    folder_id=folder_id,
+                    error=str(exc),
+                    error_type=type(exc).__name__,
+                )
+
+        return list(dict.fromkeys(file_id for file_id in file_ids if file_id))
+
     def _get_drive_client(self) -> AsyncGoogleDriveClient:
         if not self.drive_client:
             self.drive_client = AsyncGoogleDriveClient(
@@ -63,6 +63,7 @@ class UploadCollector(SourceCollector[UploadCollectionRequest]):
                     data=file_path,
                     filename=request.filename,
                     mime_type=request.mime_type,
+                    content_hash=request.content_hash,
                 ),
                 metadata={"file_path": file_path},
                 namespace=_to_namespace(request.namespace),
@@ -95,6 +96,7 @@ class UploadCollector(SourceCollector[UploadCollectionRequest]):
                 data=content,
                 filename=request.filename,
                 mime_type=request.mime_type,
+                content_hash=request.content_hash,
             ),
             metadata={},
             namespace=_to_namespace(request.namespace),
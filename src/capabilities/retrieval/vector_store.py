@@ -3,10 +3,19 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
 
 from bson import ObjectId
+from mdrag.capabilities.ingestion.models import Namespace
 from mdrag.config.settings import Settings
+from mdrag.integrations.crawl4ai.cache import CrawlCache
+from mdrag.integrations.mongodb.adapters.aliases import DocumentAliasStore
+from mdrag.integrations.mongodb.adapters.chunk_schema import (
+    PURGE_CHUNK_FIELDS,
+    PURGE_DOCUMENT_FIELDS,
+)
+from mdrag.integrations.mongodb.adapters.fingerprints import ChunkFingerprintStore, record_scope
+from mdrag.integrations.mongodb.adapters.representations import RepresentationStore
 from pymongo import AsyncMongoClient
 
 
@@ -16,6 +25,7 @@ class VectorStore:
 
     settings: Settings
     mongo_client: Optional[AsyncMongoClient] = None
+    crawl_cache: Optional[CrawlCache] = None
 
     async def initialize(self) -> None:
         if not self.mongo_client:
@@ -23,43 +33,88 @@ class VectorStore:
                 self.settings.mongodb_connection_string,
                 serverSelectionTimeoutMS=5000,
             )
+        if self.crawl_cache is None and self.settings.crawl4ai_conditional_requests:
+            self.crawl_cache = CrawlCache(
+                self.settings.redis_url, ttl=self.settings.crawl4ai_cache_ttl
+            )
 
     async def close(self) -> None:
         if self.mongo_client:
             await self.mongo_client.close()
             self.mongo_client = None
+        if self.crawl_cache is not None:
+            await self.crawl_cache.close()
+            self.crawl_cache = None
 
     async def purge_source(self, source_id: str) -> Dict[str, int]:
-        """Delete all vectors/documents for a source ID or URL."""
+        """Delete all vectors/documents for a source ID or URL.
+
+        Chunk sets shared with other sources through content aliases are
+        handed to a remaining alias instead of being deleted, and chunks
+        that other sources' suppressed duplicates link to are handed to the
+        first linked source. Crawl cache
+        entries of the purged pages are dropped, so recrawling them ingests
+        them again instead of skipping them as unchanged.
+        """
         await self.initialize()
         db = self.mongo_client[self.settings.mongodb_database]
         documents = db[self.settings.mongodb_collection_documents]
         chunks = db[self.settings.mongodb_collection_chunks]
 
-        doc_filter = {
-            "$or": [
-                {"source_url": source_id},
-                {"metadata.source_url": source_id},
-                {"metadata.gdrive_file_id": source_id},
-                {"metadata.crawl_url": source_id},
-                {"metadata.source_group": source_id},
-            ]
-        }
-
-        doc_ids = [doc["_id"] async for doc in documents.find(doc_filter, {"_id": 1})]
-        chunk_filter = {
+        doc_filter = {"$or": [{field: source_id} for field in PURGE_DOCUMENT_FIELDS]}
+
+        matched = [
+            doc
+            async for doc in documents.find(
+                doc_filter,
+                {
+                    "_id": 1,
+                    "source_url": 1,
+                    "namespace": 1,
+                    "canonical_document_id": 1,
+                    "aliases": 1,
+                    "representations": 1,
+                },
+            )
+        ]
+        fingerprints = ChunkFingerprintStore(
+            db[self.settings.mongodb_collection_chunk_fingerprints]
+        )
+        aliases = DocumentAliasStore(
+            documents,
+            chunks,
+            fingerprints,
+            self._representations(db),
+        )
+        for doc in matched:
+            await aliases.release(doc)
+            await aliases.unlink_document(doc["_id"])
+        doc_ids = [doc["_id"] for doc in matched]
+        chunk_filter: dict[str, Any] = {
             "$or": [
                 {"document_id": {"$in": doc_ids}} if doc_ids else {"_id": None},
-                {"source_url": source_id},
-                {"metadata.source_url": source_id},
-                {"metadata.gdrive_file_id": source_id},
-                {"metadata.crawl_url": source_id},
-                {"metadata.source_group": source_id},
+                *({field: source_id} for field in PURGE_CHUNK_FIELDS),
             ]
         }
+        handed_off = await aliases.hand_off_chunks(chunk_filter)
+        if handed_off:
+            chunk_filter = {"$and": [chunk_filter, {"_id": {"$nin": handed_off}}]}
 
         chunk_result = await chunks.delete_many(chunk_filter)
         doc_result = await documents.delete_many(doc_filter)
+        await self._representations(db).delete(doc_ids)
+        source_urls: dict[str, set[str]] = {}
+        for doc in matched:
+            urls = source_urls.setdefault(record_scope(doc), {source_id})
+            if doc.get("source_url"):
+                urls.add(doc["source_url"])
+        for scope, urls in source_urls.items():
+            await fingerprints.delete_sources(scope, urls)
+        if self.crawl_cache is not None:
+            for doc in matched:
+                if doc.get("source_url"):
+                    namespace = Namespace(**(doc.get("namespace") or {}))
+                    await self.crawl_cache.scoped(namespace).forget(doc["source_url"])
 
         return {
             "documents_deleted": doc_result.deleted_count,
@@ -67,25 +122,48 @@ class VectorStore:
         }
 
     async def get_parent_page_text(self, chunk_id: str) -> Optional[str]:
-        """Return page text for a chunk ID using stored page_texts."""
+        """Return page text for a chunk ID.
+
+        Reads a single compressed page record from the representation store,
+        falling back to inline ``page_texts``/``content`` on documents written
+        before representations were offloaded.
+        """
         await self.initialize()
         db = self.mongo_client[self.settings.mongodb_database]
         documents = db[self.settings.mongodb_collection_documents]
         chunks = db[self.settings.mongodb_collection_chunks]
 
-        chunk = await chunks.find_one({"_id": ObjectId(chunk_id)})
+        chunk = await chunks.find_one(
+            {"_id": ObjectId(chunk_id)},
+            {"document_id": 1, "page_number": 1, "metadata.page_number": 1},
+        )
         if not chunk:
             return None
 
         page_number = chunk.get("page_number") or (chunk.get("metadata") or {}).get(
             "page_number"
         )
-        document = await documents.find_one({"_id": chunk.get("document_id")})
+        document_id = chunk.get("document_id")
+        representations = self._representations(db)
+        if page_number is not None:
+            page_text = await representations.get_page_text(document_id, int(page_number))
+            if page_text is not None:
+                return page_text
+            document = await documents.find_one(
+                {"_id": document_id},
+                {f"page_texts.{page_number}": 1},
+            )
+            if not document:
+                return None
+            return (document.get("page_texts") or {}).get(str(page_number))
+
+        markdown = await representations.get_markdown(document_id)
+        if markdown is not None:
+            return markdown
+        document = await documents.find_one({"_id": document_id}, {"content": 1})
         if not document:
             return None
-
-        page_texts = document.get("page_texts", {})
-        if page_number is not None:
-            return page_texts.get(str(page_number))
-
         return document.get("content")
+
+    def _representations(self, db: Any) -> RepresentationStore:
+        return RepresentationStore(db[self.settings.mongodb_collection_representations])
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import functools
-from typing import Optional
+from typing import Dict, Optional
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -66,12 +66,28 @@ class Settings(BaseSettings):
     mongodb_collection_chunks: str = Field(
         default="chunks", description="MongoDB collection for chunks"
     )
+    mongodb_collection_representations: str = Field(
+        default="document_representations",
+        description="MongoDB collection for compressed markdown, Docling JSON, and page texts",
+    )
+    mongodb_collection_chunk_fingerprints: str = Field(
+        default="chunk_fingerprints",
+        description="MongoDB collection for per-namespace chunk duplicate fingerprints",
+    )
     mongodb_vector_index: str = Field(
         default="vector_index", description="MongoDB vector search index name"
     )
     mongodb_text_index: str = Field(
         default="text_index", description="MongoDB text search index name"
     )
+    mongodb_vector_similarity: str = Field(
+        default="cosine",
+        description="Vector search similarity function (cosine, euclidean, dotProduct)",
+    )
+    mongodb_index_ready_timeout: float = Field(
+        default=300.0,
+        description="Seconds init_indexes waits for search indexes to become queryable",
+    )
     mongodb_collection_traces: str = Field(
         default="traces", description="MongoDB collection for query traces"
     )
@@ -104,6 +120,85 @@ class Settings(BaseSettings):
     )
     embedding_dimension: int = Field(default=1536, description="Embedding dimension")
 
+    # Ingestion
+    ingestion_page_window_size: Optional[int] = Field(
+        default=None,
+        description="Convert PDFs with more pages than this in page windows of this size",
+    )
+    ingestion_write_batch_size: int = Field(
+        default=500,
+        ge=0,
+        description="Chunk writes buffered across documents per bulk write (0 = per document)",
+    )
+    ingestion_transactional_writes: bool = Field(
+        default=False,
+        description="Replace each document and its chunks in a transaction (requires a replica set)",
+    )
+    ingestion_dedup_chunks: bool = Field(
+        default=True,
+        description="Skip chunks that duplicate chunks already stored in the namespace",
+    )
+    ingestion_markdown_fast_path: bool = Field(
+        default=True,
+        description="Parse markdown/plain-text sources directly instead of through Docling",
+    )
+    ingestion_pdf_pipeline_selection: bool = Field(
+        default=True,
+        description="Probe PDFs and enable OCR/table models only when a document needs them",
+    )
+    ingestion_worker_concurrency: int = Field(
+        default=4,
+        ge=1,
+        description="Jobs a warm ingestion worker runs concurrently",
+    )
+    ingestion_fanout_batch_size: int = Field(
+        default=10,
+        ge=0,
+        description=(
+            "Sources per child job when a web or Drive job fans out; jobs with more "
+            "sources than this are split across workers (0 disables fan-out)"
+        ),
+    )
+    ingestion_idempotency_ttl: int = Field(
+        default=3600,
+        ge=1,
+        description=(
+            "Seconds a repeated ingest request may be answered with the identical "
+            "in-flight job (backstop for jobs that never finish)"
+        ),
+    )
+    ingestion_document_lock_timeout: float = Field(
+        default=600.0,
+        gt=0,
+        description="Seconds a per-document write lock lives before it expires",
+    )
+    ingestion_scheduler_enabled: bool = Field(
+        default=True,
+        description=(
+            "Route ingest jobs through the fair-share scheduler instead of enqueueing "
+            "them on RQ directly"
+        ),
+    )
+    ingestion_scheduler_window: int = Field(
+        default=4,
+        ge=1,
+        description="Jobs the scheduler keeps queued in RQ ahead of the workers",
+    )
+    ingestion_tenant_max_running: int = Field(
+        default=2,
+        ge=1,
+        description="Jobs one tenant (org, else user) may have dispatched at once",
+    )
+    ingestion_tenant_weights: Dict[str, float] = Field(
+        default_factory=dict,
+        description="Fair-share weight per tenant (default 1.0), as a JSON object",
+    )
+    ingestion_scheduler_lease_seconds: float = Field(
+        default=3600.0,
+        gt=0,
+        description="Seconds a dispatched job counts against its tenant if never released",
+    )
+
     # Redis
     redis_url: str = Field(
         default="redis://localhost:6379", description="Redis connection URL"
@@ -137,6 +232,74 @@ class Settings(BaseSettings):
     crawl4ai_remove_base64_images: bool = Field(
         default=True, description="Crawl4AI remove base64 images"
     )
+    crawl4ai_cache_mode: str = Field(
+        default="BYPASS", description="Crawl4AI cache mode (BYPASS, CACHED, or WRITE)"
+    )
+    crawl4ai_browser_type: str = Field(
+        default="chromium", description="Crawl4AI browser type"
+    )
+    crawl4ai_timeout: int = Field(
+        default=30, description="Crawl4AI request timeout in seconds"
+    )
+    crawl4ai_user_agent: Optional[str] = Field(
+        default=None, description="Crawl4AI custom user agent"
+    )
+    crawl4ai_cookies: Optional[str] = Field(
+        default=None, description="Crawl4AI cookies sent with every request"
+    )
+    crawl4ai_max_concurrent: int = Field(
+        default=10, ge=1, description="Deep crawl pages in flight across all hosts"
+    )
+    crawl4ai_max_per_host: int = Field(
+        default=2, ge=1, description="Deep crawl pages in flight per host"
+    )
+    crawl4ai_host_delay: float = Field(
+        default=0.25,
+        ge=0.0,
+        description="Minimum seconds between deep crawl requests to one host",
+    )
+    crawl4ai_max_pages: int = Field(
+        default=1000, ge=0, description="Deep crawl page budget (0 = unlimited)"
+    )
+    crawl4ai_max_bytes: int = Field(
+        default=256 * 1024 * 1024,
+        ge=0,
+        description="Deep crawl content byte budget (0 = unlimited)",
+    )
+    crawl4ai_conditional_requests: bool = Field(
+        default=True,
+        description="Revalidate recrawled pages with ETag/Last-Modified and skip unchanged ones",
+    )
+    crawl4ai_cache_ttl: int = Field(
+        default=30 * 24 * 3600,
+        ge=1,
+        description="Seconds a crawl cache entry lives after its last fetch",
+    )
+    crawl4ai_browser_pool_size: int = Field(
+        default=2,
+        ge=0,
+        description="Warm Crawl4AI browsers kept per process (0 = launch one per crawl)",
+    )
+    crawl4ai_browser_contexts: int = Field(
+        default=4, ge=1, description="Concurrent isolated browser contexts per pooled browser"
+    )
+    crawl4ai_browser_recycle_pages: int = Field(
+        default=200,
+        ge=0,
+        description="Pages a pooled browser renders before it is replaced (0 = never)",
+    )
+    crawl4ai_block_resources: bool = Field(
+        default=True, description="Skip image, font, and media requests in pooled browsers"
+    )
+    crawl4ai_fetch_mode: str = Field(
+        default="static_first",
+        description="browser renders every page; static_first renders only pages needing JS",
+    )
+    crawl4ai_static_min_text_chars: int = Field(
+        default=200,
+        ge=0,
+        description="Visible text below which a statically fetched page is rendered instead",
+    )
 
     # SearXNG Configuration
     searxng_url: str = Field(
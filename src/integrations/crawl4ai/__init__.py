@@ -1,12 +1,24 @@
 """Crawl4AI web crawling service."""
 
+from .cache import CrawlCache
 from .client import Crawl4AIClient
-from .crawler import crawl_deep, crawl_single_page
+from .crawler import crawl_deep, crawl_deep_stream, crawl_single_page
+from .fetch import PageScan, scan_html
+from .pool import BrowserPool, close_shared_browser_pool, shared_browser_pool
 from .schemas import CrawlRequest, CrawlResult, DeepCrawlRequest, DeepCrawlResult
 
 __all__ = [
     # Client
     "Crawl4AIClient",
+    # Conditional recrawl cache
+    "CrawlCache",
+    # Static-first fetch heuristics
+    "PageScan",
+    "scan_html",
+    # Warm browser pool
+    "BrowserPool",
+    "close_shared_browser_pool",
+    "shared_browser_pool",
     # Schemas
     "CrawlRequest",
     "CrawlResult",
@@ -14,5 +26,6 @@ __all__ = [
     "DeepCrawlResult",
     # Crawler functions (for backward compatibility with workflow)
     "crawl_deep",
+    "crawl_deep_stream",
     "crawl_single_page",
 ]
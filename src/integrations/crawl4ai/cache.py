@@ -0,0 +1,194 @@
+"""Persistent crawl cache for conditional recrawls.
+
+Each crawled page is recorded under its namespace and normalized URL with
+the validators the server sent (ETag, Last-Modified), a hash of its content,
+its links, and when it was last fetched. Recrawls revalidate with ``If-None-Match`` /
+``If-Modified-Since`` first and skip pages the server reports as unchanged,
+following their cached links instead of re-rendering them.
+
+Entries are scoped to the tenant and source group that ingested the page, so
+one namespace's crawl never marks a page unchanged for another namespace
+that has not stored it. Purging a source forgets its entries, and cleaning
+the store (``ingest --clean``) clears them all.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING
+
+import redis.asyncio as redis
+
+from .frontier import normalize_url
+
+if TYPE_CHECKING:
+    from mdrag.capabilities.ingestion.models import Namespace
+
+_KEY_PREFIX = "crawl:cache:"
+
+
+def response_validators(headers: Mapping[str, str] | None) -> dict[str, str]:
+    """Extract ``etag`` / ``last_modified`` from response headers, any case."""
+    if not headers:
+        return {}
+    lowered = {str(name).lower(): value for name, value in headers.items()}
+    validators = {}
+    if lowered.get("etag"):
+        validators["etag"] = lowered["etag"]
+    if lowered.get("last-modified"):
+        validators["last_modified"] = lowered["last-modified"]
+    return validators
+
+
+def content_hash(payload: str) -> str:
+    """SHA-256 of a page payload, as stored in the cache."""
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheEntry:
+    """What the last successful crawl of a URL recorded."""
+
+    url: str
+    fetched_at: str
+    etag: str | None = None
+    last_modified: str | None = None
+    content_hash: str | None = None
+    links: list[str] = field(default_factory=list)
+
+    def conditional_headers(self) -> dict[str, str]:
+        """Request headers that let the server answer ``304 Not Modified``."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class CrawlCache:
+    """Store crawl validators in Redis, one hash per namespace and normalized URL."""
+
+    def __init__(
+        self,
+        redis_url: str,
+        *,
+        ttl: int = 30 * 24 * 3600,
+        client: redis.Redis | None = None,
+        scope: str = "",
+    ) -> None:
+        """Initialize the cache.
+
+        Args:
+            redis_url: Redis connection URL.
+            ttl: Seconds an entry lives after its last fetch.
+            client: Redis client override.
+            scope: Namespace scope of the entries (see ``scoped``).
+        """
+        self.redis_url = redis_url
+        self.redis = client or redis.Redis.from_url(redis_url, decode_responses=True)
+        self.ttl = ttl
+        self.scope = scope
+
+    def scoped(self, namespace: Namespace) -> CrawlCache:
+        """Return a view of the cache holding ``namespace``'s entries.
+
+        The view shares this cache's Redis client; close the parent, not it.
+        """
+        scope = ":".join(
+            value or "" for value in (namespace.org_id, namespace.user_id, namespace.source_group)
+        )
+        return CrawlCache(self.redis_url, ttl=self.ttl, client=self.redis, scope=scope)
+
+    async def get(self, url: str) -> CacheEntry | None:
+        """Return the entry for ``url``, or None if it was never recorded."""
+        key = self._key(url)
+        if key is None:
+            return None
+        raw = await self.redis.hgetall(key)
+        if not raw:
+            return None
+        return CacheEntry(
+            url=raw.get("url", url),
+            fetched_at=raw.get("fetched_at", ""),
+            etag=raw.get("etag") or None,
+            last_modified=raw.get("last_modified") or None,
+            content_hash=raw.get("content_hash") or None,
+            links=json.loads(raw.get("links") or "[]"),
+        )
+
+    async def put(
+        self,
+        url: str,
+        *,
+        etag: str | None = None,
+        last_modified: str | None = None,
+        content_hash: str | None = None,
+        links: list[str] | None = None,
+    ) -> None:
+        """Record a successful crawl of ``url``."""
+        key = self._key(url)
+        if key is None:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hset(
+            key,
+            mapping={
+                "url": url,
+                "fetched_at": datetime.now().isoformat(),
+                "etag": etag or "",
+                "last_modified": last_modified or "",
+                "content_hash": content_hash or "",
+                "links": json.dumps(links or []),
+            },
+        )
+        pipe.expire(key, self.ttl)
+        await pipe.execute()
+
+    async def touch(self, url: str) -> None:
+        """Record that ``url`` was revalidated as unchanged."""
+        key = self._key(url)
+        if key is None:
+            return
+        pipe = self.redis.pipeline(transaction=False)
+        pipe.hset(key, mapping={"fetched_at": datetime.now().isoformat()})
+        pipe.expire(key, self.ttl)
+        await pipe.execute()
+
+    async def forget(self, url: str) -> None:
+        """Drop the entry for ``url`` so its next crawl is ingested in full."""
+        key = self._key(url)
+        if key is not None:
+            await self.redis.delete(key)
+
+    async def clear(self) -> int:
+        """Drop every entry of every namespace, so all pages are ingested again.
+
+        Returns:
+            Number of entries deleted.
+        """
+        deleted = 0
+        batch: list[str] = []
+        async for key in self.redis.scan_iter(match=f"{_KEY_PREFIX}*", count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                deleted += await self.redis.delete(*batch)
+                batch.clear()
+        if batch:
+            deleted += await self.redis.delete(*batch)
+        return deleted
+
+    async def close(self) -> None:
+        """Close the Redis connection pool."""
+        await self.redis.aclose()
+
+    def _key(self, url: str) -> str | None:
+        normalized = normalize_url(url)
+        return f"{_KEY_PREFIX}{self.scope}|{normalized}" if normalized else None
+
+
+__all__ = ["CacheEntry", "CrawlCache", "content_hash", "response_validators"]
@@ -4,16 +4,33 @@ This module provides a unified interface for crawling web pages using Crawl4AI,
 supporting both single-page and deep crawling with configurable parameters.
 """
 
+from collections.abc import AsyncIterator
+
 from ...mdrag_logging.service_logging import log_service_class
 from ..models import Source
 
-from .crawler import crawl_deep, crawl_single_page
+from .cache import CrawlCache
+from .crawler import crawl_deep, crawl_deep_stream, crawl_single_page
+from .pool import BrowserPool, shared_browser_pool
 
 
 @log_service_class
 class Crawl4AIClient:
     """Client for Crawl4AI web crawling service."""
 
+    def __init__(self, pool: BrowserPool | None = None) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            pool: Browser pool to lease browsers from; defaults to the shared
+                pool configured in settings (none if pooling is disabled)
+        """
+        self.pool = pool
+
+    def _browser_pool(self) -> BrowserPool | None:
+        return self.pool or shared_browser_pool()
+
     async def crawl_single_page(
         self,
         url: str,
@@ -31,6 +48,9 @@ class Crawl4AIClient:
         page_timeout: int | None = None,
         css_selector: str | None = None,
         allow_fallback: bool = True,
+        cache: CrawlCache | None = None,
+        fetch_mode: str = "browser",
+        min_text_chars: int = 200,
     ) -> Source | None:
         """
         Crawl a single web page and extract content.
@@ -45,12 +65,16 @@ class Crawl4AIClient:
             timeout: Request timeout in seconds
             cookies: Optional cookies as string or dict
             user_agent: Optional custom user agent
+            cache: Crawl cache; unchanged pages come back marked ``crawl_unchanged``
+            fetch_mode: ``browser`` or ``static_first`` (render only pages needing JS)
+            min_text_chars: Visible text below which a static page is rendered
 
         Returns:
             Source payload containing crawled content and metadata
         """
         return await crawl_single_page(
             crawler=None,
+            pool=self._browser_pool(),
             url=url,
             word_count_threshold=word_count_threshold,
             remove_overlay_elements=remove_overlay_elements,
@@ -66,6 +90,9 @@ class Crawl4AIClient:
             page_timeout=page_timeout,
             css_selector=css_selector,
             allow_fallback=allow_fallback,
+            cache=cache,
+            fetch_mode=fetch_mode,
+            min_text_chars=min_text_chars,
         )
 
     async def crawl_deep(
@@ -125,4 +152,83 @@ class Crawl4AIClient:
             user_agent=user_agent,
             visited_urls=visited_urls,
             current_depth=current_depth,
+            pool=self._browser_pool(),
+        )
+
+    def crawl_deep_stream(
+        self,
+        start_url: str,
+        max_depth: int = 2,
+        allowed_domains: list[str] | None = None,
+        allowed_subdomains: list[str] | None = None,
+        exclude_external_links: bool = False,
+        max_concurrent: int = 10,
+        max_per_host: int = 2,
+        host_delay: float = 0.0,
+        max_pages: int = 0,
+        max_bytes: int = 0,
+        remove_overlay_elements: bool = True,
+        remove_base64_images: bool = True,
+        word_count_threshold: int = 10,
+        cache_mode: str = "BYPASS",
+        browser_type: str = "chromium",
+        timeout: int = 30,
+        cookies: str | dict[str, str] | None = None,
+        user_agent: str | None = None,
+        cache: CrawlCache | None = None,
+        fetch_mode: str = "browser",
+        min_text_chars: int = 200,
+    ) -> AsyncIterator[Source]:
+        """
+        Deep crawl a website breadth-first, yielding pages as they are fetched.
+
+        Args:
+            start_url: The starting URL for the crawl
+            max_depth: Maximum depth to crawl
+            allowed_domains: List of allowed domains (None = same domain as start_url)
+            allowed_subdomains: List of allowed subdomains
+            exclude_external_links: Exclude external links from crawl
+            max_concurrent: Maximum pages in flight across all hosts
+            max_per_host: Maximum pages in flight per host
+            host_delay: Minimum seconds between request starts to one host
+            max_pages: Page budget for the crawl (0 = unlimited)
+            max_bytes: Content byte budget for the crawl (0 = unlimited)
+            remove_overlay_elements: Remove overlay elements from pages
+            remove_base64_images: Remove base64 encoded images
+            word_count_threshold: Minimum word count for a block to be included
+            cache_mode: Cache mode for crawling
+            browser_type: Browser type to use
+            timeout: Request timeout in seconds
+            cookies: Optional cookies
+            user_agent: Optional custom user agent
+            cache: Crawl cache used to skip unchanged pages
+            fetch_mode: ``browser`` or ``static_first`` (render only pages needing JS)
+            min_text_chars: Visible text below which a static page is rendered
+
+        Returns:
+            Async iterator of Source payloads
+        """
+        return crawl_deep_stream(
+            start_url=start_url,
+            max_depth=max_depth,
+            allowed_domains=allowed_domains,
+            allowed_subdomains=allowed_subdomains,
+            exclude_external_links=exclude_external_links,
+            max_concurrent=max_concurrent,
+            max_per_host=max_per_host,
+            host_delay=host_delay,
+            max_pages=max_pages,
+            max_bytes=max_bytes,
+            remove_overlay_elements=remove_overlay_elements,
+            remove_base64_images=remove_base64_images,
+            word_count_threshold=word_count_threshold,
+            cache_mode=cache_mode,
+            browser_type=browser_type,
+            timeout=timeout,
+            cookies=cookies,
+            user_agent=user_agent,
+            cache=cache,
+            pool=self._browser_pool(),
+            fetch_mode=fetch_mode,
+            min_text_chars=min_text_chars,
         )
@@ -1,20 +1,28 @@
 """Core crawler functions for Crawl4AI web crawling operations.
 
 This module provides the actual crawling implementation using Crawl4AI,
-supporting both single-page and deep crawling with authentication support.
+supporting single-page crawling and streaming breadth-first deep crawling
+with authentication support.
 """
 
 # ruff: noqa: I001
 
 import asyncio
+from collections import deque
+from contextlib import AsyncExitStack, asynccontextmanager
 from datetime import datetime
-from collections.abc import Awaitable, Callable
+from collections.abc import AsyncIterator, Callable
 from typing import Any, cast
 from urllib.parse import urlparse
 
+import httpx
 from crawl4ai import AsyncWebCrawler, CacheMode, CrawlerRunConfig
 from ...mdrag_logging.service_logging import get_logger, log_service
 from ..models import Source, SourceFrontmatter
+from .cache import CacheEntry, CrawlCache, content_hash, response_validators
+from .fetch import FETCH_MODES, scan_html
+from .frontier import CrawlBudget, HostLimiter, normalize_url
+from .pool import BrowserLease, BrowserPool
 
 logger = get_logger(__name__)
 
@@ -119,6 +127,7 @@ def _build_crawler_config(
     wait_for_timeout: int | None = None,
     page_timeout: int | None = None,
     css_selector: str | None = None,
+    session_id: str | None = None,
 ) -> tuple[CrawlerRunConfig, dict[str, int]]:
     """
     Build a CrawlerRunConfig with authentication support.
@@ -130,6 +139,7 @@ def _build_crawler_config(
         word_count_threshold: Minimum word count for content blocks
         remove_overlay_elements: Whether to remove overlay elements
         cache_mode: Cache mode string (BYPASS, CACHED, or WRITE)
+        session_id: Crawl session (page and browser context) to render in
 
     Returns:
         Configured CrawlerRunConfig instance
@@ -157,6 +167,8 @@ def _build_crawler_config(
         config_kwargs["page_timeout"] = page_timeout
     if css_selector:
         config_kwargs["css_selector"] = css_selector
+    if session_id:
+        config_kwargs["session_id"] = session_id
 
     if user_agent:
         headers = {**(headers or {}), "User-Agent": user_agent}
@@ -178,15 +190,195 @@ def _build_crawler_config(
     return CrawlerRunConfig(**config_kwargs), metadata
 
 
-async def _with_crawler(
+@asynccontextmanager
+async def _crawler_scope(
     crawler: AsyncWebCrawler | None,
-    action: Callable[[AsyncWebCrawler], Awaitable[Any]],
-) -> Any:
+    pool: BrowserPool | None = None,
+) -> AsyncIterator[BrowserLease]:
+    """Yield the injected crawler, a lease from ``pool``, or a managed crawler closed on exit."""
     if crawler is not None:
-        return await action(crawler)
+        yield BrowserLease(crawler)
+        return
+
+    if pool is not None:
+        async with pool.lease() as lease:
+            yield lease
+        return
 
     async with AsyncWebCrawler() as managed_crawler:
-        return await action(managed_crawler)
+        yield BrowserLease(managed_crawler)
+
+
+@asynccontextmanager
+async def _http_scope(
+    http_client: httpx.AsyncClient | None,
+    timeout: int | None = None,
+    max_connections: int | None = None,
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Yield the injected HTTP client, or a managed one closed on exit.
+
+    The managed client keeps up to ``max_connections`` connections alive, so
+    the pages of one crawl reuse connections to the same host.
+    """
+    if http_client is not None:
+        yield http_client
+        return
+
+    limits = httpx.Limits(
+        max_connections=max_connections, max_keepalive_connections=max_connections
+    )
+    async with httpx.AsyncClient(
+        follow_redirects=True, timeout=timeout or 30, limits=limits
+    ) as managed_client:
+        yield managed_client
+
+
+def _request_options(
+    url: str,
+    cookies: str | dict[str, str] | None,
+    headers: dict[str, str] | None,
+    user_agent: str | None,
+) -> tuple[dict[str, str], dict[str, str] | None]:
+    """Headers and cookies for a plain HTTP request matching the browser's."""
+    request_headers = dict(headers or {})
+    if user_agent:
+        request_headers["User-Agent"] = user_agent
+    request_cookies = {
+        cookie["name"]: cookie["value"] for cookie in _parse_cookies(cookies, url) or []
+    }
+    return request_headers, request_cookies or None
+
+
+async def _revalidate(
+    http_client: httpx.AsyncClient,
+    url: str,
+    entry: CacheEntry,
+    cookies: str | dict[str, str] | None,
+    headers: dict[str, str] | None,
+    user_agent: str | None,
+) -> bool:
+    """Send a conditional request; True if the server answers 304 Not Modified.
+
+    The response body is never read, so a changed page costs only its headers.
+    """
+    request_headers, request_cookies = _request_options(url, cookies, headers, user_agent)
+    request_headers.update(entry.conditional_headers())
+    try:
+        async with http_client.stream(
+            "GET", url, headers=request_headers, cookies=request_cookies
+        ) as response:
+            unchanged = response.status_code == 304
+    except httpx.HTTPError as exc:
+        await logger.warning(
+            "crawl_revalidate_failed",
+            url=url,
+            error=str(exc),
+            error_type=type(exc).__name__,
+            action="crawl_revalidate_failed",
+        )
+        return False
+    if unchanged:
+        await logger.info("crawl_page_not_modified", url=url, action="crawl_page_not_modified")
+    return unchanged
+
+
+def _unchanged_source(url: str, entry: CacheEntry, links: list[Any]) -> Source:
+    """Placeholder for a page the crawl cache shows is unchanged: links, no content."""
+    return _attach_frontmatter(
+        {
+            "url": url,
+            "markdown": "",
+            "html": None,
+            "metadata": {
+                "crawl_unchanged": True,
+                "etag": entry.etag,
+                "last_modified": entry.last_modified,
+            },
+            "links": links,
+        }
+    )
+
+
+async def _fetch_static(
+    http_client: httpx.AsyncClient,
+    url: str,
+    entry: CacheEntry | None,
+    cache: CrawlCache | None,
+    cookies: str | dict[str, str] | None,
+    headers: dict[str, str] | None,
+    user_agent: str | None,
+    min_text_chars: int,
+) -> Source | None:
+    """Fetch ``url`` over plain HTTP; None if the page needs the browser.
+
+    A cached page is fetched conditionally, so one request both revalidates
+    and, if the page changed, fetches it.
+    """
+    request_headers, request_cookies = _request_options(url, cookies, headers, user_agent)
+    if entry is not None:
+        request_headers.update(entry.conditional_headers())
+    try:
+        response = await http_client.get(url, headers=request_headers, cookies=request_cookies)
+    except httpx.HTTPError as exc:
+        await logger.warning(
+            "crawl_static_fetch_failed",
+            url=url,
+            error=str(exc),
+            error_type=type(exc).__name__,
+            action="crawl_static_fetch_failed",
+        )
+        return None
+
+    if response.status_code == 304 and entry is not None and cache is not None:
+        await logger.info("crawl_page_not_modified", url=url, action="crawl_page_not_modified")
+        await cache.touch(url)
+        return _unchanged_source(url, entry, entry.links)
+
+    content_type = response.headers.get("content-type", "")
+    reason = None
+    if not 200 <= response.status_code < 300:
+        reason = "http_status"
+    elif "html" not in content_type.lower():
+        reason = "content_type"
+    else:
+        html = response.text
+        scan = scan_html(html)
+        reason = scan.needs_javascript(min_text_chars)
+    if reason:
+        await logger.info(
+            "crawl_static_escalate",
+            url=url,
+            reason=reason,
+            status_code=response.status_code,
+            action="crawl_static_escalate",
+        )
+        return None
+
+    final_url = str(response.url)
+    if entry is not None and entry.content_hash == content_hash(html):
+        return _unchanged_source(final_url, entry, scan.links)
+
+    await logger.info(
+        "crawl_static_fetch_complete",
+        url=url,
+        text_chars=scan.text_chars,
+        action="crawl_static_fetch_complete",
+    )
+    return _attach_frontmatter(
+        {
+            "url": final_url,
+            "markdown": "",
+            "html": html,
+            "metadata": {
+                "page_title": scan.title,
+                "status_code": response.status_code,
+                "mime_type": content_type.split(";")[0].strip() or None,
+                "fetch_mode": "static",
+                **response_validators(response.headers),
+            },
+            "links": scan.links,
+        }
+    )
 
 
 @log_service()
@@ -209,6 +401,10 @@ async def crawl_single_page(
     page_timeout: int | None = None,
     css_selector: str | None = None,
     allow_fallback: bool = True,
+    cache: CrawlCache | None = None,
+    pool: BrowserPool | None = None,
+    fetch_mode: str = "browser",
+    min_text_chars: int = 200,
     **kwargs,  # Accept additional kwargs for forward compatibility
 ) -> Source | None:
     """
@@ -223,11 +419,40 @@ async def crawl_single_page(
         remove_overlay_elements: Remove overlay elements from the page
         remove_base64_images: Remove base64 encoded images
         cache_mode: Cache mode for crawling (BYPASS, CACHED, or WRITE)
+        cache: Crawl cache; a page recorded there is revalidated with a
+            conditional request before the browser is used, and a page the
+            server reports as ``304 Not Modified`` (or whose content hash is
+            unchanged) is returned marked ``crawl_unchanged`` with its cached
+            links and no content
+        pool: Browser pool to lease a warm browser from when no crawler is
+            injected; without either, a browser is launched for this page
+        fetch_mode: ``browser`` renders every page; ``static_first`` fetches
+            over plain HTTP and only renders pages that look like they need
+            JavaScript (see ``PageScan.needs_javascript``). Static pages come
+            back with HTML and no markdown
+        min_text_chars: Visible text below which a static page is rendered
 
     Returns:
         Source payload with markdown, metadata, and frontmatter, or None if failed.
     """
-    async def _run(active_crawler: AsyncWebCrawler) -> Source | None:
+    if fetch_mode not in FETCH_MODES:
+        raise ValueError(f"Unknown fetch mode: {fetch_mode}")
+
+    entry = await cache.get(url) if cache is not None else None
+    if fetch_mode == "static_first":
+        async with _http_scope(http_client, timeout) as static_client:
+            static_source = await _fetch_static(
+                static_client, url, entry, cache, cookies, headers, user_agent, min_text_chars
+            )
+        if static_source is not None:
+            return static_source
+    elif entry is not None and entry.conditional_headers():
+        async with _http_scope(http_client, timeout) as revalidation_client:
+            if await _revalidate(revalidation_client, url, entry, cookies, headers, user_agent):
+                await cache.touch(url)
+                return _unchanged_source(url, entry, entry.links)
+
+    async def _run(lease: BrowserLease) -> Source | None:
         _ = (remove_base64_images, browser_type, timeout, kwargs)
 
         async def _httpx_fallback() -> Source | None:
@@ -238,6 +463,8 @@ async def crawl_single_page(
                 response = await http_client.get(url, follow_redirects=True)
                 response.raise_for_status()
                 html = response.text
+                if entry is not None and entry.content_hash == content_hash(html):
+                    return _unchanged_source(url, entry, entry.links)
                 title = ""
 
                 try:
@@ -265,6 +492,7 @@ async def crawl_single_page(
                         "metadata": {
                             "page_title": title,
                             "status_code": response.status_code,
+                            **response_validators(response.headers),
                         },
                         "links": [],
                     }
@@ -292,6 +520,7 @@ async def crawl_single_page(
                 wait_for_timeout=wait_for_timeout,
                 page_timeout=page_timeout,
                 css_selector=css_selector,
+                session_id=lease.session_id,
             )
 
             await logger.info("crawl_single_page_start", url=url, action="crawl_single_page_start")
@@ -310,7 +539,7 @@ async def crawl_single_page(
                     action="crawl_single_page_headers_configured",
                 )
 
-            result = cast(Any, await active_crawler.arun(url=url, config=config))
+            result = cast(Any, await lease.crawler.arun(url=url, config=config))
 
             if not result.success:
                 await logger.warning(
@@ -335,6 +564,8 @@ async def crawl_single_page(
             # Add any additional metadata from result.metadata if available
             if hasattr(result, "metadata") and result.metadata:
                 metadata.update(result.metadata)
+            metadata.update(response_validators(getattr(result, "response_headers", None)))
+            metadata["fetch_mode"] = "browser"
 
             # Extract links if available
             links = []
@@ -347,11 +578,16 @@ async def crawl_single_page(
                 elif isinstance(result.links, list):
                     links = result.links
 
+            html = result.html or ""
+            markdown = result.markdown or ""
+            if entry is not None and entry.content_hash == content_hash(html or markdown):
+                return _unchanged_source(result.url or url, entry, links)
+
             return _attach_frontmatter(
                 {
                     "url": result.url or url,
-                    "markdown": result.markdown or "",
-                    "html": result.html or "",
+                    "markdown": markdown,
+                    "html": html,
                     "metadata": metadata,
                     "links": links,
                 }
@@ -371,11 +607,60 @@ async def crawl_single_page(
                     return fallback_result
             return None
 
-    return await _with_crawler(crawler, _run)
+    async with _crawler_scope(crawler, pool) as lease:
+        return await _run(lease)
+
+
+def _domain_filter(
+    start_url: str,
+    allowed_domains: list[str] | None,
+    allowed_subdomains: list[str] | None,
+    exclude_external_links: bool,
+) -> tuple[list[str], Callable[[str], bool]]:
+    """Build the allowed-domain list and URL predicate for a deep crawl."""
+    start_domain = urlparse(start_url).netloc
+
+    # Default allowed domains to starting domain if not provided
+    if not allowed_domains:
+        # Remove www. prefix for matching
+        clean_domain = start_domain
+        if clean_domain.startswith("www."):
+            clean_domain = clean_domain[4:]
+        allowed_domains = [clean_domain, f"www.{clean_domain}"]
+
+    if exclude_external_links:
+        allowed_domains = [start_domain.replace("www.", ""), f"www.{start_domain.replace('www.', '')}"]
+
+    def _is_allowed_url(url: str) -> bool:
+        """Check if a URL is allowed based on domain/subdomain filters."""
+        try:
+            domain = urlparse(url).netloc
+
+            # Check allowed domains (exact match)
+            if not any(
+                domain == allowed or domain.endswith(f".{allowed}") for allowed in allowed_domains
+            ):
+                return False
+
+            # Check allowed subdomains (prefix match)
+            if allowed_subdomains:
+                return any(domain.startswith(f"{subdomain}.") for subdomain in allowed_subdomains)
+
+            return True
+
+        except Exception:
+            return False
+
+    return allowed_domains, _is_allowed_url
+
+
+def _payload_size(source: Source) -> int:
+    """Bytes a crawled page contributes to the crawl's byte budget."""
+    return len((source.html or "").encode("utf-8")) + len(source.content.encode("utf-8"))
 
 
 @log_service()
-async def crawl_deep(
+async def crawl_deep_stream(
     start_url: str,
     crawler: AsyncWebCrawler | None = None,
     max_depth: int = 2,
@@ -383,6 +668,10 @@ async def crawl_deep(
     allowed_subdomains: list[str] | None = None,
     exclude_external_links: bool = False,
     max_concurrent: int = 10,
+    max_per_host: int = 2,
+    host_delay: float = 0.0,
+    max_pages: int = 0,
+    max_bytes: int = 0,
     cookies: str | dict[str, str] | None = None,
     headers: dict[str, str] | None = None,
     word_count_threshold: int = 10,
@@ -394,163 +683,259 @@ async def crawl_deep(
     user_agent: str | None = None,
     visited_urls: set[str] | None = None,
     current_depth: int = 0,
+    cache: CrawlCache | None = None,
+    http_client: httpx.AsyncClient | None = None,
+    pool: BrowserPool | None = None,
+    fetch_mode: str = "browser",
+    min_text_chars: int = 200,
     **kwargs,  # Accept additional kwargs for forward compatibility
-) -> list[Source]:
+) -> AsyncIterator[Source]:
     """
-    Perform a deep crawl of a website, recursively following links.
+    Deep crawl a website breadth-first, yielding each page as it is fetched.
+
+    Links are normalized and deduplicated against a visited set before they
+    enter a FIFO frontier, so each page is fetched at most once and shallower
+    pages are fetched first. Up to ``max_concurrent`` pages are in flight at
+    once, at most ``max_per_host`` of them per host, with ``host_delay``
+    seconds between request starts to the same host. The crawl stops
+    scheduling pages once ``max_pages`` pages or ``max_bytes`` bytes of
+    content have been fetched (0 disables either budget). With a ``cache``,
+    pages are revalidated with conditional requests first; unchanged pages
+    are not yielded, but their cached links are still followed. With a
+    ``pool`` and no injected crawler, each page leases its own browser
+    context, so concurrent pages spread across the pool's warm browsers.
+    In ``static_first`` mode only pages that need JavaScript use a browser.
 
     Args:
         crawler: AsyncWebCrawler instance (must be entered via __aenter__)
         start_url: The starting URL for the crawl
-        max_depth: Maximum recursion depth (1 = start page only, 2 = start + 1 level, etc.)
+        max_depth: Maximum depth (1 = start page only, 2 = start + 1 level, etc.)
         allowed_domains: List of allowed domains for exact matching
         allowed_subdomains: List of allowed subdomain prefixes
-        max_concurrent: Maximum concurrent crawler sessions
+        max_concurrent: Maximum pages in flight across all hosts
+        max_per_host: Maximum pages in flight per host
+        host_delay: Minimum seconds between request starts to one host
+        max_pages: Page budget for the whole crawl
+        max_bytes: Content byte budget for the whole crawl
         cookies: Optional authentication cookies as string or dict
         headers: Optional custom HTTP headers as dict
         word_count_threshold: Minimum word count for a block to be included
         remove_overlay_elements: Remove overlay elements from the page
         remove_base64_images: Remove base64 encoded images
         cache_mode: Cache mode for crawling
-
-    Returns:
-        List of Source payloads for each crawled page.
+        cache: Crawl cache used to skip unchanged pages
+        http_client: HTTP client for conditional requests and fallback fetches
+        pool: Browser pool pages lease from; without it (and without a
+            crawler) one browser is launched for the whole crawl
+        fetch_mode: ``browser`` or ``static_first`` (see ``crawl_single_page``)
+        min_text_chars: Visible text below which a static page is rendered
+
+    Yields:
+        Source payloads in completion order, roughly breadth-first.
     """
     max_depth = max(max_depth, 1)
     max_depth = min(max_depth, 10)
-    _ = (remove_base64_images, browser_type, timeout, kwargs)
-
-    # Parse starting URL for domain filtering
-    parsed_start = urlparse(start_url)
-    start_domain = parsed_start.netloc
+    _ = (browser_type, timeout, kwargs)
+
+    start = normalize_url(start_url)
+    if start is None:
+        await logger.warning(
+            "crawl_deep_invalid_start_url",
+            url=start_url,
+            action="crawl_deep_invalid_start_url",
+        )
+        return
+    allowed_domains, _is_allowed_url = _domain_filter(
+        start, allowed_domains, allowed_subdomains, exclude_external_links
+    )
 
-    # Default allowed domains to starting domain if not provided
-    if not allowed_domains:
-        # Remove www. prefix for matching
-        clean_domain = start_domain
-        if clean_domain.startswith("www."):
-            clean_domain = clean_domain[4:]
-        allowed_domains = [clean_domain, f"www.{clean_domain}"]
+    visited = visited_urls if visited_urls is not None else set()
+    limiter = HostLimiter(max_per_host, host_delay)
+    budget = CrawlBudget(max_pages=max_pages, max_bytes=max_bytes)
+    frontier: deque[tuple[str, int, str | None]] = deque()
+    if start not in visited:
+        visited.add(start)
+        frontier.append((start, max(current_depth, 1), None))
+
+    async def _fetch(
+        active_crawler: AsyncWebCrawler | None,
+        active_http: httpx.AsyncClient | None,
+        url: str,
+    ) -> Source | None:
+        async with limiter.slot(url):
+            return await crawl_single_page(
+                crawler=active_crawler,
+                pool=pool,
+                http_client=active_http,
+                cache=cache,
+                url=url,
+                cookies=cookies,
+                headers=headers,
+                word_count_threshold=word_count_threshold,
+                remove_overlay_elements=remove_overlay_elements,
+                remove_base64_images=remove_base64_images,
+                cache_mode=cache_mode,
+                user_agent=user_agent,
+                fetch_mode=fetch_mode,
+                min_text_chars=min_text_chars,
+            )
 
-    if exclude_external_links:
-        allowed_domains = [start_domain.replace("www.", ""), f"www.{start_domain.replace('www.', '')}"]
+    await logger.info(
+        "crawl_deep_start",
+        start_url=start_url,
+        max_depth=max_depth,
+        allowed_domains=allowed_domains,
+        max_pages=max_pages,
+        max_bytes=max_bytes,
+        action="crawl_deep_start",
+    )
 
-    def _is_allowed_url(url: str) -> bool:
-        """Check if a URL is allowed based on domain/subdomain filters."""
+    unchanged = 0
+    async with AsyncExitStack() as scopes:
+        active_crawler = crawler
+        if crawler is None and pool is None:
+            active_crawler = (await scopes.enter_async_context(_crawler_scope(None))).crawler
+        active_http = await scopes.enter_async_context(
+            _http_scope(http_client, timeout, max_connections=max_concurrent)
+        )
+        in_flight: dict[asyncio.Task, tuple[str, int, str | None]] = {}
         try:
-            parsed = urlparse(url)
-            domain = parsed.netloc
-
-            # Check allowed domains (exact match)
-            domain_match = False
-            for allowed in allowed_domains:
-                if domain == allowed or domain.endswith(f".{allowed}"):
-                    domain_match = True
+            while frontier or in_flight:
+                while (
+                    frontier
+                    and len(in_flight) < max_concurrent
+                    and budget.allows(len(in_flight))
+                ):
+                    url, depth, parent_url = frontier.popleft()
+                    task = asyncio.create_task(_fetch(active_crawler, active_http, url))
+                    in_flight[task] = (url, depth, parent_url)
+                if not in_flight:
                     break
 
-            if not domain_match:
-                return False
-
-            # Check allowed subdomains (prefix match)
-            if allowed_subdomains:
-                return any(domain.startswith(f"{subdomain}.") for subdomain in allowed_subdomains)
-
-            return True
-
-        except Exception:
-            return False
-
-    # Track visited URLs and results
-    visited_urls = visited_urls or set()
-    results: list[Source] = []
-    semaphore = asyncio.Semaphore(max_concurrent)
-
-    async def _run(active_crawler: AsyncWebCrawler) -> list[Source]:
-        async def _crawl_page(url: str, depth: int, parent_url: str | None = None) -> None:
-            """Crawl a single page and queue its links for further crawling."""
-            # Normalize URL (remove fragment, trailing slash)
-            normalized_url = url.split("#")[0].rstrip("/")
-
-            async with semaphore:
-                # Skip if already visited
-                if normalized_url in visited_urls:
-                    return
-                visited_urls.add(normalized_url)
-
-                # Skip if not allowed
-                if not _is_allowed_url(normalized_url):
-                    await logger.debug(
-                        "crawl_deep_url_disallowed",
-                        url=normalized_url,
-                        action="crawl_deep_url_disallowed",
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    url, depth, parent_url = in_flight.pop(task)
+                    result = task.result()
+                    if not result:
+                        await logger.warning(
+                            "crawl_deep_page_failed",
+                            url=url,
+                            depth=depth,
+                            action="crawl_deep_page_failed",
+                        )
+                        continue
+
+                    is_unchanged = bool(result.metadata.get("crawl_unchanged"))
+                    budget.record(0 if is_unchanged else _payload_size(result))
+                    result.metadata["crawl_depth"] = depth
+                    result.metadata["parent_url"] = parent_url
+                    unchanged += is_unchanged
+                    await logger.info(
+                        "crawl_deep_page_complete",
+                        url=url,
+                        depth=depth,
+                        total=budget.pages,
+                        unchanged=is_unchanged,
+                        frontier=len(frontier),
+                        action="crawl_deep_page_complete",
                     )
-                    return
-
-                # Crawl the page
-                result = await crawl_single_page(
-                    crawler=active_crawler,
-                    url=normalized_url,
-                    cookies=cookies,
-                    headers=headers,
-                    word_count_threshold=word_count_threshold,
-                    remove_overlay_elements=remove_overlay_elements,
-                    remove_base64_images=remove_base64_images,
-                    cache_mode=cache_mode,
-                    user_agent=user_agent,
-                )
 
-                if not result:
-                    await logger.warning(
-                        "crawl_deep_page_failed",
-                        url=normalized_url,
-                        depth=depth,
-                        action="crawl_deep_page_failed",
+                    if depth < max_depth and not budget.exhausted:
+                        base = result.frontmatter.source_url or url
+                        for link in result.links:
+                            child_url = normalize_url(link, base)
+                            if (
+                                child_url
+                                and child_url not in visited
+                                and _is_allowed_url(child_url)
+                            ):
+                                visited.add(child_url)
+                                frontier.append((child_url, depth + 1, url))
+                    if not is_unchanged:
+                        yield result
+
+                if budget.exhausted and frontier:
+                    await logger.info(
+                        "crawl_deep_budget_exhausted",
+                        start_url=start_url,
+                        pages=budget.pages,
+                        bytes=budget.bytes,
+                        skipped=len(frontier),
+                        action="crawl_deep_budget_exhausted",
                     )
-                    return
+                    frontier.clear()
+        finally:
+            for task in in_flight:
+                task.cancel()
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    await logger.info(
+        "crawl_deep_complete",
+        start_url=start_url,
+        total=budget.pages,
+        unchanged=unchanged,
+        bytes=budget.bytes,
+        action="crawl_deep_complete",
+    )
 
-                # Add crawl metadata
-                result.metadata["crawl_depth"] = depth
-                result.metadata["parent_url"] = parent_url
 
-                results.append(result)
-                await logger.info(
-                    "crawl_deep_page_complete",
-                    url=normalized_url,
-                    depth=depth,
-                    total=len(results),
-                    action="crawl_deep_page_complete",
-                )
+@log_service()
+async def crawl_deep(
+    start_url: str,
+    crawler: AsyncWebCrawler | None = None,
+    max_depth: int = 2,
+    allowed_domains: list[str] | None = None,
+    allowed_subdomains: list[str] | None = None,
+    exclude_external_links: bool = False,
+    max_concurrent: int = 10,
+    cookies: str | dict[str, str] | None = None,
+    headers: dict[str, str] | None = None,
+    word_count_threshold: int = 10,
+    remove_overlay_elements: bool = True,
+    remove_base64_images: bool = True,
+    cache_mode: str = "BYPASS",
+    browser_type: str | None = None,
+    timeout: int | None = None,
+    user_agent: str | None = None,
+    visited_urls: set[str] | None = None,
+    current_depth: int = 0,
+    **kwargs,  # Accept additional kwargs for forward compatibility
+) -> list[Source]:
+    """
+    Perform a deep crawl of a website and return every page at once.
 
-                # Follow links if not at max depth
-                if depth < max_depth and result.links:
-                    child_urls = [link for link in result.links if _is_allowed_url(link)]
-                    if child_urls:
-                        child_tasks = [
-                            _crawl_page(child_url, depth + 1, normalized_url)
-                            for child_url in child_urls[:50]  # Limit links per page
-                        ]
-                        await asyncio.gather(*child_tasks, return_exceptions=True)
+    Collects ``crawl_deep_stream``; use that directly to process pages while
+    the crawl is still running. Extra keyword arguments (budgets, per-host
+    limits) are passed through.
 
-        await logger.info(
-            "crawl_deep_start",
+    Returns:
+        List of Source payloads for each crawled page.
+    """
+    return [
+        source
+        async for source in crawl_deep_stream(
             start_url=start_url,
+            crawler=crawler,
             max_depth=max_depth,
             allowed_domains=allowed_domains,
-            action="crawl_deep_start",
+            allowed_subdomains=allowed_subdomains,
+            exclude_external_links=exclude_external_links,
+            max_concurrent=max_concurrent,
+            cookies=cookies,
+            headers=headers,
+            word_count_threshold=word_count_threshold,
+            remove_overlay_elements=remove_overlay_elements,
+            remove_base64_images=remove_base64_images,
+            cache_mode=cache_mode,
+            browser_type=browser_type,
+            timeout=timeout,
+            user_agent=user_agent,
+            visited_urls=visited_urls,
+            current_depth=current_depth,
+            **kwargs,
         )
-
-        start_depth = max(current_depth, 1)
-        await _crawl_page(start_url, depth=start_depth)
-
-        await logger.info(
-            "crawl_deep_complete",
-            start_url=start_url,
-            total=len(results),
-            action="crawl_deep_complete",
-        )
-        return results
-
-    return await _with_crawler(crawler, _run)
+    ]
 
 
-__all__ = ["crawl_deep", "crawl_single_page"]
+__all__ = ["crawl_deep", "crawl_deep_stream", "crawl_single_page"]
@@ -0,0 +1,101 @@
+"""Heuristics for static-first fetching.
+
+A page fetched over plain HTTP is scanned once for its title, links, and
+visible text. Pages that look like they only render with JavaScript (no
+visible text, an empty single-page-app mount point, a "please enable
+JavaScript" notice, or too little text) are escalated to the browser.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+
+FETCH_MODES = frozenset({"browser", "static_first"})
+
+_SPA_MOUNT_IDS = frozenset({"root", "app", "__next", "__nuxt", "___gatsby", "svelte"})
+_HIDDEN_TAGS = frozenset({"head", "script", "style", "template", "noscript"})
+_VOID_TAGS = frozenset(
+    {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "wbr"}
+)
+_JS_REQUIRED = re.compile(
+    r"(enable|turn on|requires?|need)\W+(\w+\W+){0,3}javascript|javascript\W+(is\W+)?required",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class PageScan:
+    """What a static HTML page shows without running its scripts."""
+
+    title: str = ""
+    links: list[str] = field(default_factory=list)
+    text_chars: int = 0
+    empty_mount: bool = False
+    noscript_text: str = ""
+
+    def needs_javascript(self, min_text_chars: int = 200) -> str | None:
+        """Return why the page needs a browser to render, or None if it is static."""
+        if self.text_chars == 0:
+            return "empty_body"
+        if self.empty_mount or _JS_REQUIRED.search(self.noscript_text):
+            return "spa_marker"
+        if self.text_chars < min_text_chars:
+            return "thin_text"
+        return None
+
+
+class _PageScanner(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.scan = PageScan()
+        self._open: list[str] = []
+        self._mount: str | None = None
+        self._in_title = False
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, str | None]]) -> None:
+        self._mount = None
+        attributes = dict(attrs)
+        if tag == "a" and attributes.get("href"):
+            self.scan.links.append(attributes["href"] or "")
+        if tag == "title":
+            self._in_title = True
+        if tag in _VOID_TAGS:
+            return
+        if attributes.get("id") in _SPA_MOUNT_IDS:
+            self._mount = tag
+        self._open.append(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if self._mount == tag:
+            self.scan.empty_mount = True
+        self._mount = None
+        if tag == "title":
+            self._in_title = False
+        if tag in self._open:
+            while self._open.pop() != tag:
+                pass
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.scan.title += data.strip()
+        if "noscript" in self._open:
+            self.scan.noscript_text += data
+        if any(tag in _HIDDEN_TAGS for tag in self._open):
+            return
+        text = "".join(data.split())
+        if text:
+            self._mount = None
+            self.scan.text_chars += len(text)
+
+
+def scan_html(html: str) -> PageScan:
+    """Scan raw HTML for its title, ``<a href>`` links, and visible text."""
+    scanner = _PageScanner()
+    scanner.feed(html)
+    scanner.close()
+    return scanner.scan
+
+
+__all__ = ["FETCH_MODES", "PageScan", "scan_html"]
@@ -0,0 +1,108 @@
+"""Frontier helpers for breadth-first deep crawls.
+
+URL normalization decides which links are the same page, the host limiter
+keeps the crawl polite to each site, and the budget bounds the whole crawl.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+_CRAWLABLE_SCHEMES = frozenset({"http", "https"})
+_DEFAULT_PORTS = {("http", 80), ("https", 443)}
+
+
+def normalize_url(href: str, base: str | None = None) -> str | None:
+    """Resolve a link against ``base`` and normalize it for deduplication.
+
+    Lowercases the scheme and host, drops default ports, the fragment, and a
+    trailing slash on non-root paths. The query string is kept. The crawl
+    frontier, the crawl cache, and ingestion job idempotency keys all compare
+    URLs in this form.
+
+    Returns:
+        The normalized URL, or None for links that are not crawlable (mailto:,
+        javascript:, malformed, ...).
+    """
+    href = href.strip()
+    if not href:
+        return None
+    try:
+        parts = urlsplit(urljoin(base, href) if base else href)
+        port = parts.port
+    except ValueError:
+        return None
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if scheme not in _CRAWLABLE_SCHEMES or not host:
+        return None
+    if port and (scheme, port) not in _DEFAULT_PORTS:
+        host = f"{host}:{port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, parts.query, ""))
+
+
+class HostLimiter:
+    """Per-host concurrency cap and minimum delay between request starts."""
+
+    def __init__(self, max_concurrent: int = 2, delay: float = 0.0) -> None:
+        """Initialize the limiter.
+
+        Args:
+            max_concurrent: Requests allowed in flight per host.
+            delay: Seconds between the starts of two requests to one host.
+        """
+        self.max_concurrent = max(max_concurrent, 1)
+        self.delay = max(delay, 0.0)
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+        self._next_start: dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[None]:
+        """Hold a request slot for the host of ``url``."""
+        host = urlsplit(url).netloc
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.max_concurrent))
+        async with semaphore:
+            if self.delay:
+                loop = asyncio.get_running_loop()
+                async with self._locks.setdefault(host, asyncio.Lock()):
+                    wait = self._next_start.get(host, 0.0) - loop.time()
+                    if wait > 0:
+                        await asyncio.sleep(wait)
+                    self._next_start[host] = loop.time() + self.delay
+            yield
+
+
+@dataclass
+class CrawlBudget:
+    """Global page and byte limits for one crawl; 0 means unlimited."""
+
+    max_pages: int = 0
+    max_bytes: int = 0
+    pages: int = 0
+    bytes: int = 0
+
+    def record(self, size: int) -> None:
+        """Count one fetched page of ``size`` bytes."""
+        self.pages += 1
+        self.bytes += size
+
+    def allows(self, in_flight: int = 0) -> bool:
+        """Return True if another page may be scheduled."""
+        if self.max_pages and self.pages + in_flight >= self.max_pages:
+            return False
+        return not (self.max_bytes and self.bytes >= self.max_bytes)
+
+    @property
+    def exhausted(self) -> bool:
+        return not self.allows()
+
+
+__all__ = ["CrawlBudget", "HostLimiter", "normalize_url"]
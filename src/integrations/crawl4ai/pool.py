@@ -0,0 +1,313 @@
+"""Warm browser pool shared by crawl and readings calls.
+
+Launching a headless browser costs far more than rendering one page, so
+browsers are started once and leased out. Each browser serves up to
+``contexts_per_browser`` leases at a time, each in its own crawl session
+(its own page and browser context, so cookies never leak between leases).
+A browser that fails its health check or has served ``recycle_after``
+leases is retired: it takes no new leases, is closed once its last lease is
+returned, and a replacement is launched on demand. Pages rendered in the
+pool skip image, font, and media requests, which text extraction never uses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import uuid
+import weakref
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any
+
+from crawl4ai import AsyncWebCrawler, BrowserConfig
+
+from mdrag.config.settings import load_settings
+
+from ...mdrag_logging.service_logging import get_logger
+
+logger = get_logger(__name__)
+
+CrawlerFactory = Callable[[], Awaitable[Any]]
+
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "font", "media"})
+
+
+async def _skip_heavy_resource(route: Any) -> None:
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        await route.abort()
+    else:
+        await route.continue_()
+
+
+async def _block_heavy_resources(page: Any, context: Any = None, **kwargs: Any) -> Any:
+    """Crawl4AI page hook: abort image, font, and media requests for the page."""
+    await page.route("**/*", _skip_heavy_resource)
+    return page
+
+
+def block_heavy_resources(crawler: Any) -> None:
+    """Install the resource-blocking hook on every page ``crawler`` opens."""
+    crawler.crawler_strategy.set_hook("on_page_context_created", _block_heavy_resources)
+
+
+@dataclass
+class BrowserLease:
+    """A crawler to render pages with, and the session isolating this lease."""
+
+    crawler: Any
+    session_id: str | None = None
+
+
+@dataclass
+class _PooledBrowser:
+    crawler: Any = None
+    active: int = 0
+    leases: int = 0
+    retiring: bool = False
+    launching: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class BrowserPool:
+    """Lease warm Crawl4AI browsers instead of launching one per page."""
+
+    def __init__(
+        self,
+        size: int = 2,
+        *,
+        contexts_per_browser: int = 4,
+        recycle_after: int = 200,
+        browser_type: str = "chromium",
+        block_resources: bool = True,
+        factory: CrawlerFactory | None = None,
+    ) -> None:
+        """Initialize the pool; browsers are launched on first use.
+
+        Args:
+            size: Browsers kept warm.
+            contexts_per_browser: Concurrent leases (contexts) per browser.
+            recycle_after: Leases a browser serves before it is replaced
+                (0 = never).
+            browser_type: Browser launched by the default factory.
+            block_resources: Skip image, font, and media requests in
+                browsers launched by the default factory.
+            factory: Coroutine function returning a started crawler.
+        """
+        self.size = max(size, 1)
+        self.contexts_per_browser = max(contexts_per_browser, 1)
+        self.recycle_after = max(recycle_after, 0)
+        self.browser_type = browser_type
+        self.block_resources = block_resources
+        self._factory = factory or self._launch
+        self._browsers = [_PooledBrowser() for _ in range(self.size)]
+        self._capacity = asyncio.Semaphore(self.size * self.contexts_per_browser)
+        self._lock = asyncio.Lock()
+        self._closed = False
+        self.launched = 0
+        self.retired = 0
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[BrowserLease]:
+        """Hold a browser context for one crawl; waits while the pool is full."""
+        if self._closed:
+            raise RuntimeError("Browser pool is closed")
+        async with self._capacity:
+            browser = await self._acquire()
+            session_id = uuid.uuid4().hex
+            try:
+                yield BrowserLease(browser.crawler, session_id)
+            finally:
+                await self._release(browser, session_id)
+
+    def stats(self) -> dict[str, int]:
+        """Current pool occupancy and lifetime launch/retire counts."""
+        return {
+            "browsers": sum(1 for b in self._browsers if b.crawler is not None),
+            "active": sum(b.active for b in self._browsers),
+            "capacity": self.size * self.contexts_per_browser,
+            "launched": self.launched,
+            "retired": self.retired,
+        }
+
+    async def close(self) -> None:
+        """Close every browser, including ones still leased."""
+        self._closed = True
+        async with self._lock:
+            browsers, self._browsers = self._browsers, []
+        for browser in browsers:
+            if browser.crawler is not None:
+                await self._close_crawler(browser.crawler)
+
+    async def _acquire(self) -> _PooledBrowser:
+        """Reserve a context on the least busy healthy browser, launching it if cold."""
+        unhealthy = []
+        async with self._lock:
+            while True:
+                browser = min(
+                    (
+                        b
+                        for b in self._browsers
+                        if not b.retiring and b.active < self.contexts_per_browser
+                    ),
+                    key=lambda b: (b.active, b.crawler is None),
+                )
+                if browser.crawler is None or self._healthy(browser.crawler):
+                    break
+                self._retire(browser)
+                unhealthy.append(browser)
+            browser.active += 1
+            idle = [b for b in unhealthy if b.active == 0]
+            for retired in idle:
+                self._browsers.remove(retired)
+        for retired in unhealthy:
+            await self._log_retire(retired, "unhealthy")
+        for retired in idle:
+            await self._close_crawler(retired.crawler)
+
+        try:
+            async with browser.launching:
+                if browser.crawler is None:
+                    browser.crawler = await self._factory()
+                    self.launched += 1
+                    await logger.info(
+                        "browser_pool_launch",
+                        launched=self.launched,
+                        action="browser_pool_launch",
+                    )
+        except BaseException:
+            async with self._lock:
+                browser.active -= 1
+            raise
+        return browser
+
+    async def _release(self, browser: _PooledBrowser, session_id: str) -> None:
+        """Drop the lease's session, then recycle or close the browser if due."""
+        await self._kill_session(browser.crawler, session_id)
+        reason = None
+        async with self._lock:
+            browser.active -= 1
+            browser.leases += 1
+            if self._closed:
+                return
+            if not browser.retiring:
+                if self.recycle_after and browser.leases >= self.recycle_after:
+                    reason = "recycle"
+                elif not self._healthy(browser.crawler):
+                    reason = "unhealthy"
+                if reason:
+                    self._retire(browser)
+            close = browser.retiring and browser.active == 0
+            if close:
+                self._browsers.remove(browser)
+        if reason:
+            await self._log_retire(browser, reason)
+        if close:
+            await self._close_crawler(browser.crawler)
+
+    def _retire(self, browser: _PooledBrowser) -> None:
+        """Stop leasing ``browser`` and add a cold replacement; caller holds the lock."""
+        browser.retiring = True
+        self.retired += 1
+        self._browsers.append(_PooledBrowser())
+
+    async def _log_retire(self, browser: _PooledBrowser, reason: str) -> None:
+        await logger.info(
+            "browser_pool_retire",
+            reason=reason,
+            leases=browser.leases,
+            active=browser.active,
+            action="browser_pool_retire",
+        )
+
+    async def _launch(self) -> Any:
+        crawler = AsyncWebCrawler(
+            config=BrowserConfig(browser_type=self.browser_type, headless=True)
+        )
+        if self.block_resources:
+            block_heavy_resources(crawler)
+        await crawler.start()
+        return crawler
+
+    @staticmethod
+    def _healthy(crawler: Any) -> bool:
+        """False once the crawler's underlying browser has disconnected."""
+        strategy = getattr(crawler, "crawler_strategy", None)
+        browser = getattr(getattr(strategy, "browser_manager", None), "browser", None)
+        is_connected = getattr(browser, "is_connected", None)
+        if not callable(is_connected):
+            return True
+        try:
+            return bool(is_connected())
+        except Exception:
+            return False
+
+    @staticmethod
+    async def _kill_session(crawler: Any, session_id: str) -> None:
+        """Close the lease's page and context so nothing carries over."""
+        kill_session = getattr(getattr(crawler, "crawler_strategy", None), "kill_session", None)
+        if kill_session is None:
+            return
+        try:
+            result = kill_session(session_id)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as exc:
+            await logger.warning(
+                "browser_pool_session_close_failed",
+                error=str(exc),
+                error_type=type(exc).__name__,
+                action="browser_pool_session_close_failed",
+            )
+
+    @staticmethod
+    async def _close_crawler(crawler: Any) -> None:
+        try:
+            await crawler.close()
+        except Exception as exc:
+            await logger.warning(
+                "browser_pool_close_failed",
+                error=str(exc),
+                error_type=type(exc).__name__,
+                action="browser_pool_close_failed",
+            )
+
+
+_shared_pools: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, BrowserPool] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def shared_browser_pool() -> BrowserPool | None:
+    """Return this event loop's pool built from settings, or None if pooling is off."""
+    loop = asyncio.get_running_loop()
+    pool = _shared_pools.get(loop)
+    if pool is None:
+        settings = load_settings()
+        if settings.crawl4ai_browser_pool_size <= 0:
+            return None
+        pool = BrowserPool(
+            settings.crawl4ai_browser_pool_size,
+            contexts_per_browser=settings.crawl4ai_browser_contexts,
+            recycle_after=settings.crawl4ai_browser_recycle_pages,
+            browser_type=settings.crawl4ai_browser_type,
+            block_resources=settings.crawl4ai_block_resources,
+        )
+        _shared_pools[loop] = pool
+    return pool
+
+
+async def close_shared_browser_pool() -> None:
+    """Close this event loop's shared pool, if one was started."""
+    pool = _shared_pools.pop(asyncio.get_running_loop(), None)
+    if pool is not None:
+        await pool.close()
+
+
+__all__ = [
+    "BrowserLease",
+    "BrowserPool",
+    "block_heavy_resources",
+    "close_shared_browser_pool",
+    "shared_browser_pool",
+]
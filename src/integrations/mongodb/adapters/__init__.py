@@ -1,5 +1,13 @@
 """MongoDB adapters implementing capability protocols."""
 
+from mdrag.integrations.mongodb.adapters.aliases import DocumentAliasStore
+from mdrag.integrations.mongodb.adapters.fingerprints import ChunkFingerprintStore
+from mdrag.integrations.mongodb.adapters.representations import RepresentationStore
 from mdrag.integrations.mongodb.adapters.storage import MongoStorageAdapter
 
-__all__ = ["MongoStorageAdapter"]
+__all__ = [
+    "ChunkFingerprintStore",
+    "DocumentAliasStore",
+    "MongoStorageAdapter",
+    "RepresentationStore",
+]
@@ -0,0 +1,436 @@
+"""Content-hash aliases that let sources with identical content share chunks.
+
+The same file often arrives through several sources (an upload, a Drive sync,
+a crawled link). Only the first copy in a namespace keeps a chunk set; later
+copies are stored as alias document records pointing at that canonical
+document, and their source URL, type, group, and mask are mirrored onto the
+canonical chunks so source filters still match them. A chunk set is deleted
+only when its last reference is released.
+
+Chunks suppressed as duplicates of a chunk stored for another source are
+linked the same way, one chunk at a time: the suppressed chunk's source is
+listed in the canonical chunk's ``duplicate_sources`` and mirrored onto its
+alias fields. A linked chunk is handed to its first linked source instead of
+being deleted with its own source.
+
+Every method accepts an optional ``session`` so alias bookkeeping can run
+inside the transaction of the write that triggered it.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any, Iterable, Optional
+
+from pymongo import ReturnDocument, UpdateOne
+
+from mdrag.capabilities.ingestion.dedup import ChunkDuplicate
+from mdrag.integrations.mongodb.adapters.chunk_schema import CHUNK_SCHEMA_VERSION
+from mdrag.integrations.mongodb.adapters.fingerprints import (
+    ChunkFingerprintStore,
+    record_scope,
+)
+from mdrag.integrations.mongodb.adapters.representations import RepresentationStore
+
+# Chunk fields listing the alias values of each per-source chunk field.
+ALIAS_FIELDS = {
+    "source_url": "alias_source_urls",
+    "source_type": "alias_source_types",
+    "source_group": "alias_source_groups",
+}
+
+# Chunk field listing the alias entries of sources whose duplicate chunks were
+# suppressed in favour of the chunk.
+DUPLICATE_SOURCES_FIELD = "duplicate_sources"
+
+_SOURCE_MASKS = {"web": 1, "gdrive": 2, "upload": 4}
+
+
+def _document_mask(document: dict[str, Any]) -> int:
+    """Source mask of a document record, derived for records that predate it."""
+    mask = document.get("source_mask")
+    if mask is None:
+        return _SOURCE_MASKS.get(document.get("source_type") or "", 0)
+    return int(mask)
+
+
+def _source_group(document: dict[str, Any]) -> Optional[str]:
+    return (document.get("namespace") or {}).get("source_group")
+
+
+def alias_entry(document_id: Any, document: dict[str, Any]) -> dict[str, Any]:
+    """Build the alias reference stored on a canonical document."""
+    return {
+        "document_id": document_id,
+        "document_uid": document.get("document_uid"),
+        "source_url": document.get("source_url"),
+        "source_type": document.get("source_type"),
+        "source_id": document.get("source_id"),
+        "source_group": _source_group(document),
+        "source_mask": _document_mask(document),
+    }
+
+
+def linked_source_mask(links: list[dict[str, Any]]) -> int:
+    """Combined source mask of a chunk's duplicate links."""
+    source_mask = 0
+    for link in links:
+        source_mask |= int(link.get("source_mask") or 0)
+    return source_mask
+
+
+def _link_update(links: list[dict[str, Any]]) -> dict[str, Any]:
+    """Update adding linked sources to a chunk's alias fields and source mask."""
+    return {
+        "$addToSet": {
+            alias_field: {"$each": sorted({link[field] for link in links if link.get(field)})}
+            for field, alias_field in ALIAS_FIELDS.items()
+        },
+        "$bit": {"source_mask": {"or": linked_source_mask(links)}},
+    }
+
+
+class DocumentAliasStore:
+    """Maintain canonical documents and their alias references in MongoDB."""
+
+    def __init__(
+        self,
+        documents_collection: Any,
+        chunks_collection: Any,
+        fingerprints: Optional[ChunkFingerprintStore] = None,
+        representations: Optional[RepresentationStore] = None,
+    ) -> None:
+        """Initialize the store.
+
+        Args:
+            documents_collection: Collection holding document records.
+            chunks_collection: Collection holding chunk records.
+            fingerprints: Fingerprint store re-pointed when a chunk set is
+                handed to an alias.
+            representations: Representation store re-pointed when a chunk
+                set is handed to an alias.
+        """
+        self.documents = documents_collection
+        self.chunks = chunks_collection
+        self.fingerprints = fingerprints
+        self.representations = representations
+
+    async def find_canonical(
+        self,
+        content_hash: str,
+        namespace: dict[str, Any],
+        exclude_id: Any = None,
+    ) -> Optional[dict[str, Any]]:
+        """Find the document owning the chunk set for content in a namespace."""
+        query: dict[str, Any] = {
+            "content_hash": content_hash,
+            "namespace.org_id": namespace.get("org_id"),
+            "namespace.user_id": namespace.get("user_id"),
+            "canonical_document_id": {"$exists": False},
+        }
+        if exclude_id is not None:
+            query["_id"] = {"$ne": exclude_id}
+        return await self.documents.find_one(query, {"_id": 1, "document_uid": 1})
+
+    async def attach(
+        self,
+        canonical_id: Any,
+        entry: dict[str, Any],
+        *,
+        session: Any = None,
+    ) -> None:
+        """Record (or refresh) an alias reference on a canonical document."""
+        await self.documents.update_one(
+            {"_id": canonical_id},
+            {"$pull": {"aliases": {"document_id": entry["document_id"]}}},
+            session=session,
+        )
+        canonical = await self.documents.find_one_and_update(
+            {"_id": canonical_id},
+            {"$push": {"aliases": entry}, "$set": {"updated_at": datetime.now()}},
+            return_document=ReturnDocument.AFTER,
+            session=session,
+        )
+        if canonical is not None:
+            await self.sync_chunks(canonical, session=session)
+
+    async def detach(self, alias: dict[str, Any], *, session: Any = None) -> None:
+        """Remove an alias reference from its canonical document."""
+        canonical = await self.documents.find_one_and_update(
+            {"_id": alias["canonical_document_id"]},
+            {
+                "$pull": {"aliases": {"document_id": alias["_id"]}},
+                "$set": {"updated_at": datetime.now()},
+            },
+            return_document=ReturnDocument.AFTER,
+            session=session,
+        )
+        if canonical is not None:
+            await self.sync_chunks(canonical, session=session)
+
+    async def release(self, document: dict[str, Any], *, session: Any = None) -> None:
+        """Drop a document's reference to a chunk set before it is removed.
+
+        Aliases are detached from their canonical document. A canonical
+        document with aliases hands its chunk set to the first alias, so
+        deleting its chunks afterwards removes nothing that is still shared.
+
+        Args:
+            document: Stored document record, including ``aliases`` and
+                ``canonical_document_id`` when present.
+            session: Optional session to run the updates in.
+        """
+        if document.get("canonical_document_id") is not None:
+            await self.detach(document, session=session)
+        elif document.get("aliases"):
+            await self.hand_off(document, session=session)
+
+    async def hand_off(self, canonical: dict[str, Any], *, session: Any = None) -> None:
+        """Move a canonical document's chunk set to its first remaining alias.
+
+        The alias record becomes the canonical document for the other
+        aliases, and the chunks, representations, and fingerprints are
+        re-pointed at it. The old canonical record keeps no aliases.
+        """
+        aliases = list(canonical.get("aliases") or [])
+        owner: Optional[dict[str, Any]] = None
+        while aliases and owner is None:
+            entry = aliases.pop(0)
+            owner = await self.documents.find_one_and_update(
+                {"_id": entry["document_id"]},
+                {
+                    "$unset": {"canonical_document_id": ""},
+                    "$set": {
+                        "aliases": aliases,
+                        "representations": canonical.get("representations"),
+                        "updated_at": datetime.now(),
+                    },
+                },
+                return_document=ReturnDocument.AFTER,
+                session=session,
+            )
+        await self.documents.update_one(
+            {"_id": canonical["_id"]},
+            {"$unset": {"aliases": ""}},
+            session=session,
+        )
+        if owner is None:
+            return
+
+        if aliases:
+            await self.documents.update_many(
+                {"_id": {"$in": [alias["document_id"] for alias in aliases]}},
+                {"$set": {"canonical_document_id": owner["_id"]}},
+                session=session,
+            )
+        identity = {
+            "document_uid": owner.get("document_uid"),
+            "source_url": owner.get("source_url"),
+            "source_type": owner.get("source_type"),
+            "source_id": owner.get("source_id"),
+            "source_group": _source_group(owner),
+        }
+        legacy_update: dict[str, Any] = {}
+        for field, value in identity.items():
+            legacy_update[f"passport.{field}"] = value
+            legacy_update[f"metadata.{field}"] = value
+        # Older chunks also repeat the identity in their passport and metadata.
+        await self.chunks.update_many(
+            {
+                "document_id": canonical["_id"],
+                "schema_version": {"$ne": CHUNK_SCHEMA_VERSION},
+            },
+            {"$set": legacy_update},
+            session=session,
+        )
+        await self.chunks.update_many(
+            {"document_id": canonical["_id"]},
+            {"$set": {"document_id": owner["_id"], **identity}},
+            session=session,
+        )
+        if self.representations is not None:
+            await self.representations.reassign(
+                canonical["_id"],
+                owner["_id"],
+                identity["document_uid"],
+                session=session,
+            )
+        if self.fingerprints is not None and canonical.get("source_url"):
+            # Aliases share their canonical document's namespace.
+            await self.fingerprints.reassign_source(
+                record_scope(owner),
+                canonical["source_url"],
+                identity["source_url"],
+                identity["document_uid"],
+                session=session,
+            )
+        await self.sync_chunks(owner, session=session)
+
+    async def sync_chunks(self, canonical: dict[str, Any], *, session: Any = None) -> None:
+        """Mirror alias source fields and masks onto the canonical chunks."""
+        aliases = canonical.get("aliases") or []
+        source_mask = _document_mask(canonical)
+        for alias in aliases:
+            source_mask |= int(alias.get("source_mask") or 0)
+        update: dict[str, Any] = {"source_mask": source_mask}
+        for field, alias_field in ALIAS_FIELDS.items():
+            update[alias_field] = sorted(
+                {alias[field] for alias in aliases if alias.get(field)}
+            )
+        await self.chunks.update_many(
+            {"document_id": canonical["_id"]},
+            {"$set": update},
+            session=session,
+        )
+        await self.chunks.update_many(
+            {
+                "document_id": canonical["_id"],
+                "schema_version": {"$ne": CHUNK_SCHEMA_VERSION},
+            },
+            {"$set": {"metadata.source_mask": source_mask}},
+            session=session,
+        )
+        # Chunks with duplicate links keep their linked sources on top.
+        linked = [
+            UpdateOne({"_id": chunk["_id"]}, _link_update(chunk[DUPLICATE_SOURCES_FIELD]))
+            async for chunk in self.chunks.find(
+                {
+                    "document_id": canonical["_id"],
+                    f"{DUPLICATE_SOURCES_FIELD}.0": {"$exists": True},
+                },
+                {DUPLICATE_SOURCES_FIELD: 1},
+                session=session,
+            )
+        ]
+        if linked:
+            await self.chunks.bulk_write(linked, ordered=False, session=session)
+
+    async def link_chunks(
+        self,
+        entry: dict[str, Any],
+        duplicates: Iterable[ChunkDuplicate],
+        *,
+        replace: bool = True,
+        session: Any = None,
+    ) -> int:
+        """Link a source to the stored chunks its suppressed chunks duplicate.
+
+        Args:
+            entry: Alias entry of the source's document record.
+            duplicates: Suppressed chunks and their canonical chunks.
+            replace: Drop the source's previous links first.
+            session: Optional session to run the updates in.
+
+        Returns:
+            Number of canonical chunks linked.
+        """
+        if replace:
+            await self.unlink_document(entry["document_id"], session=session)
+        targets = sorted(
+            {
+                (duplicate.canonical_document_uid, duplicate.canonical_chunk_hash)
+                for duplicate in duplicates
+                if duplicate.canonical_document_uid != entry.get("document_uid")
+            }
+        )
+        if not targets:
+            return 0
+        update = _link_update([entry])
+        update["$addToSet"][DUPLICATE_SOURCES_FIELD] = entry
+        result = await self.chunks.bulk_write(
+            [
+                UpdateOne({"document_uid": document_uid, "chunk_hash": chunk_hash}, update)
+                for document_uid, chunk_hash in targets
+            ],
+            ordered=False,
+            session=session,
+        )
+        return result.matched_count
+
+    async def unlink_document(self, document_id: Any, *, session: Any = None) -> None:
+        """Remove a document's duplicate links and re-sync the chunks they were on."""
+        link_filter = {f"{DUPLICATE_SOURCES_FIELD}.document_id": document_id}
+        canonical_ids = await self.chunks.distinct("document_id", link_filter, session=session)
+        if not canonical_ids:
+            return
+        await self.chunks.update_many(
+            link_filter,
+            {"$pull": {DUPLICATE_SOURCES_FIELD: {"document_id": document_id}}},
+            session=session,
+        )
+        async for canonical in self.documents.find(
+            {"_id": {"$in": canonical_ids}},
+            {"_id": 1, "source_type": 1, "source_mask": 1, "aliases": 1},
+            session=session,
+        ):
+            await self.sync_chunks(canonical, session=session)
+
+    async def hand_off_chunks(
+        self,
+        chunk_filter: dict[str, Any],
+        *,
+        session: Any = None,
+    ) -> list[Any]:
+        """Move linked chunks that are about to be deleted to their first linked source.
+
+        The chunk and its fingerprint are re-pointed at the linked source's
+        document record; its other links stay on it.
+
+        Returns:
+            IDs of the chunks handed off, which must not be deleted.
+        """
+        handed_off: list[Any] = []
+        cursor = self.chunks.find(
+            {**chunk_filter, f"{DUPLICATE_SOURCES_FIELD}.0": {"$exists": True}},
+            {"document_uid": 1, "source_url": 1, "chunk_hash": 1, DUPLICATE_SOURCES_FIELD: 1},
+            session=session,
+        )
+        linked = [chunk async for chunk in cursor]
+        scopes: dict[Any, str] = {}
+        if linked and self.fingerprints is not None:
+            # Linked sources share the namespace of the chunk they link to.
+            owner_ids = {chunk[DUPLICATE_SOURCES_FIELD][0]["document_id"] for chunk in linked}
+            async for record in self.documents.find(
+                {"_id": {"$in": list(owner_ids)}},
+                {"namespace": 1},
+                session=session,
+            ):
+                scopes[record["_id"]] = record_scope(record)
+        for chunk in linked:
+            owner, *links = chunk[DUPLICATE_SOURCES_FIELD]
+            update: dict[str, Any] = {
+                "document_id": owner["document_id"],
+                "document_uid": owner.get("document_uid"),
+                "source_url": owner.get("source_url"),
+                "source_type": owner.get("source_type"),
+                "source_id": owner.get("source_id"),
+                "source_group": owner.get("source_group"),
+                "source_mask": linked_source_mask([owner, *links]),
+                DUPLICATE_SOURCES_FIELD: links,
+                "updated_at": datetime.now(),
+            }
+            for field, alias_field in ALIAS_FIELDS.items():
+                update[alias_field] = sorted({link[field] for link in links if link.get(field)})
+            await self.chunks.update_one({"_id": chunk["_id"]}, {"$set": update}, session=session)
+            scope = scopes.get(owner["document_id"])
+            if self.fingerprints is not None and scope is not None and chunk.get("chunk_hash"):
+                await self.fingerprints.reassign_chunks(
+                    scope,
+                    chunk.get("source_url"),
+                    chunk.get("document_uid"),
+                    [chunk["chunk_hash"]],
+                    owner.get("source_url"),
+                    owner.get("document_uid"),
+                    session=session,
+                )
+            handed_off.append(chunk["_id"])
+        return handed_off
+
+
+__all__ = [
+    "ALIAS_FIELDS",
+    "DUPLICATE_SOURCES_FIELD",
+    "DocumentAliasStore",
+    "alias_entry",
+    "linked_source_mask",
+]
@@ -0,0 +1,107 @@
+"""Type-directed conversion of storage payloads into BSON-encodable values.
+
+Chunk payloads share a handful of shapes, so the per-field conversion is
+compiled once per shape (field names and value types) and reused. Fields
+declared as numeric vectors are passed through untouched, and atomic values
+such as strings and floats are never visited; only containers, ints, and
+values that may be ``Path``/``Enum`` instances are converted.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+MIN_INT64 = -(2**63)
+MAX_INT64 = 2**63 - 1
+# Compiled plans kept per sanitizer before the cache is reset.
+MAX_PLANS = 256
+
+# Exact types BSON encodes as-is and that need no conversion.
+_ATOMIC_TYPES = frozenset({str, float, bool, type(None), bytes, datetime})
+
+Step = Optional[Callable[[Any], Any]]
+
+
+def _sanitize_int(value: int) -> Any:
+    """Store ints outside the int64 range as strings."""
+    if value < MIN_INT64 or value > MAX_INT64:
+        return str(value)
+    return value
+
+
+def sanitize_value(value: Any) -> Any:
+    """Convert an arbitrary value into a BSON-encodable one.
+
+    Paths become strings, enums their values, and ints outside the int64
+    range strings; dicts and lists are converted recursively.
+    """
+    kind = type(value)
+    if kind in _ATOMIC_TYPES:
+        return value
+    if kind is dict:
+        return {key: sanitize_value(val) for key, val in value.items()}
+    if kind is list:
+        return [sanitize_value(val) for val in value]
+    if kind is int:
+        return _sanitize_int(value)
+
+    # Subclasses of the types above, checked in order of precedence.
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, Path):
+        return str(value)
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, int):
+        return _sanitize_int(value)
+    if isinstance(value, dict):
+        return {key: sanitize_value(val) for key, val in value.items()}
+    if isinstance(value, list):
+        return [sanitize_value(val) for val in value]
+    return value
+
+
+class PayloadSanitizer:
+    """Sanitize top-level payload fields with a plan compiled per payload shape."""
+
+    def __init__(self, *, vector_fields: Iterable[str] = ()) -> None:
+        """Initialize the sanitizer.
+
+        Args:
+            vector_fields: Fields holding lists of floats (embeddings), which
+                are passed through without visiting their elements.
+        """
+        self.vector_fields = frozenset(vector_fields)
+        self._plans: dict[tuple[Any, ...], tuple[Step, ...]] = {}
+
+    def __call__(self, payload: dict[str, Any]) -> dict[str, Any]:
+        """Return a BSON-encodable copy of ``payload``."""
+        shape = (*payload, *map(type, payload.values()))
+        plan = self._plans.get(shape)
+        if plan is None:
+            plan = self._compile(payload)
+            if len(self._plans) >= MAX_PLANS:
+                self._plans.clear()
+            self._plans[shape] = plan
+        return {
+            key: value if step is None else step(value)
+            for (key, value), step in zip(payload.items(), plan)
+        }
+
+    def _compile(self, payload: dict[str, Any]) -> tuple[Step, ...]:
+        return tuple(self._step(key, type(value)) for key, value in payload.items())
+
+    def _step(self, key: str, kind: type) -> Step:
+        if kind in _ATOMIC_TYPES:
+            return None
+        if key in self.vector_fields and kind is list:
+            return None
+        if kind is int:
+            return _sanitize_int
+        return sanitize_value
+
+
+__all__ = ["PayloadSanitizer", "sanitize_value"]
@@ -0,0 +1,256 @@
+"""Compact chunk schema (v2) and readers/migration for older chunk records.
+
+Version 1 chunks stored their provenance up to three times: as top-level
+filter fields, in a ``passport`` subdocument, and in ``metadata`` (together
+with the document title, ingestion timestamp, and source metadata), plus a
+``frontmatter`` copy, all repeated on every chunk of a document.
+
+Version 2 chunks keep filterable fields at the top level only and leave
+document-level metadata on the parent document record. ``metadata`` holds
+just the chunk-level keys (and any value that differs from what it would
+inherit), so ``chunk_result_metadata`` can rebuild the version 1 view from a
+chunk and its parent document.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+from pymongo import UpdateOne
+
+CHUNK_SCHEMA_VERSION = 2
+
+# Top-level chunk fields used by search filters and purges.
+CHUNK_FILTER_FIELDS = (
+    "source_url",
+    "source_type",
+    "source_id",
+    "source_group",
+    "user_id",
+    "org_id",
+    "page_number",
+    "heading_path",
+    "source_mask",
+)
+
+# Chunk fields accepted as search filters, besides ``source_mask`` and the
+# content-alias fields.
+SEARCH_FILTER_FIELDS = ("source_url", "source_type", "source_group", "user_id", "org_id")
+
+# Fields a source ID or URL is matched against when purging a source. Chunk
+# ``metadata.*`` fields are only present on version 1 chunks.
+PURGE_CHUNK_FIELDS = (
+    "source_url",
+    "metadata.source_url",
+    "metadata.gdrive_file_id",
+    "metadata.crawl_url",
+    "metadata.source_group",
+)
+PURGE_DOCUMENT_FIELDS = (
+    *PURGE_CHUNK_FIELDS,
+    "ingestion_metadata.source_metadata.gdrive_file_id",
+    "ingestion_metadata.source_metadata.crawl_url",
+    "namespace.source_group",
+)
+
+# Version 1 fields that duplicate top-level, metadata, or parent values.
+LEGACY_CHUNK_FIELDS = ("passport", "frontmatter", "summary_context", "content_hash")
+
+# Metadata keys dropped outright: ``raw_text`` repeats the chunk content.
+_DROPPED_METADATA = frozenset({"raw_text"})
+
+# Parent document fields needed to rebuild version 1 chunk metadata.
+PARENT_PROJECTION = {
+    "title": 1,
+    "document_uid": 1,
+    "content_hash": 1,
+    "ingestion_metadata.ingested_at": 1,
+    "ingestion_metadata.source_metadata": 1,
+}
+
+DEFAULT_MIGRATION_BATCH_SIZE = 500
+# Parent documents cached by the migration before the cache is reset.
+_PARENT_CACHE_SIZE = 256
+
+
+def document_metadata(parent: dict[str, Any]) -> dict[str, Any]:
+    """Metadata keys a chunk inherits from its parent document record."""
+    ingestion = parent.get("ingestion_metadata") or {}
+    return {
+        **(ingestion.get("source_metadata") or {}),
+        "document_uid": parent.get("document_uid"),
+        "content_hash": parent.get("content_hash"),
+        "document_title": parent.get("title"),
+        "ingestion_timestamp": ingestion.get("ingested_at"),
+    }
+
+
+def inherited_metadata(chunk: dict[str, Any], parent: dict[str, Any]) -> dict[str, Any]:
+    """Metadata a version 2 chunk exposes without storing it in ``metadata``."""
+    inherited = document_metadata(parent)
+    for field in CHUNK_FILTER_FIELDS:
+        if field in chunk:
+            inherited[field] = chunk[field]
+    return inherited
+
+
+def compact_chunk_metadata(
+    metadata: dict[str, Any],
+    inherited: dict[str, Any],
+) -> dict[str, Any]:
+    """Keep only the metadata that cannot be rebuilt from ``inherited``."""
+    return {
+        key: value
+        for key, value in metadata.items()
+        if value is not None
+        and key not in _DROPPED_METADATA
+        and (key not in inherited or inherited[key] != value)
+    }
+
+
+def parent_expression(path: str) -> dict[str, Any]:
+    """Aggregation expression projecting ``PARENT_PROJECTION`` from ``$path``.
+
+    Used after a ``$lookup`` of the parent document, where dotted names are
+    not allowed inside an expression object.
+    """
+    expression: dict[str, Any] = {}
+    for field in PARENT_PROJECTION:
+        *parents, leaf = field.split(".")
+        target = expression
+        for name in parents:
+            target = target.setdefault(name, {})
+        target[leaf] = f"${path}.{field}"
+    return expression
+
+
+def chunk_result_metadata(
+    chunk: dict[str, Any],
+    parent: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    """Return the full metadata view of a chunk of any schema version.
+
+    Version 1 metadata is returned as stored. Version 2 metadata is merged
+    over the chunk's top-level fields and its parent document's metadata.
+
+    Args:
+        chunk: Chunk record, including its top-level filter fields and
+            ``schema_version`` when present.
+        parent: Parent document record, projected with at least
+            ``PARENT_PROJECTION``.
+    """
+    metadata = chunk.get("metadata") or {}
+    if chunk.get("schema_version", 1) < CHUNK_SCHEMA_VERSION:
+        return dict(metadata)
+    return {**inherited_metadata(chunk, parent or {}), **metadata}
+
+
+def upgrade_chunk(
+    chunk: dict[str, Any],
+    parent: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    """Build the update rewriting a version 1 chunk into the version 2 schema.
+
+    Filter fields missing at the top level are lifted from the passport or
+    metadata first. Chunks whose parent document is gone keep their
+    document-level metadata, since nothing else records it.
+    """
+    passport = chunk.get("passport") or {}
+    metadata = dict(chunk.get("metadata") or {})
+    top_level: dict[str, Any] = {}
+    for field in CHUNK_FILTER_FIELDS:
+        if field in chunk:
+            continue
+        value = passport.get(field, metadata.get(field))
+        if value is not None:
+            top_level[field] = value
+    if chunk.get("summary_context") is not None:
+        metadata.setdefault("summary_context", chunk["summary_context"])
+
+    inherited = inherited_metadata({**chunk, **top_level}, parent or {})
+    return {
+        "$set": {
+            **top_level,
+            "metadata": compact_chunk_metadata(metadata, inherited),
+            "schema_version": CHUNK_SCHEMA_VERSION,
+        },
+        "$unset": {field: "" for field in LEGACY_CHUNK_FIELDS},
+    }
+
+
+async def migrate_chunks(
+    chunks_collection: Any,
+    documents_collection: Any,
+    *,
+    batch_size: int = DEFAULT_MIGRATION_BATCH_SIZE,
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """Rewrite older chunks into the version 2 schema in streamed batches.
+
+    Chunks are streamed in natural order (a document's chunks are written
+    together, so a small cache of parent documents avoids refetching them),
+    and updates are sent as unordered bulk writes of ``batch_size``
+    operations. Only chunks not yet at version 2 are read, so an interrupted
+    migration can simply be run again.
+
+    Args:
+        chunks_collection: Collection holding chunk records.
+        documents_collection: Collection holding document records.
+        batch_size: Updates per bulk write.
+        dry_run: Count the chunks that would be rewritten without writing.
+
+    Returns:
+        Counts of scanned and migrated chunks.
+    """
+    cursor = chunks_collection.find(
+        {"schema_version": {"$ne": CHUNK_SCHEMA_VERSION}},
+        {"content": 0, "embedding": 0},
+        batch_size=batch_size,
+    )
+    parents: dict[Any, Optional[dict[str, Any]]] = {}
+    operations: list[Any] = []
+    scanned = migrated = 0
+    async for chunk in cursor:
+        scanned += 1
+        document_id = chunk.get("document_id")
+        if document_id not in parents:
+            if len(parents) >= _PARENT_CACHE_SIZE:
+                parents.clear()
+            parents[document_id] = await documents_collection.find_one(
+                {"_id": document_id},
+                PARENT_PROJECTION,
+            )
+        operations.append(
+            UpdateOne({"_id": chunk["_id"]}, upgrade_chunk(chunk, parents[document_id]))
+        )
+        if len(operations) >= batch_size:
+            migrated += await _apply(chunks_collection, operations, dry_run)
+            operations = []
+    if operations:
+        migrated += await _apply(chunks_collection, operations, dry_run)
+    return {"scanned": scanned, "migrated": migrated}
+
+
+async def _apply(chunks_collection: Any, operations: list[Any], dry_run: bool) -> int:
+    if dry_run:
+        return len(operations)
+    result = await chunks_collection.bulk_write(operations, ordered=False)
+    return result.modified_count
+
+
+__all__ = [
+    "CHUNK_FILTER_FIELDS",
+    "CHUNK_SCHEMA_VERSION",
+    "DEFAULT_MIGRATION_BATCH_SIZE",
+    "LEGACY_CHUNK_FIELDS",
+    "PARENT_PROJECTION",
+    "PURGE_CHUNK_FIELDS",
+    "PURGE_DOCUMENT_FIELDS",
+    "SEARCH_FILTER_FIELDS",
+    "chunk_result_metadata",
+    "compact_chunk_metadata",
+    "inherited_metadata",
+    "migrate_chunks",
+    "parent_expression",
+    "upgrade_chunk",
+]
@@ -0,0 +1,193 @@
+"""Per-namespace chunk fingerprint index used for duplicate suppression."""
+
+from __future__ import annotations
+
+from typing import Any, Iterable, List, Sequence
+
+from mdrag.capabilities.ingestion.dedup import (
+    ChunkDuplicate,
+    ChunkFingerprint,
+    from_signed64,
+    hamming_distance,
+    to_signed64,
+)
+from mdrag.capabilities.ingestion.models import Namespace
+
+# Fingerprints per candidate query, to bound the size of ``$in`` lists.
+LOOKUP_BATCH_SIZE = 500
+
+
+def namespace_scope(namespace: Namespace) -> str:
+    """Key fingerprints by tenant so duplicates never cross namespaces."""
+    return f"{namespace.org_id or ''}:{namespace.user_id or ''}"
+
+
+def record_scope(record: dict[str, Any]) -> str:
+    """Return the fingerprint scope of a stored document record."""
+    return namespace_scope(Namespace(**(record.get("namespace") or {})))
+
+
+class ChunkFingerprintStore:
+    """Read and write chunk fingerprints in MongoDB."""
+
+    def __init__(self, collection: Any) -> None:
+        """Initialize the store.
+
+        Args:
+            collection: MongoDB collection holding fingerprint records.
+        """
+        self.collection = collection
+
+    async def find_duplicates(
+        self,
+        scope: str,
+        source_url: str,
+        fingerprints: Sequence[ChunkFingerprint],
+        max_distance: int,
+    ) -> dict[int, ChunkDuplicate]:
+        """Match fingerprints against chunks stored for other sources in scope.
+
+        Chunks from ``source_url`` itself are excluded so re-ingesting a
+        source never suppresses its own chunks.
+        """
+        duplicates: dict[int, ChunkDuplicate] = {}
+        for start in range(0, len(fingerprints), LOOKUP_BATCH_SIZE):
+            batch = fingerprints[start : start + LOOKUP_BATCH_SIZE]
+            by_hash = {fingerprint.chunk_hash: fingerprint for fingerprint in batch}
+            bands = sorted({band for fingerprint in batch for band in fingerprint.bands})
+            candidates: List[dict[str, Any]] = [
+                record
+                async for record in self.collection.find(
+                    {
+                        "scope": scope,
+                        "source_url": {"$ne": source_url},
+                        "$or": [
+                            {"chunk_hash": {"$in": list(by_hash)}},
+                            {"bands": {"$in": bands}},
+                        ],
+                    },
+                    {"chunk_hash": 1, "simhash": 1, "document_uid": 1, "bands": 1},
+                )
+            ]
+
+            exact = {record["chunk_hash"]: record for record in candidates}
+            by_band: dict[int, List[dict[str, Any]]] = {}
+            for record in candidates:
+                for band in record.get("bands") or []:
+                    by_band.setdefault(band, []).append(record)
+            for fingerprint in batch:
+                record = exact.get(fingerprint.chunk_hash)
+                if record is not None:
+                    duplicates[fingerprint.index] = ChunkDuplicate(
+                        index=fingerprint.index,
+                        canonical_document_uid=record["document_uid"],
+                        canonical_chunk_hash=record["chunk_hash"],
+                        exact=True,
+                    )
+                    continue
+                match = next(
+                    (
+                        record
+                        for band in fingerprint.bands
+                        for record in by_band.get(band, [])
+                        if hamming_distance(
+                            from_signed64(record["simhash"]),
+                            fingerprint.simhash,
+                        )
+                        <= max_distance
+                    ),
+                    None,
+                )
+                if match is not None:
+                    duplicates[fingerprint.index] = ChunkDuplicate(
+                        index=fingerprint.index,
+                        canonical_document_uid=match["document_uid"],
+                        canonical_chunk_hash=match["chunk_hash"],
+                        exact=False,
+                    )
+        return duplicates
+
+    async def write(
+        self,
+        scope: str,
+        source_url: str,
+        document_uid: str,
+        fingerprints: Iterable[ChunkFingerprint],
+        *,
+        replace: bool = True,
+    ) -> None:
+        """Record fingerprints for a source, replacing its previous ones."""
+        if replace:
+            await self.collection.delete_many({"source_url": source_url, "scope": scope})
+        records = [
+            {
+                "scope": scope,
+                "source_url": source_url,
+                "document_uid": document_uid,
+                "chunk_hash": fingerprint.chunk_hash,
+                "simhash": to_signed64(fingerprint.simhash),
+                "bands": fingerprint.bands,
+            }
+            for fingerprint in fingerprints
+        ]
+        if records:
+            await self.collection.insert_many(records, ordered=False)
+
+    async def reassign_source(
+        self,
+        scope: str,
+        source_url: str,
+        new_source_url: str,
+        document_uid: str,
+        *,
+        session: Any = None,
+    ) -> None:
+        """Move fingerprints to the source that took over a shared chunk set."""
+        await self.collection.update_many(
+            {"scope": scope, "source_url": source_url},
+            {"$set": {"source_url": new_source_url, "document_uid": document_uid}},
+            session=session,
+        )
+
+    async def reassign_chunks(
+        self,
+        scope: str,
+        source_url: str,
+        document_uid: str,
+        chunk_hashes: Iterable[str],
+        new_source_url: str,
+        new_document_uid: str,
+        *,
+        session: Any = None,
+    ) -> None:
+        """Move single chunks' fingerprints to the source that took them over."""
+        await self.collection.update_many(
+            {
+                "scope": scope,
+                "source_url": source_url,
+                "document_uid": document_uid,
+                "chunk_hash": {"$in": list(chunk_hashes)},
+            },
+            {"$set": {"source_url": new_source_url, "document_uid": new_document_uid}},
+            session=session,
+        )
+
+    async def delete_sources(
+        self,
+        scope: str,
+        source_urls: Iterable[str],
+        *,
+        session: Any = None,
+    ) -> int:
+        """Delete fingerprints for sources purged from a namespace."""
+        urls = list(source_urls)
+        if not urls:
+            return 0
+        result = await self.collection.delete_many(
+            {"scope": scope, "source_url": {"$in": urls}},
+            session=session,
+        )
+        return result.deleted_count
+
+
+__all__ = ["ChunkFingerprintStore", "namespace_scope", "record_scope"]
@@ -0,0 +1,248 @@
+"""Compressed, page-addressable storage for document representations.
+
+Full markdown, Docling JSON, and per-page texts are kept out of the documents
+collection (which search pipelines ``$lookup`` into) and stored as compressed
+records in a side collection. Each record is addressed by
+``(document_id, kind, key, part)`` so a single page can be read without
+loading the rest of the document.
+"""
+
+from __future__ import annotations
+
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+from bson import Binary
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+from mdrag.mdrag_logging.service_logging import get_logger
+
+logger = get_logger(__name__)
+
+KIND_MARKDOWN = "markdown"
+KIND_DOCLING_JSON = "docling_json"
+KIND_PAGE_TEXT = "page_text"
+
+# Keep each record well below the 16 MB BSON limit.
+MAX_RECORD_BYTES = 8 * 1024 * 1024
+
+
+def compress_payload(data: bytes) -> tuple[str, bytes]:
+    """Compress bytes with zstd when available, zlib otherwise.
+
+    Returns:
+        Tuple of codec name and compressed bytes.
+    """
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=3).compress(data)
+    return "zlib", zlib.compress(data, 6)
+
+
+def decompress_payload(codec: str, data: bytes) -> bytes:
+    """Decompress bytes written by ``compress_payload``."""
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd representations")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "zlib":
+        return zlib.decompress(data)
+    return data
+
+
+class RepresentationStore:
+    """Read and write compressed document representations."""
+
+    def __init__(self, collection: Any) -> None:
+        """Initialize the store.
+
+        Args:
+            collection: MongoDB collection holding representation records.
+        """
+        self.collection = collection
+
+    async def write_segment(
+        self,
+        document_id: Any,
+        document_uid: str,
+        *,
+        segment: int = 0,
+        markdown: Optional[str] = None,
+        docling_json: Optional[Dict[str, Any]] = None,
+        page_texts: Optional[Dict[str, str]] = None,
+        session: Any = None,
+    ) -> Dict[str, Any]:
+        """Write one segment of a document's representations.
+
+        Whole documents are written as segment 0; page-windowed documents write
+        one segment per window. Page texts are keyed by page number.
+
+        Returns:
+            Summary with the codec used and raw/stored byte counts.
+        """
+        records: list[Dict[str, Any]] = []
+        if markdown:
+            records.extend(
+                self._build_records(
+                    document_id,
+                    document_uid,
+                    KIND_MARKDOWN,
+                    segment,
+                    markdown.encode("utf-8"),
+                )
+            )
+        if docling_json:
+            records.extend(
+                self._build_records(
+                    document_id,
+                    document_uid,
+                    KIND_DOCLING_JSON,
+                    segment,
+                    json.dumps(docling_json, default=str).encode("utf-8"),
+                )
+            )
+        for page, text in (page_texts or {}).items():
+            if not text:
+                continue
+            records.extend(
+                self._build_records(
+                    document_id,
+                    document_uid,
+                    KIND_PAGE_TEXT,
+                    int(page),
+                    text.encode("utf-8"),
+                )
+            )
+
+        if records:
+            await self.collection.insert_many(records, ordered=False, session=session)
+        summary = {
+            "codec": records[0]["codec"] if records else None,
+            "record_count": len(records),
+            "raw_bytes": sum(record["raw_size"] for record in records),
+            "stored_bytes": sum(len(record["data"]) for record in records),
+        }
+        await logger.debug(
+            "representations_written",
+            action="representations_written",
+            document_uid=document_uid,
+            segment=segment,
+            **summary,
+        )
+        return summary
+
+    async def delete(self, document_ids: Iterable[Any], *, session: Any = None) -> int:
+        """Delete all representation records for the given documents."""
+        ids = list(document_ids)
+        if not ids:
+            return 0
+        result = await self.collection.delete_many(
+            {"document_id": {"$in": ids}},
+            session=session,
+        )
+        return result.deleted_count
+
+    async def reassign(
+        self,
+        document_id: Any,
+        new_document_id: Any,
+        document_uid: str,
+        *,
+        session: Any = None,
+    ) -> None:
+        """Move representation records to another document record."""
+        await self.collection.update_many(
+            {"document_id": document_id},
+            {"$set": {"document_id": new_document_id, "document_uid": document_uid}},
+            session=session,
+        )
+
+    async def get_page_text(self, document_id: Any, page_number: int) -> Optional[str]:
+        """Return the text of a single page, or None if it was not stored."""
+        async for _, data in self._segments(document_id, KIND_PAGE_TEXT, key=int(page_number)):
+            return data.decode("utf-8")
+        return None
+
+    async def get_markdown(self, document_id: Any) -> Optional[str]:
+        """Return the full markdown, joining segments in order."""
+        segments = [
+            data.decode("utf-8")
+            async for _, data in self._segments(document_id, KIND_MARKDOWN)
+        ]
+        return "\n\n".join(segments) if segments else None
+
+    async def get_docling_json(self, document_id: Any) -> list[Dict[str, Any]]:
+        """Return the Docling JSON for each stored segment, in order."""
+        return [
+            json.loads(data)
+            async for _, data in self._segments(document_id, KIND_DOCLING_JSON)
+        ]
+
+    async def _segments(
+        self,
+        document_id: Any,
+        kind: str,
+        *,
+        key: Optional[int] = None,
+    ) -> AsyncIterator[tuple[int, bytes]]:
+        """Yield ``(key, raw bytes)`` per key, joining parts before decompressing."""
+        query: Dict[str, Any] = {"document_id": document_id, "kind": kind}
+        if key is not None:
+            query["key"] = key
+        cursor = self.collection.find(
+            query,
+            {"key": 1, "part": 1, "codec": 1, "data": 1},
+        ).sort([("key", 1), ("part", 1)])
+
+        current_key: Optional[int] = None
+        codec = ""
+        parts: list[bytes] = []
+        async for record in cursor:
+            if current_key is not None and record["key"] != current_key:
+                yield current_key, decompress_payload(codec, b"".join(parts))
+                parts = []
+            current_key = record["key"]
+            codec = record["codec"]
+            parts.append(bytes(record["data"]))
+        if current_key is not None:
+            yield current_key, decompress_payload(codec, b"".join(parts))
+
+    @staticmethod
+    def _build_records(
+        document_id: Any,
+        document_uid: str,
+        kind: str,
+        key: int,
+        raw: bytes,
+    ) -> list[Dict[str, Any]]:
+        """Compress a payload and split it into size-bounded records."""
+        codec, compressed = compress_payload(raw)
+        records = []
+        for part, offset in enumerate(range(0, max(len(compressed), 1), MAX_RECORD_BYTES)):
+            records.append(
+                {
+                    "document_id": document_id,
+                    "document_uid": document_uid,
+                    "kind": kind,
+                    "key": key,
+                    "part": part,
+                    "codec": codec,
+                    "data": Binary(compressed[offset : offset + MAX_RECORD_BYTES]),
+                    "raw_size": len(raw) if part == 0 else 0,
+                }
+            )
+        return records
+
+
+__all__ = [
+    "KIND_DOCLING_JSON",
+    "KIND_MARKDOWN",
+    "KIND_PAGE_TEXT",
+    "RepresentationStore",
+    "compress_payload",
+    "decompress_payload",
+]
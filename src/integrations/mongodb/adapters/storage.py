@@ -2,10 +2,14 @@
 
 from __future__ import annotations
 
+import asyncio
+import weakref
+from collections import defaultdict
+from contextlib import asynccontextmanager, suppress
+from contextvars import ContextVar
+from dataclasses import dataclass, field
 from datetime import datetime
-from enum import Enum
-from pathlib import Path
-from typing import Any, Optional
+from typing import Any, AsyncIterator, Optional
 
 from mdrag.capabilities.ingestion.docling.chunker import DoclingChunks
 from mdrag.capabilities.ingestion.docling.darwinxml_models import DarwinXMLDocument
@@ -13,23 +17,89 @@ from mdrag.capabilities.ingestion.docling.darwinxml_storage import DarwinXMLStor
 from mdrag.capabilities.ingestion.models import (
     IngestionConfig,
     IngestionDocument,
+    Namespace,
     StorageRepresentations,
     StorageResult,
 )
-from mdrag.capabilities.ingestion.protocols import StorageAdapter
+from mdrag.capabilities.ingestion.dedup import ChunkDuplicate, ChunkFingerprint
+from mdrag.capabilities.ingestion.locks import DocumentLocks
+from mdrag.capabilities.ingestion.protocols import (
+    BufferedStorageAdapter,
+    ChunkFingerprintIndex,
+    ContentAliasIndex,
+    IncrementalStorageAdapter,
+)
+from mdrag.integrations.mongodb.adapters.aliases import (
+    DUPLICATE_SOURCES_FIELD,
+    DocumentAliasStore,
+    alias_entry,
+    linked_source_mask,
+)
+from mdrag.integrations.mongodb.adapters.bson_sanitizer import PayloadSanitizer
+from mdrag.integrations.mongodb.adapters.chunk_schema import (
+    CHUNK_SCHEMA_VERSION,
+    LEGACY_CHUNK_FIELDS,
+    compact_chunk_metadata,
+    inherited_metadata,
+)
+from mdrag.integrations.mongodb.adapters.fingerprints import (
+    ChunkFingerprintStore,
+    namespace_scope,
+    record_scope,
+)
+from mdrag.integrations.mongodb.adapters.representations import RepresentationStore
+from mdrag.integrations.mongodb.indexes import build_index_specs, ensure_btree_indexes
 from mdrag.mdrag_logging.service_logging import get_logger
 from mdrag.config.settings import Settings
-from pymongo import AsyncMongoClient
+from bson import ObjectId
+from pymongo import AsyncMongoClient, DeleteMany, InsertOne, ReturnDocument, UpdateOne
 from pymongo.errors import (
+    BulkWriteError,
     ConnectionFailure,
-    DocumentTooLarge,
+    PyMongoError,
     ServerSelectionTimeoutError,
 )
 
 logger = get_logger(__name__)
 
+_sanitize_document = PayloadSanitizer()
+_sanitize_chunk = PayloadSanitizer(vector_fields=("embedding",))
+
+# Fields of a stored document version needed to release content aliases.
+_ALIAS_PROJECTION = {
+    "_id": 1,
+    "content_hash": 1,
+    "source_url": 1,
+    "source_type": 1,
+    "source_mask": 1,
+    "namespace": 1,
+    "canonical_document_id": 1,
+    "aliases": 1,
+    "representations": 1,
+}
 
-class MongoStorageAdapter(StorageAdapter):
+
+@dataclass
+class _WriteBuffer:
+    """Chunk writes buffered across documents, and the locks they hold."""
+
+    operations: list[Any] = field(default_factory=list)
+    # document_uid of each buffered write, to attribute flush failures.
+    owners: list[str] = field(default_factory=list)
+    errors: dict[str, list[str]] = field(default_factory=dict)
+    # Redis locks held until the buffered writes are flushed.
+    held_locks: dict[str, Any] = field(default_factory=dict)
+    active_documents: set[str] = field(default_factory=set)
+    # Extends the held locks while writes stay buffered.
+    keepalive: Optional[asyncio.Task] = None
+
+
+class MongoStorageAdapter(
+    IncrementalStorageAdapter,
+    BufferedStorageAdapter,
+    ChunkFingerprintIndex,
+    ContentAliasIndex,
+):
     """MongoDB storage adapter for documents and chunks."""
 
     name = "mongodb"
@@ -40,6 +110,7 @@ class MongoStorageAdapter(StorageAdapter):
         settings: Settings,
         config: IngestionConfig,
         mongo_client: Optional[AsyncMongoClient] = None,
+        document_locks: Optional[DocumentLocks] = None,
     ) -> None:
         """Initialize MongoDB storage adapter.
 
@@ -47,13 +118,26 @@ class MongoStorageAdapter(StorageAdapter):
             settings: Application settings.
             config: Ingestion configuration.
             mongo_client: Optional pre-configured Mongo client.
+            document_locks: Distributed locks serializing writers of the same
+                ``document_uid`` across workers (default: no locking).
         """
         self.settings = settings
         self.config = config
         self.mongo_client = mongo_client
+        self.document_locks = document_locks
+        self._local_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
         self.db: Optional[Any] = None
         self._initialized = False
         self.darwin_storage: Optional[DarwinXMLStorage] = None
+        self.representations: Optional[RepresentationStore] = None
+        self.fingerprints: Optional[ChunkFingerprintStore] = None
+        self.aliases: Optional[DocumentAliasStore] = None
+        self._default_buffer = _WriteBuffer()
+        self._scoped_buffer: ContextVar[Optional[_WriteBuffer]] = ContextVar(
+            f"mongodb_write_buffer_{id(self)}", default=None
+        )
 
     async def initialize(self) -> None:
         """Initialize MongoDB connection and DarwinXML storage."""
@@ -72,8 +156,21 @@ class MongoStorageAdapter(StorageAdapter):
                 )
             self.db = self.mongo_client[self.settings.mongodb_database]
             await self.mongo_client.admin.command("ping")
+            self.representations = RepresentationStore(
+                self.db[self.settings.mongodb_collection_representations]
+            )
+            self.fingerprints = ChunkFingerprintStore(
+                self.db[self.settings.mongodb_collection_chunk_fingerprints]
+            )
+            self.aliases = DocumentAliasStore(
+                self.db[self.settings.mongodb_collection_documents],
+                self.db[self.settings.mongodb_collection_chunks],
+                self.fingerprints,
+                self.representations,
+            )
+            await ensure_btree_indexes(self.db, build_index_specs(self.settings))
 
-            if self.config.enable_darwinxml and self.db:
+            if self.config.enable_darwinxml and self.db is not None:
                 chunks_collection = self.db[self.settings.mongodb_collection_chunks]
                 self.darwin_storage = DarwinXMLStorage(
                     chunks_collection=chunks_collection,
@@ -93,8 +190,9 @@ class MongoStorageAdapter(StorageAdapter):
             raise
 
     async def close(self) -> None:
-        """Close MongoDB connections."""
+        """Flush buffered chunk writes and close MongoDB connections."""
         if self._initialized and self.mongo_client:
+            await self.flush()
             await self.mongo_client.close()
         self._initialized = False
         self.mongo_client = None
@@ -104,8 +202,10 @@ class MongoStorageAdapter(StorageAdapter):
         """Delete all documents and chunks from MongoDB."""
         if not self._initialized:
             await self.initialize()
-        if not self.db:
+        if self.db is None:
             return
+        self._buffer.operations.clear()
+        self._buffer.owners.clear()
         await logger.warning(
             "mongodb_cleanup_start",
             action="mongodb_cleanup_start",
@@ -118,6 +218,15 @@ class MongoStorageAdapter(StorageAdapter):
             action="mongodb_chunks_deleted",
             deleted_count=chunks_result.deleted_count,
         )
+        representations_result = await self.db[
+            self.settings.mongodb_collection_representations
+        ].delete_many({})
+        await logger.info(
+            "mongodb_representations_deleted",
+            action="mongodb_representations_deleted",
+            deleted_count=representations_result.deleted_count,
+        )
+        await self.db[self.settings.mongodb_collection_chunk_fingerprints].delete_many({})
         docs_result = await documents_collection.delete_many({})
         await logger.info(
             "mongodb_documents_deleted",
@@ -132,19 +241,718 @@ class MongoStorageAdapter(StorageAdapter):
         representations: StorageRepresentations,
         darwin_documents: list[DarwinXMLDocument],
     ) -> StorageResult:
-        """Persist document and chunks into MongoDB."""
+        """Persist document and chunks into MongoDB.
+
+        With ``transactional_writes`` the document record, its representations,
+        and its chunk replacement commit atomically. Otherwise chunk writes may
+        be buffered across documents (``write_batch_size``) and sent together
+        on ``flush``.
+        """
         if not self._initialized:
             await self.initialize()
-        if not self.db:
+        if self.db is None:
             raise RuntimeError("MongoDB storage is not initialized")
 
+        async with self._document_lock(document.document_uid):
+            if not self.config.transactional_writes:
+                return await self._store(document, chunks, representations, darwin_documents)
+            await self.flush()
+            async with self.mongo_client.start_session() as session:
+                return await session.with_transaction(
+                    lambda txn: self._store(
+                        document,
+                        chunks,
+                        representations,
+                        darwin_documents,
+                        session=txn,
+                    )
+                )
+
+    @asynccontextmanager
+    async def write_scope(self) -> AsyncIterator[None]:
+        """Buffer chunk writes made inside the scope apart from other callers.
+
+        Writes, flush errors, and held document locks belong to the current
+        task and the tasks it starts, so concurrent jobs sharing this adapter
+        never flush, report, or release each other's writes. The scope's
+        remaining writes are flushed when it exits.
+        """
+        token = self._scoped_buffer.set(_WriteBuffer())
+        try:
+            yield
+        finally:
+            try:
+                await self.flush()
+            finally:
+                self._scoped_buffer.reset(token)
+
+    @property
+    def _buffer(self) -> _WriteBuffer:
+        """The write buffer of the current ``write_scope``, or the adapter's."""
+        buffer = self._scoped_buffer.get()
+        return self._default_buffer if buffer is None else buffer
+
+    async def flush(self) -> None:
+        """Send chunk writes buffered across documents in one bulk write.
+
+        Only the current ``write_scope``'s writes are sent. Failed writes are
+        attributed to the documents that buffered them and kept for
+        ``pop_write_errors``; the other writes of the unordered bulk write
+        still apply. Document locks held for the flushed writes are released
+        afterwards.
+        """
+        buffer = self._buffer
+        if buffer.operations and self.db is not None:
+            operations, buffer.operations = buffer.operations, []
+            owners, buffer.owners = buffer.owners, []
+            chunks_collection = self.db[self.settings.mongodb_collection_chunks]
+            failed: list[tuple[str, str]] = []
+            try:
+                await chunks_collection.bulk_write(operations, ordered=False)
+            except BulkWriteError as exc:
+                failed = [
+                    (owners[error["index"]], error.get("errmsg", ""))
+                    for error in exc.details.get("writeErrors", [])
+                ]
+            except PyMongoError as exc:
+                failed = [(document_uid, str(exc)) for document_uid in dict.fromkeys(owners)]
+            for document_uid, message in failed:
+                errors = buffer.errors.setdefault(document_uid, [])
+                if message not in errors:
+                    errors.append(message)
+            if failed:
+                await logger.error(
+                    "mongodb_chunk_writes_failed",
+                    action="mongodb_chunk_writes_failed",
+                    operation_count=len(operations),
+                    failed_count=len(failed),
+                    document_uids=sorted({document_uid for document_uid, _ in failed}),
+                )
+            await logger.info(
+                "mongodb_chunk_writes_flushed",
+                action="mongodb_chunk_writes_flushed",
+                operation_count=len(operations),
+            )
+        await self._release_document_locks()
+
+    def buffered_documents(self) -> set[str]:
+        """document_uids with chunk writes still waiting for a flush."""
+        return set(self._buffer.owners)
+
+    def pop_write_errors(self) -> dict[str, list[str]]:
+        """Return and clear errors of flushed writes, keyed by document_uid."""
+        buffer = self._buffer
+        errors, buffer.errors = buffer.errors, {}
+        return errors
+
+    @asynccontextmanager
+    async def _document_lock(self, document_uid: str) -> AsyncIterator[None]:
+        """Hold the document's write lock for a store call.
+
+        The Redis lock stays held while the document's chunk writes are
+        buffered and is released by ``flush``; until then it is extended
+        periodically so it cannot expire. Before waiting on a lock held
+        elsewhere, including by another ``write_scope`` of this adapter, the
+        scope's buffered writes are flushed so it never waits while holding
+        other documents' locks.
+        """
+        if self.document_locks is None:
+            yield
+            return
+        buffer = self._buffer
+        local_lock = self._local_locks.setdefault(document_uid, asyncio.Lock())
+        if local_lock.locked():
+            await self.flush()
+        async with local_lock:
+            if document_uid in buffer.held_locks:
+                # This document's previous writes are still buffered.
+                await self.flush()
+            buffer.active_documents.add(document_uid)
+            try:
+                lock = await self.document_locks.acquire(document_uid, blocking=False)
+                if lock is None:
+                    await self.flush()
+                    lock = await self.document_locks.acquire(document_uid)
+                buffer.held_locks[document_uid] = lock
+                if buffer.keepalive is None:
+                    buffer.keepalive = asyncio.create_task(self._extend_document_locks(buffer))
+                yield
+            finally:
+                buffer.active_documents.discard(document_uid)
+                if not buffer.operations:
+                    await self._release_document_locks()
+
+    async def _release_document_locks(self) -> None:
+        """Release held locks of documents not currently being written."""
+        if self.document_locks is None:
+            return
+        buffer = self._buffer
+        releasable = [uid for uid in buffer.held_locks if uid not in buffer.active_documents]
+        if len(releasable) == len(buffer.held_locks) and buffer.keepalive is not None:
+            # Stop extending before releasing, so no released lock is extended.
+            keepalive, buffer.keepalive = buffer.keepalive, None
+            keepalive.cancel()
+            with suppress(asyncio.CancelledError):
+                await keepalive
+        for document_uid in releasable:
+            lock = buffer.held_locks.pop(document_uid)
+            await self.document_locks.release(document_uid, lock)
+
+    async def _extend_document_locks(self, buffer: _WriteBuffer) -> None:
+        """Extend a buffer's held locks every third of their timeout."""
+        while True:
+            await asyncio.sleep(self.document_locks.timeout / 3)
+            for document_uid, lock in list(buffer.held_locks.items()):
+                await self.document_locks.extend(document_uid, lock)
+
+    async def _store(
+        self,
+        document: IngestionDocument,
+        chunks: list[DoclingChunks],
+        representations: StorageRepresentations,
+        darwin_documents: list[DarwinXMLDocument],
+        *,
+        session: Any = None,
+    ) -> StorageResult:
+        """Write one document version, optionally inside a transaction."""
         documents_collection = self.db[self.settings.mongodb_collection_documents]
         chunks_collection = self.db[self.settings.mongodb_collection_chunks]
 
         identity = document.metadata.identity
-        namespace = document.metadata.namespace.model_dump(exclude_none=True)
         source_mask = self._source_type_to_mask(identity.source_type)
+        window = document.page_window
+
+        previous = None
+        if window and not window.is_first:
+            previous = await self._find_existing_document(
+                documents_collection,
+                document,
+                session=session,
+            )
+        if previous:
+            document_id = previous["_id"]
+            await self._append_document_window(
+                documents_collection,
+                document_id,
+                document,
+                session=session,
+            )
+        else:
+            document_id, previous = await self._upsert_document(
+                documents_collection,
+                document,
+                source_mask,
+                session=session,
+            )
+            if previous:
+                await self._release_previous_version(
+                    previous,
+                    identity.content_hash,
+                    session=session,
+                )
+                await self.representations.delete([document_id], session=session)
+        await self.representations.write_segment(
+            document_id,
+            identity.document_uid,
+            segment=window.index if window else 0,
+            markdown=document.content,
+            docling_json=representations.docling_json,
+            page_texts=document.page_texts,
+            session=session,
+        )
+        await logger.info(
+            "mongodb_document_updated" if previous else "mongodb_document_inserted",
+            action="mongodb_document_updated" if previous else "mongodb_document_inserted",
+            document_uid=identity.document_uid,
+            document_id=str(document_id),
+        )
+
+        chunk_scope = self._chunk_scope(document_id, document)
+        if previous and window:
+            await self._delete_stale_window_chunks(
+                document_id,
+                document,
+                session=session,
+            )
+
+        use_darwin = self.config.enable_darwinxml and darwin_documents
+        if previous and (use_darwin or not self.config.diff_chunk_writes):
+            await self._delete_chunks(chunk_scope, session=session)
+
+        if use_darwin:
+            await self._store_darwin_documents(
+                darwin_documents, chunks, document_id, session=session
+            )
+        elif previous and self.config.diff_chunk_writes:
+            await self._write_chunk_diff(
+                chunks_collection,
+                chunks,
+                chunk_scope=chunk_scope,
+                document_id=document_id,
+                document=document,
+                source_mask=source_mask,
+                session=session,
+            )
+        else:
+            await self._write_chunks(
+                [
+                    InsertOne(
+                        self._build_chunk_document(
+                            chunk,
+                            document_id=document_id,
+                            document=document,
+                            source_mask=source_mask,
+                        )
+                    )
+                    for chunk in chunks
+                ],
+                document_uid=identity.document_uid,
+                session=session,
+            )
+            await logger.info(
+                "mongodb_chunks_inserted",
+                action="mongodb_chunks_inserted",
+                chunk_count=len(chunks),
+            )
+
+        if (
+            previous
+            and previous.get("aliases")
+            and previous.get("content_hash") == identity.content_hash
+        ):
+            # Rewritten chunks carry only this source's mask; restore the aliases'.
+            if session is None:
+                await self.flush()
+            await self.aliases.sync_chunks(
+                {**previous, "source_mask": source_mask},
+                session=session,
+            )
 
+        return StorageResult(
+            adapter=self.name,
+            document_uid=identity.document_uid,
+            document_id=str(document_id),
+            chunk_count=len(chunks),
+            metadata={
+                "source_mask": source_mask,
+                "graph_triple_count": len(representations.graph_triples),
+            },
+        )
+
+    async def store_content_alias(
+        self,
+        document: IngestionDocument,
+    ) -> Optional[StorageResult]:
+        """Store a document as an alias of a stored copy with the same content.
+
+        The alias gets its own document record but no chunks, representations,
+        or fingerprints; its source fields and mask are mirrored onto the
+        canonical document's chunks.
+
+        Returns:
+            The storage result, or None if no other document in the namespace
+            has the same content hash.
+        """
+        if not self._initialized:
+            await self.initialize()
+        if self.db is None or self.aliases is None:
+            return None
+        # The canonical copy's chunks may still be buffered.
+        await self.flush()
+        documents_collection = self.db[self.settings.mongodb_collection_documents]
+        identity = document.metadata.identity
+
+        existing = await self._find_existing_document(documents_collection, document)
+        if existing and existing.get("aliases"):
+            # Other sources share this document's chunk set.
+            return None
+        canonical = await self.aliases.find_canonical(
+            identity.content_hash,
+            document.metadata.namespace.model_dump(exclude_none=True),
+            exclude_id=existing["_id"] if existing else None,
+        )
+        if canonical is None:
+            return None
+
+        if existing and existing.get("canonical_document_id") is not None:
+            if existing["canonical_document_id"] != canonical["_id"]:
+                await self.aliases.detach(existing)
+        elif existing:
+            # The source previously owned a chunk set of its own.
+            await self._delete_chunks({"document_id": existing["_id"]})
+            await self.representations.delete([existing["_id"]])
+            await self.fingerprints.delete_sources(
+                namespace_scope(document.metadata.namespace),
+                [identity.source_url],
+            )
+
+        source_mask = self._source_type_to_mask(identity.source_type)
+        document_payload = self._build_document_payload(document, source_mask)
+        document_payload.pop("representations")
+        document_payload["canonical_document_id"] = canonical["_id"]
+        if existing:
+            document_id = existing["_id"]
+            document_payload.pop("created_at")
+            await documents_collection.update_one(
+                {"_id": document_id},
+                {"$set": document_payload, "$unset": {"representations": ""}},
+            )
+        else:
+            document_id = (await documents_collection.insert_one(document_payload)).inserted_id
+        await self.aliases.attach(canonical["_id"], alias_entry(document_id, document_payload))
+        await logger.info(
+            "mongodb_document_aliased",
+            action="mongodb_document_aliased",
+            document_uid=identity.document_uid,
+            document_id=str(document_id),
+            canonical_document_id=str(canonical["_id"]),
+        )
+        return StorageResult(
+            adapter=self.name,
+            document_uid=identity.document_uid,
+            document_id=str(document_id),
+            chunk_count=0,
+            metadata={
+                "source_mask": source_mask,
+                "canonical_document_id": str(canonical["_id"]),
+                "canonical_document_uid": canonical.get("document_uid"),
+            },
+        )
+
+    async def load_chunk_embeddings(
+        self,
+        document: IngestionDocument,
+        embedding_model: str,
+    ) -> dict[str, list[float]]:
+        """Return embeddings from the stored version of a document.
+
+        Args:
+            document: Incoming document version.
+            embedding_model: Model the new embeddings would be generated with.
+                Vectors produced by other models are not reused.
+
+        Returns:
+            Mapping of chunk hash to stored embedding.
+        """
+        if not self._initialized:
+            await self.initialize()
+        if self.db is None:
+            return {}
+        documents_collection = self.db[self.settings.mongodb_collection_documents]
+        chunks_collection = self.db[self.settings.mongodb_collection_chunks]
+        existing = await self._find_existing_document(documents_collection, document)
+        if not existing:
+            return {}
+
+        embeddings: dict[str, list[float]] = {}
+        cursor = chunks_collection.find(
+            {
+                **self._chunk_scope(existing["_id"], document),
+                "chunk_hash": {"$exists": True},
+                "metadata.embedding_model": embedding_model,
+            },
+            {"chunk_hash": 1, "embedding": 1},
+        )
+        async for chunk_doc in cursor:
+            if chunk_doc.get("embedding"):
+                embeddings[chunk_doc["chunk_hash"]] = chunk_doc["embedding"]
+        return embeddings
+
+    async def delete_source(
+        self,
+        source_url: str,
+        namespace: Optional[Namespace] = None,
+    ) -> dict[str, int]:
+        """Delete documents, chunks, and representations for a source URL.
+
+        Chunk sets shared with other sources through content aliases are kept
+        and handed to a remaining alias, and chunks that other sources'
+        suppressed duplicates link to are handed to the first linked source.
+
+        Args:
+            source_url: Source URL the documents were ingested from.
+            namespace: Restrict deletion to this namespace when provided.
+
+        Returns:
+            Counts of deleted documents and chunks.
+        """
+        if not self._initialized:
+            await self.initialize()
+        if self.db is None:
+            return {"documents_deleted": 0, "chunks_deleted": 0}
+        await self.flush()
+        documents_collection = self.db[self.settings.mongodb_collection_documents]
+
+        doc_filter: dict[str, Any] = {"source_url": source_url}
+        if namespace is not None:
+            doc_filter["namespace.user_id"] = namespace.user_id
+            doc_filter["namespace.org_id"] = namespace.org_id
+        matched = [
+            doc async for doc in documents_collection.find(doc_filter, _ALIAS_PROJECTION)
+        ]
+        if not matched:
+            return {"documents_deleted": 0, "chunks_deleted": 0}
+        for doc in matched:
+            await self.aliases.release(doc)
+            await self.aliases.unlink_document(doc["_id"])
+        doc_ids = [doc["_id"] for doc in matched]
+
+        chunks_deleted = await self._delete_chunks({"document_id": {"$in": doc_ids}})
+        await self.representations.delete(doc_ids)
+        for scope in {record_scope(doc) for doc in matched}:
+            await self.fingerprints.delete_sources(scope, [source_url])
+        docs_result = await documents_collection.delete_many({"_id": {"$in": doc_ids}})
+        await logger.info(
+            "mongodb_source_deleted",
+            action="mongodb_source_deleted",
+            source_url=source_url,
+            documents_deleted=docs_result.deleted_count,
+            chunks_deleted=chunks_deleted,
+        )
+        return {
+            "documents_deleted": docs_result.deleted_count,
+            "chunks_deleted": chunks_deleted,
+        }
+
+    async def find_duplicate_chunks(
+        self,
+        document: IngestionDocument,
+        fingerprints: list[ChunkFingerprint],
+        max_distance: int,
+    ) -> dict[int, ChunkDuplicate]:
+        """Match chunk fingerprints against other sources in the namespace."""
+        if not self._initialized:
+            await self.initialize()
+        if self.fingerprints is None or not fingerprints:
+            return {}
+        return await self.fingerprints.find_duplicates(
+            namespace_scope(document.metadata.namespace),
+            document.metadata.identity.source_url,
+            fingerprints,
+            max_distance,
+        )
+
+    async def record_chunk_fingerprints(
+        self,
+        document: IngestionDocument,
+        fingerprints: list[ChunkFingerprint],
+        duplicates: Optional[dict[int, ChunkDuplicate]] = None,
+    ) -> None:
+        """Replace the fingerprints and duplicate links recorded for a document's source.
+
+        Each suppressed chunk links the source to the chunk it duplicates, so
+        filters on the source still find that content. Page windows after the
+        first append to the fingerprints and links written by earlier windows.
+        """
+        if not self._initialized:
+            await self.initialize()
+        if self.fingerprints is None:
+            return
+        window = document.page_window
+        replace = window is None or window.is_first
+        await self.fingerprints.write(
+            namespace_scope(document.metadata.namespace),
+            document.metadata.identity.source_url,
+            document.metadata.identity.document_uid,
+            fingerprints,
+            replace=replace,
+        )
+        if not (duplicates or replace):
+            return
+        documents_collection = self.db[self.settings.mongodb_collection_documents]
+        stored = await documents_collection.find_one(
+            self._existing_document_filter(document),
+            {
+                "document_uid": 1,
+                "source_url": 1,
+                "source_type": 1,
+                "source_id": 1,
+                "source_mask": 1,
+                "namespace.source_group": 1,
+            },
+        )
+        if stored is None:
+            return
+        if duplicates:
+            # The canonical chunks may still be buffered.
+            await self.flush()
+        linked = await self.aliases.link_chunks(
+            alias_entry(stored["_id"], stored),
+            (duplicates or {}).values(),
+            replace=replace,
+        )
+        if linked:
+            await logger.info(
+                "mongodb_duplicate_chunks_linked",
+                action="mongodb_duplicate_chunks_linked",
+                document_uid=document.metadata.identity.document_uid,
+                linked_count=linked,
+            )
+
+    async def _find_existing_document(
+        self,
+        documents_collection: Any,
+        document: IngestionDocument,
+        *,
+        session: Any = None,
+    ) -> Optional[dict[str, Any]]:
+        """Find the stored version of a document."""
+        return await documents_collection.find_one(
+            self._existing_document_filter(document),
+            _ALIAS_PROJECTION,
+            session=session,
+        )
+
+    async def _upsert_document(
+        self,
+        documents_collection: Any,
+        document: IngestionDocument,
+        source_mask: int,
+        *,
+        session: Any = None,
+    ) -> tuple[Any, Optional[dict[str, Any]]]:
+        """Write the document record in a single round trip.
+
+        The ``_id`` of a new record is generated client-side, so returning the
+        previous version gives both the record ID and the state the alias and
+        chunk-diff logic need.
+
+        Returns:
+            The record ID and the previous version, or None if it was inserted.
+        """
+        document_payload = self._build_document_payload(document, source_mask)
+        created_at = document_payload.pop("created_at")
+        new_id = ObjectId()
+        previous = await documents_collection.find_one_and_update(
+            self._existing_document_filter(document),
+            {
+                "$set": document_payload,
+                "$setOnInsert": {"_id": new_id, "created_at": created_at},
+                "$unset": {"canonical_document_id": ""},
+            },
+            projection=_ALIAS_PROJECTION,
+            upsert=True,
+            return_document=ReturnDocument.BEFORE,
+            session=session,
+        )
+        if previous is None:
+            return new_id, None
+        return previous["_id"], previous
+
+    @staticmethod
+    def _existing_document_filter(document: IngestionDocument) -> dict[str, Any]:
+        """Filter matching the stored version of a document.
+
+        A re-ingested source gets a new ``document_uid`` whenever its content
+        changes, so previous versions are located by source identity within
+        the same namespace.
+        """
+        identity = document.metadata.identity
+        namespace = document.metadata.namespace
+        source_filter: dict[str, Any] = {
+            "source_type": identity.source_type,
+            "namespace.user_id": namespace.user_id,
+            "namespace.org_id": namespace.org_id,
+        }
+        if identity.source_id:
+            source_filter["source_id"] = identity.source_id
+        else:
+            source_filter["source_url"] = identity.source_url
+        return {"$or": [{"document_uid": identity.document_uid}, source_filter]}
+
+    async def _release_previous_version(
+        self,
+        previous: dict[str, Any],
+        content_hash: str,
+        *,
+        session: Any = None,
+    ) -> None:
+        """Detach a rewritten document from chunk sets shared with other sources.
+
+        A source previously stored as an alias now owns its own chunks, and a
+        canonical document whose content changed hands its chunk set to its
+        aliases, which still have the old content.
+        """
+        if previous.get("canonical_document_id") is not None:
+            await self.aliases.detach(previous, session=session)
+        elif previous.get("aliases") and previous.get("content_hash") != content_hash:
+            await self.aliases.hand_off(previous, session=session)
+
+    @staticmethod
+    def _chunk_scope(document_id: Any, document: IngestionDocument) -> dict[str, Any]:
+        """Filter for the stored chunks replaced by this (windowed) document."""
+        if document.page_window:
+            return {"document_id": document_id, "page_window": document.page_window.index}
+        return {"document_id": document_id}
+
+    async def _delete_stale_window_chunks(
+        self,
+        document_id: Any,
+        document: IngestionDocument,
+        *,
+        session: Any = None,
+    ) -> None:
+        """Drop chunks that no page window of the new version will replace.
+
+        The first window removes chunks written by a non-windowed ingestion;
+        the last window removes windows beyond the new page count.
+        """
+        window = document.page_window
+        if window is None:
+            return
+        if window.is_first:
+            await self._delete_chunks(
+                {"document_id": document_id, "page_window": {"$exists": False}},
+                session=session,
+            )
+        if window.is_last:
+            await self._delete_chunks(
+                {
+                    "document_id": document_id,
+                    "page_window": {"$gte": window.total_windows},
+                },
+                session=session,
+            )
+
+    async def _delete_chunks(self, chunk_filter: dict[str, Any], *, session: Any = None) -> int:
+        """Delete chunks, handing chunks other sources' duplicates link to to those sources."""
+        handed_off = await self.aliases.hand_off_chunks(chunk_filter, session=session)
+        if handed_off:
+            chunk_filter = {"$and": [chunk_filter, {"_id": {"$nin": handed_off}}]}
+        chunks_collection = self.db[self.settings.mongodb_collection_chunks]
+        result = await chunks_collection.delete_many(chunk_filter, session=session)
+        return result.deleted_count
+
+    @staticmethod
+    async def _append_document_window(
+        documents_collection: Any,
+        document_id: Any,
+        document: IngestionDocument,
+        *,
+        session: Any = None,
+    ) -> None:
+        """Record a later page window on a document written by its first window."""
+        await documents_collection.update_one(
+            {"_id": document_id},
+            {
+                "$inc": {
+                    "representations.content_length": len(document.content),
+                    "representations.page_count": len(document.page_texts or {}),
+                    "representations.segment_count": 1,
+                },
+                "$set": {"updated_at": datetime.now()},
+            },
+            session=session,
+        )
+
+    def _build_document_payload(
+        self,
+        document: IngestionDocument,
+        source_mask: int,
+    ) -> dict[str, Any]:
+        """Build the MongoDB payload for a document record."""
+        identity = document.metadata.identity
+        namespace = document.metadata.namespace.model_dump(exclude_none=True)
         document_payload = {
             "document_uid": identity.document_uid,
             "content_hash": identity.content_hash,
@@ -153,7 +961,7 @@ class MongoStorageAdapter(StorageAdapter):
             "source_type": identity.source_type,
             "source_id": identity.source_id,
             "source_mime_type": identity.source_mime_type,
-            "content": document.content,
+            "source_mask": source_mask,
             "frontmatter": document.metadata.frontmatter.model_dump(exclude_none=True),
             "namespace": namespace,
             "ingestion_metadata": {
@@ -163,128 +971,200 @@ class MongoStorageAdapter(StorageAdapter):
                 "ingested_at": document.metadata.ingested_at,
                 "source_metadata": document.metadata.source_metadata,
             },
-            "docling_json": representations.docling_json or {},
-            "page_texts": document.page_texts or {},
+            "representations": {
+                "collection": self.settings.mongodb_collection_representations,
+                "content_length": len(document.content),
+                "page_count": len(document.page_texts or {}),
+                "segment_count": 1,
+            },
             "updated_at": datetime.now(),
             "created_at": datetime.now(),
         }
-        document_payload = self._sanitize_for_mongo(document_payload)
+        return _sanitize_document(document_payload)
 
-        existing = await documents_collection.find_one(
-            {"document_uid": identity.document_uid}
+    def _build_chunk_document(
+        self,
+        chunk: DoclingChunks,
+        *,
+        document_id: Any,
+        document: IngestionDocument,
+        source_mask: int,
+    ) -> dict[str, Any]:
+        """Build the MongoDB payload for a single chunk (schema version 2).
+
+        Filter fields live at the top level only; document-level metadata is
+        left on the document record and rebuilt by ``chunk_result_metadata``.
+        """
+        identity = document.metadata.identity
+        passport = chunk.passport
+        chunk_doc = {
+            "document_id": document_id,
+            "document_uid": identity.document_uid,
+            "content": chunk.content,
+            "embedding": chunk.embedding,
+            "chunk_index": chunk.index,
+            "chunk_hash": chunk.chunk_hash,
+            "token_count": chunk.token_count,
+            "source_url": passport.source_url,
+            "source_type": passport.source_type,
+            "source_id": passport.source_id,
+            "source_group": passport.source_group,
+            "user_id": passport.user_id,
+            "org_id": passport.org_id,
+            "page_number": passport.page_number,
+            "heading_path": passport.heading_path,
+            "source_mask": source_mask,
+            "schema_version": CHUNK_SCHEMA_VERSION,
+            "created_at": datetime.now(),
+        }
+        parent = {
+            "title": document.title,
+            "document_uid": identity.document_uid,
+            "content_hash": identity.content_hash,
+            "ingestion_metadata": {
+                "ingested_at": document.metadata.ingested_at,
+                "source_metadata": document.metadata.source_metadata,
+            },
+        }
+        chunk_doc["metadata"] = compact_chunk_metadata(
+            chunk.metadata,
+            inherited_metadata(chunk_doc, parent),
         )
-        try:
-            if existing:
-                document_id = existing["_id"]
-                await documents_collection.update_one(
-                    {"_id": document_id},
-                    {"$set": {**document_payload, "updated_at": datetime.now()}},
-                )
-                await chunks_collection.delete_many(
-                    {"document_uid": identity.document_uid}
-                )
-                await logger.info(
-                    "mongodb_document_updated",
-                    action="mongodb_document_updated",
-                    document_uid=identity.document_uid,
-                    document_id=str(document_id),
-                )
+        if document.page_window:
+            chunk_doc["page_window"] = document.page_window.index
+        return _sanitize_chunk(chunk_doc)
+
+    async def _write_chunk_diff(
+        self,
+        chunks_collection: Any,
+        chunks: list[DoclingChunks],
+        *,
+        chunk_scope: dict[str, Any],
+        document_id: Any,
+        document: IngestionDocument,
+        source_mask: int,
+        session: Any = None,
+    ) -> None:
+        """Apply only the chunk changes between the stored and new versions.
+
+        Chunks are matched by ``chunk_hash``. Matched chunks keep their ``_id``
+        and embedding and only have positional and provenance fields updated
+        (dropping fields of older chunk schemas); unmatched new chunks are
+        inserted and unmatched old chunks are deleted. Everything is sent in a
+        single unordered ``bulk_write``, or buffered with other documents'
+        writes. Matched chunks keep the sources other sources' duplicates
+        link to them; unmatched linked chunks are handed to those sources.
+        """
+        stored: dict[str, list[Any]] = defaultdict(list)
+        legacy_ids: list[Any] = []
+        linked_masks: dict[Any, int] = {}
+        cursor = chunks_collection.find(
+            chunk_scope,
+            {"_id": 1, "chunk_hash": 1, f"{DUPLICATE_SOURCES_FIELD}.source_mask": 1},
+            session=session,
+        )
+        async for chunk_doc in cursor:
+            links = chunk_doc.get(DUPLICATE_SOURCES_FIELD)
+            if links:
+                linked_masks[chunk_doc["_id"]] = linked_source_mask(links)
+            chunk_hash = chunk_doc.get("chunk_hash")
+            if chunk_hash:
+                stored[chunk_hash].append(chunk_doc["_id"])
             else:
-                document_result = await documents_collection.insert_one(
-                    document_payload
-                )
-                document_id = document_result.inserted_id
-                await logger.info(
-                    "mongodb_document_inserted",
-                    action="mongodb_document_inserted",
-                    document_uid=identity.document_uid,
-                    document_id=str(document_id),
-                )
-        except DocumentTooLarge:
-            await logger.warning(
-                "mongodb_document_too_large",
-                action="mongodb_document_too_large",
-                title=document.title,
-                document_uid=identity.document_uid,
+                legacy_ids.append(chunk_doc["_id"])
+
+        operations: list[Any] = []
+        inserted = updated = 0
+        for chunk in chunks:
+            chunk_doc = self._build_chunk_document(
+                chunk,
+                document_id=document_id,
+                document=document,
+                source_mask=source_mask,
             )
-            document_payload["docling_json"] = {}
-            document_payload["page_texts"] = {}
-            document_payload = self._sanitize_for_mongo(document_payload)
-            if existing:
-                document_id = existing["_id"]
-                await documents_collection.update_one(
-                    {"_id": document_id},
-                    {"$set": {**document_payload, "updated_at": datetime.now()}},
-                )
-                await chunks_collection.delete_many(
-                    {"document_uid": identity.document_uid}
+            matches = stored.get(chunk_doc["chunk_hash"])
+            if matches:
+                chunk_id = matches.pop()
+                for field in ("_id", "content", "embedding", "created_at"):
+                    chunk_doc.pop(field, None)
+                chunk_doc["source_mask"] |= linked_masks.get(chunk_id, 0)
+                operations.append(
+                    UpdateOne(
+                        {"_id": chunk_id},
+                        {
+                            "$set": {**chunk_doc, "updated_at": datetime.now()},
+                            "$unset": {field: "" for field in LEGACY_CHUNK_FIELDS},
+                        },
+                    )
                 )
+                updated += 1
             else:
-                document_result = await documents_collection.insert_one(
-                    document_payload
-                )
-                document_id = document_result.inserted_id
+                operations.append(InsertOne(chunk_doc))
+                inserted += 1
 
-        if self.config.enable_darwinxml and darwin_documents:
-            await self._store_darwin_documents(darwin_documents, chunks, document_id)
-        else:
-            chunk_docs = []
-            for chunk in chunks:
-                chunk_metadata = {
-                    **chunk.metadata,
-                    "source_mask": source_mask,
-                }
-                chunk_doc = {
-                    "document_id": document_id,
-                    "document_uid": identity.document_uid,
-                    "content": chunk.content,
-                    "embedding": chunk.embedding,
-                    "chunk_index": chunk.index,
-                    "metadata": chunk_metadata,
-                    "passport": chunk.passport.model_dump(exclude_none=True),
-                    "frontmatter": chunk.frontmatter.model_dump(exclude_none=True),
-                    "token_count": chunk.token_count,
-                    "summary_context": chunk_metadata.get("summary_context"),
-                    "source_url": chunk.passport.source_url,
-                    "source_type": chunk.passport.source_type,
-                    "source_id": chunk.passport.source_id,
-                    "source_group": chunk.passport.source_group,
-                    "user_id": chunk.passport.user_id,
-                    "org_id": chunk.passport.org_id,
-                    "page_number": chunk.passport.page_number,
-                    "heading_path": chunk.passport.heading_path,
-                    "source_mask": source_mask,
-                    "content_hash": identity.content_hash,
-                    "created_at": datetime.now(),
-                }
-                chunk_docs.append(self._sanitize_for_mongo(chunk_doc))
-
-            if chunk_docs:
-                await chunks_collection.insert_many(chunk_docs, ordered=False)
-            await logger.info(
-                "mongodb_chunks_inserted",
-                action="mongodb_chunks_inserted",
-                chunk_count=len(chunk_docs),
+        removed_ids = legacy_ids + [
+            chunk_id for chunk_ids in stored.values() for chunk_id in chunk_ids
+        ]
+        linked_removed = [chunk_id for chunk_id in removed_ids if chunk_id in linked_masks]
+        if linked_removed:
+            handed_off = set(
+                await self.aliases.hand_off_chunks(
+                    {"_id": {"$in": linked_removed}},
+                    session=session,
+                )
             )
+            removed_ids = [chunk_id for chunk_id in removed_ids if chunk_id not in handed_off]
+        if removed_ids:
+            operations.append(DeleteMany({"_id": {"$in": removed_ids}}))
 
-        return StorageResult(
-            adapter=self.name,
-            document_uid=identity.document_uid,
+        await self._write_chunks(
+            operations,
+            document_uid=document.metadata.identity.document_uid,
+            session=session,
+        )
+        await logger.info(
+            "mongodb_chunks_diffed",
+            action="mongodb_chunks_diffed",
             document_id=str(document_id),
-            chunk_count=len(chunks),
-            metadata={
-                "source_mask": source_mask,
-                "graph_triple_count": len(representations.graph_triples),
-            },
+            inserted=inserted,
+            updated=updated,
+            deleted=len(removed_ids),
         )
 
+    async def _write_chunks(
+        self,
+        operations: list[Any],
+        *,
+        document_uid: str = "",
+        session: Any = None,
+    ) -> None:
+        """Send chunk writes now, or buffer them for a shared bulk write.
+
+        Only inserts, updates, and deletes by ``_id`` go through here, so
+        buffered operations from different documents never conflict.
+        """
+        if not operations:
+            return
+        batch_size = self.config.write_batch_size
+        if session is None and batch_size > 0:
+            buffer = self._buffer
+            buffer.operations.extend(operations)
+            buffer.owners.extend([document_uid] * len(operations))
+            if len(buffer.operations) >= batch_size:
+                await self.flush()
+            return
+        chunks_collection = self.db[self.settings.mongodb_collection_chunks]
+        await chunks_collection.bulk_write(operations, ordered=False, session=session)
+
     async def _store_darwin_documents(
         self,
         darwin_documents: list[DarwinXMLDocument],
         chunks: list[DoclingChunks],
         document_id: Any,
+        *,
+        session: Any = None,
     ) -> None:
-        """Persist DarwinXML documents into MongoDB."""
+        """Persist DarwinXML documents into MongoDB, in ``session``'s transaction if given."""
         if not self.darwin_storage:
             await logger.warning(
                 "darwin_storage_missing",
@@ -302,6 +1182,7 @@ class MongoStorageAdapter(StorageAdapter):
             embeddings=embeddings_payload,
             upsert=True,
             document_id=document_id,
+            session=session,
         )
         await logger.info(
             "darwin_chunks_stored",
@@ -314,29 +1195,5 @@ class MongoStorageAdapter(StorageAdapter):
         mapping = {"web": 1, "gdrive": 2, "upload": 4}
         return mapping.get(source_type, 0)
 
-    @staticmethod
-    def _sanitize_for_mongo(value: Any) -> Any:
-        """Ensure values are compatible with MongoDB BSON encoding."""
-        if isinstance(value, bool) or value is None:
-            return value
-        if isinstance(value, Path):
-            return str(value)
-        if isinstance(value, Enum):
-            return value.value
-        if isinstance(value, int):
-            min_int64 = -(2**63)
-            max_int64 = 2**63 - 1
-            if value < min_int64 or value > max_int64:
-                return str(value)
-            return value
-        if isinstance(value, dict):
-            return {
-                key: MongoStorageAdapter._sanitize_for_mongo(val)
-                for key, val in value.items()
-            }
-        if isinstance(value, list):
-            return [MongoStorageAdapter._sanitize_for_mongo(val) for val in value]
-        return value
-
 
 __all__ = ["MongoStorageAdapter"]
@@ -0,0 +1,664 @@
+"""Declarative MongoDB index management for the ingestion collections.
+
+Index specs are derived from settings (embedding dimension and similarity,
+collection and index names) and from the fields the search filter builders,
+purge paths, and storage adapters query on. They are the only definition of
+the indexes: the storage adapter creates missing B-tree indexes from them on
+startup, and ``init_indexes`` syncs all of them. ``IndexManager`` diffs the specs against the live
+B-tree and Atlas Search indexes, applies the differences, waits for search
+indexes to become queryable, and reports filters no live index covers.
+
+Indexes that exist but are not described by a spec are left alone.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Iterable, Optional, Union
+
+from pymongo.errors import OperationFailure
+
+from mdrag.config.settings import Settings
+from mdrag.integrations.mongodb.adapters.aliases import ALIAS_FIELDS, DUPLICATE_SOURCES_FIELD
+from mdrag.integrations.mongodb.adapters.chunk_schema import (
+    PURGE_CHUNK_FIELDS,
+    PURGE_DOCUMENT_FIELDS,
+    SEARCH_FILTER_FIELDS,
+)
+from mdrag.mdrag_logging.service_logging import get_logger
+
+logger = get_logger(__name__)
+
+DEFAULT_READY_TIMEOUT = 300.0
+DEFAULT_POLL_INTERVAL = 5.0
+
+VECTOR_SEARCH = "vectorSearch"
+TEXT_SEARCH = "search"
+BTREE = "btree"
+
+
+@dataclass(frozen=True)
+class BTreeIndexSpec:
+    """A regular (B-tree) index on a collection."""
+
+    collection: str
+    name: str
+    keys: tuple[tuple[str, int], ...]
+    sparse: bool = False
+    unique: bool = False
+
+    @property
+    def kind(self) -> str:
+        return BTREE
+
+
+@dataclass(frozen=True)
+class SearchIndexSpec:
+    """An Atlas Search or Vector Search index on a collection."""
+
+    collection: str
+    name: str
+    kind: str
+    definition: dict[str, Any] = field(hash=False, compare=False)
+
+
+IndexSpec = Union[BTreeIndexSpec, SearchIndexSpec]
+
+
+@dataclass(frozen=True)
+class FilterUsage:
+    """A field queried on by the application, and the index kind serving it."""
+
+    collection: str
+    field: str
+    kind: str
+    used_by: str
+
+
+@dataclass(frozen=True)
+class IndexAction:
+    """One change needed to bring a collection's indexes in line with a spec."""
+
+    action: str
+    spec: IndexSpec
+    drop: Optional[str] = None
+
+
+@dataclass
+class IndexPlan:
+    """Differences between the index specs and the live indexes."""
+
+    actions: list[IndexAction] = field(default_factory=list)
+    unchanged: list[str] = field(default_factory=list)
+    unsupported: list[str] = field(default_factory=list)
+
+
+@dataclass
+class IndexReport:
+    """Outcome of an index sync."""
+
+    plan: IndexPlan
+    failed: list[str] = field(default_factory=list)
+    not_ready: list[str] = field(default_factory=list)
+    unindexed: list[FilterUsage] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not (self.failed or self.not_ready or self.plan.unsupported)
+
+
+def vector_filter_paths() -> tuple[str, ...]:
+    """Chunk fields ``$vectorSearch`` pre-filters may reference."""
+    return (*SEARCH_FILTER_FIELDS, "source_mask", *ALIAS_FIELDS.values())
+
+
+def text_filter_paths() -> tuple[str, ...]:
+    """Chunk fields ``$search`` ``equals`` filters may reference."""
+    return (*SEARCH_FILTER_FIELDS, *ALIAS_FIELDS.values())
+
+
+def _single_field_name(path: str) -> str:
+    return path.replace(".", "_")
+
+
+def build_index_specs(settings: Settings) -> list[IndexSpec]:
+    """Build the index specs for the ingestion collections."""
+    chunks = settings.mongodb_collection_chunks
+    documents = settings.mongodb_collection_documents
+    representations = settings.mongodb_collection_representations
+    fingerprints = settings.mongodb_collection_chunk_fingerprints
+    specs: list[IndexSpec] = [
+        SearchIndexSpec(
+            collection=chunks,
+            name=settings.mongodb_vector_index,
+            kind=VECTOR_SEARCH,
+            definition={
+                "fields": [
+                    {
+                        "type": "vector",
+                        "path": "embedding",
+                        "numDimensions": settings.embedding_dimension,
+                        "similarity": settings.mongodb_vector_similarity,
+                    },
+                    *({"type": "filter", "path": path} for path in vector_filter_paths()),
+                ]
+            },
+        ),
+        SearchIndexSpec(
+            collection=chunks,
+            name=settings.mongodb_text_index,
+            kind=TEXT_SEARCH,
+            definition={
+                "mappings": {
+                    "dynamic": False,
+                    "fields": {
+                        "content": {"type": "string", "analyzer": "lucene.standard"},
+                        **{path: {"type": "token"} for path in text_filter_paths()},
+                    },
+                }
+            },
+        ),
+        BTreeIndexSpec(
+            chunks,
+            "document_id_page_window",
+            (("document_id", 1), ("page_window", 1)),
+        ),
+        BTreeIndexSpec(chunks, "document_uid", (("document_uid", 1),)),
+        # Only chunks other sources' suppressed duplicates link to.
+        BTreeIndexSpec(
+            chunks,
+            "duplicate_sources_document_id",
+            ((f"{DUPLICATE_SOURCES_FIELD}.document_id", 1),),
+            sparse=True,
+        ),
+        # Per-chunk upsert key of DarwinXMLStorage; only DarwinXML chunks have it.
+        BTreeIndexSpec(
+            chunks,
+            "darwin_content_hash_chunk_index",
+            (
+                ("darwin_metadata.provenance.content_hash", 1),
+                ("darwin_metadata.chunk_index", 1),
+            ),
+            sparse=True,
+        ),
+        BTreeIndexSpec(documents, "document_uid", (("document_uid", 1),)),
+        BTreeIndexSpec(
+            documents,
+            "source_url_namespace",
+            (("source_url", 1), ("namespace.org_id", 1), ("namespace.user_id", 1)),
+        ),
+        BTreeIndexSpec(
+            documents,
+            "content_hash_namespace",
+            (("content_hash", 1), ("namespace.org_id", 1), ("namespace.user_id", 1)),
+        ),
+        BTreeIndexSpec(
+            documents,
+            "source_id_namespace",
+            (
+                ("source_id", 1),
+                ("source_type", 1),
+                ("namespace.org_id", 1),
+                ("namespace.user_id", 1),
+            ),
+        ),
+        # Page and segment reads of RepresentationStore.
+        BTreeIndexSpec(
+            representations,
+            "document_kind_key_part",
+            (("document_id", 1), ("kind", 1), ("key", 1), ("part", 1)),
+            unique=True,
+        ),
+        # Band, exact-hash, and source lookups of ChunkFingerprintStore.
+        BTreeIndexSpec(fingerprints, "scope_bands", (("scope", 1), ("bands", 1))),
+        BTreeIndexSpec(fingerprints, "scope_chunk_hash", (("scope", 1), ("chunk_hash", 1))),
+        BTreeIndexSpec(fingerprints, "source_url", (("source_url", 1),)),
+    ]
+    purge_fields = ((chunks, PURGE_CHUNK_FIELDS), (documents, PURGE_DOCUMENT_FIELDS))
+    for collection, paths in purge_fields:
+        for path in paths:
+            if _btree_covers(specs, collection, path):
+                continue
+            # Purge fields other than source_url are absent from most records.
+            specs.append(
+                BTreeIndexSpec(
+                    collection,
+                    _single_field_name(path),
+                    ((path, 1),),
+                    sparse=path != "source_url",
+                )
+            )
+    return specs
+
+
+def build_filter_usages(settings: Settings) -> list[FilterUsage]:
+    """List the fields the application filters the chunks and documents on."""
+    chunks = settings.mongodb_collection_chunks
+    documents = settings.mongodb_collection_documents
+    return [
+        FilterUsage(chunks, "document_id", BTREE, "chunk writes"),
+        FilterUsage(chunks, "document_uid", BTREE, "re-ingestion"),
+        FilterUsage(
+            chunks,
+            f"{DUPLICATE_SOURCES_FIELD}.document_id",
+            BTREE,
+            "duplicate chunk links",
+        ),
+        FilterUsage(
+            chunks,
+            "darwin_metadata.provenance.content_hash",
+            BTREE,
+            "DarwinXML chunk upserts",
+        ),
+        *(FilterUsage(chunks, path, BTREE, "purge_source") for path in PURGE_CHUNK_FIELDS),
+        *(
+            FilterUsage(chunks, path, VECTOR_SEARCH, "semantic_search")
+            for path in vector_filter_paths()
+        ),
+        *(FilterUsage(chunks, path, TEXT_SEARCH, "text_search") for path in text_filter_paths()),
+        FilterUsage(documents, "document_uid", BTREE, "re-ingestion"),
+        FilterUsage(documents, "source_url", BTREE, "re-ingestion"),
+        FilterUsage(documents, "source_id", BTREE, "re-ingestion"),
+        FilterUsage(documents, "content_hash", BTREE, "content aliases"),
+        *(
+            FilterUsage(documents, path, BTREE, "purge_source")
+            for path in PURGE_DOCUMENT_FIELDS
+        ),
+    ]
+
+
+async def ensure_btree_indexes(db: Any, specs: Iterable[IndexSpec]) -> None:
+    """Create the B-tree indexes in ``specs`` that do not exist yet.
+
+    Existing indexes are left as they are; one whose options differ from its
+    spec is logged and left for ``IndexManager.sync`` to replace.
+    """
+    for spec in specs:
+        if not isinstance(spec, BTreeIndexSpec):
+            continue
+        try:
+            await _create_btree(db[spec.collection], spec)
+        except OperationFailure as e:
+            await logger.warning(
+                "index_create_conflict",
+                action="index_create_conflict",
+                index_name=spec.name,
+                collection=spec.collection,
+                error=str(e),
+            )
+
+
+async def _create_btree(collection: Any, spec: BTreeIndexSpec) -> None:
+    options: dict[str, Any] = {"name": spec.name}
+    if spec.sparse:
+        options["sparse"] = True
+    if spec.unique:
+        options["unique"] = True
+    await collection.create_index(list(spec.keys), **options)
+
+
+def _btree_covers(specs: list[IndexSpec], collection: str, path: str) -> bool:
+    return any(
+        isinstance(spec, BTreeIndexSpec)
+        and spec.collection == collection
+        and spec.keys[0][0] == path
+        for spec in specs
+    )
+
+
+def _index_keys(index: dict[str, Any]) -> tuple[tuple[str, Any], ...]:
+    return tuple(
+        (name, int(direction) if isinstance(direction, (int, float)) else direction)
+        for name, direction in index.get("key", {}).items()
+    )
+
+
+def definition_matches(expected: Any, actual: Any) -> bool:
+    """Whether a live definition contains everything a spec asks for.
+
+    Live definitions include server-side defaults, so extra keys in ``actual``
+    are ignored; lists must match item for item, in any order.
+    """
+    if isinstance(expected, dict):
+        return isinstance(actual, dict) and all(
+            key in actual and definition_matches(value, actual[key])
+            for key, value in expected.items()
+        )
+    if isinstance(expected, list):
+        if not isinstance(actual, list) or len(expected) != len(actual):
+            return False
+        remaining = list(actual)
+        for item in expected:
+            match = next(
+                (i for i, live in enumerate(remaining) if definition_matches(item, live)),
+                None,
+            )
+            if match is None:
+                return False
+            remaining.pop(match)
+        return True
+    return expected == actual
+
+
+def _search_covers(index: dict[str, Any], kind: str, path: str) -> bool:
+    if index.get("type", TEXT_SEARCH) != kind:
+        return False
+    definition = index.get("latestDefinition") or {}
+    if kind == VECTOR_SEARCH:
+        return any(item.get("path") == path for item in definition.get("fields", []))
+    mappings = definition.get("mappings") or {}
+    return bool(mappings.get("dynamic")) or path in (mappings.get("fields") or {})
+
+
+class IndexManager:
+    """Bring live indexes in line with declared specs."""
+
+    def __init__(
+        self,
+        db: Any,
+        specs: list[IndexSpec],
+        usages: Iterable[FilterUsage] = (),
+    ) -> None:
+        """Initialize the manager.
+
+        Args:
+            db: Database holding the indexed collections.
+            specs: Indexes that should exist.
+            usages: Filtered fields to check for index coverage.
+        """
+        self.db = db
+        self.specs = list(specs)
+        self.usages = list(usages)
+
+    @classmethod
+    def from_settings(cls, db: Any, settings: Settings) -> "IndexManager":
+        """Build a manager for the specs and filter usages derived from settings."""
+        return cls(db, build_index_specs(settings), build_filter_usages(settings))
+
+    def _collections(self) -> list[str]:
+        names = [spec.collection for spec in self.specs]
+        names += [usage.collection for usage in self.usages]
+        return list(dict.fromkeys(names))
+
+    async def live_indexes(self, collection: str) -> dict[str, dict[str, Any]]:
+        """B-tree indexes of a collection, by name."""
+        cursor = await self.db[collection].list_indexes()
+        return {index["name"]: index for index in await cursor.to_list(length=None)}
+
+    async def live_search_indexes(self, collection: str) -> Optional[dict[str, dict[str, Any]]]:
+        """Search indexes of a collection by name, or None if unsupported."""
+        try:
+            cursor = await self.db[collection].aggregate([{"$listSearchIndexes": {}}])
+            indexes = await cursor.to_list(length=None)
+        except OperationFailure:
+            return None
+        return {index["name"]: index for index in indexes if index.get("name")}
+
+    async def plan(self) -> IndexPlan:
+        """Diff the specs against the live indexes."""
+        plan = IndexPlan()
+        live: dict[str, dict[str, dict[str, Any]]] = {}
+        live_search: dict[str, Optional[dict[str, dict[str, Any]]]] = {}
+        for spec in self.specs:
+            if isinstance(spec, BTreeIndexSpec):
+                if spec.collection not in live:
+                    live[spec.collection] = await self.live_indexes(spec.collection)
+                self._plan_btree(plan, spec, live[spec.collection])
+            else:
+                if spec.collection not in live_search:
+                    live_search[spec.collection] = await self.live_search_indexes(
+                        spec.collection
+                    )
+                self._plan_search(plan, spec, live_search[spec.collection])
+        return plan
+
+    @staticmethod
+    def _plan_btree(
+        plan: IndexPlan,
+        spec: BTreeIndexSpec,
+        live: dict[str, dict[str, Any]],
+    ) -> None:
+        def matches(index: dict[str, Any]) -> bool:
+            return (
+                _index_keys(index) == spec.keys
+                and bool(index.get("sparse")) == spec.sparse
+                and bool(index.get("unique")) == spec.unique
+            )
+
+        existing = live.get(spec.name)
+        if existing is not None:
+            if matches(existing):
+                plan.unchanged.append(spec.name)
+            else:
+                plan.actions.append(IndexAction("replace", spec, drop=spec.name))
+            return
+        # The same keys may already be indexed under another name.
+        for name, index in live.items():
+            if _index_keys(index) == spec.keys:
+                if matches(index):
+                    plan.unchanged.append(name)
+                else:
+                    plan.actions.append(IndexAction("replace", spec, drop=name))
+                return
+        plan.actions.append(IndexAction("create", spec))
+
+    @staticmethod
+    def _plan_search(
+        plan: IndexPlan,
+        spec: SearchIndexSpec,
+        live: Optional[dict[str, dict[str, Any]]],
+    ) -> None:
+        if live is None:
+            plan.unsupported.append(spec.name)
+            return
+        existing = live.get(spec.name)
+        if existing is None:
+            plan.actions.append(IndexAction("create", spec))
+        elif existing.get("type", TEXT_SEARCH) != spec.kind:
+            plan.actions.append(IndexAction("replace", spec, drop=spec.name))
+        elif not definition_matches(spec.definition, existing.get("latestDefinition")):
+            plan.actions.append(IndexAction("update", spec))
+        else:
+            plan.unchanged.append(spec.name)
+
+    async def apply(self, plan: IndexPlan) -> list[str]:
+        """Apply a plan, returning the names of indexes that failed."""
+        failed: list[str] = []
+        for action in plan.actions:
+            spec = action.spec
+            try:
+                if isinstance(spec, BTreeIndexSpec):
+                    await self._apply_btree(action)
+                else:
+                    await self._apply_search(action)
+            except OperationFailure as e:
+                failed.append(spec.name)
+                await logger.error(
+                    "index_apply_failed",
+                    action="index_apply_failed",
+                    index_name=spec.name,
+                    collection=spec.collection,
+                    change=action.action,
+                    error=str(e),
+                )
+                continue
+            await logger.info(
+                f"index_{action.action}d",
+                action=f"index_{action.action}d",
+                index_name=spec.name,
+                index_kind=spec.kind,
+                collection=spec.collection,
+            )
+        return failed
+
+    async def _apply_btree(self, action: IndexAction) -> None:
+        spec = action.spec
+        collection = self.db[spec.collection]
+        if action.drop:
+            await collection.drop_index(action.drop)
+        await _create_btree(collection, spec)
+
+    async def _apply_search(self, action: IndexAction) -> None:
+        spec = action.spec
+        if action.drop:
+            await self.db.command(
+                {"dropSearchIndex": spec.collection, "name": action.drop}
+            )
+        if action.action == "update":
+            await self.db.command(
+                {
+                    "updateSearchIndex": spec.collection,
+                    "name": spec.name,
+                    "definition": spec.definition,
+                }
+            )
+            return
+        await self.db.command(
+            {
+                "createSearchIndexes": spec.collection,
+                "indexes": [
+                    {"name": spec.name, "type": spec.kind, "definition": spec.definition}
+                ],
+            }
+        )
+
+    async def wait_until_queryable(
+        self,
+        names: list[str],
+        *,
+        timeout: float = DEFAULT_READY_TIMEOUT,
+        interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> list[str]:
+        """Poll search indexes until they are queryable.
+
+        Returns:
+            Names of the indexes still not queryable when ``timeout`` expires.
+        """
+        pending = {
+            spec.name: spec.collection
+            for spec in self.specs
+            if isinstance(spec, SearchIndexSpec) and spec.name in names
+        }
+        deadline = time.monotonic() + timeout
+        while pending:
+            for collection in set(pending.values()):
+                live = await self.live_search_indexes(collection) or {}
+                for name, index in live.items():
+                    if pending.get(name) == collection and index.get("queryable"):
+                        del pending[name]
+                        await logger.info(
+                            "search_index_queryable",
+                            action="search_index_queryable",
+                            index_name=name,
+                            collection=collection,
+                            status=index.get("status"),
+                        )
+            if not pending or time.monotonic() >= deadline:
+                break
+            await asyncio.sleep(interval)
+        return sorted(pending)
+
+    async def unindexed_filters(self) -> list[FilterUsage]:
+        """Filter usages no live index serves (queries on them scan)."""
+        unindexed: list[FilterUsage] = []
+        live: dict[str, dict[str, dict[str, Any]]] = {}
+        live_search: dict[str, dict[str, dict[str, Any]]] = {}
+        for collection in self._collections():
+            live[collection] = await self.live_indexes(collection)
+            live_search[collection] = await self.live_search_indexes(collection) or {}
+        for usage in self.usages:
+            if usage.kind == BTREE:
+                covered = any(
+                    keys and keys[0][0] == usage.field
+                    for keys in map(_index_keys, live[usage.collection].values())
+                )
+            else:
+                covered = any(
+                    _search_covers(index, usage.kind, usage.field)
+                    for index in live_search[usage.collection].values()
+                )
+            if not covered:
+                unindexed.append(usage)
+        return unindexed
+
+    async def sync(
+        self,
+        *,
+        dry_run: bool = False,
+        wait: bool = True,
+        timeout: float = DEFAULT_READY_TIMEOUT,
+        interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> IndexReport:
+        """Plan, apply, wait for search indexes, and report unindexed filters.
+
+        Args:
+            dry_run: Only compute the plan and the coverage report.
+            wait: Poll created or updated search indexes until queryable.
+            timeout: Seconds to wait for search indexes.
+            interval: Seconds between polls.
+        """
+        plan = await self.plan()
+        await logger.info(
+            "index_plan_computed",
+            action="index_plan_computed",
+            changes=[f"{a.action}:{a.spec.collection}.{a.spec.name}" for a in plan.actions],
+            unchanged=len(plan.unchanged),
+            unsupported=plan.unsupported,
+            dry_run=dry_run,
+        )
+        report = IndexReport(plan=plan)
+        if plan.unsupported:
+            await logger.warning(
+                "search_indexes_not_supported",
+                action="search_indexes_not_supported",
+                index_names=plan.unsupported,
+            )
+        if not dry_run:
+            report.failed = await self.apply(plan)
+            search_changes = [
+                action.spec.name
+                for action in plan.actions
+                if isinstance(action.spec, SearchIndexSpec)
+                and action.spec.name not in report.failed
+            ]
+            if wait and search_changes:
+                report.not_ready = await self.wait_until_queryable(
+                    search_changes,
+                    timeout=timeout,
+                    interval=interval,
+                )
+                if report.not_ready:
+                    await logger.warning(
+                        "search_indexes_not_queryable",
+                        action="search_indexes_not_queryable",
+                        index_names=report.not_ready,
+                        timeout=timeout,
+                    )
+        report.unindexed = await self.unindexed_filters()
+        for usage in report.unindexed:
+            await logger.warning(
+                "index_unindexed_filter",
+                action="index_unindexed_filter",
+                collection=usage.collection,
+                field=usage.field,
+                index_kind=usage.kind,
+                used_by=usage.used_by,
+            )
+        return report
+
+
+__all__ = [
+    "BTreeIndexSpec",
+    "FilterUsage",
+    "IndexAction",
+    "IndexManager",
+    "IndexPlan",
+    "IndexReport",
+    "SearchIndexSpec",
+    "build_filter_usages",
+    "build_index_specs",
+    "definition_matches",
+    "ensure_btree_indexes",
+]
@@ -39,6 +39,9 @@ class JobResponse(BaseModel):
     job_id: str
     status: str
     status_url: str
+    deduplicated: bool = Field(
+        False, description="True if an identical in-flight job was returned"
+    )
 
 
 class JobStatusResponse(BaseModel):
@@ -50,3 +53,6 @@ class JobStatusResponse(BaseModel):
     updated_at: str
     error: Optional[str] = None
     result: Optional[dict] = None
+    parent_id: Optional[str] = None
+    children: Optional[dict] = None
+    progress: Optional[dict] = None
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import tempfile
 from pathlib import Path
 
-from fastapi import APIRouter, File, HTTPException, UploadFile, status
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile, status
+from fastapi.responses import StreamingResponse
 
 from mdrag.mdrag_logging.service_logging import log_call
 from mdrag.interfaces.api.api.ingest.models import (
@@ -19,6 +22,8 @@ from mdrag.interfaces.api.services.ingest import IngestJobService
 
 ingest_service = IngestJobService()
 
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 ingest_router = APIRouter(
     prefix=api_config.INGEST_PREFIX,
     tags=["ingestion"],
@@ -34,7 +39,7 @@ jobs_router = APIRouter(
 @log_call(action_name="ingest_web")
 async def ingest_web(request: WebIngestRequest) -> JobResponse:
     """Queue ingestion for a web URL."""
-    payload = ingest_service.queue_web(
+    payload = await ingest_service.queue_web(
         url=request.url,
         deep=request.deep,
         max_depth=request.max_depth,
@@ -48,6 +53,7 @@ async def ingest_web(request: WebIngestRequest) -> JobResponse:
         job_id=payload["job_id"],
         status=payload["status"],
         status_url=f"{api_config.JOBS_PREFIX}/{payload['job_id']}",
+        deduplicated=payload["deduplicated"],
     )
 
 
@@ -61,7 +67,7 @@ async def ingest_drive(request: DriveIngestRequest) -> JobResponse:
             detail="Provide at least one Drive file, folder, or doc ID.",
         )
 
-    payload = ingest_service.queue_drive(
+    payload = await ingest_service.queue_drive(
         file_ids=request.file_ids,
         folder_ids=request.folder_ids,
         doc_ids=request.doc_ids,
@@ -75,9 +81,17 @@ async def ingest_drive(request: DriveIngestRequest) -> JobResponse:
         job_id=payload["job_id"],
         status=payload["status"],
         status_url=f"{api_config.JOBS_PREFIX}/{payload['job_id']}",
+        deduplicated=payload["deduplicated"],
     )
 
 
+@ingest_router.get("/scheduler")
+@log_call(action_name="get_scheduler_metrics")
+async def get_scheduler_metrics() -> dict:
+    """Pending depth, dispatch counts, and queue wait times per priority class."""
+    return await ingest_service.scheduler_metrics()
+
+
 @ingest_router.post("/upload", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
 @log_call(action_name="ingest_upload")
 async def ingest_upload(
@@ -93,13 +107,18 @@ async def ingest_upload(
             detail="Upload filename is required.",
         )
 
+    # Hash while streaming to disk so the worker never re-reads the file to hash it.
     suffix = Path(file.filename).suffix or ".bin"
+    digest = hashlib.sha256()
     with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-        temp_file.write(await file.read())
+        while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+            temp_file.write(chunk)
         temp_path = temp_file.name
 
-    payload = ingest_service.queue_upload(
+    payload = await ingest_service.queue_upload(
         file_path=temp_path,
+        content_hash=digest.hexdigest(),
         namespace={
             "user_id": user_id,
             "org_id": org_id,
@@ -110,6 +129,7 @@ async def ingest_upload(
         job_id=payload["job_id"],
         status=payload["status"],
         status_url=f"{api_config.JOBS_PREFIX}/{payload['job_id']}",
+        deduplicated=payload["deduplicated"],
     )
 
 
@@ -117,7 +137,7 @@ async def ingest_upload(
 @log_call(action_name="get_job_status")
 async def get_job_status(job_id: str) -> JobStatusResponse:
     """Get the status of an ingestion job."""
-    state = ingest_service.get_job(job_id)
+    state = await ingest_service.get_job(job_id)
     if not state:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -131,4 +151,36 @@ async def get_job_status(job_id: str) -> JobStatusResponse:
         updated_at=state.updated_at,
         error=state.error,
         result=state.result,
+        parent_id=state.parent_id,
+        children=state.children,
+        progress=state.progress,
+    )
+
+
+@jobs_router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request) -> StreamingResponse:
+    """Stream job status and progress as server-sent events.
+
+    The first event is a snapshot of the current state; the stream ends after
+    the job completes or fails.
+    """
+    if not await ingest_service.get_job(job_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+
+    async def event_stream():
+        async for event in ingest_service.watch_job(job_id):
+            if await request.is_disconnected():
+                break
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: {event.get('event', 'progress')}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
@@ -1,10 +1,12 @@
 """FastAPI entry point for ingestion APIs."""
 
+import asyncio
 import logging
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from mdrag.capabilities.ingestion.jobs.scheduler import FairShareScheduler
 from mdrag.workflows.rag.dependencies import AgentDependencies
 from mdrag.interfaces.api.api.feedback.router import feedback_router
 from mdrag.interfaces.api.api.health.router import health_router
@@ -13,6 +15,7 @@ from mdrag.interfaces.api.api.query.router import query_router
 from mdrag.interfaces.api.api.readings.router import readings_router
 from mdrag.interfaces.api.api.wiki.router import wiki_router
 from mdrag.config.settings import load_settings
+from mdrag.integrations.crawl4ai.pool import close_shared_browser_pool
 from mdrag.core.validation import ValidationError, validate_rq_workers, validate_vllm
 
 logger = logging.getLogger(__name__)
@@ -43,7 +46,24 @@ async def lifespan(app: FastAPI):
 			raise RuntimeError("vLLM services unavailable but vllm_enabled=True") from e
 	
 	await deps.cleanup()
-	yield
+
+	# Dispatch scheduled ingest jobs to RQ (one leader across API replicas)
+	scheduler = None
+	dispatcher = None
+	if settings.ingestion_scheduler_enabled:
+		scheduler = FairShareScheduler(settings)
+		dispatcher = asyncio.create_task(scheduler.run())
+	try:
+		yield
+	finally:
+		if dispatcher:
+			scheduler.stop()
+			dispatcher.cancel()
+			with suppress(asyncio.CancelledError):
+				await dispatcher
+			await scheduler.close()
+		# Browsers leased by readings crawls
+		await close_shared_browser_pool()
 
 
 app = FastAPI(title="MongoDB RAG Agent", version="0.1.0", lifespan=lifespan)
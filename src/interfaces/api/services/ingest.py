@@ -2,28 +2,46 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
 import uuid
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Optional
 
+import redis
 from rq import Queue
 
-from mdrag.capabilities.ingestion.jobs import JobStore, process_ingestion_job
-from mdrag.mdrag_logging.service_logging import get_logger, log_async
+from mdrag.capabilities.ingestion.jobs import JobStatus, JobStore, process_ingestion_job
+from mdrag.capabilities.ingestion.jobs.idempotency import idempotency_key
+from mdrag.capabilities.ingestion.jobs.scheduler import FairShareScheduler, PriorityClass
+from mdrag.mdrag_logging.service_logging import get_logger
 from mdrag.config.settings import load_settings
 
 
 class IngestJobService:
     """Handle ingestion job orchestration."""
 
-    def __init__(self, job_store: JobStore | None = None, queue: Queue | None = None) -> None:
+    def __init__(
+        self,
+        job_store: JobStore | None = None,
+        queue: Queue | None = None,
+        scheduler: FairShareScheduler | None = None,
+    ) -> None:
         settings = load_settings()
+        self.settings = settings
         self.job_store = job_store or JobStore(settings.redis_url)
-        self.queue = queue or Queue(connection=self.job_store.redis)
+        # RQ needs a synchronous connection that does not decode responses.
+        self.queue = queue or Queue(connection=redis.Redis.from_url(settings.redis_url))
+        self.scheduler = scheduler or FairShareScheduler(settings, queue=self.queue)
         self.logger = get_logger(__name__)
 
-    def queue_web(self, url: str, deep: bool, max_depth: int | None, namespace: Dict[str, Any]) -> Dict[str, Any]:
-        job_id = str(uuid.uuid4())
+    async def queue_web(
+        self,
+        url: str,
+        deep: bool,
+        max_depth: int | None,
+        namespace: Dict[str, Any],
+        priority: PriorityClass | None = None,
+    ) -> Dict[str, Any]:
         payload = {
             "source_type": "web",
             "url": url,
@@ -31,26 +49,17 @@ class IngestJobService:
             "max_depth": max_depth,
             "namespace": namespace,
         }
-        self.job_store.create_job(job_id, payload)
-        self.queue.enqueue(process_ingestion_job, job_id, payload)
-        log_async(
-            self.logger,
-            "info",
-            "ingest_job_queued",
-            action="ingest_job_queued",
-            job_id=job_id,
-            source_type="web",
-        )
-        return {"job_id": job_id, "status": "PENDING"}
+        if priority:
+            payload["priority"] = priority.value
+        return await self._queue(payload)
 
-    def queue_drive(
+    async def queue_drive(
         self,
         file_ids: list[str],
         folder_ids: list[str],
         doc_ids: list[str],
         namespace: Dict[str, Any],
     ) -> Dict[str, Any]:
-        job_id = str(uuid.uuid4())
         payload = {
             "source_type": "gdrive",
             "file_ids": file_ids,
@@ -58,37 +67,85 @@ class IngestJobService:
             "doc_ids": doc_ids,
             "namespace": namespace,
         }
-        self.job_store.create_job(job_id, payload)
-        self.queue.enqueue(process_ingestion_job, job_id, payload)
-        log_async(
-            self.logger,
-            "info",
-            "ingest_job_queued",
-            action="ingest_job_queued",
-            job_id=job_id,
-            source_type="gdrive",
-        )
-        return {"job_id": job_id, "status": "PENDING"}
+        return await self._queue(payload)
 
-    def queue_upload(self, file_path: str, namespace: Dict[str, Any]) -> Dict[str, Any]:
-        job_id = str(uuid.uuid4())
+    async def queue_upload(
+        self,
+        file_path: str,
+        content_hash: str,
+        namespace: Dict[str, Any],
+    ) -> Dict[str, Any]:
         payload = {
             "source_type": "upload",
             "file_path": file_path,
             "filename": os.path.basename(file_path),
+            "content_hash": content_hash,
             "namespace": namespace,
         }
-        self.job_store.create_job(job_id, payload)
-        self.queue.enqueue(process_ingestion_job, job_id, payload)
-        log_async(
-            self.logger,
-            "info",
+        result = await self._queue(payload)
+        if result["deduplicated"]:
+            os.remove(file_path)
+        return result
+
+    async def _queue(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Create and enqueue a job, or return the identical in-flight job."""
+        job_id = str(uuid.uuid4())
+        source_type = payload["source_type"]
+        await self.job_store.create_job(job_id, payload)
+        key = idempotency_key(payload)
+        if key:
+            owner = await self.job_store.claim_idempotency_key(
+                key, job_id, self.settings.ingestion_idempotency_ttl
+            )
+            if owner != job_id:
+                await self.job_store.delete_job(job_id)
+                state = await self.job_store.get_job(owner)
+                await self.logger.info(
+                    "ingest_job_deduplicated",
+                    action="ingest_job_deduplicated",
+                    job_id=owner,
+                    source_type=source_type,
+                )
+                return {
+                    "job_id": owner,
+                    "status": state.status.value if state else "PENDING",
+                    "deduplicated": True,
+                }
+        try:
+            if self.settings.ingestion_scheduler_enabled:
+                await self.scheduler.submit(job_id, payload)
+            else:
+                await asyncio.to_thread(
+                    self.queue.enqueue, process_ingestion_job, job_id, payload
+                )
+        except Exception as exc:
+            # The job never reached a worker: fail it and free its key, so a
+            # retry is queued instead of deduplicated onto this job.
+            await self.job_store.update_status(job_id, JobStatus.FAILED, error=str(exc))
+            if key:
+                await self.job_store.release_idempotency_key(key, job_id)
+            await self.logger.error(
+                "ingest_job_queue_failed",
+                action="ingest_job_queue_failed",
+                job_id=job_id,
+                source_type=source_type,
+                error=str(exc),
+                error_type=type(exc).__name__,
+            )
+            raise
+        await self.logger.info(
             "ingest_job_queued",
             action="ingest_job_queued",
             job_id=job_id,
-            source_type="upload",
+            source_type=source_type,
         )
-        return {"job_id": job_id, "status": "PENDING"}
+        return {"job_id": job_id, "status": "PENDING", "deduplicated": False}
+
+    async def get_job(self, job_id: str):
+        return await self.job_store.get_job(job_id)
+
+    def watch_job(self, job_id: str) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        return self.job_store.watch(job_id)
 
-    def get_job(self, job_id: str):
-        return self.job_store.get_job(job_id)
+    async def scheduler_metrics(self) -> Dict[str, Any]:
+        return await self.scheduler.metrics()
@@ -498,13 +498,15 @@ Return ONLY valid JSON."""
     ) -> Optional[str]:
         """Queue the URL for RAG ingestion (non-blocking)."""
         try:
+            from mdrag.capabilities.ingestion.jobs.scheduler import PriorityClass
             from mdrag.interfaces.api.services.ingest import IngestJobService
             service = IngestJobService()
-            result = service.queue_web(
+            result = await service.queue_web(
                 url=url,
                 deep=False,
                 max_depth=None,
                 namespace={"source_group": source_group},
+                priority=PriorityClass.READINGS,
             )
             return result.get("job_id")
         except Exception as e:
@@ -8,6 +8,13 @@ import httpx
 from pydantic import BaseModel, Field
 from pymongo.errors import OperationFailure
 
+from mdrag.integrations.mongodb.adapters.aliases import ALIAS_FIELDS
+from mdrag.integrations.mongodb.adapters.chunk_schema import (
+    CHUNK_FILTER_FIELDS,
+    SEARCH_FILTER_FIELDS,
+    chunk_result_metadata,
+    parent_expression,
+)
 from mdrag.workflows.rag.dependencies import AgentDependencies
 from mdrag.config.settings import load_settings
 
@@ -20,6 +27,14 @@ class HasDeps(Protocol):
     deps: AgentDependencies
 
 
+# Chunk and parent fields needed to rebuild metadata of compact (v2) chunks.
+_CHUNK_RESULT_FIELDS: Dict[str, Any] = {
+    "schema_version": 1,
+    **{field: 1 for field in CHUNK_FILTER_FIELDS},
+    "document_parent": parent_expression("document_info"),
+}
+
+
 class SearchResult(BaseModel):
     """Model for search results."""
 
@@ -109,6 +124,7 @@ async def semantic_search(
                     "content": 1,
                     "similarity": {"$meta": "vectorSearchScore"},
                     "metadata": 1,
+                    **_CHUNK_RESULT_FIELDS,
                     "document_title": "$document_info.title",
                     "document_source": "$document_info.source_url"
                 }
@@ -127,7 +143,7 @@ async def semantic_search(
                 document_id=str(doc['document_id']),
                 content=doc['content'],
                 similarity=doc['similarity'],
-                metadata=doc.get('metadata', {}),
+                metadata=chunk_result_metadata(doc, doc.get('document_parent')),
                 document_title=doc['document_title'],
                 document_source=doc['document_source']
             )
@@ -245,6 +261,7 @@ async def text_search(
                     "content": 1,
                     "similarity": {"$meta": "searchScore"},  # Text relevance score
                     "metadata": 1,
+                    **_CHUNK_RESULT_FIELDS,
                     "document_title": "$document_info.title",
                     "document_source": "$document_info.source_url"
                 }
@@ -263,7 +280,7 @@ async def text_search(
                 document_id=str(doc['document_id']),
                 content=doc['content'],
                 similarity=doc['similarity'],
-                metadata=doc.get('metadata', {}),
+                metadata=chunk_result_metadata(doc, doc.get('document_parent')),
                 document_title=doc['document_title'],
                 document_source=doc['document_source']
             )
@@ -540,13 +557,7 @@ def _build_chunk_filter(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str,
     if not filters:
         return None
 
-    allowed = {
-        "source_url": "source_url",
-        "source_type": "source_type",
-        "source_group": "source_group",
-        "user_id": "user_id",
-        "org_id": "org_id",
-    }
+    allowed = {field: field for field in SEARCH_FILTER_FIELDS}
     clauses = []
     source_mask = filters.get("source_mask") if filters else None
     if source_mask:
@@ -559,7 +570,11 @@ def _build_chunk_filter(filters: Optional[Dict[str, Any]]) -> Optional[Dict[str,
     for key, field in allowed.items():
         value = filters.get(key) if filters else None
         if value and key != "source_type":
-            clauses.append({field: value})
+            if key in ALIAS_FIELDS:
+                # Content aliases share the canonical document's chunks.
+                clauses.append({"$or": [{field: value}, {ALIAS_FIELDS[key]: value}]})
+            else:
+                clauses.append({field: value})
 
     if not clauses:
         return None
@@ -572,17 +587,25 @@ def _build_search_filter(filters: Optional[Dict[str, Any]]) -> List[Dict[str, An
     if not filters:
         return []
 
-    allowed = {
-        "source_url": "source_url",
-        "source_type": "source_type",
-        "source_group": "source_group",
-        "user_id": "user_id",
-        "org_id": "org_id",
-    }
+    allowed = {field: field for field in SEARCH_FILTER_FIELDS}
     clauses = []
     for key, path in allowed.items():
         value = filters.get(key) if filters else None
-        if value:
+        if not value:
+            continue
+        if key in ALIAS_FIELDS:
+            clauses.append(
+                {
+                    "compound": {
+                        "should": [
+                            {"equals": {"path": path, "value": value}},
+                            {"equals": {"path": ALIAS_FIELDS[key], "value": value}},
+                        ],
+                        "minimumShouldMatch": 1,
+                    }
+                }
+            )
+        else:
             clauses.append({"equals": {"path": path, "value": value}})
     return clauses
 
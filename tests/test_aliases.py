@@ -0,0 +1,206 @@
+"""Tests for content-hash alias bookkeeping."""
+
+import asyncio
+from types import SimpleNamespace
+
+from mdrag.capabilities.ingestion.dedup import ChunkDuplicate
+from mdrag.integrations.mongodb.adapters.aliases import DocumentAliasStore, alias_entry
+from mdrag.integrations.mongodb.adapters.fingerprints import ChunkFingerprintStore
+
+
+class _RecordingCollection:
+    def __init__(self, found=None) -> None:
+        self.updates: list[tuple[dict, dict]] = []
+        self.bulk: list = []
+        self.found = found or []
+
+    async def update_many(self, query: dict, update: dict, session=None) -> None:
+        self.updates.append((query, update))
+
+    async def update_one(self, query: dict, update: dict, session=None) -> None:
+        self.updates.append((query, update))
+
+    async def distinct(self, key: str, query: dict, session=None) -> list:
+        return []
+
+    async def delete_many(self, query: dict, session=None):
+        self.updates.append((query, {}))
+        return SimpleNamespace(deleted_count=0)
+
+    async def bulk_write(self, operations, ordered=True, session=None):
+        self.bulk.extend(operations)
+        return SimpleNamespace(matched_count=len(operations))
+
+    def find(self, query: dict, projection=None, session=None):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self.found:
+            yield doc
+
+
+class _RecordingFingerprints:
+    def __init__(self) -> None:
+        self.reassigned: list[tuple] = []
+
+    async def reassign_chunks(self, *args, session=None) -> None:
+        self.reassigned.append(args)
+
+
+_LINKED_SOURCE = {
+    "document_id": "dup-id",
+    "document_uid": "uid-dup",
+    "source_url": "https://mirror.example.com/guide",
+    "source_type": "web",
+    "source_id": None,
+    "source_group": "mirror.example.com",
+    "source_mask": 1,
+}
+
+
+def test_alias_entry_falls_back_to_source_type_mask() -> None:
+    entry = alias_entry(
+        "alias-id",
+        {
+            "document_uid": "uid-2",
+            "source_url": "https://example.com/a.pdf",
+            "source_type": "web",
+            "namespace": {"source_group": "example.com"},
+        },
+    )
+
+    assert entry["source_mask"] == 1
+    assert entry["source_group"] == "example.com"
+    assert entry["document_id"] == "alias-id"
+
+
+def test_sync_mirrors_alias_sources_onto_chunks() -> None:
+    chunks = _RecordingCollection()
+    store = DocumentAliasStore(documents_collection=None, chunks_collection=chunks)
+    canonical = {
+        "_id": "canonical-id",
+        "source_type": "upload",
+        "source_mask": 4,
+        "aliases": [
+            {"source_url": "https://example.com/a.pdf", "source_type": "web", "source_mask": 1},
+            {"source_url": "gdrive://file", "source_type": "gdrive", "source_mask": 2},
+        ],
+    }
+
+    asyncio.run(store.sync_chunks(canonical))
+
+    query, update = chunks.updates[0]
+    assert query == {"document_id": "canonical-id"}
+    assert update["$set"]["source_mask"] == 7
+    assert update["$set"]["alias_source_urls"] == [
+        "gdrive://file",
+        "https://example.com/a.pdf",
+    ]
+    assert update["$set"]["alias_source_groups"] == []
+
+
+def test_release_without_aliases_leaves_other_documents_alone() -> None:
+    chunks = _RecordingCollection()
+    store = DocumentAliasStore(documents_collection=None, chunks_collection=chunks)
+
+    asyncio.run(store.release({"_id": "doc", "aliases": []}))
+
+    assert chunks.updates == []
+
+
+def test_sync_keeps_duplicate_links_on_linked_chunks() -> None:
+    chunks = _RecordingCollection(
+        found=[{"_id": "chunk-1", "duplicate_sources": [_LINKED_SOURCE]}],
+    )
+    store = DocumentAliasStore(documents_collection=None, chunks_collection=chunks)
+
+    asyncio.run(store.sync_chunks({"_id": "canonical-id", "source_mask": 4, "aliases": []}))
+
+    (operation,) = chunks.bulk
+    assert operation._filter == {"_id": "chunk-1"}
+    assert operation._doc["$addToSet"]["alias_source_urls"] == {
+        "$each": ["https://mirror.example.com/guide"]
+    }
+    assert operation._doc["$bit"] == {"source_mask": {"or": 1}}
+
+
+def test_link_chunks_adds_the_source_to_canonical_chunks() -> None:
+    chunks = _RecordingCollection()
+    store = DocumentAliasStore(documents_collection=None, chunks_collection=chunks)
+    duplicates = [
+        ChunkDuplicate(3, canonical_document_uid="uid-1", canonical_chunk_hash="h1", exact=True),
+        ChunkDuplicate(4, canonical_document_uid="uid-1", canonical_chunk_hash="h1", exact=False),
+        # Internal duplicates of the source's own chunks are not links.
+        ChunkDuplicate(5, canonical_document_uid="uid-dup", canonical_chunk_hash="h2", exact=True),
+    ]
+
+    linked = asyncio.run(store.link_chunks(_LINKED_SOURCE, duplicates))
+
+    assert linked == 1
+    (operation,) = chunks.bulk
+    assert operation._filter == {"document_uid": "uid-1", "chunk_hash": "h1"}
+    assert operation._doc["$addToSet"]["duplicate_sources"] == _LINKED_SOURCE
+    assert operation._doc["$addToSet"]["alias_source_groups"] == {"$each": ["mirror.example.com"]}
+
+
+def test_linked_chunk_is_handed_to_the_linked_source() -> None:
+    second = {
+        **_LINKED_SOURCE,
+        "document_id": "dup-2",
+        "source_url": "gdrive://f",
+        "source_mask": 2,
+    }
+    chunks = _RecordingCollection(
+        found=[
+            {
+                "_id": "chunk-1",
+                "document_uid": "uid-1",
+                "source_url": "https://example.com/guide",
+                "chunk_hash": "h1",
+                "duplicate_sources": [_LINKED_SOURCE, second],
+            }
+        ]
+    )
+    documents = _RecordingCollection(
+        found=[{"_id": "dup-id", "namespace": {"org_id": "org-1", "user_id": "user-1"}}],
+    )
+    fingerprints = _RecordingFingerprints()
+    store = DocumentAliasStore(
+        documents_collection=documents,
+        chunks_collection=chunks,
+        fingerprints=fingerprints,
+    )
+
+    handed_off = asyncio.run(store.hand_off_chunks({"document_id": "canonical-id"}))
+
+    assert handed_off == ["chunk-1"]
+    query, update = chunks.updates[0]
+    assert query == {"_id": "chunk-1"}
+    assert update["$set"]["document_id"] == "dup-id"
+    assert update["$set"]["source_url"] == "https://mirror.example.com/guide"
+    assert update["$set"]["duplicate_sources"] == [second]
+    assert update["$set"]["alias_source_urls"] == ["gdrive://f"]
+    assert update["$set"]["source_mask"] == 3
+    assert fingerprints.reassigned == [
+        (
+            "org-1:user-1",
+            "https://example.com/guide",
+            "uid-1",
+            ["h1"],
+            "https://mirror.example.com/guide",
+            "uid-dup",
+        )
+    ]
+
+
+def test_fingerprint_deletes_stay_in_the_namespace() -> None:
+    collection = _RecordingCollection()
+    store = ChunkFingerprintStore(collection)
+
+    asyncio.run(store.delete_sources("org-1:user-1", ["https://example.com/guide"]))
+
+    ((query, _),) = collection.updates
+    assert query == {
+        "scope": "org-1:user-1",
+        "source_url": {"$in": ["https://example.com/guide"]},
+    }
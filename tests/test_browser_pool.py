@@ -0,0 +1,121 @@
+"""Tests for the warm browser pool."""
+
+import asyncio
+from types import SimpleNamespace
+
+from mdrag.integrations.crawl4ai import crawler
+from mdrag.integrations.crawl4ai.pool import BrowserPool
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.connected = True
+
+    def is_connected(self):
+        return self.connected
+
+
+class _FakeStrategy:
+    def __init__(self):
+        self.browser_manager = SimpleNamespace(browser=_FakeBrowser())
+        self.killed = []
+
+    async def kill_session(self, session_id):
+        self.killed.append(session_id)
+
+
+class _FakeCrawler:
+    def __init__(self):
+        self.crawler_strategy = _FakeStrategy()
+        self.closed = False
+        self.configs = []
+
+    async def arun(self, url, config):
+        self.configs.append(config)
+        return SimpleNamespace(success=True, url=url, html="<p>hi</p>", markdown="hi", links=[])
+
+    async def close(self):
+        self.closed = True
+
+
+def _pool(**kwargs):
+    launched = []
+
+    async def factory():
+        launched.append(_FakeCrawler())
+        return launched[-1]
+
+    return BrowserPool(factory=factory, **kwargs), launched
+
+
+def _lease_times(pool, count):
+    async def run():
+        sessions = []
+        for _ in range(count):
+            async with pool.lease() as lease:
+                sessions.append(lease.session_id)
+        return sessions
+
+    return asyncio.run(run())
+
+
+def test_leases_reuse_a_warm_browser_in_fresh_sessions() -> None:
+    pool, launched = _pool(size=1)
+
+    sessions = _lease_times(pool, 3)
+
+    assert len(launched) == 1
+    assert len(set(sessions)) == 3
+    assert launched[0].crawler_strategy.killed == sessions
+
+
+def test_browser_is_recycled_after_its_lease_budget() -> None:
+    pool, launched = _pool(size=1, recycle_after=2)
+
+    _lease_times(pool, 5)
+
+    assert len(launched) == 3
+    assert [browser.closed for browser in launched] == [True, True, False]
+    assert pool.stats()["retired"] == 2
+
+
+def test_disconnected_browser_is_replaced() -> None:
+    pool, launched = _pool(size=1)
+    _lease_times(pool, 1)
+    launched[0].crawler_strategy.browser_manager.browser.connected = False
+
+    _lease_times(pool, 1)
+
+    assert len(launched) == 2
+    assert launched[0].closed
+
+
+def test_leases_wait_for_capacity() -> None:
+    pool, launched = _pool(size=2, contexts_per_browser=2)
+    peak = 0
+
+    async def crawl():
+        nonlocal peak
+        async with pool.lease():
+            peak = max(peak, pool.stats()["active"])
+            await asyncio.sleep(0.01)
+
+    async def run():
+        await asyncio.gather(*(crawl() for _ in range(10)))
+        await pool.close()
+
+    asyncio.run(run())
+
+    assert peak == 4
+    assert len(launched) == 2
+    assert all(browser.closed for browser in launched)
+
+
+def test_single_page_crawl_renders_in_its_lease_session() -> None:
+    pool, launched = _pool(size=1)
+
+    source = asyncio.run(crawler.crawl_single_page("https://example.com/", pool=pool))
+
+    assert source.content == "hi"
+    session_id = launched[0].configs[0].session_id
+    assert launched[0].crawler_strategy.killed == [session_id]
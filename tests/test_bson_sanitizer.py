@@ -0,0 +1,44 @@
+"""Tests for the type-directed BSON payload sanitizer."""
+
+from enum import Enum
+from pathlib import Path
+
+from mdrag.integrations.mongodb.adapters.bson_sanitizer import PayloadSanitizer, sanitize_value
+
+
+class _Kind(str, Enum):
+    WEB = "web"
+
+
+def test_sanitize_value_converts_nested_values() -> None:
+    value = {
+        "path": Path("/tmp/doc.pdf"),
+        "kind": _Kind.WEB,
+        "items": [2**70, 5, True, None],
+    }
+
+    assert sanitize_value(value) == {
+        "path": "/tmp/doc.pdf",
+        "kind": "web",
+        "items": [str(2**70), 5, True, None],
+    }
+
+
+def test_payload_sanitizer_reuses_plan_per_shape() -> None:
+    sanitizer = PayloadSanitizer(vector_fields=("embedding",))
+    embedding = [0.1, 0.2, 0.3]
+    payload = {
+        "content": "text",
+        "embedding": embedding,
+        "metadata": {"source": Path("a.md")},
+        "chunk_index": 2**64,
+    }
+
+    first = sanitizer(payload)
+    second = sanitizer({**payload, "chunk_index": 3})
+
+    assert first["embedding"] is embedding
+    assert first["metadata"] == {"source": "a.md"}
+    assert first["chunk_index"] == str(2**64)
+    assert second["chunk_index"] == 3
+    assert len(sanitizer._plans) == 1
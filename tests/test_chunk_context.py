@@ -0,0 +1,48 @@
+"""Tests for chunks sharing one document-level context."""
+
+from types import SimpleNamespace
+
+from mdrag.capabilities.ingestion.docling.chunker import DoclingHierarchicalChunker
+
+
+def _chunker():
+    chunker = object.__new__(DoclingHierarchicalChunker)
+    chunker.config = SimpleNamespace(chunk_size=100, chunk_overlap=10, min_chunk_size=20)
+    chunker._count_tokens = lambda texts, **kwargs: [len(text) // 4 for text in texts]
+    return chunker
+
+
+def _chunks():
+    return _chunker()._simple_fallback_chunk(
+        "Alpha beta gamma. " * 30,
+        {"document_title": "Guide", "document_uid": "uid-1", "source_url": "https://x/"},
+    )
+
+
+def test_chunks_reference_one_document_context() -> None:
+    chunks = _chunks()
+
+    assert len(chunks) > 1
+    assert len({id(chunk.document) for chunk in chunks}) == 1
+    assert chunks[1].metadata["total_chunks"] == len(chunks)
+    assert chunks[1].metadata["chunk_method"] == "simple_fallback"
+    assert chunks[1].metadata["raw_text"] == chunks[1].content
+    assert chunks[1].passport.document_uid == "uid-1"
+
+
+def test_metadata_writes_stay_on_the_chunk() -> None:
+    first, second = _chunks()[:2]
+
+    second.metadata["embedding_model"] = "text-embedding-3-small"
+
+    assert second.metadata["embedding_model"] == "text-embedding-3-small"
+    assert "embedding_model" not in first.metadata
+    assert "embedding_model" not in second.document.base_metadata
+
+
+def test_passport_and_frontmatter_are_built_once_per_chunk() -> None:
+    chunk = _chunks()[1]
+
+    assert chunk.passport is chunk.passport
+    assert chunk.frontmatter is chunk.frontmatter
+    assert chunk.passport is not chunk.document.passport
@@ -0,0 +1,160 @@
+"""Tests for the compact chunk schema and its migration."""
+
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+from mdrag.integrations.mongodb.adapters.chunk_schema import (
+    CHUNK_SCHEMA_VERSION,
+    chunk_result_metadata,
+    migrate_chunks,
+    parent_expression,
+    upgrade_chunk,
+)
+
+_INGESTED_AT = datetime(2026, 1, 2, 3, 4, 5)
+
+_PARENT = {
+    "_id": "doc-1",
+    "title": "Guide",
+    "document_uid": "uid-1",
+    "content_hash": "hash-1",
+    "ingestion_metadata": {
+        "ingested_at": _INGESTED_AT,
+        "source_metadata": {"crawl_url": "https://example.com/guide"},
+    },
+}
+
+_LEGACY_CHUNK = {
+    "_id": "chunk-1",
+    "document_id": "doc-1",
+    "source_url": "https://example.com/guide",
+    "source_type": "web",
+    "page_number": 3,
+    "source_mask": 1,
+    "summary_context": "Intro",
+    "content_hash": "hash-1",
+    "passport": {"source_url": "https://example.com/guide", "source_group": "example.com"},
+    "frontmatter": {"source_title": "Guide"},
+    "metadata": {
+        "crawl_url": "https://example.com/guide",
+        "document_uid": "uid-1",
+        "content_hash": "hash-1",
+        "source_url": "https://example.com/guide",
+        "source_type": "web",
+        "source_group": "example.com",
+        "document_title": "Guide",
+        "ingestion_timestamp": _INGESTED_AT,
+        "page_number": 3,
+        "source_mask": 1,
+        "summary_context": "Intro",
+        "embedding_model": "text-embedding-3-small",
+        "raw_text": "chunk text",
+        "is_table": False,
+    },
+}
+
+
+class _FakeCursor:
+    def __init__(self, docs):
+        self._docs = list(docs)
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for doc in self._docs:
+            yield doc
+
+
+class _ChunksCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.batches = []
+
+    def find(self, query, projection=None, **kwargs):
+        return _FakeCursor(self.docs)
+
+    async def bulk_write(self, operations, ordered=True):
+        self.batches.append(operations)
+        return SimpleNamespace(modified_count=len(operations))
+
+
+class _DocumentsCollection:
+    def __init__(self, docs):
+        self.docs = {doc["_id"]: doc for doc in docs}
+        self.lookups = 0
+
+    async def find_one(self, query, projection=None):
+        self.lookups += 1
+        return self.docs.get(query["_id"])
+
+
+def _applied(chunk: dict, update: dict) -> dict:
+    upgraded = {k: v for k, v in chunk.items() if k not in update["$unset"]}
+    upgraded.update(update["$set"])
+    return upgraded
+
+
+def test_upgrade_keeps_only_chunk_level_metadata() -> None:
+    update = upgrade_chunk(_LEGACY_CHUNK, _PARENT)
+
+    assert update["$set"]["schema_version"] == CHUNK_SCHEMA_VERSION
+    assert update["$set"]["source_group"] == "example.com"
+    assert update["$set"]["metadata"] == {
+        "summary_context": "Intro",
+        "embedding_model": "text-embedding-3-small",
+        "is_table": False,
+    }
+    assert set(update["$unset"]) >= {"passport", "frontmatter", "summary_context"}
+
+
+def test_reader_rebuilds_legacy_metadata_view() -> None:
+    upgraded = _applied(_LEGACY_CHUNK, upgrade_chunk(_LEGACY_CHUNK, _PARENT))
+
+    expected = dict(_LEGACY_CHUNK["metadata"])
+    expected.pop("raw_text")
+    metadata = chunk_result_metadata(upgraded, _PARENT)
+
+    assert {key: metadata[key] for key in expected} == expected
+    assert chunk_result_metadata(_LEGACY_CHUNK) == _LEGACY_CHUNK["metadata"]
+
+
+def test_upgrade_without_parent_keeps_document_metadata() -> None:
+    update = upgrade_chunk(_LEGACY_CHUNK, None)
+
+    assert update["$set"]["metadata"]["document_title"] == "Guide"
+    assert update["$set"]["metadata"]["crawl_url"] == "https://example.com/guide"
+
+
+def test_parent_expression_nests_dotted_fields() -> None:
+    expression = parent_expression("document_info")
+
+    assert expression["title"] == "$document_info.title"
+    assert expression["ingestion_metadata"] == {
+        "ingested_at": "$document_info.ingestion_metadata.ingested_at",
+        "source_metadata": "$document_info.ingestion_metadata.source_metadata",
+    }
+
+
+def test_migration_batches_updates_and_caches_parents() -> None:
+    chunks = _ChunksCollection(
+        [{**_LEGACY_CHUNK, "_id": f"chunk-{i}"} for i in range(5)]
+    )
+    documents = _DocumentsCollection([_PARENT])
+
+    counts = asyncio.run(migrate_chunks(chunks, documents, batch_size=2))
+
+    assert counts == {"scanned": 5, "migrated": 5}
+    assert [len(batch) for batch in chunks.batches] == [2, 2, 1]
+    assert documents.lookups == 1
+
+
+def test_migration_dry_run_writes_nothing() -> None:
+    chunks = _ChunksCollection([_LEGACY_CHUNK])
+    documents = _DocumentsCollection([_PARENT])
+
+    counts = asyncio.run(migrate_chunks(chunks, documents, dry_run=True))
+
+    assert counts == {"scanned": 1, "migrated": 1}
+    assert chunks.batches == []
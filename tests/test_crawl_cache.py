@@ -0,0 +1,221 @@
+"""Tests for conditional recrawls through the crawl cache."""
+
+import asyncio
+from types import SimpleNamespace
+
+from mdrag.capabilities.ingestion.models import Namespace
+from mdrag.integrations.crawl4ai import crawler
+from mdrag.integrations.crawl4ai.cache import CrawlCache, content_hash, response_validators
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [
+            await getattr(self._client, name)(*args, **kwargs)
+            for name, args, kwargs in self._calls
+        ]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.hashes = {}
+        self.ttls = {}
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    async def expire(self, key, ttl):
+        self.ttls[key] = ttl
+
+    async def delete(self, *keys):
+        return sum(self.hashes.pop(key, None) is not None for key in keys)
+
+    async def scan_iter(self, match, count=None):
+        prefix = match.rstrip("*")
+        for key in list(self.hashes):
+            if key.startswith(prefix):
+                yield key
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _FakeHttp:
+    def __init__(self, status_code):
+        self.status_code = status_code
+        self.requests = []
+
+    def stream(self, method, url, headers=None, cookies=None):
+        self.requests.append(headers)
+        return _FakeResponse(self.status_code)
+
+
+class _FakeCrawler:
+    def __init__(self, html):
+        self.html = html
+        self.runs = 0
+
+    async def arun(self, url, config):
+        self.runs += 1
+        return SimpleNamespace(
+            success=True,
+            url=url,
+            html=self.html,
+            markdown="",
+            links={"internal": [{"href": "/fresh"}]},
+            response_headers={"ETag": '"v2"'},
+        )
+
+
+def _cache_with_page(html="<p>docs</p>"):
+    cache = CrawlCache("redis://unused", client=_FakeRedis())
+
+    async def seed():
+        await cache.put(
+            "https://Example.com/docs/",
+            etag='"v1"',
+            last_modified="Wed, 21 Oct 2026 07:28:00 GMT",
+            content_hash=content_hash(html),
+            links=["/cached"],
+        )
+
+    asyncio.run(seed())
+    return cache
+
+
+def test_entries_are_keyed_by_normalized_url() -> None:
+    cache = _cache_with_page()
+    entry = asyncio.run(cache.get("https://example.com/docs#intro"))
+
+    assert entry.links == ["/cached"]
+    assert entry.conditional_headers() == {
+        "If-None-Match": '"v1"',
+        "If-Modified-Since": "Wed, 21 Oct 2026 07:28:00 GMT",
+    }
+    assert response_validators({"ETag": '"v2"', "last-modified": "x"}) == {
+        "etag": '"v2"',
+        "last_modified": "x",
+    }
+
+
+def test_entries_are_scoped_to_their_namespace_and_forgotten_on_purge() -> None:
+    cache = CrawlCache("redis://unused", client=_FakeRedis())
+    acme = cache.scoped(Namespace(org_id="acme", source_group="docs"))
+    other_group = cache.scoped(Namespace(org_id="acme", source_group="blog"))
+
+    async def run():
+        await acme.put("https://example.com/docs", etag='"v1"')
+        seen = [
+            await view.get("https://example.com/docs")
+            for view in (acme, other_group, cache.scoped(Namespace(org_id="globex")))
+        ]
+        await acme.forget("https://example.com/docs/")
+        return seen, await acme.get("https://example.com/docs")
+
+    (own, group, tenant), forgotten = asyncio.run(run())
+
+    assert own.etag == '"v1"'
+    assert group is None
+    assert tenant is None
+    assert forgotten is None
+
+
+def test_clear_drops_every_namespace() -> None:
+    client = _FakeRedis()
+    cache = CrawlCache("redis://unused", client=client)
+    client.hashes["job:1"] = {"status": "done"}
+
+    async def run():
+        await cache.scoped(Namespace(org_id="acme")).put("https://example.com/a")
+        await cache.scoped(Namespace(org_id="globex")).put("https://example.com/b")
+        return await cache.clear()
+
+    assert asyncio.run(run()) == 2
+    assert list(client.hashes) == ["job:1"]
+
+
+def test_not_modified_page_skips_the_browser() -> None:
+    cache = _cache_with_page()
+    http = _FakeHttp(304)
+    browser = _FakeCrawler("<p>docs</p>")
+
+    source = asyncio.run(
+        crawler.crawl_single_page(
+            "https://example.com/docs", crawler=browser, http_client=http, cache=cache
+        )
+    )
+
+    assert http.requests[0]["If-None-Match"] == '"v1"'
+    assert browser.runs == 0
+    assert source.metadata["crawl_unchanged"] is True
+    assert source.links == ["/cached"]
+
+
+def test_unchanged_content_hash_is_skipped_after_fetch() -> None:
+    cache = _cache_with_page()
+    browser = _FakeCrawler("<p>docs</p>")
+
+    unchanged = asyncio.run(
+        crawler.crawl_single_page(
+            "https://example.com/docs", crawler=browser, http_client=_FakeHttp(200), cache=cache
+        )
+    )
+    browser.html = "<p>new docs</p>"
+    changed = asyncio.run(
+        crawler.crawl_single_page(
+            "https://example.com/docs", crawler=browser, http_client=_FakeHttp(200), cache=cache
+        )
+    )
+
+    assert unchanged.metadata["crawl_unchanged"] is True
+    assert unchanged.links == ["/fresh"]
+    assert "crawl_unchanged" not in changed.metadata
+    assert changed.frontmatter.source_etag == '"v2"'
+
+
+def test_deep_crawl_follows_unchanged_pages_without_yielding_them(monkeypatch) -> None:
+    attach_frontmatter = crawler._attach_frontmatter
+
+    async def crawl_single_page(url, **kwargs):
+        source = attach_frontmatter(
+            {"url": url, "markdown": "page", "links": ["/child"] if url.endswith("/") else []}
+        )
+        source.metadata["crawl_unchanged"] = url.endswith("/")
+        return source
+
+    monkeypatch.setattr(crawler, "crawl_single_page", crawl_single_page)
+
+    async def run():
+        return [
+            source.frontmatter.source_url
+            async for source in crawler.crawl_deep_stream(
+                "https://example.com/", crawler=object(), http_client=object()
+            )
+        ]
+
+    assert asyncio.run(run()) == ["https://example.com/child"]
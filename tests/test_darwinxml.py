@@ -279,6 +279,92 @@ def test_relationship_type_enum():
     assert RelationshipType.RELATED_TO.value == "related_to"
 
 
+def test_storage_batch_uses_bulk_write():
+    """Test that batch storage sends sized unordered bulk writes."""
+    import asyncio
+
+    from mdrag.capabilities.ingestion.docling.darwinxml_storage import DarwinXMLStorage
+
+    class _BulkResult:
+        upserted_ids = {0: "new-id"}
+
+    class _Collection:
+        def __init__(self):
+            self.calls = []
+
+        async def bulk_write(self, operations, ordered=True, session=None):
+            self.calls.append((len(operations), ordered))
+            return _BulkResult()
+
+    docs = [
+        DarwinXMLDocument(
+            document_title="Test Document",
+            chunk_index=index,
+            chunk_uuid=f"chunk-{index}",
+            content=f"Content {index}",
+            provenance=ProvenanceMetadata(
+                source_url="file:///test.md",
+                source_type="upload",
+                content_hash=f"hash-{index}",
+            ),
+        )
+        for index in range(3)
+    ]
+    collection = _Collection()
+    storage = DarwinXMLStorage(chunks_collection=collection)
+
+    doc_ids = asyncio.run(storage.store_darwin_documents_batch(docs, batch_size=2))
+
+    assert collection.calls == [(2, False), (1, False)]
+    assert doc_ids == ["new-id", "chunk-1", "new-id"]
+
+
+def test_storage_batch_stores_every_chunk_of_a_document():
+    """Test that chunks sharing their document's content hash each get an upsert."""
+    import asyncio
+
+    from mdrag.capabilities.ingestion.docling.darwinxml_storage import DarwinXMLStorage
+
+    class _BulkResult:
+        upserted_ids = {0: "new-id", 2: "other-id"}
+
+    class _Collection:
+        def __init__(self):
+            self.operations = []
+
+        async def bulk_write(self, operations, ordered=True, session=None):
+            self.operations.extend(operations)
+            return _BulkResult()
+
+    docs = [
+        DarwinXMLDocument(
+            document_title="Test Document",
+            chunk_index=index,
+            chunk_uuid=f"chunk-{index}",
+            content=f"Content {index}",
+            provenance=ProvenanceMetadata(
+                source_url="file:///test.md",
+                source_type="upload",
+                content_hash="document-hash",
+            ),
+        )
+        for index in range(3)
+    ]
+    collection = _Collection()
+    storage = DarwinXMLStorage(chunks_collection=collection)
+
+    doc_ids = asyncio.run(storage.store_darwin_documents_batch(docs))
+
+    assert [operation._filter for operation in collection.operations] == [
+        {
+            "darwin_metadata.provenance.content_hash": "document-hash",
+            "darwin_metadata.chunk_index": index,
+        }
+        for index in range(3)
+    ]
+    assert doc_ids == ["new-id", "chunk-1", "other-id"]
+
+
 if __name__ == "__main__":
     # Run tests manually
     print("Running DarwinXML tests...\n")
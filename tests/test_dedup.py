@@ -0,0 +1,60 @@
+"""Tests for chunk fingerprinting and duplicate detection."""
+
+from mdrag.capabilities.ingestion.dedup import (
+    ChunkFingerprint,
+    find_internal_duplicates,
+    from_signed64,
+    hamming_distance,
+    simhash,
+    simhash_bands,
+    to_signed64,
+)
+
+FOOTER = (
+    "Copyright 2024 Example Corp. All rights reserved. Example Corp and the Example "
+    "logo are trademarks of Example Corp in the United States and other countries. "
+    "Use of this site is subject to our terms of service and privacy policy. We use "
+    "cookies to remember your preferences, measure traffic, and improve the "
+    "documentation; you can change your cookie settings at any time from the footer "
+    "of any page. Product names, prices, and availability are subject to change "
+    "without notice. For help with your account, contact support@example.com or "
+    "open a ticket from the support portal. Follow us on social media for product "
+    "updates, release notes, and community events near you."
+)
+
+
+def test_simhash_near_duplicates_are_close() -> None:
+    near = FOOTER.replace("2024", "2025")
+    other = "Install the package with pip and configure the MongoDB connection string."
+
+    assert hamming_distance(simhash(FOOTER), simhash(near)) <= 3
+    assert hamming_distance(simhash(FOOTER), simhash(other)) > 3
+
+
+def test_simhash_depends_on_word_order() -> None:
+    same_words = " ".join(sorted(FOOTER.split()))
+
+    assert hamming_distance(simhash(FOOTER), simhash(same_words)) > 3
+
+
+def test_bands_share_a_value_within_distance() -> None:
+    value = simhash(FOOTER)
+    flipped = value ^ (1 << 3) ^ (1 << 40) ^ (1 << 63)
+    assert set(simhash_bands(value)) & set(simhash_bands(flipped))
+    assert from_signed64(to_signed64(flipped)) == flipped
+
+
+def test_internal_duplicates_link_to_first_occurrence() -> None:
+    base = simhash(FOOTER)
+    fingerprints = [
+        ChunkFingerprint(index=0, chunk_hash="a", simhash=base),
+        ChunkFingerprint(index=1, chunk_hash="b", simhash=base ^ 1),
+        ChunkFingerprint(index=2, chunk_hash="a", simhash=base),
+        ChunkFingerprint(index=3, chunk_hash="c", simhash=~base & ((1 << 64) - 1)),
+    ]
+
+    duplicates = find_internal_duplicates(fingerprints, "doc", max_distance=3)
+
+    assert set(duplicates) == {1, 2}
+    assert duplicates[1].canonical_chunk_hash == "a" and not duplicates[1].exact
+    assert duplicates[2].exact
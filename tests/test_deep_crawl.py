@@ -0,0 +1,101 @@
+"""Tests for the streaming breadth-first deep crawler."""
+
+import asyncio
+
+from mdrag.integrations.crawl4ai import crawler
+from mdrag.integrations.crawl4ai.frontier import HostLimiter, normalize_url
+from mdrag.integrations.models import Source, SourceFrontmatter
+
+_SITE = {
+    "https://docs.example.com/": ["/guide/", "/api", "https://other.com/x", "mailto:a@b.c"],
+    "https://docs.example.com/guide": ["/guide/install#step-1", "../api/"],
+    "https://docs.example.com/api": ["/guide/install", "/api/deep"],
+    "https://docs.example.com/guide/install": ["/api/deep"],
+    "https://docs.example.com/api/deep": [],
+}
+
+
+def _fake_fetch(fetched):
+    async def crawl_single_page(url, crawler=None, **kwargs):
+        fetched.append(url)
+        await asyncio.sleep(0)
+        return Source(
+            frontmatter=SourceFrontmatter(source_type="web", source_url=url),
+            content="x" * 10,
+            links=list(_SITE[url]),
+        )
+
+    return crawl_single_page
+
+
+def _crawl(monkeypatch, **kwargs):
+    fetched = []
+    monkeypatch.setattr(crawler, "crawl_single_page", _fake_fetch(fetched))
+
+    async def run():
+        return [
+            source
+            async for source in crawler.crawl_deep_stream(
+                "https://Docs.Example.com", crawler=object(), **kwargs
+            )
+        ]
+
+    return asyncio.run(run()), fetched
+
+
+def test_normalize_url_resolves_and_canonicalizes_links() -> None:
+    base = "https://docs.example.com/guide/"
+
+    assert normalize_url("install/#top", base) == "https://docs.example.com/guide/install"
+    assert normalize_url("HTTP://Example.COM:80/a/?q=1") == "http://example.com/a?q=1"
+    assert normalize_url("https://example.com:8443") == "https://example.com:8443/"
+    assert normalize_url("mailto:someone@example.com", base) is None
+    assert normalize_url("javascript:void(0)", base) is None
+
+
+def test_crawl_is_breadth_first_and_fetches_each_page_once(monkeypatch) -> None:
+    sources, fetched = _crawl(monkeypatch, max_depth=3, max_concurrent=1)
+
+    assert fetched == [
+        "https://docs.example.com/",
+        "https://docs.example.com/guide",
+        "https://docs.example.com/api",
+        "https://docs.example.com/guide/install",
+        "https://docs.example.com/api/deep",
+    ]
+    assert [source.metadata["crawl_depth"] for source in sources] == [1, 2, 2, 3, 3]
+    assert sources[3].metadata["parent_url"] == "https://docs.example.com/guide"
+
+
+def test_crawl_respects_depth_and_page_budget(monkeypatch) -> None:
+    _, fetched = _crawl(monkeypatch, max_depth=2)
+    assert len(fetched) == 3
+
+    sources, fetched = _crawl(monkeypatch, max_depth=3, max_pages=2)
+    assert len(fetched) == len(sources) == 2
+
+
+def test_crawl_stops_scheduling_when_byte_budget_is_spent(monkeypatch) -> None:
+    sources, _ = _crawl(monkeypatch, max_depth=3, max_concurrent=1, max_bytes=15)
+
+    assert len(sources) == 2
+
+
+def test_host_limiter_caps_concurrency_per_host() -> None:
+    limiter = HostLimiter(max_concurrent=2)
+    running = {"a.com": 0, "b.com": 0}
+    peak = {"a.com": 0, "b.com": 0}
+
+    async def fetch(host):
+        async with limiter.slot(f"https://{host}/page"):
+            running[host] += 1
+            peak[host] = max(peak[host], running[host])
+            await asyncio.sleep(0.01)
+            running[host] -= 1
+
+    async def run():
+        await asyncio.gather(*(fetch(host) for host in ["a.com"] * 5 + ["b.com"] * 5))
+
+    asyncio.run(run())
+
+    assert peak == {"a.com": 2, "b.com": 2}
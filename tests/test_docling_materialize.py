@@ -0,0 +1,50 @@
+"""Tests for handing source content to Docling without temp files."""
+
+import asyncio
+import hashlib
+from types import SimpleNamespace
+
+from mdrag.capabilities.ingestion.docling.processor import DoclingProcessor
+from mdrag.capabilities.ingestion.models import SourceContent, SourceContentKind
+
+
+def _processor() -> DoclingProcessor:
+    return DoclingProcessor(SimpleNamespace())
+
+
+def test_in_memory_content_is_streamed_not_written() -> None:
+    content = SourceContent(
+        kind=SourceContentKind.HTML,
+        data="<h1>Hello</h1>",
+        filename="page",
+    )
+    materialized = asyncio.run(_processor()._materialize_content(content))
+
+    assert materialized.path is None
+    assert materialized.name == "page.html"
+    assert materialized.content_hash == hashlib.sha256(b"<h1>Hello</h1>").hexdigest()
+    first = materialized.docling_source()
+    second = materialized.docling_source()
+    assert first is not second
+    assert first.stream.read() == second.stream.read() == b"<h1>Hello</h1>"
+
+
+def test_upstream_hash_skips_rereading_the_file(tmp_path, monkeypatch) -> None:
+    upload = tmp_path / "report.pdf"
+    upload.write_bytes(b"%PDF-1.7")
+
+    def _fail(path):
+        raise AssertionError("file was re-read to hash it")
+
+    monkeypatch.setattr(DoclingProcessor, "_hash_file", staticmethod(_fail))
+    content = SourceContent(
+        kind=SourceContentKind.FILE_PATH,
+        data=str(upload),
+        filename="report.pdf",
+        content_hash="abc123",
+    )
+    materialized = asyncio.run(_processor()._materialize_content(content))
+
+    assert materialized.content_hash == "abc123"
+    assert materialized.docling_source() == str(upload)
+    assert materialized.suffix == ".pdf"
@@ -0,0 +1,155 @@
+"""Tests for per-document write locks in the MongoDB storage adapter."""
+
+import asyncio
+from types import SimpleNamespace
+
+from mdrag.capabilities.ingestion.models import IngestionConfig
+from mdrag.integrations.mongodb.adapters.storage import MongoStorageAdapter
+
+
+class _Locks:
+    """In-memory stand-in for ``DocumentLocks`` shared by several adapters."""
+
+    def __init__(self, timeout=300.0) -> None:
+        self.timeout = timeout
+        self.held: set[str] = set()
+        self.released = asyncio.Event()
+        self.events: list[str] = []
+
+    async def acquire(self, document_uid, *, blocking=True):
+        while document_uid in self.held:
+            if not blocking:
+                return None
+            self.released.clear()
+            await self.released.wait()
+        self.held.add(document_uid)
+        self.events.append(f"acquire:{document_uid}")
+        return document_uid
+
+    async def extend(self, document_uid, lock):
+        self.events.append(f"extend:{document_uid}")
+        return True
+
+    async def release(self, document_uid, lock):
+        self.held.discard(document_uid)
+        self.events.append(f"release:{document_uid}")
+        self.released.set()
+
+
+class _Chunks:
+    async def bulk_write(self, operations, ordered=True, session=None):
+        pass
+
+
+def _adapter(locks, batch_size=10) -> MongoStorageAdapter:
+    adapter = MongoStorageAdapter(
+        settings=SimpleNamespace(mongodb_collection_chunks="chunks"),
+        config=IngestionConfig(write_batch_size=batch_size),
+        document_locks=locks,
+    )
+    adapter.db = {"chunks": _Chunks()}
+    adapter._initialized = True
+
+    async def store(document, chunks, representations, darwin_documents, session=None):
+        locks.events.append(f"write:{document.document_uid}")
+        await asyncio.sleep(0)
+        await adapter._write_chunks(chunks, document_uid=document.document_uid)
+
+    adapter._store = store
+    return adapter
+
+
+def _document(uid):
+    return SimpleNamespace(document_uid=uid)
+
+
+def test_lock_is_held_until_buffered_writes_are_flushed() -> None:
+    locks = _Locks()
+    adapter = _adapter(locks)
+
+    async def run():
+        await adapter.store(_document("a"), ["op"], None, [])
+        assert locks.held == {"a"}
+        await adapter.flush()
+
+    asyncio.run(run())
+
+    assert locks.held == set()
+    assert locks.events == ["acquire:a", "write:a", "release:a"]
+
+
+def test_buffered_locks_are_extended_until_flushed() -> None:
+    locks = _Locks(timeout=0.03)
+    adapter = _adapter(locks)
+
+    async def run():
+        await adapter.store(_document("a"), ["op"], None, [])
+        await asyncio.sleep(0.05)
+        await adapter.flush()
+        await asyncio.sleep(0.05)
+
+    asyncio.run(run())
+
+    assert locks.events[:2] == ["acquire:a", "write:a"]
+    assert "extend:a" in locks.events
+    assert locks.events[-1] == "release:a"
+
+
+def test_contended_lock_flushes_own_buffer_before_waiting() -> None:
+    locks = _Locks()
+    first, second = _adapter(locks), _adapter(locks)
+
+    async def run():
+        await first.store(_document("a"), ["op"], None, [])
+        await second.store(_document("b"), ["op"], None, [])
+        waiting = asyncio.create_task(first.store(_document("b"), ["op"], None, []))
+        await asyncio.sleep(0.01)
+        # ``first`` released "a" before waiting on "b", so this cannot deadlock.
+        await asyncio.wait_for(second.store(_document("a"), ["op"], None, []), timeout=1)
+        await second.flush()
+        await asyncio.wait_for(waiting, timeout=1)
+        await first.flush()
+
+    asyncio.run(run())
+
+    assert locks.held == set()
+    assert locks.events.count("write:a") == 2
+    assert locks.events.count("write:b") == 2
+
+
+def test_write_scopes_keep_concurrent_jobs_buffers_apart() -> None:
+    locks = _Locks()
+    adapter = _adapter(locks)
+    buffered = {}
+
+    async def job(uid, later_uid, delay):
+        async with adapter.write_scope():
+            await adapter.store(_document(uid), ["op"], None, [])
+            await asyncio.sleep(delay)
+            buffered[uid] = adapter.buffered_documents()
+            await adapter.store(_document(later_uid), ["op"], None, [])
+
+    async def run():
+        # "a" waits on "b" while holding its local lock; the job holding "b"
+        # flushes before waiting on that local lock, so this cannot deadlock.
+        await asyncio.wait_for(
+            asyncio.gather(job("a", "b", 0.01), job("b", "b", 0.02)), timeout=1
+        )
+
+    asyncio.run(run())
+
+    assert buffered == {"a": {"a"}, "b": {"b"}}
+    assert locks.held == set()
+    assert locks.events.count("write:b") == 3
+
+
+def test_unbuffered_writes_release_the_lock_immediately() -> None:
+    locks = _Locks()
+    adapter = _adapter(locks, batch_size=0)
+
+    async def run():
+        await adapter.store(_document("a"), [], None, [])
+
+    asyncio.run(run())
+
+    assert locks.events == ["acquire:a", "write:a", "release:a"]
@@ -0,0 +1,172 @@
+"""Tests for the declarative MongoDB index manager."""
+
+import asyncio
+from types import SimpleNamespace
+
+from mdrag.integrations.mongodb.indexes import (
+    BTreeIndexSpec,
+    IndexManager,
+    build_index_specs,
+    definition_matches,
+    ensure_btree_indexes,
+)
+
+_SETTINGS = SimpleNamespace(
+    mongodb_collection_chunks="chunks",
+    mongodb_collection_documents="documents",
+    mongodb_collection_representations="representations",
+    mongodb_collection_chunk_fingerprints="fingerprints",
+    mongodb_vector_index="vector_index",
+    mongodb_text_index="text_index",
+    mongodb_vector_similarity="dotProduct",
+    embedding_dimension=1024,
+)
+
+
+class _Cursor:
+    def __init__(self, docs):
+        self._docs = docs
+
+    async def to_list(self, length=None):
+        return list(self._docs)
+
+
+class _Collection:
+    def __init__(self, indexes=(), search_indexes=()):
+        self.indexes = {index["name"]: index for index in indexes}
+        self.search_indexes = list(search_indexes)
+        self.created = []
+
+    async def list_indexes(self):
+        return _Cursor(self.indexes.values())
+
+    async def aggregate(self, pipeline):
+        return _Cursor(self.search_indexes)
+
+    async def create_index(self, keys, name, sparse=False, unique=False):
+        self.created.append(name)
+        self.indexes[name] = {
+            "name": name,
+            "key": dict(keys),
+            "sparse": sparse,
+            "unique": unique,
+        }
+
+    async def drop_index(self, name):
+        self.indexes.pop(name)
+
+
+class _Database:
+    def __init__(self, collections):
+        self.collections = collections
+        self.commands = []
+
+    def __getitem__(self, name):
+        return self.collections.setdefault(name, _Collection())
+
+    async def command(self, command):
+        self.commands.append(command)
+        name = command.get("createSearchIndexes") or command.get("updateSearchIndex")
+        collection = self[name]
+        for index in command.get("indexes", []):
+            collection.search_indexes.append(
+                {
+                    "name": index["name"],
+                    "type": index["type"],
+                    "queryable": True,
+                    "latestDefinition": index["definition"],
+                }
+            )
+
+
+def test_vector_spec_uses_settings_and_filter_fields() -> None:
+    vector = build_index_specs(_SETTINGS)[0]
+
+    embedding, *filters = vector.definition["fields"]
+    assert embedding["numDimensions"] == 1024
+    assert embedding["similarity"] == "dotProduct"
+    assert {item["path"] for item in filters} >= {
+        "source_url",
+        "source_group",
+        "user_id",
+        "org_id",
+        "source_mask",
+        "alias_source_urls",
+    }
+
+
+def test_definition_matches_ignores_server_defaults_and_order() -> None:
+    expected = {"fields": [{"type": "filter", "path": "a"}, {"type": "filter", "path": "b"}]}
+    live = {
+        "fields": [
+            {"type": "filter", "path": "b"},
+            {"type": "filter", "path": "a", "extra": True},
+        ]
+    }
+
+    assert definition_matches(expected, live)
+    assert not definition_matches(expected, {"fields": live["fields"][:1]})
+
+
+def test_plan_keeps_matching_indexes_and_replaces_changed_ones() -> None:
+    chunks = _Collection(
+        indexes=[
+            {"name": "_id_", "key": {"_id": 1}},
+            {"name": "doc_uid_idx", "key": {"document_uid": 1}},
+            {"name": "document_id_page_window", "key": {"document_id": 1}},
+        ]
+    )
+    manager = IndexManager(
+        _Database({"chunks": chunks}),
+        [
+            BTreeIndexSpec("chunks", "document_uid", (("document_uid", 1),)),
+            BTreeIndexSpec(
+                "chunks",
+                "document_id_page_window",
+                (("document_id", 1), ("page_window", 1)),
+            ),
+        ],
+    )
+
+    plan = asyncio.run(manager.plan())
+
+    assert plan.unchanged == ["doc_uid_idx"]
+    assert [(a.action, a.drop) for a in plan.actions] == [
+        ("replace", "document_id_page_window")
+    ]
+
+
+def test_sync_creates_indexes_and_reports_nothing_unindexed() -> None:
+    db = _Database({})
+    manager = IndexManager.from_settings(db, _SETTINGS)
+
+    report = asyncio.run(manager.sync(interval=0))
+
+    assert report.ok
+    assert report.unindexed == []
+    assert {command.get("createSearchIndexes") for command in db.commands} == {"chunks"}
+
+
+def test_adapters_create_btree_indexes_from_the_specs() -> None:
+    db = _Database({})
+    specs = build_index_specs(_SETTINGS)
+
+    asyncio.run(ensure_btree_indexes(db, specs))
+
+    assert db.commands == []
+    assert db["chunks"].indexes["duplicate_sources_document_id"]["sparse"] is True
+    assert db["representations"].indexes["document_kind_key_part"]["unique"] is True
+    assert set(db["fingerprints"].created) == {"scope_bands", "scope_chunk_hash", "source_url"}
+    plan = asyncio.run(IndexManager(db, specs).plan())
+    assert all(action.spec.kind != "btree" for action in plan.actions)
+
+
+def test_dry_run_reports_unindexed_filters_without_writing() -> None:
+    db = _Database({})
+    manager = IndexManager.from_settings(db, _SETTINGS)
+
+    report = asyncio.run(manager.sync(dry_run=True))
+
+    assert db.commands == []
+    assert db["chunks"].created == []
+    assert {usage.field for usage in report.unindexed} >= {"document_uid", "source_mask"}
@@ -0,0 +1,441 @@
+"""Tests for the async job store, progress events, and job fan-out."""
+
+import asyncio
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from mdrag.capabilities.ingestion.jobs.idempotency import idempotency_key
+from mdrag.capabilities.ingestion.jobs.service import IngestionService
+from mdrag.capabilities.ingestion.jobs.store import JobStatus, JobStore
+from mdrag.interfaces.api.services.ingest import IngestJobService
+from mdrag.mdrag_logging.service_logging import get_logger
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [
+            await getattr(self._client, name)(*args, **kwargs)
+            for name, args, kwargs in self._calls
+        ]
+
+
+class _FakePubSub:
+    def __init__(self, client):
+        self._client = client
+        self.messages = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self._client.subscribers.setdefault(channel, []).append(self)
+
+    async def get_message(self, ignore_subscribe_messages=True, timeout=None):
+        try:
+            return await asyncio.wait_for(self.messages.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def unsubscribe(self, channel):
+        self._client.subscribers[channel].remove(self)
+
+    async def aclose(self):
+        pass
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.hashes = {}
+        self.lists = {}
+        self.subscribers = {}
+        self.commands = []
+
+    async def hset(self, key, mapping):
+        self.commands.append(("hset", key, sorted(mapping)))
+        self.hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    async def hsetnx(self, key, field, value):
+        self.hashes.setdefault(key, {}).setdefault(field, value)
+
+    async def hgetall(self, key):
+        self.commands.append(("hgetall", key))
+        return dict(self.hashes.get(key, {}))
+
+    async def hget(self, key, field):
+        return self.hashes.get(key, {}).get(field)
+
+    async def hmget(self, key, *fields):
+        return [self.hashes.get(key, {}).get(field) for field in fields]
+
+    async def hdel(self, key, *fields):
+        for field in fields:
+            self.hashes.get(key, {}).pop(field, None)
+
+    async def hincrby(self, key, field, amount):
+        value = int(self.hashes.setdefault(key, {}).get(field, 0)) + amount
+        self.hashes[key][field] = str(value)
+        return value
+
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(value)
+
+    async def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+    async def delete(self, key):
+        self.lists.pop(key, None)
+        self.hashes.pop(key, None)
+
+    async def publish(self, channel, message):
+        for subscriber in self.subscribers.get(channel, []):
+            subscriber.messages.put_nowait({"type": "message", "data": message})
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+    def pubsub(self):
+        return _FakePubSub(self)
+
+
+def _service(enqueue, batch_size=2):
+    service = IngestionService.__new__(IngestionService)
+    service.settings = SimpleNamespace(ingestion_fanout_batch_size=batch_size)
+    service._enqueue = enqueue
+    return service
+
+
+def test_status_updates_write_only_changed_fields() -> None:
+    client = _FakeRedis()
+    store = JobStore("redis://unused", client=client)
+
+    async def run():
+        await store.create_job("job", {"source_type": "web"})
+        client.commands.clear()
+        await store.update_status("job", JobStatus.INDEXING)
+        await store.report_progress("job", sources_done=1, sources_total=3, chunks_embedded=7)
+        await store.report_progress("job", sources_done=2, chunks_embedded=5)
+        return await store.get_job("job")
+
+    state = asyncio.run(run())
+
+    assert ("hset", "ingestion:job:job", ["status", "updated_at"]) in client.commands
+    assert not any(command[0] == "hgetall" for command in client.commands[:-1])
+    assert state.status == JobStatus.INDEXING
+    assert state.payload == {"source_type": "web"}
+    assert state.progress == {"sources_done": 2, "sources_total": 3, "chunks_embedded": 12}
+
+
+def test_watch_streams_snapshot_then_events_until_terminal() -> None:
+    store = JobStore("redis://unused", client=_FakeRedis())
+
+    async def run():
+        await store.create_job("job", {})
+        events = []
+
+        async def consume():
+            async for event in store.watch("job", keepalive=0.01):
+                events.append(event)
+
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        await store.report_progress("job", sources_done=1, sources_total=1, chunks_embedded=4)
+        await store.update_status("job", JobStatus.COMPLETED)
+        await asyncio.wait_for(consumer, 1)
+        return events
+
+    events = [event for event in asyncio.run(run()) if event is not None]
+
+    assert [event["event"] for event in events] == ["snapshot", "progress", "status"]
+    assert events[1]["chunks_embedded"] == 4
+    assert events[-1]["status"] == "COMPLETED"
+
+
+def test_idempotency_key_follows_source_identity() -> None:
+    web = {"source_type": "web", "url": "HTTPS://Docs.Example.com/guide/#intro", "namespace": {}}
+
+    assert idempotency_key(web) == idempotency_key(
+        {**web, "url": "https://docs.example.com/guide"}
+    )
+    assert idempotency_key(web) != idempotency_key({**web, "deep": True})
+    assert idempotency_key(web) != idempotency_key({**web, "namespace": {"org_id": "b"}})
+    assert idempotency_key(
+        {"source_type": "gdrive", "file_ids": ["b", "a"], "namespace": {}}
+    ) == idempotency_key({"source_type": "gdrive", "file_ids": ["a", "b", "a"]})
+    assert idempotency_key({"source_type": "upload", "file_path": "/tmp/x"}) is None
+
+
+def _lua_store() -> JobStore:
+    """Job store on fakeredis, which runs the claim and release Lua scripts."""
+    return JobStore("redis://unused", client=fakeredis.FakeAsyncRedis(decode_responses=True))
+
+
+def test_claim_returns_in_flight_owner_until_it_finishes() -> None:
+    store = _lua_store()
+
+    async def run():
+        await store.create_job("first", {})
+        claims = [await store.claim_idempotency_key("key", "first", 60)]
+        await store.create_job("second", {})
+        claims.append(await store.claim_idempotency_key("key", "second", 60))
+        await store.delete_job("second")
+        await store.update_status("first", JobStatus.COMPLETED)
+        await store.create_job("third", {})
+        claims.append(await store.claim_idempotency_key("key", "third", 60))
+        return claims, await store.get_job("second")
+
+    claims, deleted = asyncio.run(run())
+
+    assert claims == ["first", "first", "third"]
+    assert deleted is None
+
+
+def test_release_only_drops_a_key_its_job_still_owns() -> None:
+    store = _lua_store()
+
+    async def run():
+        await store.claim_idempotency_key("key", "first", 60)
+        released = [await store.release_idempotency_key("key", "second")]
+        released.append(await store.release_idempotency_key("key", "first"))
+        return released, await store.redis.get("ingestion:idempotency:key")
+
+    released, owner = asyncio.run(run())
+
+    assert released == [False, True]
+    assert owner is None
+
+
+def test_failed_submit_fails_the_job_and_frees_its_key() -> None:
+    store = _lua_store()
+    submitted = []
+
+    class _Scheduler:
+        down = True
+
+        async def submit(self, job_id, payload):
+            submitted.append(job_id)
+            if self.down:
+                raise ConnectionError("scheduler unavailable")
+
+    service = IngestJobService.__new__(IngestJobService)
+    service.settings = SimpleNamespace(
+        ingestion_scheduler_enabled=True, ingestion_idempotency_ttl=60
+    )
+    service.job_store = store
+    service.scheduler = _Scheduler()
+    service.logger = get_logger(__name__)
+    payload = {"source_type": "web", "url": "https://example.com/", "namespace": {}}
+
+    async def run():
+        with pytest.raises(ConnectionError):
+            await service._queue(dict(payload))
+        failed = await store.get_job(submitted[0])
+        service.scheduler.down = False
+        return failed, await service._queue(dict(payload))
+
+    failed, retried = asyncio.run(run())
+
+    assert failed.status == JobStatus.FAILED
+    assert failed.error == "scheduler unavailable"
+    assert retried["deduplicated"] is False
+    assert submitted == [failed.job_id, retried["job_id"]]
+
+
+def test_fanout_batches_only_split_jobs_larger_than_batch_size() -> None:
+    service = _service(None, batch_size=2)
+
+    assert service._fanout_batches(["a", "b"]) is None
+    assert service._fanout_batches(["a", "b", "c"]) == [["a", "b"], ["c"]]
+    assert _service(None, batch_size=0)._fanout_batches(["a"] * 5) is None
+
+
+def test_parent_aggregates_children_when_last_child_finishes() -> None:
+    store = JobStore("redis://unused", client=_FakeRedis())
+    queued = []
+
+    async def enqueue(job_id, payload):
+        queued.append((job_id, payload))
+
+    service = _service(enqueue)
+
+    async def run():
+        await store.create_job("parent", {"source_type": "gdrive"})
+        await service._fan_out(
+            "parent",
+            store,
+            [
+                {"source_type": "gdrive", "file_ids": ["a", "b"]},
+                {"source_type": "gdrive", "file_ids": ["c"]},
+            ],
+            "bulk",
+        )
+        waiting = await store.get_job("parent")
+        child = await store.get_job("parent-1")
+        first = await store.record_child_result(
+            "parent", "parent-0", failed=False, result={"documents": [{"document_uid": "a"}]}
+        )
+        final = await store.record_child_result("parent", "parent-1", failed=True, error="boom")
+        return waiting, child, first, final
+
+    waiting, child, first, final = asyncio.run(run())
+
+    assert [job_id for job_id, _ in queued] == ["parent-0", "parent-1"]
+    assert all(payload["parent_id"] == "parent" for _, payload in queued)
+    assert all(payload["priority"] == "bulk" for _, payload in queued)
+    assert waiting.status == JobStatus.WAITING_FOR_CHILDREN
+    assert child.parent_id == "parent"
+    assert first is None
+    assert final.status == JobStatus.COMPLETED
+    assert final.error == "1 of 2 child jobs failed"
+    assert final.result["documents"] == [{"document_uid": "a"}]
+    assert final.result["failed_children"] == [{"job_id": "parent-1", "error": "boom"}]
+    assert final.children == {"total": 2, "done": 2, "failed": 1}
+
+
+def test_unqueueable_children_still_complete_the_parent() -> None:
+    store = JobStore("redis://unused", client=_FakeRedis())
+
+    async def enqueue(job_id, payload):
+        raise ConnectionError("redis down")
+
+    async def run():
+        await store.create_job("parent", {"source_type": "web"})
+        await _service(enqueue)._fan_out(
+            "parent",
+            store,
+            [
+                {
+                    "source_type": "collected",
+                    "sources": [{"frontmatter": {"source_url": "https://example.com"}}],
+                }
+            ],
+            "bulk",
+        )
+        return await store.get_job("parent"), await store.get_job("parent-0")
+
+    parent, child = asyncio.run(run())
+
+    assert parent.status == JobStatus.FAILED
+    assert child.payload["source_urls"] == ["https://example.com"]
+    assert parent.result["children"]["failed"] == 1
+
+
+class _FakeSource:
+    def __init__(self, url):
+        self.url = url
+
+    def model_dump(self, mode=None):
+        return {"frontmatter": {"source_url": self.url}}
+
+
+async def _stream(urls):
+    for url in urls:
+        yield _FakeSource(url)
+
+
+def _collected_batch(batch):
+    return {"source_type": "collected", "sources": [source.model_dump() for source in batch]}
+
+
+def test_streamed_fanout_enqueues_batches_as_they_fill_and_seals_count() -> None:
+    store = JobStore("redis://unused", client=_FakeRedis())
+    queued = []
+
+    async def enqueue(job_id, payload):
+        queued.append(job_id)
+        # Children may finish before the parent knows how many there are.
+        await store.record_child_result("parent", job_id, failed=False, result={})
+
+    service = _service(enqueue)
+
+    async def run():
+        await store.create_job("parent", {"source_type": "web"})
+        held = await service._fan_out_stream(
+            "parent", store, _stream(["a", "b", "c", "d", "e"]), _collected_batch, "bulk"
+        )
+        return held, await store.get_job("parent"), await store.get_job("parent-2")
+
+    held, parent, last_child = asyncio.run(run())
+
+    assert held is None
+    assert queued == ["parent-0", "parent-1", "parent-2"]
+    assert last_child.payload["source_urls"] == ["e"]
+    assert parent.status == JobStatus.COMPLETED
+    assert parent.children == {"total": 3, "done": 3, "failed": 0}
+
+
+def test_failed_stream_seals_the_children_already_enqueued() -> None:
+    store = JobStore("redis://unused", client=_FakeRedis())
+    queued = []
+
+    async def enqueue(job_id, payload):
+        queued.append(job_id)
+
+    async def broken_stream():
+        async for source in _stream(["a", "b", "c", "d"]):
+            yield source
+        raise RuntimeError("crawler crashed")
+
+    async def run():
+        await store.create_job("parent", {"source_type": "web"})
+        held = await _service(enqueue)._fan_out_stream(
+            "parent", store, broken_stream(), _collected_batch, "bulk"
+        )
+        waiting = await store.get_job("parent")
+        for job_id in queued:
+            await store.record_child_result("parent", job_id, failed=False, result={})
+        return held, waiting, await store.get_job("parent")
+
+    held, waiting, parent = asyncio.run(run())
+
+    assert held is None
+    assert queued == ["parent-0", "parent-1"]
+    assert waiting.children == {"total": 2, "done": 0, "failed": 0}
+    assert parent.status == JobStatus.COMPLETED
+    assert parent.result["fanout_error"] == "crawler crashed"
+    assert parent.error == "Source stream failed after 2 child jobs: crawler crashed"
+
+
+def test_stream_failing_before_fanout_fails_the_job() -> None:
+    store = JobStore("redis://unused", client=_FakeRedis())
+
+    async def broken_stream():
+        yield _FakeSource("a")
+        raise RuntimeError("crawler crashed")
+
+    async def run():
+        await store.create_job("parent", {"source_type": "web"})
+        await _service(None)._fan_out_stream(
+            "parent", store, broken_stream(), _collected_batch, "bulk"
+        )
+
+    with pytest.raises(RuntimeError, match="crawler crashed"):
+        asyncio.run(run())
+
+
+def test_streamed_fanout_keeps_small_jobs_whole() -> None:
+    store = JobStore("redis://unused", client=_FakeRedis())
+
+    async def enqueue(job_id, payload):
+        raise AssertionError("small jobs must not fan out")
+
+    async def run():
+        await store.create_job("parent", {"source_type": "web"})
+        held = await _service(enqueue)._fan_out_stream(
+            "parent", store, _stream(["a", "b"]), _collected_batch, "bulk"
+        )
+        return held, await store.get_job("parent")
+
+    held, parent = asyncio.run(run())
+
+    assert [source.url for source in held] == ["a", "b"]
+    assert parent.children is None
@@ -0,0 +1,52 @@
+"""Tests for markdown structure parsing used by the text-native fast path."""
+
+from mdrag.capabilities.ingestion.docling.markdown_blocks import (
+    BLOCK_CODE,
+    BLOCK_LIST,
+    BLOCK_PARAGRAPH,
+    BLOCK_TABLE,
+    parse_markdown_blocks,
+)
+
+SAMPLE = """# Guide
+
+Intro paragraph
+spanning two lines.
+
+## Install
+
+- step one
+- step two
+  continued
+
+```bash
+# not a heading
+pip install mdrag
+```
+
+Usage
+-----
+
+| a | b |
+|---|---|
+| 1 | 2 |
+
+# Appendix
+
+Tail.
+"""
+
+
+def test_blocks_carry_heading_paths() -> None:
+    blocks = parse_markdown_blocks(SAMPLE)
+
+    assert [(block.kind, block.heading_path) for block in blocks] == [
+        (BLOCK_PARAGRAPH, ["Guide"]),
+        (BLOCK_LIST, ["Guide", "Install"]),
+        (BLOCK_CODE, ["Guide", "Install"]),
+        (BLOCK_TABLE, ["Guide", "Usage"]),
+        (BLOCK_PARAGRAPH, ["Appendix"]),
+    ]
+    assert blocks[0].text == "Intro paragraph\nspanning two lines."
+    assert "# not a heading" in blocks[2].text
+    assert SAMPLE[blocks[3].start_char :].startswith("| a | b |")
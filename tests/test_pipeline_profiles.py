@@ -0,0 +1,38 @@
+"""Tests for Docling pipeline profile selection."""
+
+from mdrag.capabilities.ingestion.docling.pipeline_profiles import (
+    PROFILE_OCR_FULL,
+    PROFILE_OCR_PARTIAL,
+    PROFILE_TEXT,
+    PROFILE_TEXT_TABLES,
+    PdfProbe,
+    select_profile,
+)
+
+
+def _probe(**overrides) -> PdfProbe:
+    values = dict(
+        page_count=20,
+        sampled_pages=8,
+        text_pages=8,
+        ocr_pages=0,
+        image_pages=0,
+        table_pages=0,
+        avg_chars=1800.0,
+    )
+    values.update(overrides)
+    return PdfProbe(**values)
+
+
+def test_digital_pdf_skips_ocr_and_tables() -> None:
+    assert select_profile(_probe()) is PROFILE_TEXT
+    assert select_profile(_probe(image_pages=3)) is PROFILE_TEXT
+
+
+def test_tables_enable_table_structure_only() -> None:
+    assert select_profile(_probe(table_pages=2)) is PROFILE_TEXT_TABLES
+
+
+def test_scanned_pages_select_ocr() -> None:
+    assert select_profile(_probe(text_pages=6, ocr_pages=2, image_pages=2)) is PROFILE_OCR_PARTIAL
+    assert select_profile(_probe(text_pages=0, ocr_pages=8, image_pages=8)) is PROFILE_OCR_FULL
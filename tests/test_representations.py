@@ -0,0 +1,29 @@
+"""Tests for compressed document representation records."""
+
+from mdrag.integrations.mongodb.adapters import representations
+from mdrag.integrations.mongodb.adapters.representations import (
+    KIND_PAGE_TEXT,
+    RepresentationStore,
+    compress_payload,
+    decompress_payload,
+)
+
+
+def test_compress_roundtrip() -> None:
+    raw = ("page text " * 1000).encode("utf-8")
+    codec, compressed = compress_payload(raw)
+    assert codec in {"zstd", "zlib"}
+    assert len(compressed) < len(raw)
+    assert decompress_payload(codec, compressed) == raw
+
+
+def test_build_records_splits_large_payloads(monkeypatch) -> None:
+    monkeypatch.setattr(representations, "MAX_RECORD_BYTES", 16)
+    monkeypatch.setattr(representations, "compress_payload", lambda data: ("none", data))
+    raw = b"x" * 40
+    records = RepresentationStore._build_records("doc", "uid", KIND_PAGE_TEXT, 3, raw)
+
+    assert [record["part"] for record in records] == [0, 1, 2]
+    assert all(record["key"] == 3 for record in records)
+    assert b"".join(bytes(record["data"]) for record in records) == raw
+    assert records[0]["raw_size"] == len(raw)
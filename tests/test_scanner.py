@@ -0,0 +1,45 @@
+"""Tests for folder scanning and manifest change detection."""
+
+import os
+
+from mdrag.capabilities.ingestion.scanner import FolderManifest, scan_document_files
+
+
+def test_scan_filters_suffixes_and_hidden_dirs(tmp_path) -> None:
+    (tmp_path / "a.md").write_text("a")
+    (tmp_path / "nested").mkdir()
+    (tmp_path / "nested" / "b.PDF").write_bytes(b"b")
+    (tmp_path / "notes.json").write_text("{}")
+    (tmp_path / ".cache").mkdir()
+    (tmp_path / ".cache" / "c.md").write_text("c")
+
+    files = scan_document_files(str(tmp_path))
+
+    assert files == sorted([str(tmp_path / "a.md"), str(tmp_path / "nested" / "b.PDF")])
+
+
+def test_manifest_detects_new_modified_and_deleted(tmp_path) -> None:
+    root = str(tmp_path)
+    (tmp_path / "keep.md").write_text("keep")
+    (tmp_path / "edit.md").write_text("before")
+    (tmp_path / "gone.md").write_text("gone")
+
+    manifest = FolderManifest(root).load()
+    first = manifest.diff(scan_document_files(root))
+    assert len(first.new) == 3
+    for file_path in first.changed:
+        manifest.mark_ingested(file_path)
+    manifest.save()
+
+    (tmp_path / "edit.md").write_text("after!")
+    (tmp_path / "gone.md").unlink()
+    (tmp_path / "added.md").write_text("added")
+    touched = tmp_path / "keep.md"
+    os.utime(touched, ns=(touched.stat().st_atime_ns, touched.stat().st_mtime_ns + 10**9))
+
+    second = FolderManifest(root).load().diff(scan_document_files(root))
+
+    assert second.new == [str(tmp_path / "added.md")]
+    assert second.modified == [str(tmp_path / "edit.md")]
+    assert second.deleted == [str(tmp_path / "gone.md")]
+    assert second.unchanged == [str(tmp_path / "keep.md")]
@@ -0,0 +1,199 @@
+"""Tests for the fair-share ingestion scheduler."""
+
+import asyncio
+from types import SimpleNamespace
+
+from mdrag.capabilities.ingestion.jobs.scheduler import (
+    FairShareScheduler,
+    PriorityClass,
+    classify_job,
+)
+
+
+class _FakePipeline:
+    def __init__(self, client):
+        self._client = client
+        self._calls = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self):
+        return [
+            await getattr(self._client, name)(*args, **kwargs)
+            for name, args, kwargs in self._calls
+        ]
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.lists = {}
+        self.sets = {}
+        self.zsets = {}
+        self.hashes = {}
+
+    async def rpush(self, key, value):
+        self.lists.setdefault(key, []).append(str(value))
+
+    async def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, str(value))
+
+    async def lpop(self, key):
+        items = self.lists.get(key)
+        return items.pop(0) if items else None
+
+    async def llen(self, key):
+        return len(self.lists.get(key, []))
+
+    async def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+    async def ltrim(self, key, start, end):
+        self.lists[key] = self.lists.get(key, [])[start : end + 1]
+
+    async def sadd(self, key, member):
+        self.sets.setdefault(key, set()).add(member)
+
+    async def srem(self, key, member):
+        self.sets.get(key, set()).discard(member)
+
+    async def smembers(self, key):
+        return set(self.sets.get(key, set()))
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zrem(self, key, member):
+        self.zsets.get(key, {}).pop(member, None)
+
+    async def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        for member in [m for m, score in zset.items() if score <= high]:
+            del zset[member]
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def hincrby(self, key, field, amount):
+        bucket = self.hashes.setdefault(key, {})
+        bucket[field] = str(int(bucket.get(field, 0)) + amount)
+
+    async def hincrbyfloat(self, key, field, amount):
+        bucket = self.hashes.setdefault(key, {})
+        bucket[field] = str(float(bucket.get(field, 0)) + amount)
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+class _FakeQueue:
+    def __init__(self):
+        self.jobs = []
+
+    @property
+    def count(self):
+        return len(self.jobs)
+
+    def enqueue(self, func, job_id, payload):
+        self.jobs.append(job_id)
+
+
+def _scheduler(max_running=10, weights=None, window=100):
+    settings = SimpleNamespace(
+        redis_url="redis://unused",
+        ingestion_scheduler_window=window,
+        ingestion_tenant_max_running=max_running,
+        ingestion_tenant_weights=weights or {},
+        ingestion_scheduler_lease_seconds=3600.0,
+    )
+    return FairShareScheduler(settings, client=_FakeRedis(), queue=_FakeQueue())
+
+
+def _job(org, **payload):
+    return {
+        "source_type": "web",
+        "url": "https://example.com",
+        "namespace": {"org_id": org},
+        **payload,
+    }
+
+
+async def _drain(scheduler, limit=20):
+    order = []
+    for _ in range(limit):
+        entry = await scheduler.next_job()
+        if entry is None:
+            break
+        order.append(entry["job_id"])
+    return order
+
+
+def test_classify_job_by_source_and_explicit_priority() -> None:
+    assert classify_job({"source_type": "upload"}) == PriorityClass.INTERACTIVE
+    assert classify_job({"source_type": "web", "deep": True}) == PriorityClass.BULK
+    assert classify_job({"source_type": "gdrive", "folder_ids": ["f"]}) == PriorityClass.BULK
+    assert classify_job({"source_type": "web", "priority": "readings"}) == PriorityClass.READINGS
+
+
+def test_higher_classes_are_served_first() -> None:
+    scheduler = _scheduler()
+
+    async def run():
+        await scheduler.submit("crawl", _job("a", deep=True))
+        await scheduler.submit("reading", _job("a", priority="readings"))
+        await scheduler.submit("upload", {"source_type": "upload", "namespace": {"org_id": "b"}})
+        return await _drain(scheduler)
+
+    assert asyncio.run(run()) == ["upload", "reading", "crawl"]
+
+
+def test_tenants_take_weighted_turns_within_a_class() -> None:
+    scheduler = _scheduler(weights={"a": 2.0})
+
+    async def run():
+        for index in range(4):
+            await scheduler.submit(f"a{index}", _job("a", deep=True))
+        for index in range(2):
+            await scheduler.submit(f"b{index}", _job("b", deep=True))
+        return await _drain(scheduler)
+
+    assert asyncio.run(run()) == ["a0", "a1", "b0", "a2", "a3", "b1"]
+
+
+def test_tenant_cap_holds_jobs_until_release() -> None:
+    scheduler = _scheduler(max_running=1)
+
+    async def run():
+        await scheduler.submit("a0", _job("a"))
+        await scheduler.submit("a1", _job("a"))
+        await scheduler.submit("b0", _job("b"))
+        first = await _drain(scheduler)
+        await scheduler.release("a0", _job("a"))
+        return first, await _drain(scheduler)
+
+    assert asyncio.run(run()) == (["a0", "b0"], ["a1"])
+
+
+def test_dispatch_respects_window_and_records_wait_metrics() -> None:
+    scheduler = _scheduler(window=1)
+
+    async def run():
+        await scheduler.submit("a0", _job("a"))
+        await scheduler.submit("a1", _job("a", deep=True))
+        dispatched = [await scheduler.dispatch_once(), await scheduler.dispatch_once()]
+        return dispatched, await scheduler.metrics()
+
+    dispatched, metrics = asyncio.run(run())
+
+    assert dispatched == [True, False]
+    assert scheduler.queue.jobs == ["a0"]
+    assert metrics["classes"]["interactive"]["dispatched"] == 1
+    assert metrics["classes"]["bulk"]["pending"] == 1
+    assert metrics["classes"]["interactive"]["wait_seconds"]["p95"] >= 0
@@ -0,0 +1,132 @@
+"""Tests for static-first fetching with browser escalation."""
+
+import asyncio
+from types import SimpleNamespace
+
+from mdrag.integrations.crawl4ai import crawler
+from mdrag.integrations.crawl4ai.fetch import scan_html
+from mdrag.integrations.crawl4ai.pool import _block_heavy_resources
+
+_DOCS_PAGE = (
+    "<html><head><title>Install</title><script>track()</script></head><body>"
+    "<nav><a href='/guide'>Guide</a></nav><main><h1>Install</h1><p>"
+    + "Run the installer and follow the prompts. " * 10
+    + "</p><a href='../api#top'>API</a></main></body></html>"
+)
+_SPA_SHELL = (
+    "<html><head><title>App</title></head><body>"
+    "<noscript>You need to enable JavaScript to run this app.</noscript>"
+    "<div id='root'></div><script src='/bundle.js'></script></body></html>"
+)
+
+
+class _FakeResponse:
+    def __init__(self, status_code, text="", content_type="text/html; charset=utf-8"):
+        self.status_code = status_code
+        self.text = text
+        self.headers = {"content-type": content_type, "etag": '"v1"'}
+        self.url = "https://docs.example.com/install"
+
+
+class _FakeHttp:
+    def __init__(self, response):
+        self.response = response
+        self.requests = []
+
+    async def get(self, url, headers=None, cookies=None, **kwargs):
+        self.requests.append(headers)
+        return self.response
+
+
+class _FakeCrawler:
+    def __init__(self):
+        self.runs = 0
+
+    async def arun(self, url, config):
+        self.runs += 1
+        return SimpleNamespace(
+            success=True, url=url, html="<p>rendered</p>", markdown="rendered", links=[]
+        )
+
+
+def _crawl(response):
+    browser = _FakeCrawler()
+    source = asyncio.run(
+        crawler.crawl_single_page(
+            "https://docs.example.com/install",
+            crawler=browser,
+            http_client=_FakeHttp(response),
+            fetch_mode="static_first",
+        )
+    )
+    return source, browser
+
+
+def test_scan_flags_pages_that_need_javascript() -> None:
+    docs = scan_html(_DOCS_PAGE)
+
+    assert docs.title == "Install"
+    assert docs.links == ["/guide", "../api#top"]
+    assert docs.needs_javascript() is None
+    assert scan_html(_SPA_SHELL).needs_javascript() == "empty_body"
+    shell_with_footer = _SPA_SHELL.replace("</body>", "<footer>(c) Example</footer></body>")
+    assert scan_html(shell_with_footer).needs_javascript() == "spa_marker"
+    mounted_app = "<body><div id='app'></div><footer>" + "x" * 300 + "</footer></body>"
+    assert scan_html(mounted_app).needs_javascript() == "spa_marker"
+    assert scan_html("<body><p>Moved.</p></body>").needs_javascript() == "thin_text"
+
+
+def test_static_page_never_reaches_the_browser() -> None:
+    source, browser = _crawl(_FakeResponse(200, _DOCS_PAGE))
+
+    assert browser.runs == 0
+    assert source.html == _DOCS_PAGE
+    assert source.links == ["/guide", "../api#top"]
+    assert source.metadata["fetch_mode"] == "static"
+    assert source.frontmatter.source_etag == '"v1"'
+
+
+def test_javascript_and_non_html_pages_escalate_to_the_browser() -> None:
+    for response in (
+        _FakeResponse(200, _SPA_SHELL),
+        _FakeResponse(200, "%PDF-1.7", content_type="application/pdf"),
+        _FakeResponse(403, _DOCS_PAGE),
+    ):
+        source, browser = _crawl(response)
+
+        assert browser.runs == 1
+        assert source.content == "rendered"
+        assert source.metadata["fetch_mode"] == "browser"
+
+
+def test_pooled_pages_skip_images_fonts_and_media() -> None:
+    routed = {}
+
+    class _Route:
+        def __init__(self, resource_type):
+            self.request = SimpleNamespace(resource_type=resource_type)
+
+        async def abort(self):
+            routed[self.request.resource_type] = "abort"
+
+        async def continue_(self):
+            routed[self.request.resource_type] = "continue"
+
+    class _Page:
+        async def route(self, pattern, handler):
+            self.handler = handler
+
+    async def run():
+        page = await _block_heavy_resources(_Page(), context=None)
+        for resource_type in ("document", "script", "image", "font", "media"):
+            await page.handler(_Route(resource_type))
+
+    asyncio.run(run())
+
+    assert routed == {
+        "document": "continue",
+        "script": "continue",
+        "image": "abort",
+        "font": "abort",
+        "media": "abort",
+    }
@@ -0,0 +1,88 @@
+"""Tests for chunk write buffering in the MongoDB storage adapter."""
+
+import asyncio
+from types import SimpleNamespace
+
+from pymongo.errors import BulkWriteError
+
+from mdrag.capabilities.ingestion.models import IngestionConfig
+from mdrag.integrations.mongodb.adapters.storage import MongoStorageAdapter
+
+
+class _Chunks:
+    def __init__(self) -> None:
+        self.batches: list[int] = []
+        self.error: BulkWriteError | None = None
+
+    async def bulk_write(self, operations, ordered=True, session=None):
+        self.batches.append(len(operations))
+        if self.error is not None:
+            raise self.error
+
+
+def _adapter(batch_size: int) -> tuple[MongoStorageAdapter, _Chunks]:
+    chunks = _Chunks()
+    adapter = MongoStorageAdapter(
+        settings=SimpleNamespace(mongodb_collection_chunks="chunks"),
+        config=IngestionConfig(write_batch_size=batch_size),
+    )
+    adapter.db = {"chunks": chunks}
+    return adapter, chunks
+
+
+def test_chunk_writes_are_buffered_across_documents() -> None:
+    adapter, chunks = _adapter(batch_size=5)
+
+    async def run() -> None:
+        await adapter._write_chunks(["a", "b", "c"])
+        await adapter._write_chunks(["d", "e", "f"])
+        await adapter._write_chunks(["g"])
+        assert chunks.batches == [6]
+        await adapter.flush()
+
+    asyncio.run(run())
+    assert chunks.batches == [6, 1]
+
+
+def test_write_scopes_flush_only_their_own_writes() -> None:
+    adapter, chunks = _adapter(batch_size=10)
+
+    async def job(uid, count):
+        async with adapter.write_scope():
+            await adapter._write_chunks(["op"] * count, document_uid=uid)
+            await asyncio.sleep(0)
+            assert adapter.buffered_documents() == {uid}
+            await adapter.flush()
+
+    async def run() -> None:
+        await asyncio.gather(job("uid-1", 2), job("uid-2", 3))
+
+    asyncio.run(run())
+    assert sorted(chunks.batches) == [2, 3]
+    assert adapter.buffered_documents() == set()
+
+
+def test_chunk_writes_are_immediate_without_batching() -> None:
+    adapter, chunks = _adapter(batch_size=0)
+
+    asyncio.run(adapter._write_chunks(["a", "b"]))
+
+    assert chunks.batches == [2]
+
+
+def test_flush_failures_are_attributed_to_their_documents() -> None:
+    adapter, chunks = _adapter(batch_size=10)
+    chunks.error = BulkWriteError(
+        {"writeErrors": [{"index": 2, "code": 11000, "errmsg": "E11000 duplicate key"}]}
+    )
+
+    async def run() -> None:
+        await adapter._write_chunks(["a", "b"], document_uid="uid-1")
+        await adapter._write_chunks(["c"], document_uid="uid-2")
+        assert adapter.buffered_documents() == {"uid-1", "uid-2"}
+        await adapter.flush()
+
+    asyncio.run(run())
+    assert adapter.buffered_documents() == set()
+    assert adapter.pop_write_errors() == {"uid-2": ["E11000 duplicate key"]}
+    assert adapter.pop_write_errors() == {}
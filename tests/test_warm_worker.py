@@ -0,0 +1,129 @@
+"""Tests for the warm async ingestion worker."""
+
+import asyncio
+from types import SimpleNamespace
+
+from mdrag.capabilities.ingestion.jobs import warm_worker
+from mdrag.capabilities.ingestion.jobs.warm_worker import WarmIngestionWorker
+
+
+class _FakeRQWorker:
+    def __init__(self, queues, connection=None, name=None):
+        self.name = name
+        self.events = []
+
+    def register_birth(self):
+        self.events.append("birth")
+
+    def heartbeat(self):
+        self.events.append("heartbeat")
+
+    def register_death(self):
+        self.events.append("death")
+
+
+class _FakeJob:
+    def __init__(self, job_id):
+        self.id = job_id
+        self.func_name = warm_worker._INGESTION_HANDLER
+        self.args = (job_id, {"source_type": "upload"})
+        self.statuses = []
+
+    def set_status(self, status):
+        self.statuses.append(status)
+
+
+class _FakeService:
+    def __init__(self):
+        self.workflow = SimpleNamespace(initialize=self._initialize)
+        self.initialized = 0
+        self.closed = 0
+        self.running = 0
+        self.max_running = 0
+
+    async def _initialize(self):
+        self.initialized += 1
+
+    async def run_job(self, job_id, payload, job_store):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        if job_id == "bad":
+            raise RuntimeError("boom")
+
+    async def close(self):
+        self.closed += 1
+
+
+class _FakeJobStore:
+    def __init__(self):
+        self.closed = 0
+
+    async def close(self):
+        self.closed += 1
+
+
+def test_worker_runs_jobs_concurrently_with_one_warm_service(monkeypatch) -> None:
+    monkeypatch.setattr(warm_worker, "Worker", _FakeRQWorker)
+    service = _FakeService()
+    job_store = _FakeJobStore()
+    worker = WarmIngestionWorker(
+        SimpleNamespace(ingestion_worker_concurrency=2, redis_url="redis://localhost"),
+        service=service,
+        job_store=job_store,
+        connection=SimpleNamespace(),
+    )
+    worker.queue = SimpleNamespace(name="default")
+    jobs = [_FakeJob(job_id) for job_id in ("a", "b", "bad", "c")]
+    pending = list(jobs)
+
+    def dequeue():
+        if not pending:
+            worker.stop()
+            return None
+        return pending.pop(0)
+
+    worker._dequeue = dequeue
+    asyncio.run(worker.run())
+
+    assert service.initialized == 1
+    assert service.closed == 1
+    assert job_store.closed == 1
+    assert service.max_running == 2
+    assert [job.statuses[-1] for job in jobs] == ["finished", "finished", "failed", "finished"]
+
+
+def test_heartbeats_continue_while_every_slot_is_busy(monkeypatch) -> None:
+    workers = []
+
+    def rq_worker_factory(*args, **kwargs):
+        workers.append(_FakeRQWorker(*args, **kwargs))
+        return workers[-1]
+
+    monkeypatch.setattr(warm_worker, "Worker", rq_worker_factory)
+    monkeypatch.setattr(warm_worker, "HEARTBEAT_INTERVAL", 0.01)
+    service = _FakeService()
+    worker = WarmIngestionWorker(
+        SimpleNamespace(ingestion_worker_concurrency=1, redis_url="redis://localhost"),
+        service=service,
+        job_store=_FakeJobStore(),
+        connection=SimpleNamespace(),
+    )
+    worker.queue = SimpleNamespace(name="default")
+    pending = [_FakeJob("slow")]
+
+    async def run_job(job_id, payload, job_store):
+        await asyncio.sleep(0.1)
+        worker.stop()
+
+    def dequeue():
+        return pending.pop(0) if pending else None
+
+    service.run_job = run_job
+    worker._dequeue = dequeue
+    asyncio.run(worker.run())
+
+    (rq_worker,) = workers
+    assert rq_worker.events.count("heartbeat") >= 3
+    assert rq_worker.events[-1] == "death"